@@ -13,6 +13,12 @@ class BatchConfig(AppConfig):
     def ready(self):
         """Registers components related to batches"""
 
+        # Register the batch metrics processor with the clock system
+        import job.clock as clock
+        from batch.batch_metrics import BatchMetricsProcessor
+
+        clock.register_processor('scale-batch-metrics', BatchMetricsProcessor)
+
         # Register batch message types
         from batch.messages.create_batch_recipes import CreateBatchRecipes
         from batch.messages.update_batch_metrics import UpdateBatchMetrics
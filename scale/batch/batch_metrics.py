@@ -0,0 +1,21 @@
+"""Defines the clock event processor for reconciling the batch metrics."""
+from batch.messages.update_batch_metrics import create_update_batch_metrics_messages
+from batch.models import Batch
+from job.clock import ClockEventProcessor
+from messaging.manager import CommandMessageManager
+
+
+class BatchMetricsProcessor(ClockEventProcessor):
+    """This class corrects any drift between the batch metrics and the recipes and jobs within the batches."""
+
+    def process_event(self, event, last_event=None):
+        """See :meth:`job.clock.ClockEventProcessor.process_event`.
+
+        Sends messages to recount the metrics of the batches that were modified since the last event.
+        """
+        batches = Batch.objects.all()
+        if last_event:
+            batches = batches.filter(last_modified__gte=last_event.occurred)
+        batch_ids = list(batches.values_list('id', flat=True))
+        if batch_ids:
+            CommandMessageManager().send_messages(create_update_batch_metrics_messages(batch_ids))
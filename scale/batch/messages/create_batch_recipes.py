@@ -45,6 +45,8 @@ class CreateBatchRecipes(CommandMessage):
         self.batch_id = None
         self.is_prev_batch_done = False  # Indicates if all recipes from pervious batch have been handled
         self.current_recipe_id = None  # Keeps track of the last recipe that was reprocessed
+        # The number of recipes handled down to current_recipe_id that are not yet recorded in the batch's progress
+        self.pending_recipe_count = 0
 
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
@@ -53,6 +55,8 @@ class CreateBatchRecipes(CommandMessage):
         json_dict = {'batch_id': self.batch_id, 'is_prev_batch_done': self.is_prev_batch_done}
         if self.current_recipe_id is not None:
             json_dict['current_recipe_id'] = self.current_recipe_id
+        if self.pending_recipe_count:
+            json_dict['pending_recipe_count'] = self.pending_recipe_count
 
         return json_dict
 
@@ -66,6 +70,8 @@ class CreateBatchRecipes(CommandMessage):
         message.is_prev_batch_done = json_dict['is_prev_batch_done']
         if 'current_recipe_id' in json_dict:
             message.current_recipe_id = json_dict['current_recipe_id']
+        if 'pending_recipe_count' in json_dict:
+            message.pending_recipe_count = json_dict['pending_recipe_count']
 
         return message
 
@@ -73,23 +79,32 @@ class CreateBatchRecipes(CommandMessage):
         """See :meth:`messaging.messages.message.CommandMessage.execute`
         """
 
+        when = now()
         batch = Batch.objects.get(id=self.batch_id)
         definition = batch.get_definition()
-        new_messages = []
+        Batch.objects.start_creation(self.batch_id, when)
+
+        # This message is only sent after the previous message's re-processing messages, so they have been sent and
+        # their recipes can be recorded in the batch's progress
+        if self.pending_recipe_count:
+            Batch.objects.update_creation_progress(self.batch_id, self.current_recipe_id, self.pending_recipe_count,
+                                                   when)
+            self.pending_recipe_count = 0
 
         # Reprocess recipes from previous batch
         if not self.is_prev_batch_done:
-            new_messages.extend(self._handle_previous_batch(batch, definition))
+            self.new_messages.extend(self._handle_previous_batch(batch, definition))
 
-        if self.is_prev_batch_done:
+        if self.is_prev_batch_done and not self.pending_recipe_count:
             logger.info('All re-processing messages created, marking recipe creation as done')
-            Batch.objects.mark_creation_done(self.batch_id, now())
+            Batch.objects.mark_creation_done(self.batch_id, when)
         else:
+            # The next message goes after the re-processing messages so that it records their progress once they are
+            # sent
             logger.info('Creating new message for next set of batch recipes')
             msg = CreateBatchRecipes.from_json(self.to_json())
             self.new_messages.append(msg)
 
-        self.new_messages.extend(new_messages)
         return True
 
     def _handle_previous_batch(self, batch, definition):
@@ -130,6 +145,7 @@ class CreateBatchRecipes(CommandMessage):
                                                      all_jobs=definition.all_jobs, job_names=definition.job_names,
                                                      batch_id=batch.id)
             messages.extend(msgs)
+            self.pending_recipe_count = recipe_count
 
         if recipe_count < MAX_RECIPE_NUM:
             # Handled less than the max number of recipes, so recipes from previous batch must be done
@@ -40,7 +40,7 @@ def create_update_batch_metrics_messages(batch_ids):
 
 
 class UpdateBatchMetrics(CommandMessage):
-    """Command message that updates batch metrics
+    """Command message that reconciles batch metrics by recounting them from the recipes and jobs within the batches
     """
 
     def __init__(self):
@@ -69,6 +69,19 @@ class UpdateBatchMetrics(CommandMessage):
 
         return len(self._batch_ids) < MAX_NUM
 
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        batch_ids = set(self._batch_ids)
+        new_batch_ids = [batch_id for batch_id in message._batch_ids if batch_id not in batch_ids]
+        if len(self._batch_ids) + len(new_batch_ids) > MAX_NUM:
+            return False
+
+        for batch_id in new_batch_ids:
+            self.add_batch(batch_id)
+        return True
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
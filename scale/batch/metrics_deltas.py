@@ -0,0 +1,159 @@
+"""Defines the class that collects the changes to batch metrics so they can be applied without a full recount"""
+from __future__ import unicode_literals
+
+from collections import namedtuple
+
+# The job counts that a batch sums from its top-level recipes, and that batch metrics count per job name
+JOB_COUNT_FIELDS = ('jobs_total', 'jobs_pending', 'jobs_blocked', 'jobs_queued', 'jobs_running', 'jobs_failed',
+                    'jobs_completed', 'jobs_canceled')
+# The recipe metrics that the deltas of a batch are calculated from
+RECIPE_METRICS_FIELDS = JOB_COUNT_FIELDS + ('sub_recipes_total', 'sub_recipes_completed', 'is_completed')
+
+JobMetricsDelta = namedtuple('JobMetricsDelta', ['batch_id', 'job_name', 'counts', 'job_durations',
+                                                 'seed_durations'])
+
+
+class DurationSamples(object):
+    """Represents the durations of a set of newly completed jobs
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self.count = 0
+        self.total = None
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, duration):
+        """Adds the given duration to the samples
+
+        :param duration: The duration, possibly None
+        :type duration: :class:`datetime.timedelta`
+        """
+
+        if duration is None:
+            return
+
+        self.count += 1
+        self.total = duration if self.total is None else self.total + duration
+        self.minimum = duration if self.minimum is None else min(self.minimum, duration)
+        self.maximum = duration if self.maximum is None else max(self.maximum, duration)
+
+
+class BatchMetricsDeltas(object):
+    """Collects the signed changes to the metrics of batches. The counts of a batch change by the difference between the
+    new metrics of each of its top-level recipes and the metrics that recipe was last counted with. The counts per job
+    name change by -1 for the old status and +1 for the new status of each job that changed status since it was last
+    counted, and each newly completed job adds its durations. A completed job that changes status cannot take its
+    durations back out of the minimum and maximum, so its batch is marked to be reconciled with a full recount instead.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._batches = {}  # {Batch ID: {Field name: Delta}}
+        self._jobs = {}  # {(Batch ID, Job name): JobMetricsDelta}
+        self.batch_ids_to_reconcile = set()
+
+    def add_job(self, batch_id, job_name, old_status, new_status, job_duration=None, seed_duration=None):
+        """Adds the status change of a job within a top-level recipe of the given batch
+
+        :param batch_id: The batch ID
+        :type batch_id: int
+        :param job_name: The name of the job's node within the recipe
+        :type job_name: string
+        :param old_status: The status the job was last counted with, None if the job has never been counted
+        :type old_status: string
+        :param new_status: The new status of the job
+        :type new_status: string
+        :param job_duration: The duration of the job, used if the job is newly completed
+        :type job_duration: :class:`datetime.timedelta`
+        :param seed_duration: The Seed run duration of the job's last execution, used if the job is newly completed
+        :type seed_duration: :class:`datetime.timedelta`
+        """
+
+        key = (batch_id, job_name)
+        if key not in self._jobs:
+            self._jobs[key] = JobMetricsDelta(batch_id, job_name, {}, DurationSamples(), DurationSamples())
+        job_delta = self._jobs[key]
+
+        if old_status is None:
+            _add_count(job_delta.counts, 'jobs_total', 1)
+        else:
+            _add_count(job_delta.counts, 'jobs_%s' % old_status.lower(), -1)
+        _add_count(job_delta.counts, 'jobs_%s' % new_status.lower(), 1)
+
+        if new_status == 'COMPLETED':
+            job_delta.job_durations.add(job_duration)
+            job_delta.seed_durations.add(seed_duration)
+        if old_status == 'COMPLETED':
+            self.batch_ids_to_reconcile.add(batch_id)
+
+    def add_recipe(self, batch_id, old_metrics, new_metrics):
+        """Adds the change in the metrics of a top-level recipe of the given batch
+
+        :param batch_id: The batch ID
+        :type batch_id: int
+        :param old_metrics: The metrics the recipe was last counted with, None if the recipe has never been counted
+        :type old_metrics: dict
+        :param new_metrics: The new metrics of the recipe
+        :type new_metrics: dict
+        """
+
+        batch_delta = self._batches.setdefault(batch_id, {})
+        old = old_metrics if old_metrics is not None else {}
+
+        for field_name in JOB_COUNT_FIELDS:
+            _add_count(batch_delta, field_name, new_metrics[field_name] - old.get(field_name, 0))
+        recipes_total = new_metrics['sub_recipes_total'] - old.get('sub_recipes_total', 0)
+        if old_metrics is None:
+            recipes_total += 1
+        recipes_completed = new_metrics['sub_recipes_completed'] - old.get('sub_recipes_completed', 0)
+        recipes_completed += int(new_metrics['is_completed']) - int(old.get('is_completed', False))
+        _add_count(batch_delta, 'recipes_total', recipes_total)
+        _add_count(batch_delta, 'recipes_completed', recipes_completed)
+
+    def get_batch_deltas(self):
+        """Returns the non-zero changes to the counts of each batch
+
+        :returns: The changes stored by field name, stored by batch ID
+        :rtype: dict
+        """
+
+        batch_deltas = {}
+        for batch_id, batch_delta in self._batches.items():
+            counts = {field_name: delta for field_name, delta in batch_delta.items() if delta}
+            if counts:
+                batch_deltas[batch_id] = counts
+        return batch_deltas
+
+    def get_job_deltas(self):
+        """Returns the changes to the metrics per job name that change the counts or add durations
+
+        :returns: The list of job metrics deltas
+        :rtype: :func:`list` of :class:`batch.metrics_deltas.JobMetricsDelta`
+        """
+
+        job_deltas = []
+        for job_delta in self._jobs.values():
+            counts = {field_name: delta for field_name, delta in job_delta.counts.items() if delta}
+            if counts or job_delta.job_durations.count or job_delta.seed_durations.count:
+                job_deltas.append(job_delta._replace(counts=counts))
+        return job_deltas
+
+
+def _add_count(counts, field_name, delta):
+    """Adds the given delta to a count
+
+    :param counts: The counts stored by field name
+    :type counts: dict
+    :param field_name: The name of the count field
+    :type field_name: string
+    :param delta: The signed change to the count
+    :type delta: int
+    """
+
+    counts[field_name] = counts.get(field_name, 0) + delta
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import datetime
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('batch', '0007_auto_20180516_1915'),
+        ('recipe', '0027_recipe_metrics_counted'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='batchmetrics',
+            name='job_duration_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='batchmetrics',
+            name='seed_duration_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='batchmetrics',
+            name='total_job_duration',
+            field=models.DurationField(default=datetime.timedelta(0)),
+        ),
+        migrations.AddField(
+            model_name='batchmetrics',
+            name='total_seed_duration',
+            field=models.DurationField(default=datetime.timedelta(0)),
+        ),
+        migrations.RunSQL(
+            sql='UPDATE batch_metrics bm SET job_duration_count = s.job_duration_count, '
+                'total_job_duration = s.total_job_duration, seed_duration_count = s.seed_duration_count, '
+                'total_seed_duration = s.total_seed_duration FROM ('
+                'SELECT r.batch_id, rn.node_name, COUNT(j.ended - j.started) AS job_duration_count, '
+                'COALESCE(SUM(j.ended - j.started), INTERVAL \'0\') AS total_job_duration, '
+                'COUNT(je.seed_ended - je.seed_started) AS seed_duration_count, '
+                'COALESCE(SUM(je.seed_ended - je.seed_started), INTERVAL \'0\') AS total_seed_duration '
+                'FROM recipe_node rn JOIN job j ON rn.job_id = j.id JOIN recipe r ON rn.recipe_id = r.id '
+                'LEFT OUTER JOIN job_exe_end je ON je.job_id = j.id AND je.exe_num = j.num_exes '
+                'WHERE r.batch_id IS NOT NULL AND r.recipe_id IS NULL AND j.status = \'COMPLETED\' '
+                'GROUP BY r.batch_id, rn.node_name) s '
+                'WHERE bm.batch_id = s.batch_id AND bm.job_name = s.node_name',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
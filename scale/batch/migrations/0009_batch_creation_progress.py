@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('batch', '0008_batchmetrics_duration_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='batch',
+            name='creation_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='batch',
+            name='creation_cursor',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='batch',
+            name='creation_ended',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='batch',
+            name='creation_file_cursor',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='batch',
+            name='creation_started',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,6 +1,7 @@
 """Defines the database models for a batch"""
 from __future__ import unicode_literals
 
+import datetime
 import logging
 from collections import namedtuple
 
@@ -15,6 +16,7 @@ from batch.definition.exceptions import InvalidDefinition
 from batch.definition.json.definition_v6 import convert_definition_to_v6, BatchDefinitionV6
 from batch.definition.json.old.batch_definition import BatchDefinition as OldBatchDefinition
 from batch.exceptions import BatchError
+from batch.metrics_deltas import JOB_COUNT_FIELDS
 from job.configuration.data.job_data import JobData
 from job.models import JobType
 from messaging.manager import CommandMessageManager
@@ -34,6 +36,9 @@ logger = logging.getLogger(__name__)
 
 BatchValidation = namedtuple('BatchValidation', ['is_valid', 'errors', 'warnings', 'batch'])
 
+# The number of recipes or files that batch creation handles before it saves its progress
+CREATION_CHUNK_SIZE = 1000
+
 
 class BatchManager(models.Manager):
     """Provides additional methods for handling batches"""
@@ -443,7 +448,37 @@ class BatchManager(models.Manager):
         :type when: :class:`datetime.datetime`
         """
 
-        self.filter(id=batch_id).update(is_creation_done=True, last_modified=when)
+        self.filter(id=batch_id).update(is_creation_done=True, creation_ended=when, last_modified=when)
+
+    def start_creation(self, batch_id, when):
+        """Records when recipe creation started for this batch, unless it has already started
+
+        :param batch_id: The batch ID
+        :type batch_id: int
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        self.filter(id=batch_id, creation_started__isnull=True).update(creation_started=when, last_modified=when)
+
+    def update_creation_progress(self, batch_id, cursor, count, when):
+        """Records that recipe creation for this batch has handled the given number of recipes, down to the recipe with
+        the given ID. Recipe creation always handles recipes in descending ID order, so the progress is only recorded
+        if the cursor is lower than the batch's current cursor. This keeps a re-executed message from counting its
+        recipes twice.
+
+        :param batch_id: The batch ID
+        :type batch_id: int
+        :param cursor: The ID of the last recipe handled
+        :type cursor: int
+        :param count: The number of recipes handled
+        :type count: int
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        qry = self.filter(Q(creation_cursor__isnull=True) | Q(creation_cursor__gt=cursor), id=batch_id)
+        qry.update(creation_cursor=cursor, creation_count=F('creation_count') + count, last_modified=when)
 
     def supersede_batch(self, batch_id, when):
         """Updates the given batch to be superseded
@@ -458,7 +493,10 @@ class BatchManager(models.Manager):
 
     # TODO: remove this when v5 REST API is removed
     def schedule_recipes(self, batch_id):
-        """Schedules each recipe that matches the batch for re-processing and creates associated batch models.
+        """Schedules each recipe that matches the batch for re-processing and creates associated batch models. Matching
+        recipes are handled a chunk at a time in descending ID order, like the v6 batch messages, and matching files in
+        ascending ID order. The batch's cursors are saved after each chunk, so an interrupted batch resumes after the
+        last chunk that it finished.
 
         :param batch_id: The unique identifier of the batch that defines the recipes to schedule.
         :type batch_id: string
@@ -471,37 +509,59 @@ class BatchManager(models.Manager):
         if batch.status == 'CREATED':
             raise BatchError('Batch already completed: %i', batch_id)
         batch_definition = batch.get_old_definition()
-
-        # Fetch all the recipes of the requested type that are not already superseded
+        # Only the creation fields are saved, so that the batch metrics updated by other processes are not overwritten
+        progress_fields = ['created_count', 'failed_count', 'total_count', 'recipes_estimated', 'creation_count',
+                           'creation_cursor', 'creation_file_cursor', 'creation_started', 'last_modified']
+        if not batch.creation_started:
+            batch.creation_started = now()
+
+        # Fetch all the recipes of the requested type that are not already superseded and that have not already been
+        # handled by an earlier, interrupted run
         old_recipes = self.get_matched_recipes(batch.recipe_type, batch_definition)
+        if batch.creation_cursor is not None:
+            old_recipes = old_recipes.filter(id__lt=batch.creation_cursor)
 
-        # Fetch all the old files that were never triggered for the recipe type
+        # Fetch all the old files that were never triggered for the recipe type and have not already been handled
         old_files = self.get_matched_files(batch.recipe_type, batch_definition)
+        if batch.creation_file_cursor is not None:
+            old_files = old_files.filter(id__gt=batch.creation_file_cursor)
 
         # Estimate the batch size
         old_recipes_count = old_recipes.count()
         old_files_count = old_files.count()
-        if old_recipes_count + old_files_count > batch.total_count:
-            batch.total_count = old_recipes_count + old_files_count
+        estimated_count = batch.created_count + batch.failed_count + old_recipes_count + old_files_count
+        if estimated_count > batch.total_count:
+            batch.total_count = estimated_count
             batch.recipes_estimated = batch.total_count
-            batch.save()
+        batch.save(update_fields=progress_fields)
 
-        # Send messages to reprocess old recipes
+        # Send messages to reprocess old recipes, saving the progress of the batch after each chunk
         logger.info('Sending messages to reprocess old recipes: %i', old_recipes_count)
         new_rev = RecipeTypeRevision.objects.get_revision_old(batch.recipe_type_id, batch.recipe_type.revision_num)
-        root_recipe_ids = []
-        for old_recipe in old_recipes.iterator():
-            root_id = old_recipe.root_superseded_recipe_id if old_recipe.root_superseded_recipe_id else old_recipe.id
-            root_recipe_ids.append(root_id)
-        if root_recipe_ids:
+        old_recipes = old_recipes.only('id', 'root_superseded_recipe_id').order_by('-id')
+        while True:
+            recipe_qry = old_recipes
+            if batch.creation_cursor is not None:
+                recipe_qry = recipe_qry.filter(id__lt=batch.creation_cursor)
+            root_recipe_ids = []
+            for old_recipe in recipe_qry[:CREATION_CHUNK_SIZE]:
+                if old_recipe.id == batch.creation_cursor:
+                    continue  # Date range filters join on input files, which can return the same recipe twice
+                batch.creation_cursor = old_recipe.id
+                root_id = old_recipe.root_superseded_recipe_id
+                root_recipe_ids.append(root_id if root_id else old_recipe.id)
+            if not root_recipe_ids:
+                break
+
             all_jobs = batch_definition.all_jobs
             job_names = batch_definition.job_names
             messages = create_reprocess_recipes_messages(root_recipe_ids, new_rev.id, batch.event_id, all_jobs=all_jobs,
                                                          job_names=job_names, batch_id=batch.id)
             CommandMessageManager().send_messages(messages)
             # Update the overall batch status
-            batch.created_count += old_recipes_count
-            batch.save()
+            batch.created_count += len(root_recipe_ids)
+            batch.creation_count += len(root_recipe_ids)
+            batch.save(update_fields=progress_fields)
 
         # Determine what trigger rule should be applied
         trigger_config = None
@@ -510,15 +570,27 @@ class BatchManager(models.Manager):
         elif batch_definition.trigger_config:
             trigger_config = batch_definition.trigger_config
 
-        # Schedule new recipes for old files
-        logger.info('Scheduling new batch recipes for old files: %i', old_recipes_count)
-        for old_file in old_files.iterator():
-            try:
-                self._process_trigger(batch, trigger_config, old_file)
-            except:
-                logger.exception('Unable to trigger batch file: %i', old_file.id)
-                batch.failed_count += 1
-                batch.save()
+        # Schedule new recipes for old files, saving the progress of the batch after each chunk
+        logger.info('Scheduling new batch recipes for old files: %i', old_files_count)
+        old_files = old_files.order_by('id')
+        while True:
+            file_qry = old_files
+            if batch.creation_file_cursor is not None:
+                file_qry = file_qry.filter(id__gt=batch.creation_file_cursor)
+            old_files_chunk = list(file_qry[:CREATION_CHUNK_SIZE])
+            if not old_files_chunk:
+                break
+
+            for old_file in old_files_chunk:
+                try:
+                    if self._process_trigger(batch, trigger_config, old_file):
+                        batch.created_count += 1
+                except:
+                    logger.exception('Unable to trigger batch file: %i', old_file.id)
+                    batch.failed_count += 1
+                batch.creation_file_cursor = old_file.id
+            batch.creation_count += len(old_files_chunk)
+            batch.save(update_fields=progress_fields)
 
         # Update the final batch state
         # Recompute the total to catch models that may have matched after the count query
@@ -526,7 +598,8 @@ class BatchManager(models.Manager):
         batch.status = 'CREATED'
         batch.total_count = batch.created_count + batch.failed_count
         batch.is_creation_done = True
-        batch.save()
+        batch.creation_ended = now()
+        batch.save(update_fields=progress_fields + ['status', 'is_creation_done', 'creation_ended'])
 
     # TODO: remove this when v5 REST API is removed
     def get_matched_files(self, recipe_type, definition):
@@ -598,8 +671,27 @@ class BatchManager(models.Manager):
                                                  Q(recipeinputfile__input_file__data_ended__lte=definition.ended))
         return old_recipes
 
+    def apply_metrics_deltas(self, deltas):
+        """Applies the given changes to the metrics of batches and to their metrics per job name. The deltas must be
+        applied in the same transaction that calculated them.
+
+        :param deltas: The batch metrics deltas
+        :type deltas: :class:`batch.metrics_deltas.BatchMetricsDeltas`
+        """
+
+        when = now()
+        batch_deltas = deltas.get_batch_deltas()
+        for batch_id in sorted(batch_deltas):
+            counts = batch_deltas[batch_id]
+            fields = {field_name: F(field_name) + delta for field_name, delta in counts.items()}
+            self.filter(id=batch_id).update(last_modified=when, **fields)
+
+        BatchMetrics.objects.apply_job_metrics_deltas(deltas.get_job_deltas(), when)
+
     def update_batch_metrics(self, batch_ids):
-        """Updates the metrics for the batches with the given IDs
+        """Reconciles the metrics for the batches with the given IDs by recounting them from all of their top-level
+        recipes and jobs, correcting any drift from the deltas applied by :meth:`apply_metrics_deltas`. The recipes and
+        jobs are marked as counted so that later deltas start from the recount.
 
         :param batch_ids: The batch IDs
         :type batch_ids: list
@@ -608,22 +700,37 @@ class BatchManager(models.Manager):
         if not batch_ids:
             return
 
-        qry = 'UPDATE batch b SET recipes_total = s.recipes_total, recipes_completed = s.recipes_completed, '
-        qry += 'jobs_total = s.jobs_total, jobs_pending = s.jobs_pending, jobs_blocked = s.jobs_blocked, '
-        qry += 'jobs_queued = s.jobs_queued, jobs_running = s.jobs_running, jobs_failed = s.jobs_failed, '
-        qry += 'jobs_completed = s.jobs_completed, jobs_canceled = s.jobs_canceled, last_modified = %s '
-        qry += 'FROM (SELECT r.batch_id, COUNT(r.id) + SUM(r.sub_recipes_total) AS recipes_total, '
-        qry += 'COUNT(r.id) FILTER(WHERE r.is_completed) + SUM(r.sub_recipes_completed) AS recipes_completed, '
-        qry += 'SUM(r.jobs_total) AS jobs_total, SUM(r.jobs_pending) AS jobs_pending, '
-        qry += 'SUM(r.jobs_blocked) AS jobs_blocked, SUM(r.jobs_queued) AS jobs_queued, '
-        qry += 'SUM(r.jobs_running) AS jobs_running, SUM(r.jobs_failed) AS jobs_failed, '
-        qry += 'SUM(r.jobs_completed) AS jobs_completed, SUM(r.jobs_canceled) AS jobs_canceled '
-        qry += 'FROM recipe r WHERE r.batch_id IN %s AND r.recipe_id IS NULL GROUP BY r.batch_id) s '
-        qry += 'WHERE b.id = s.batch_id'
-        with connection.cursor() as cursor:
-            cursor.execute(qry, [now(), tuple(batch_ids)])
-
-        BatchMetrics.objects.update_batch_metrics_per_job(batch_ids)
+        with transaction.atomic():
+            # Lock the top-level recipes in ID order, the same order that recipe metrics updates lock them, so that no
+            # deltas are calculated for these batches during the recount
+            recipes = Recipe.objects.filter(batch_id__in=batch_ids, recipe__isnull=True)
+            list(recipes.select_for_update().order_by('id').values_list('id', flat=True))
+            recipes.update(counted_completed=F('is_completed'))
+
+            # Only batches whose metrics drifted are updated
+            qry = 'UPDATE batch b SET recipes_total = s.recipes_total, recipes_completed = s.recipes_completed, '
+            qry += 'jobs_total = s.jobs_total, jobs_pending = s.jobs_pending, jobs_blocked = s.jobs_blocked, '
+            qry += 'jobs_queued = s.jobs_queued, jobs_running = s.jobs_running, jobs_failed = s.jobs_failed, '
+            qry += 'jobs_completed = s.jobs_completed, jobs_canceled = s.jobs_canceled, last_modified = %s '
+            qry += 'FROM (SELECT r.batch_id, COUNT(r.id) + SUM(r.sub_recipes_total) AS recipes_total, '
+            qry += 'COUNT(r.id) FILTER(WHERE r.is_completed) + SUM(r.sub_recipes_completed) AS recipes_completed, '
+            qry += 'SUM(r.jobs_total) AS jobs_total, SUM(r.jobs_pending) AS jobs_pending, '
+            qry += 'SUM(r.jobs_blocked) AS jobs_blocked, SUM(r.jobs_queued) AS jobs_queued, '
+            qry += 'SUM(r.jobs_running) AS jobs_running, SUM(r.jobs_failed) AS jobs_failed, '
+            qry += 'SUM(r.jobs_completed) AS jobs_completed, SUM(r.jobs_canceled) AS jobs_canceled '
+            qry += 'FROM recipe r WHERE r.batch_id IN %s AND r.recipe_id IS NULL GROUP BY r.batch_id) s '
+            qry += 'WHERE b.id = s.batch_id AND (b.recipes_total, b.recipes_completed, b.jobs_total, b.jobs_pending, '
+            qry += 'b.jobs_blocked, b.jobs_queued, b.jobs_running, b.jobs_failed, b.jobs_completed, b.jobs_canceled) '
+            qry += 'IS DISTINCT FROM (s.recipes_total, s.recipes_completed, s.jobs_total, s.jobs_pending, '
+            qry += 's.jobs_blocked, s.jobs_queued, s.jobs_running, s.jobs_failed, s.jobs_completed, s.jobs_canceled) '
+            qry += 'RETURNING b.id'
+            with connection.cursor() as cursor:
+                cursor.execute(qry, [now(), tuple(batch_ids)])
+                corrected_ids = [row[0] for row in cursor.fetchall()]
+            if corrected_ids:
+                logger.info('Corrected the metrics of batches %s', corrected_ids)
+
+            BatchMetrics.objects.update_batch_metrics_per_job(batch_ids)
 
     def validate_batch_v6(self, recipe_type, definition, configuration=None):
         """Validates the given recipe type, definition, and configuration for creating a new batch
@@ -673,8 +780,8 @@ class BatchManager(models.Manager):
     def _process_trigger(self, batch, trigger_config, input_file):
         """Processes the given input file within the context of a particular batch request.
 
-        Each batch recipe and its batch jobs are created in an atomic transaction to support resuming the batch command
-        when it is interrupted prematurely.
+        Each batch recipe and its batch jobs are created in an atomic transaction. The caller is responsible for saving
+        the progress of the batch.
 
         :param batch: The batch that defines the recipes to schedule
         :type batch: :class:`batch.models.Batch`
@@ -682,13 +789,15 @@ class BatchManager(models.Manager):
         :type trigger_config: :class:`batch.definition.json.old.batch_definition.BatchTriggerConfiguration`
         :param input_file: The input file that should trigger a new batch recipe
         :type input_file: :class:`storage.models.ScaleFile`
+        :returns: True if a new batch recipe was created, False if the file does not match the trigger condition
+        :rtype: bool
         """
 
         # Check whether the source file matches the trigger condition
         if hasattr(trigger_config, 'get_condition'):
             condition = trigger_config.get_condition()
             if not condition.is_condition_met(input_file):
-                return
+                return False
 
         # Build recipe data to pass input file parameters to new recipes
         recipe_data = LegacyRecipeData({})
@@ -705,9 +814,7 @@ class BatchManager(models.Manager):
         }
         event = TriggerEvent.objects.create_trigger_event('BATCH', None, description, now())
         Queue.objects.queue_new_recipe(batch.recipe_type, recipe_data, event, batch_id=batch.id)
-        # Update the overall batch status
-        batch.created_count += 1
-        batch.save()
+        return True
 
 
 class Batch(models.Model):
@@ -775,6 +882,18 @@ class Batch(models.Model):
     :keyword recipes_completed: The count for all completed recipes (including sub-recipes) within the batch
     :type recipes_completed: :class:`django.db.models.IntegerField`
 
+    :keyword creation_count: The number of recipes and files that recipe creation has handled so far
+    :type creation_count: :class:`django.db.models.IntegerField`
+    :keyword creation_cursor: The ID of the last recipe handled by recipe creation, which handles recipes in
+        descending ID order, used to resume creation
+    :type creation_cursor: :class:`django.db.models.IntegerField`
+    :keyword creation_file_cursor: The ID of the last file handled by recipe creation, used to resume creation
+    :type creation_file_cursor: :class:`django.db.models.IntegerField`
+    :keyword creation_started: When recipe creation started for the batch
+    :type creation_started: :class:`django.db.models.DateTimeField`
+    :keyword creation_ended: When recipe creation finished for the batch
+    :type creation_ended: :class:`django.db.models.DateTimeField`
+
     :keyword created: When the batch was created
     :type created: :class:`django.db.models.DateTimeField`
     :keyword superseded: When this batch was superseded
@@ -831,6 +950,13 @@ class Batch(models.Model):
     recipes_total = models.IntegerField(default=0)
     recipes_completed = models.IntegerField(default=0)
 
+    # Recipe creation progress fields
+    creation_count = models.IntegerField(default=0)
+    creation_cursor = models.IntegerField(blank=True, null=True)
+    creation_file_cursor = models.IntegerField(blank=True, null=True)
+    creation_started = models.DateTimeField(blank=True, null=True)
+    creation_ended = models.DateTimeField(blank=True, null=True)
+
     created = models.DateTimeField(auto_now_add=True)
     superseded = models.DateTimeField(blank=True, null=True)
     last_modified = models.DateTimeField(auto_now=True)
@@ -846,6 +972,26 @@ class Batch(models.Model):
 
         return BatchConfigurationV6(configuration=self.configuration, do_validate=False).get_configuration()
 
+    def get_creation_progress(self):
+        """Returns the progress of recipe creation for this batch, including the rate (per second) at which recipes and
+        files have been handled
+
+        :returns: The recipe creation progress
+        :rtype: dict
+        """
+
+        rate = None
+        if self.creation_started:
+            ended = self.creation_ended if self.creation_ended else now()
+            seconds = (ended - self.creation_started).total_seconds()
+            if seconds > 0:
+                rate = round(self.creation_count / seconds, 2)
+
+        started = parse_utils.datetime_to_string(self.creation_started) if self.creation_started else None
+        ended = parse_utils.datetime_to_string(self.creation_ended) if self.creation_ended else None
+        return {'count': self.creation_count, 'estimated': self.recipes_estimated, 'rate': rate, 'started': started,
+                'ended': ended}
+
     def get_definition(self):
         """Returns the definition for this batch
 
@@ -938,8 +1084,43 @@ class BatchMetricsManager(models.Manager):
 
         return self.filter(batch_id=batch_id)
 
+    def apply_job_metrics_deltas(self, job_deltas, when):
+        """Applies the given changes to the metrics per job name of batches
+
+        :param job_deltas: The list of job metrics deltas
+        :type job_deltas: :func:`list` of :class:`batch.metrics_deltas.JobMetricsDelta`
+        :param when: The time the deltas are applied
+        :type when: :class:`datetime.datetime`
+        """
+
+        if not job_deltas:
+            return
+
+        qry = 'UPDATE batch_metrics SET '
+        qry += ', '.join('%s = %s + %%s' % (field_name, field_name) for field_name in JOB_COUNT_FIELDS) + ', '
+        # The average is recalculated from the new count and total of the durations
+        duration_qry = '{0}_duration_count = {0}_duration_count + %s, total_{0}_duration = total_{0}_duration + %s, '
+        duration_qry += 'min_{0}_duration = LEAST(min_{0}_duration, %s), '
+        duration_qry += 'max_{0}_duration = GREATEST(max_{0}_duration, %s), '
+        duration_qry += 'avg_{0}_duration = (total_{0}_duration + %s) / NULLIF({0}_duration_count + %s, 0), '
+        qry += duration_qry.format('job') + duration_qry.format('seed')
+        qry += 'last_modified = %s WHERE batch_id = %s AND job_name = %s'
+
+        params_list = []
+        for job_delta in sorted(job_deltas, key=lambda delta: (delta.batch_id, delta.job_name)):
+            params = [job_delta.counts.get(field_name, 0) for field_name in JOB_COUNT_FIELDS]
+            for durations in (job_delta.job_durations, job_delta.seed_durations):
+                total = durations.total or datetime.timedelta(0)
+                params.extend([durations.count, total, durations.minimum, durations.maximum, total, durations.count])
+            params.extend([when, job_delta.batch_id, job_delta.job_name])
+            params_list.append(params)
+        with connection.cursor() as cursor:
+            cursor.executemany(qry, params_list)
+
     def update_batch_metrics_per_job(self, batch_ids):
-        """Updates the metrics per job name for the batches with the given IDs
+        """Recounts the metrics per job name for the batches with the given IDs. The top-level recipes of the batches
+        must be locked. The jobs are marked as counted first and then counted by their marked statuses, so a job that
+        changes status during the recount is picked up by the next recipe metrics update.
 
         :param batch_ids: The batch IDs
         :type batch_ids: list
@@ -948,26 +1129,39 @@ class BatchMetricsManager(models.Manager):
         if not batch_ids:
             return
 
+        qry = 'UPDATE recipe_node rn SET counted_status = j.status FROM job j, recipe r '
+        qry += 'WHERE rn.job_id = j.id AND rn.recipe_id = r.id AND r.batch_id IN %s AND r.recipe_id IS NULL '
+        qry += 'AND rn.counted_status IS DISTINCT FROM j.status'
+        with connection.cursor() as cursor:
+            cursor.execute(qry, [tuple(batch_ids)])
+
+        completed = 'FILTER(WHERE rn.counted_status = \'COMPLETED\')'
         qry = 'UPDATE batch_metrics bm SET jobs_total = s.jobs_total, jobs_pending = s.jobs_pending, '
         qry += 'jobs_blocked = s.jobs_blocked, jobs_queued = s.jobs_queued, jobs_running = s.jobs_running, '
         qry += 'jobs_failed = s.jobs_failed, jobs_completed = s.jobs_completed, jobs_canceled = s.jobs_canceled, '
+        qry += 'job_duration_count = s.job_duration_count, total_job_duration = s.total_job_duration, '
         qry += 'min_job_duration = s.min_job_duration, avg_job_duration = s.avg_job_duration, '
-        qry += 'max_job_duration = s.max_job_duration, min_seed_duration = s.min_seed_duration, '
+        qry += 'max_job_duration = s.max_job_duration, seed_duration_count = s.seed_duration_count, '
+        qry += 'total_seed_duration = s.total_seed_duration, min_seed_duration = s.min_seed_duration, '
         qry += 'avg_seed_duration = s.avg_seed_duration, max_seed_duration = s.max_seed_duration, last_modified = %s '
         qry += 'FROM (SELECT r.batch_id, rn.node_name, COUNT(j.id) AS jobs_total, '
-        qry += 'COUNT(j.id) FILTER(WHERE j.status = \'PENDING\') AS jobs_pending, '
-        qry += 'COUNT(j.id) FILTER(WHERE j.status = \'BLOCKED\') AS jobs_blocked, '
-        qry += 'COUNT(j.id) FILTER(WHERE j.status = \'QUEUED\') AS jobs_queued, '
-        qry += 'COUNT(j.id) FILTER(WHERE j.status = \'RUNNING\') AS jobs_running, '
-        qry += 'COUNT(j.id) FILTER(WHERE j.status = \'FAILED\') AS jobs_failed, '
-        qry += 'COUNT(j.id) FILTER(WHERE j.status = \'COMPLETED\') AS jobs_completed, '
-        qry += 'COUNT(j.id) FILTER(WHERE j.status = \'CANCELED\') AS jobs_canceled, '
-        qry += 'MIN(j.ended - j.started) FILTER(WHERE j.status = \'COMPLETED\') AS min_job_duration, '
-        qry += 'AVG(j.ended - j.started) FILTER(WHERE j.status = \'COMPLETED\') AS avg_job_duration, '
-        qry += 'MAX(j.ended - j.started) FILTER(WHERE j.status = \'COMPLETED\') AS max_job_duration, '
-        qry += 'MIN(je.seed_ended - je.seed_started) FILTER(WHERE j.status = \'COMPLETED\') AS min_seed_duration, '
-        qry += 'AVG(je.seed_ended - je.seed_started) FILTER(WHERE j.status = \'COMPLETED\') AS avg_seed_duration, '
-        qry += 'MAX(je.seed_ended - je.seed_started) FILTER(WHERE j.status = \'COMPLETED\') AS max_seed_duration '
+        qry += 'COUNT(j.id) FILTER(WHERE rn.counted_status = \'PENDING\') AS jobs_pending, '
+        qry += 'COUNT(j.id) FILTER(WHERE rn.counted_status = \'BLOCKED\') AS jobs_blocked, '
+        qry += 'COUNT(j.id) FILTER(WHERE rn.counted_status = \'QUEUED\') AS jobs_queued, '
+        qry += 'COUNT(j.id) FILTER(WHERE rn.counted_status = \'RUNNING\') AS jobs_running, '
+        qry += 'COUNT(j.id) FILTER(WHERE rn.counted_status = \'FAILED\') AS jobs_failed, '
+        qry += 'COUNT(j.id) FILTER(WHERE rn.counted_status = \'COMPLETED\') AS jobs_completed, '
+        qry += 'COUNT(j.id) FILTER(WHERE rn.counted_status = \'CANCELED\') AS jobs_canceled, '
+        qry += 'COUNT(j.ended - j.started) %s AS job_duration_count, ' % completed
+        qry += 'COALESCE(SUM(j.ended - j.started) %s, INTERVAL \'0\') AS total_job_duration, ' % completed
+        qry += 'MIN(j.ended - j.started) %s AS min_job_duration, ' % completed
+        qry += 'AVG(j.ended - j.started) %s AS avg_job_duration, ' % completed
+        qry += 'MAX(j.ended - j.started) %s AS max_job_duration, ' % completed
+        qry += 'COUNT(je.seed_ended - je.seed_started) %s AS seed_duration_count, ' % completed
+        qry += 'COALESCE(SUM(je.seed_ended - je.seed_started) %s, INTERVAL \'0\') AS total_seed_duration, ' % completed
+        qry += 'MIN(je.seed_ended - je.seed_started) %s AS min_seed_duration, ' % completed
+        qry += 'AVG(je.seed_ended - je.seed_started) %s AS avg_seed_duration, ' % completed
+        qry += 'MAX(je.seed_ended - je.seed_started) %s AS max_seed_duration ' % completed
         qry += 'FROM recipe_node rn JOIN job j ON rn.job_id = j.id JOIN recipe r ON rn.recipe_id = r.id '
         qry += 'LEFT OUTER JOIN job_exe_end je ON je.job_id = j.id AND je.exe_num = j.num_exes '
         qry += 'WHERE r.batch_id IN %s AND r.recipe_id IS NULL GROUP BY r.batch_id, rn.node_name) s '
@@ -1013,6 +1207,14 @@ class BatchMetrics(models.Model):
     :type avg_job_duration: :class:`django.db.models.DurationField`
     :keyword max_job_duration: The longest job duration for all completed jobs for this job name within the batch
     :type max_job_duration: :class:`django.db.models.DurationField`
+    :keyword seed_duration_count: The number of Seed run durations in the average Seed run duration
+    :type seed_duration_count: :class:`django.db.models.IntegerField`
+    :keyword total_seed_duration: The sum of the Seed run durations in the average Seed run duration
+    :type total_seed_duration: :class:`django.db.models.DurationField`
+    :keyword job_duration_count: The number of job durations in the average job duration
+    :type job_duration_count: :class:`django.db.models.IntegerField`
+    :keyword total_job_duration: The sum of the job durations in the average job duration
+    :type total_job_duration: :class:`django.db.models.DurationField`
 
     :keyword created: When these metrics were created
     :type created: :class:`django.db.models.DateTimeField`
@@ -1038,6 +1240,10 @@ class BatchMetrics(models.Model):
     min_job_duration = models.DurationField(blank=True, null=True)
     avg_job_duration = models.DurationField(blank=True, null=True)
     max_job_duration = models.DurationField(blank=True, null=True)
+    seed_duration_count = models.IntegerField(default=0)
+    total_seed_duration = models.DurationField(default=datetime.timedelta(0))
+    job_duration_count = models.IntegerField(default=0)
+    total_job_duration = models.DurationField(default=datetime.timedelta(0))
 
     created = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
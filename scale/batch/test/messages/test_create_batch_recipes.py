@@ -4,6 +4,7 @@ import django
 from django.test import TestCase
 
 from batch.definition.definition import BatchDefinition
+from batch.models import Batch
 from batch.messages.create_batch_recipes import create_batch_recipes_message, CreateBatchRecipes
 from batch.test import utils as batch_test_utils
 from recipe.test import utils as recipe_test_utils
@@ -37,11 +38,15 @@ class TestCreateBatchRecipes(TestCase):
         result = new_message.execute()
 
         self.assertTrue(result)
-        # Should be one reprocess_recipes message for the three recipes
-        self.assertEqual(len(new_message.new_messages), 1)
+        # Should be one reprocess_recipes message for the three recipes, followed by a message to record their progress
+        self.assertEqual(len(new_message.new_messages), 2)
         message = new_message.new_messages[0]
         self.assertEqual(message.type, 'reprocess_recipes')
         self.assertSetEqual(set(message._root_recipe_ids), {recipe_1.id, recipe_2.id, recipe_3.id})
+        message = new_message.new_messages[1]
+        self.assertEqual(message.type, 'create_batch_recipes')
+        self.assertTrue(message.is_prev_batch_done)
+        self.assertEqual(message.pending_recipe_count, 3)
 
     def test_execute(self):
         """Tests calling CreateBatchRecipes.execute() successfully"""
@@ -75,10 +80,10 @@ class TestCreateBatchRecipes(TestCase):
         result = message.execute()
         self.assertTrue(result)
 
-        # Should be two messages, one for next create_batch_recipes and one for re-processing recipes
+        # Should be two messages, one for re-processing recipes and one for next create_batch_recipes
         self.assertEqual(len(message.new_messages), 2)
-        batch_recipes_message = message.new_messages[0]
-        reprocess_message = message.new_messages[1]
+        reprocess_message = message.new_messages[0]
+        batch_recipes_message = message.new_messages[1]
         self.assertEqual(batch_recipes_message.type, 'create_batch_recipes')
         self.assertEqual(batch_recipes_message.batch_id, new_batch.id)
         self.assertFalse(batch_recipes_message.is_prev_batch_done)
@@ -94,8 +99,8 @@ class TestCreateBatchRecipes(TestCase):
 
         # Should have same messages returned
         self.assertEqual(len(message.new_messages), 2)
-        batch_recipes_message = message.new_messages[0]
-        reprocess_message = message.new_messages[1]
+        reprocess_message = message.new_messages[0]
+        batch_recipes_message = message.new_messages[1]
         self.assertEqual(batch_recipes_message.type, 'create_batch_recipes')
         self.assertEqual(batch_recipes_message.batch_id, new_batch.id)
         self.assertFalse(batch_recipes_message.is_prev_batch_done)
@@ -108,9 +113,35 @@ class TestCreateBatchRecipes(TestCase):
         result = batch_recipes_message.execute()
         self.assertTrue(result)
 
-        # Should only have one last reprocess message
-        self.assertEqual(len(batch_recipes_message.new_messages), 1)
+        # Should have one last reprocess message, followed by a message to record its progress
+        self.assertEqual(len(batch_recipes_message.new_messages), 2)
         reprocess_message = batch_recipes_message.new_messages[0]
+        last_message = batch_recipes_message.new_messages[1]
         self.assertTrue(batch_recipes_message.is_prev_batch_done)
         self.assertEqual(reprocess_message.type, 'reprocess_recipes')
         self.assertSetEqual(set(reprocess_message._root_recipe_ids), {recipe_1.id})
+        self.assertEqual(last_message.type, 'create_batch_recipes')
+
+        # The last recipe is not recorded until the message after its reprocess message is executed
+        new_batch = Batch.objects.get(id=new_batch.id)
+        self.assertFalse(new_batch.is_creation_done)
+        self.assertEqual(new_batch.creation_count, 5)
+        self.assertEqual(new_batch.creation_cursor, recipe_2.id)
+
+        # Execute the last create_batch_recipes message twice
+        last_message_json = last_message.to_json()
+        result = last_message.execute()
+        self.assertTrue(result)
+        self.assertEqual(len(last_message.new_messages), 0)
+        message = batch.messages.create_batch_recipes.CreateBatchRecipes.from_json(last_message_json)
+        result = message.execute()
+        self.assertTrue(result)
+        self.assertEqual(len(message.new_messages), 0)
+
+        # Re-executing the messages should not have counted their recipes twice
+        new_batch = Batch.objects.get(id=new_batch.id)
+        self.assertTrue(new_batch.is_creation_done)
+        self.assertEqual(new_batch.creation_count, 6)
+        self.assertEqual(new_batch.creation_cursor, recipe_1.id)
+        self.assertIsNotNone(new_batch.creation_started)
+        self.assertIsNotNone(new_batch.creation_ended)
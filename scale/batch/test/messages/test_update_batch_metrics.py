@@ -300,6 +300,8 @@ class TestUpdateBatchMetrics(TestCase):
         self.assertEqual(batch_metrics[2].min_job_duration, datetime.timedelta(minutes=2))
         self.assertEqual(batch_metrics[2].avg_job_duration, datetime.timedelta(minutes=4))
         self.assertEqual(batch_metrics[2].max_job_duration, datetime.timedelta(minutes=7))
+        self.assertEqual(batch_metrics[2].job_duration_count, 3)
+        self.assertEqual(batch_metrics[2].total_job_duration, datetime.timedelta(minutes=12))
         self.assertIsNone(batch_metrics[2].min_seed_duration)
         self.assertIsNone(batch_metrics[2].avg_seed_duration)
         self.assertIsNone(batch_metrics[2].max_seed_duration)
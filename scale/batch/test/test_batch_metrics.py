@@ -0,0 +1,38 @@
+from __future__ import unicode_literals
+
+import datetime
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+from mock import patch
+
+import job.test.utils as job_test_utils
+from batch.batch_metrics import BatchMetricsProcessor
+from batch.models import Batch
+from batch.test import utils as batch_test_utils
+
+
+class TestBatchMetricsProcessor(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.processor = BatchMetricsProcessor()
+
+    @patch('batch.batch_metrics.CommandMessageManager')
+    def test_process_event(self, mock_msg_mgr):
+        """Tests that only the batches modified since the last event are reconciled"""
+
+        batch_1 = batch_test_utils.create_batch()
+        batch_2 = batch_test_utils.create_batch()
+        last_event = job_test_utils.create_clock_event(occurred=now())
+        Batch.objects.filter(id=batch_1.id).update(last_modified=last_event.occurred - datetime.timedelta(hours=1))
+        Batch.objects.filter(id=batch_2.id).update(last_modified=last_event.occurred + datetime.timedelta(minutes=1))
+
+        self.processor.process_event(job_test_utils.create_clock_event(), last_event)
+
+        messages = mock_msg_mgr.return_value.send_messages.call_args[0][0]
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].type, 'update_batch_metrics')
+        self.assertListEqual(messages[0]._batch_ids, [batch_2.id])
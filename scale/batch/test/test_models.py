@@ -218,6 +218,40 @@ class TestBatchManager(TransactionTestCase):
         batch = Batch.objects.get(pk=batch.id)
         self.assertEqual(batch.status, 'CREATED')
 
+    @patch('batch.models.CREATION_CHUNK_SIZE', 2)
+    @patch('batch.models.CommandMessageManager')
+    def test_schedule_resume(self, mock_msg_mgr):
+        """Tests calling BatchManager.schedule_recipes() for an interrupted batch that resumes from its cursor"""
+        recipes = []
+        for i in range(5):
+            handler = Recipe.objects.create_recipe_old(recipe_type=self.recipe_type, input=LegacyRecipeData(self.data),
+                                                       event=self.event)
+            recipes.append(handler.recipe)
+        recipe_test_utils.edit_recipe_type(self.recipe_type, self.definition_2)
+        batch = batch_test_utils.create_batch_old(recipe_type=self.recipe_type)
+        batch.creation_cursor = recipes[3].id
+        batch.created_count = 2
+        batch.save()
+
+        Batch.objects.schedule_recipes(batch.id)
+
+        batch = Batch.objects.get(pk=batch.id)
+        self.assertEqual(batch.status, 'CREATED')
+        self.assertEqual(batch.created_count, 5)
+        self.assertEqual(batch.total_count, 5)
+        self.assertEqual(batch.creation_count, 3)
+        self.assertEqual(batch.creation_cursor, recipes[0].id)
+        self.assertIsNotNone(batch.creation_ended)
+
+        # The three remaining recipes are sent in two chunks
+        self.assertEqual(mock_msg_mgr.return_value.send_messages.call_count, 2)
+        root_recipe_ids = []
+        for call in mock_msg_mgr.return_value.send_messages.call_args_list:
+            for message in call[0][0]:
+                root_recipe_ids.extend(message._root_recipe_ids)
+        self.assertEqual(len(root_recipe_ids), 3)
+        self.assertSetEqual(set(root_recipe_ids), {recipe.id for recipe in recipes[:3]})
+
     def test_schedule_invalid_status(self):
         """Tests calling BatchManager.schedule_recipes() for a batch that was already created"""
 
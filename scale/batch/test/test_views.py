@@ -558,6 +558,7 @@ class TestBatchDetailsViewV6(TestCase):
         self.assertEqual(result['recipe_type']['id'], batch.recipe_type.id)
         self.assertDictEqual(result['definition'], batch.get_v6_definition_json())
         self.assertDictEqual(result['configuration'], batch.get_v6_configuration_json())
+        self.assertDictEqual(result['creation_progress'], batch.get_creation_progress())
 
     def test_successful_with_old_batch(self):
         """Tests successfully calling the v6 batch details view with an old-style batch"""
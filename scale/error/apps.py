@@ -18,3 +18,9 @@ class ErrorConfig(AppConfig):
         register_error(ScaleDatabaseError())
         register_error(ScaleIOError())
         register_error(ScaleOperationalError())
+
+        # Invalidate cached error responses when errors change
+        from error.models import Error
+        from util.rest_cache import invalidate_on_change
+
+        invalidate_on_change(Error, 'errors')
@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from rest_framework.reverse import reverse
 
 import util.rest as rest_util
+import util.rest_cache as rest_cache
 from error.models import Error
 from error.serializers import ErrorDetailsSerializerV5, ErrorSerializerV5, ErrorDetailsSerializerV6, ErrorSerializerV6
 from util.rest import BadParameter
@@ -28,6 +29,7 @@ class ErrorsView(GenericAPIView):
         else:
             return ErrorSerializerV5
     
+    @rest_cache.cache_response(['errors'])
     def get(self, request):
         """Retrieves the list of all errors and returns it in JSON form
 
@@ -68,6 +68,8 @@ def perform_ingest(ingest_id):
             elif ingest.new_file_path:
                 logger.info('Moving %s to %s in workspace %s', ingest.file_path, ingest.new_file_path,
                             ingest.workspace.name)
+                # Moving the file only saves its new path, so the rest of the source file fields are saved first
+                _save_source_file(source_file)
                 file_move = FileMove(source_file, ingest.new_file_path)
                 ScaleFile.objects.move_files([file_move])
             else:
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingest', '0014_auto_20170412_1225'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingest',
+            index=models.Index(fields=['last_modified', 'id'], name='ingest_modified_id_idx'),
+        ),
+    ]
@@ -634,6 +634,7 @@ class Ingest(models.Model):
     class Meta(object):
         """meta information for database"""
         db_table = 'ingest'
+        indexes = [models.Index(fields=['last_modified', 'id'], name='ingest_modified_id_idx')]
 
 ScanValidation = namedtuple('ScanValidation', ['is_valid', 'errors', 'warnings'])
 
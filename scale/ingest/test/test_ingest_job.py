@@ -2,9 +2,13 @@ from __future__ import unicode_literals
 
 import django
 from django.test import TransactionTestCase
+from mock import patch
 
 import ingest.test.utils as ingest_test_utils
 import source.test.utils as source_test_utils
+from ingest.ingest_job import perform_ingest
+from ingest.models import Ingest
+from storage.models import ScaleFile
 
 
 class TestPerformIngest(TransactionTestCase):
@@ -20,3 +24,32 @@ class TestPerformIngest(TransactionTestCase):
         """Tests processing a new ingest successfully."""
 
         pass
+
+    @patch('ingest.ingest_job.IngestTriggerHandler')
+    @patch('storage.models.Workspace._get_volume_path')
+    @patch('storage.models.Workspace.get_broker')
+    def test_move_to_new_file_path(self, mock_get_broker, mock_get_volume_path, mock_trigger_handler):
+        """Tests that an ingest that moves its file to a new path saves the source file as ingested"""
+
+        def move_files(volume_path, file_moves):
+            for file_move in file_moves:
+                file_move.file.file_path = file_move.new_path
+        mock_get_broker.return_value.move_files.side_effect = move_files
+        mock_get_volume_path.return_value = None
+
+        # A new source file is marked deleted until it is ingested
+        source_file = self.ingest.source_file
+        source_file.is_deleted = True
+        source_file.uuid = ''
+        source_file.save()
+        self.ingest.new_file_path = 'new/path/test.txt'
+        self.ingest.save()
+
+        perform_ingest(self.ingest.id)
+
+        source_file = ScaleFile.objects.get(id=source_file.id)
+        self.assertFalse(source_file.is_deleted)
+        self.assertTrue(source_file.uuid)
+        self.assertEqual(source_file.file_path, 'new/path/test.txt')
+        self.assertEqual(source_file.workspace_id, self.ingest.workspace_id)
+        self.assertEqual(Ingest.objects.get(id=self.ingest.id).status, 'INGESTED')
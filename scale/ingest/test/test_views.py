@@ -150,6 +150,38 @@ class TestIngestsViewV6(TestCase):
         self.assertEqual(len(result['results']), 1)
         self.assertEqual(result['results'][0]['file_name'], self.ingest1.file_name)
 
+    def test_cursor(self):
+        """Tests paging through the ingests view with a cursor."""
+
+        url = '/%s/ingests/?cursor=&page_size=1' % self.version
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertNotIn('count', result)
+        self.assertListEqual([entry['id'] for entry in result['results']], [self.ingest1.id])
+        self.assertIsNotNone(result['next'])
+
+        response = self.client.generic('GET', result['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertListEqual([entry['id'] for entry in result['results']], [self.ingest2.id])
+        self.assertIsNone(result['next'])
+
+    def test_export(self):
+        """Tests streaming the filtered ingests as newline-delimited JSON."""
+
+        url = '/%s/ingests/export/?status=%s' % (self.version, self.ingest2.status)
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = b''.join(response.streaming_content).splitlines()
+        results = [json.loads(line) for line in lines]
+        self.assertListEqual([entry['id'] for entry in results], [self.ingest2.id])
+        self.assertEqual(results[0]['file_name'], self.ingest2.file_name)
+
 class TestIngestDetailsViewV5(TestCase):
     version = 'v5'
     fixtures = ['ingest_job_types.json']
@@ -6,6 +6,7 @@ import ingest.views as views
 urlpatterns = [
     # Ingest views
     url(r'^ingests/$', views.IngestsView.as_view(), name='ingests_view'),
+    url(r'^ingests/export/$', views.IngestsView.as_view(export=True), name='ingests_export_view'),
     url(r'^ingests/status/$', views.IngestsStatusView.as_view(), name='ingests_status_view'),
     url(r'^ingests/(?P<ingest_id>\d+)/$', views.IngestDetailsView.as_view(), name='ingest_details_view'),
     url(r'^ingests/(?P<file_name>[\w.]{0,250})/$', views.IngestDetailsView.as_view(), name='ingest_details_view'),
@@ -33,6 +33,8 @@ logger = logging.getLogger(__name__)
 class IngestsView(ListAPIView):
     """This view is the endpoint for retrieving the list of all ingests."""
     queryset = Ingest.objects.all()
+    pagination_class = rest_util.KeysetPagination
+    export = False
 
     def get_serializer_class(self):
         """Returns the appropriate serializer based off the requests version of the REST API"""
@@ -60,3 +60,10 @@ class JobConfig(AppConfig):
         add_message_type(SpawnDeleteFilesJob)
         add_message_type(UncancelJobs)
         add_message_type(UnpublishJobs)
+
+        # Invalidate cached job type responses when job types change
+        from job.models import JobType, JobTypeRevision
+        from util.rest_cache import invalidate_on_change
+
+        invalidate_on_change(JobType, 'job_types')
+        invalidate_on_change(JobTypeRevision, 'job_types')
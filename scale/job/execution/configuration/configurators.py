@@ -18,6 +18,7 @@ from job.execution.container import get_job_exe_input_vol_name, get_job_exe_outp
     get_workspace_volume_name, SCALE_JOB_EXE_INPUT_PATH, SCALE_JOB_EXE_OUTPUT_PATH
 from job.execution.tasks.post_task import POST_TASK_COMMAND_ARGS
 from job.execution.tasks.pre_task import PRE_TASK_COMMAND_ARGS
+from job.job_type_cache import job_type_cache
 from job.tasks.pull_task import create_pull_command
 from node.resources.node_resources import NodeResources
 from node.resources.resource import Disk
@@ -83,8 +84,8 @@ class QueuedExecutionConfigurator(object):
             else:
                 # Set output workspaces from job configuration
                 output_workspaces = {}
-                job_config = job.job_type.get_job_configuration()
-                interface = JobInterfaceSunset.create(job.job_type.manifest, do_validate=False)
+                job_config = job_type_cache.get_job_configuration(job.job_type)
+                interface = job_type_cache.get_job_type_interface(job.job_type)
                 for output_name in interface.get_file_output_names():
                     output_workspace = job_config.get_output_workspace(output_name)
                     if output_workspace:
@@ -380,7 +381,7 @@ class ScheduledExecutionConfigurator(object):
             config.add_to_task('main', docker_params=[DockerParameter('shm-size', '%dm' % shared_mem)],
                                env_vars=env_vars)
 
-        job_config = job_type.get_job_configuration()
+        job_config = job_type_cache.get_job_configuration(job_type)
         mount_volumes = {}
         for mount in interface.get_mounts():
             name = mount['name']
@@ -500,7 +501,7 @@ class ScheduledExecutionConfigurator(object):
             config_with_secrets.add_to_task('pre', settings=self._system_settings)
             config.add_to_task('post', settings=self._system_settings_hidden)
             config_with_secrets.add_to_task('post', settings=self._system_settings)
-            job_config = job_type.get_job_configuration()
+            job_config = job_type_cache.get_job_configuration(job_type)
             secret_settings = secrets_mgr.retrieve_job_type_secrets(job_type.get_secrets_key())
             for _config, secrets_hidden in [(config, True), (config_with_secrets, False)]:
                 task_settings = {}
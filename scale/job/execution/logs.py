@@ -0,0 +1,230 @@
+"""Defines the class that reads the logs of a job execution from Elasticsearch"""
+from __future__ import unicode_literals
+
+import datetime
+import json
+import logging
+
+import django.utils.html
+from django.conf import settings
+from django.utils import timezone
+
+# The number of log messages read from Elasticsearch in each request
+PAGE_SIZE = 1000
+# The most log messages a tail can return, Elasticsearch returns at most this many hits for one request
+MAX_TAIL = 10000
+# How long Elasticsearch keeps a scroll open between requests
+SCROLL_TIMEOUT = '1m'
+# Executions whose logs span more than this many days search every log index instead of listing the daily indices
+MAX_INDEX_DAYS = 31
+
+LOG_FIELDS = ['@timestamp', 'scale_order_num', 'message', 'stream', 'scale_job_exe']
+# Log messages with the same timestamp and order number are ordered by their unique document ID so that paging with
+# search_after never skips or repeats a message. _uid is sortable on every Elasticsearch version before 7.
+ID_SORT_FIELD = '_uid'
+HTML_HEADER = '<html><head><style>.stdout {} .stderr {color: red;}</style></head><body>'
+HTML_FOOTER = '</body></html>'
+
+logger = logging.getLogger(__name__)
+
+
+def stream_html(hits, document=True):
+    """Generates the HTML of the given log message hits, with a div for each message
+
+    :param hits: The hit dicts
+    :type hits: iterable
+    :param document: If True, wrap the divs in an HTML document that styles stdout and stderr
+    :type document: bool
+    :returns: The generator of HTML chunks
+    :rtype: generator
+    """
+
+    if document:
+        yield HTML_HEADER
+    for hit in hits:
+        if 'message' in hit['_source']:
+            message = django.utils.html.escape(hit['_source']['message'])
+            yield '<div class="%s">%s</div>\n' % (hit['_source']['stream'], message)
+    if document:
+        yield HTML_FOOTER
+
+
+def stream_json(hits):
+    """Generates the JSON document of the given log message hits, which has the same layout as an Elasticsearch
+    search result. The total is the number of hits in the document, so it is written after the hits.
+
+    :param hits: The hit dicts
+    :type hits: iterable
+    :returns: The generator of JSON chunks
+    :rtype: generator
+    """
+
+    yield '{"hits": {"hits": ['
+    total = 0
+    for hit in hits:
+        yield (', ' if total else '') + json.dumps(hit)
+        total += 1
+    yield '], "total": %d}}' % total
+
+
+def stream_text(hits):
+    """Generates the plain text of the given log message hits, one message per line
+
+    :param hits: The hit dicts
+    :type hits: iterable
+    :returns: The generator of text chunks
+    :rtype: generator
+    """
+
+    separator = ''
+    for hit in hits:
+        if 'message' in hit['_source']:
+            yield separator + hit['_source']['message']
+            separator = '\n'
+
+
+class JobExecutionLogs(object):
+    """This class reads the log messages of a job execution from Elasticsearch one page at a time, so the memory used
+    does not depend on the size of the log. Only the daily log indices that the execution ran within are searched.
+    Elasticsearch 2.x is paged with a scroll and later versions with search_after. The hits are formatted with the
+    module's stream functions.
+    """
+
+    def __init__(self, job_exe, include_stdout=True, include_stderr=True, since=None):
+        """Constructor
+
+        :param job_exe: The job execution
+        :type job_exe: :class:`job.models.JobExecution`
+        :param include_stdout: If True, include stdout in the logs
+        :type include_stdout: bool
+        :param include_stderr: If True, include stderr in the logs
+        :type include_stderr: bool
+        :param since: If present, only read log messages since this timestamp
+        :type since: :class:`datetime.datetime`
+        """
+
+        self._job_exe = job_exe
+        self._include_stdout = include_stdout
+        self._include_stderr = include_stderr
+        self._since = since
+        self._is_legacy = getattr(settings, 'ELASTICSEARCH_VERSION', None) == '2.4'
+
+    def get_hits(self):
+        """Generates every log message hit in order, reading one page at a time
+
+        :returns: The generator of hit dicts
+        :rtype: generator
+        """
+
+        if not self._has_logs():
+            return
+
+        query = self._get_query()
+        query['size'] = PAGE_SIZE
+        if self._is_legacy:
+            for hit in self._scroll(query):
+                yield hit
+            return
+
+        while True:
+            result = settings.ELASTICSEARCH.search(index=self._get_index(), body=query, ignore_unavailable=True)
+            hits = result['hits']['hits']
+            for hit in hits:
+                yield hit
+            if len(hits) < PAGE_SIZE:
+                return
+            query['search_after'] = hits[-1]['sort']
+
+    def get_tail(self, count):
+        """Returns the last log message hits in order with a single request. Polling with the timestamp of the last hit
+        as the since value tails the log.
+
+        :param count: The maximum number of hits to return
+        :type count: int
+        :returns: The list of hit dicts
+        :rtype: list
+        """
+
+        if not self._has_logs():
+            return []
+
+        query = self._get_query()
+        query['size'] = count
+        query['sort'] = [{'@timestamp': 'desc'}, {'scale_order_num': 'desc'}, {ID_SORT_FIELD: 'desc'}]
+        result = settings.ELASTICSEARCH.search(index=self._get_index(), body=query, ignore_unavailable=True)
+        return list(reversed(result['hits']['hits']))
+
+    def _get_index(self):
+        """Returns the comma-separated names of the daily log indices that the execution ran within
+
+        :returns: The index names
+        :rtype: string
+        """
+
+        prefix = getattr(settings, 'ELASTICSEARCH_LOG_INDEX_PREFIX', None)
+        started = self._since or self._job_exe.started or self._job_exe.queued
+        if not prefix or not started:
+            return '_all'
+        ended = self._job_exe.ended or timezone.now()
+        days = (ended.date() - started.date()).days + 1
+        if days < 1 or days > MAX_INDEX_DAYS:
+            return '%s*' % prefix
+        dates = [started.date() + datetime.timedelta(days=i) for i in range(days)]
+        return ','.join('%s%s' % (prefix, date.strftime('%Y.%m.%d')) for date in dates)
+
+    def _get_query(self):
+        """Returns the search query for the log messages
+
+        :returns: The query
+        :rtype: dict
+        """
+
+        extension = '.raw' if self._is_legacy else '.keyword'
+        must = [{'term': {'scale_job_exe' + extension: self._job_exe.get_cluster_id()}}]
+        if not self._include_stdout:
+            must.append({'term': {'stream' + extension: 'stderr'}})
+        elif not self._include_stderr:
+            must.append({'term': {'stream' + extension: 'stdout'}})
+        if self._since is not None:
+            must.append({'range': {'@timestamp': {'gte': self._since.isoformat()}}})
+
+        sort = [{'@timestamp': 'asc'}, {'scale_order_num': 'asc'}, {ID_SORT_FIELD: 'asc'}]
+        return {'query': {'bool': {'must': must}}, 'sort': sort, '_source': LOG_FIELDS}
+
+    def _has_logs(self):
+        """Indicates whether there could be any log messages to read
+
+        :returns: True if there could be log messages, False otherwise
+        :rtype: bool
+        """
+
+        if self._job_exe.status == 'QUEUED' or not settings.ELASTICSEARCH:
+            return False
+        return self._include_stdout or self._include_stderr
+
+    def _scroll(self, query):
+        """Generates every hit of the given query using a scroll
+
+        :param query: The query
+        :type query: dict
+        :returns: The generator of hit dicts
+        :rtype: generator
+        """
+
+        result = settings.ELASTICSEARCH.search(index=self._get_index(), body=query, scroll=SCROLL_TIMEOUT,
+                                               ignore_unavailable=True)
+        scroll_id = result.get('_scroll_id')
+        try:
+            while result['hits']['hits']:
+                for hit in result['hits']['hits']:
+                    yield hit
+                if len(result['hits']['hits']) < PAGE_SIZE:
+                    break
+                result = settings.ELASTICSEARCH.scroll(scroll_id=scroll_id, scroll=SCROLL_TIMEOUT)
+                scroll_id = result.get('_scroll_id', scroll_id)
+        finally:
+            if scroll_id:
+                try:
+                    settings.ELASTICSEARCH.clear_scroll(scroll_id=scroll_id)
+                except Exception:
+                    logger.exception('Failed to clear log scroll')
@@ -0,0 +1,135 @@
+"""Defines the cache of objects parsed from job types that is shared by the whole process"""
+from __future__ import unicode_literals
+
+import threading
+from collections import OrderedDict
+
+# Maximum number of parsed objects to keep
+MAX_SIZE = 1000
+
+
+class JobTypeCache(object):
+    """This class caches the manifests, interfaces, configurations, and resource requirements parsed from job types so
+    that queueing and scheduling a batch of jobs of the same type parses and validates the JSON only once. The least
+    recently used objects are evicted once the cache is full.
+
+    Job type revisions are never changed, so objects parsed from a revision are keyed by job type ID and revision
+    number. Objects parsed from the job type itself are also keyed by its last modified time, so an edited job type or a
+    new revision never hits a stale entry, even when the change was made by another process. The cached objects are
+    shared and must not be modified by callers, resources are copied since callers add to them. This class is
+    thread-safe.
+    """
+
+    def __init__(self, max_size=MAX_SIZE):
+        """Constructor
+
+        :param max_size: The maximum number of parsed objects to keep
+        :type max_size: int
+        """
+
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._objects = OrderedDict()  # {Key: Parsed object}, least recently used first
+
+    def clear(self):
+        """Clears the cache
+        """
+
+        with self._lock:
+            self._objects = OrderedDict()
+
+    def get_job_configuration(self, job_type):
+        """Returns the job configuration for the given job type
+
+        :param job_type: The job type
+        :type job_type: :class:`job.models.JobType`
+        :returns: The job configuration, which must not be modified
+        :rtype: :class:`job.configuration.configuration.JobConfiguration`
+        """
+
+        return self._get(self._job_type_key('configuration', job_type), job_type.get_job_configuration)
+
+    def get_job_interface(self, job_type_rev):
+        """Returns the job interface for the given job type revision
+
+        :param job_type_rev: The job type revision
+        :type job_type_rev: :class:`job.models.JobTypeRevision`
+        :returns: The job interface, which must not be modified
+        :rtype: :class:`job.configuration.interface.job_interface.JobInterface` or
+            :class:`job.seed.manifest.SeedManifest`
+        """
+
+        key = ('revision_interface', job_type_rev.job_type_id, job_type_rev.revision_num)
+        if job_type_rev.id is None:
+            key = None
+        return self._get(key, job_type_rev.get_job_interface)
+
+    def get_job_type_interface(self, job_type):
+        """Returns the job interface for the current manifest of the given job type
+
+        :param job_type: The job type
+        :type job_type: :class:`job.models.JobType`
+        :returns: The job interface, which must not be modified
+        :rtype: :class:`job.configuration.interface.job_interface.JobInterface` or
+            :class:`job.seed.manifest.SeedManifest`
+        """
+
+        return self._get(self._job_type_key('interface', job_type), job_type.get_job_interface)
+
+    def get_resources(self, job_type):
+        """Returns the resources required for jobs of the given job type
+
+        :param job_type: The job type
+        :type job_type: :class:`job.models.JobType`
+        :returns: A copy of the required resources
+        :rtype: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        return self._get(self._job_type_key('resources', job_type), job_type.get_resources).copy()
+
+    def _get(self, key, create_func):
+        """Returns the cached object with the given key, creating and caching it if needed
+
+        :param key: The key of the object, None if the object cannot be cached
+        :type key: tuple
+        :param create_func: Function that takes no arguments and returns the parsed object
+        :type create_func: function
+        :returns: The parsed object
+        :rtype: object
+        """
+
+        if key is None:
+            return create_func()
+
+        with self._lock:
+            if key in self._objects:
+                parsed_object = self._objects.pop(key)
+                self._objects[key] = parsed_object  # Move to most recently used
+                return parsed_object
+
+        # Parse outside of the lock, two threads may parse the same object but the results are identical
+        parsed_object = create_func()
+        with self._lock:
+            self._objects[key] = parsed_object
+            while len(self._objects) > self._max_size:
+                self._objects.popitem(last=False)
+        return parsed_object
+
+    @staticmethod
+    def _job_type_key(name, job_type):
+        """Returns the key for an object parsed from the given job type
+
+        :param name: The name of the parsed object
+        :type name: string
+        :param job_type: The job type
+        :type job_type: :class:`job.models.JobType`
+        :returns: The key, None if the job type has not been saved
+        :rtype: tuple
+        """
+
+        if job_type.id is None or job_type.last_modified is None:
+            return None
+        return name, job_type.id, job_type.revision_num, job_type.last_modified
+
+
+job_type_cache = JobTypeCache()
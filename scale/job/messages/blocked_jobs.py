@@ -6,11 +6,12 @@ import logging
 from django.db import transaction
 
 from job.models import Job
+from messaging.envelope import get_message_capacity
 from messaging.messages.message import CommandMessage
 from util.parse import datetime_to_string, parse_datetime
 
 # This is the maximum number of job models that can fit in one message. This maximum ensures that every message of this
-# type is less than 25 KiB long.
+# type is less than 25 KiB long when using the original JSON envelope (see messaging.envelope.get_message_capacity).
 MAX_NUM = 1000
 
 
@@ -77,7 +78,7 @@ class BlockedJobs(CommandMessage):
         :rtype: bool
         """
 
-        return self._count < MAX_NUM
+        return self._count < get_message_capacity(MAX_NUM)
 
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
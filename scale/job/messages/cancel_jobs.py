@@ -7,11 +7,12 @@ from django.db import transaction
 from django.utils.timezone import now
 
 from job.models import Job
+from messaging.envelope import get_message_capacity
 from messaging.messages.message import CommandMessage
 from util.parse import datetime_to_string, parse_datetime
 
 # This is the maximum number of job models that can fit in one message. This maximum ensures that every message of this
-# type is less than 25 KiB long.
+# type is less than 25 KiB long when using the original JSON envelope (see messaging.envelope.get_message_capacity).
 MAX_NUM = 100
 
 
@@ -76,7 +77,7 @@ class CancelJobs(CommandMessage):
         :rtype: bool
         """
 
-        return len(self._job_ids) < MAX_NUM
+        return len(self._job_ids) < get_message_capacity(MAX_NUM)
 
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
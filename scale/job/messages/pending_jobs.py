@@ -6,11 +6,12 @@ import logging
 from django.db import transaction
 
 from job.models import Job
+from messaging.envelope import get_message_capacity
 from messaging.messages.message import CommandMessage
 from util.parse import datetime_to_string, parse_datetime
 
 # This is the maximum number of job models that can fit in one message. This maximum ensures that every message of this
-# type is less than 25 KiB long.
+# type is less than 25 KiB long when using the original JSON envelope (see messaging.envelope.get_message_capacity).
 MAX_NUM = 1000
 
 
@@ -77,7 +78,24 @@ class PendingJobs(CommandMessage):
         :rtype: bool
         """
 
-        return self._count < MAX_NUM
+        return self._count < get_message_capacity(MAX_NUM)
+
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        # Only messages with the same status change time can be merged, it is used to skip stale updates
+        if self.status_change != message.status_change:
+            return False
+
+        job_ids = set(self._pending_job_ids)
+        new_job_ids = [job_id for job_id in message._pending_job_ids if job_id not in job_ids]
+        if self._count + len(new_job_ids) > get_message_capacity(MAX_NUM):
+            return False
+
+        for job_id in new_job_ids:
+            self.add_job(job_id)
+        return True
 
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
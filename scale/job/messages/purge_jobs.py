@@ -131,7 +131,8 @@ class PurgeJobs(CommandMessage):
             BatchJob.objects.filter(job__in=self._purge_job_ids).delete()
             RecipeNode.objects.filter(job__in=self._purge_job_ids).delete()
             JobInputFile.objects.filter(job__in=self._purge_job_ids).delete()
-            Queue.objects.filter(job__in=self._purge_job_ids).delete()
+            queue_ids = Queue.objects.filter(job__in=self._purge_job_ids).values_list('id', flat=True)
+            Queue.objects.delete_queue_models(queue_ids)
             Job.objects.filter(id__in=self._purge_job_ids).delete()
 
         return True
@@ -93,6 +93,27 @@ class RunningJobs(CommandMessage):
 
         return self._count < MAX_NUM
 
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        # Only messages with the same start time can be merged
+        if self._started != message._started:
+            return False
+
+        new_running_jobs = []
+        for node_id, job_list in message._running_jobs.items():
+            current_job_list = self._running_jobs.get(node_id, [])
+            for job_tuple in job_list:
+                if job_tuple not in current_job_list:
+                    new_running_jobs.append((job_tuple[0], job_tuple[1], node_id))
+        if self._count + len(new_running_jobs) > MAX_NUM:
+            return False
+
+        for job_id, exe_num, node_id in new_running_jobs:
+            self.add_running_job(job_id, exe_num, node_id)
+        return True
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
@@ -4,6 +4,7 @@ from __future__ import unicode_literals
 
 import copy
 import datetime
+import json
 import logging
 import math
 import re
@@ -11,7 +12,6 @@ import semver
 from collections import namedtuple
 
 import django.contrib.postgres.fields
-import django.utils.html
 from django.conf import settings
 from django.db import connection, models, transaction
 from django.db.models import F, Q
@@ -34,8 +34,10 @@ from job.data.job_data import JobData
 from job.deprecation import JobInterfaceSunset, JobDataSunset
 from job.exceptions import InvalidJobField
 from job.execution.configuration.json.exe_config import ExecutionConfiguration
+from job.execution.logs import JobExecutionLogs, stream_html, stream_text
 from job.execution.tasks.exe_task import JOB_TASK_ID_PREFIX
 from job.execution.tasks.json.results.task_results import TaskResults
+from job.job_type_cache import job_type_cache
 from job.seed.manifest import SeedManifest
 from job.seed.exceptions import InvalidSeedManifestDefinition
 from job.seed.results.job_results import JobResults
@@ -1100,6 +1102,27 @@ class JobManager(models.Manager):
         self.filter(id__in=job_ids).update(status='RUNNING', last_status_change=when, last_modified=timezone.now())
         return job_ids
 
+    def update_jobs_with_input(self, jobs, when):
+        """Updates the database with the input JSON of the given job models using a single UPDATE
+
+        :param jobs: The job models with their new input set
+        :type jobs: [:class:`job.models.Job`]
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        if not jobs:
+            return
+
+        qry = 'UPDATE job j SET input = v.input, last_modified = %s '
+        qry += 'FROM (VALUES %s) AS v(id, input) WHERE j.id = v.id'
+        qry = qry % ('%s', ', '.join(['(%s, %s::jsonb)'] * len(jobs)))
+        params = [when]
+        for job in jobs:
+            params.extend([job.id, json.dumps(job.input)])
+        with connection.cursor() as cursor:
+            cursor.execute(qry, params)
+
     # TODO: this needs to be removed as usage of this is refactored into the messaging backend
     def update_status(self, jobs, status, when, error=None):
         """Updates the given jobs with the new status. The caller must have obtained model locks on the job models.
@@ -1442,7 +1465,7 @@ class Job(models.Model):
         :rtype: :class:`job.configuration.interface.job_interface.JobInterface` or :class:`job.seed.manifest.SeedManifest`
         """
 
-        return JobInterfaceSunset.create(self.job_type_rev.manifest)
+        return job_type_cache.get_job_interface(self.job_type_rev)
 
     def get_job_results(self):
         """Returns the results for this job
@@ -1488,14 +1511,14 @@ class Job(models.Model):
         :rtype: :class:`node.resources.node_resources.NodeResources`
         """
 
-        resources = self.job_type.get_resources()
+        resources = job_type_cache.get_resources(self.job_type)
 
         # Input File Size in MiB
         input_file_size = self.input_file_size
         if not input_file_size:
             input_file_size = 0.0
 
-        interface = self.job_type.get_job_interface()
+        interface = job_type_cache.get_job_type_interface(self.job_type)
 
         # TODO: remove legacy code branch in v6
         if not isinstance(interface, SeedManifest):
@@ -1626,6 +1649,7 @@ class Job(models.Model):
         """meta information for the db"""
         db_table = 'job'
         index_together = ['last_modified', 'job_type', 'status']
+        indexes = [models.Index(fields=['last_modified', 'id'], name='job_modified_id_idx')]
 
 
 class JobExecutionManager(models.Manager):
@@ -2057,7 +2081,8 @@ class JobExecution(models.Model):
         return ExecutionConfiguration(self.configuration, do_validate=False)
 
     def get_log_json(self, include_stdout=True, include_stderr=True, since=None):
-        """Get log data from elasticsearch as a dict (from the raw JSON).
+        """Get log data from elasticsearch as a dict (from the raw JSON). All of the log messages are held in memory,
+        use :class:`job.execution.logs.JobExecutionLogs` to stream large logs.
 
         :param include_stdout: If True, include stdout in the result
         :type include_stdout: bool
@@ -2068,44 +2093,15 @@ class JobExecution(models.Model):
         :rtype: tuple of (dict, :class:`datetime.datetime`) with the results or None and the last modified timestamp
         """
 
-        if self.status == 'QUEUED':
-            return None, timezone.now()
-
-        if settings.ELASTICSEARCH_VERSION == "2.4":
-            extension = ".raw"
-        else:
-            extension = ".keyword"
-
-        q = {
-                'size': 10000,
-                'query': {
-                    'bool': {
-                        'must': [
-                            {'term': {'scale_job_exe'+extension: self.get_cluster_id()}}
-                        ]
-                    }
-                },
-                'sort': [{'@timestamp': 'asc'}, {'scale_order_num': 'asc'}],
-                '_source': ['@timestamp', 'scale_order_num', 'message', 'stream', 'scale_job_exe']
-            }
-        if not include_stdout and not include_stderr:
-            return None, timezone.now()
-        elif include_stdout and not include_stderr:
-            q['query']['bool']['must'].append({'term': {'stream'+extension: 'stdout'}})
-        elif include_stderr and not include_stdout:
-            q['query']['bool']['must'].append({'term': {'stream'+extension: 'stderr'}})
-        if since is not None:
-            q['query']['bool']['must'].append({'range': {'@timestamp': {'gte': since.isoformat()}}})
-
-        hits = settings.ELASTICSEARCH.search(index='_all', body=q)
-
-        if hits['hits']['total'] == 0:
+        hits = list(JobExecutionLogs(self, include_stdout, include_stderr, since).get_hits())
+        if not hits:
             return None, timezone.now()
-        last_modified = max([util.parse.parse_datetime(h['_source']['@timestamp']) for h in hits['hits']['hits']])
-        return hits, last_modified
+        last_modified = max([util.parse.parse_datetime(h['_source']['@timestamp']) for h in hits])
+        return {'hits': {'total': len(hits), 'hits': hits}}, last_modified
 
     def get_log_text(self, include_stdout=True, include_stderr=True, since=None, html=False):
-        """Get log data from elasticsearch.
+        """Get log data from elasticsearch. All of the log messages are held in memory, use
+        :class:`job.execution.logs.JobExecutionLogs` to stream large logs.
 
         :param include_stdout: If True, include stdout in the result
         :type include_stdout: bool
@@ -2121,17 +2117,9 @@ class JobExecution(models.Model):
         hits, last_modified = self.get_log_json(include_stdout, include_stderr, since)
         if hits is None:
             return None, last_modified
-        valid_hits = []  # Make sure hits have the required message field
-        for h in hits['hits']['hits']:
-            if 'message' in h['_source']:
-                valid_hits.append(h)
         if html:
-            d = ''
-            for h in valid_hits:
-                cls = h['_source']['stream']
-                d += '<div class="%s">%s</div>\n' % (cls, django.utils.html.escape(h['_source']['message']))
-            return d, last_modified
-        return '\n'.join(h['_source']['message'] for h in valid_hits), last_modified
+            return ''.join(stream_html(hits['hits']['hits'], document=False)), last_modified
+        return ''.join(stream_text(hits['hits']['hits'])), last_modified
 
     def get_resources(self):
         """Returns the resources allocated to this job execution
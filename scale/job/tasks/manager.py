@@ -22,6 +22,13 @@ class TaskManager(object):
         self._tasks = {}  # {Task ID: Task}
         self._lock = threading.Lock()
 
+    def clear(self):
+        """Clears all data from the manager. This method is intended for testing only.
+        """
+
+        with self._lock:
+            self._tasks = {}
+
     def generate_status_json(self, nodes_list):
         """Generates the portion of the status JSON that describes the currently running node and system tasks
 
@@ -0,0 +1,118 @@
+from __future__ import unicode_literals
+
+import datetime
+import json
+
+import django
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils.timezone import utc
+from mock import MagicMock, patch
+
+import job.execution.logs as logs_module
+from job.execution.logs import JobExecutionLogs, stream_json, stream_text
+
+
+def create_hits(start, count):
+    """Creates log message hits for unit testing"""
+
+    return [{'_source': {'message': 'line %d' % i, 'stream': 'stdout'}, 'sort': [i, i, 'log#%d' % i]}
+            for i in range(start, start + count)]
+
+
+class TestJobExecutionLogs(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.job_exe = MagicMock()
+        self.job_exe.status = 'RUNNING'
+        self.job_exe.started = datetime.datetime(2018, 10, 1, 23, tzinfo=utc)
+        self.job_exe.ended = datetime.datetime(2018, 10, 3, 1, tzinfo=utc)
+        self.job_exe.get_cluster_id.return_value = 'scale_1'
+        self.es = MagicMock()
+
+    @patch.object(logs_module, 'PAGE_SIZE', 2)
+    def test_get_hits_search_after(self):
+        """Tests reading every hit a page at a time with search_after"""
+
+        pages = [create_hits(0, 2), create_hits(2, 1)]
+        queries = []
+
+        def search(index, body, ignore_unavailable):
+            queries.append(dict(body))
+            return {'hits': {'hits': pages.pop(0)}}
+        self.es.search.side_effect = search
+
+        with override_settings(ELASTICSEARCH=self.es, ELASTICSEARCH_VERSION='5.6'):
+            hits = list(JobExecutionLogs(self.job_exe).get_hits())
+
+        self.assertListEqual([hit['_source']['message'] for hit in hits], ['line 0', 'line 1', 'line 2'])
+        self.assertNotIn('search_after', queries[0])
+        self.assertListEqual(queries[1]['search_after'], [1, 1, 'log#1'])
+        self.assertDictEqual(queries[0]['sort'][-1], {'_uid': 'asc'})
+
+    @patch.object(logs_module, 'PAGE_SIZE', 2)
+    def test_get_hits_scroll(self):
+        """Tests reading every hit with a scroll from Elasticsearch 2.4"""
+
+        self.es.search.return_value = {'_scroll_id': 'abc', 'hits': {'hits': create_hits(0, 2)}}
+        self.es.scroll.return_value = {'_scroll_id': 'abc', 'hits': {'hits': create_hits(2, 1)}}
+
+        with override_settings(ELASTICSEARCH=self.es, ELASTICSEARCH_VERSION='2.4'):
+            hits = list(JobExecutionLogs(self.job_exe, include_stderr=False).get_hits())
+
+        self.assertEqual(len(hits), 3)
+        query = self.es.search.call_args[1]['body']
+        self.assertIn({'term': {'stream.raw': 'stdout'}}, query['query']['bool']['must'])
+        self.es.clear_scroll.assert_called_once_with(scroll_id='abc')
+
+    def test_get_hits_queued(self):
+        """Tests that a queued job execution has no logs"""
+
+        self.job_exe.status = 'QUEUED'
+        with override_settings(ELASTICSEARCH=self.es):
+            self.assertListEqual(list(JobExecutionLogs(self.job_exe).get_hits()), [])
+        self.assertFalse(self.es.search.called)
+
+    def test_get_tail(self):
+        """Tests that the tail is read newest first and returned in order"""
+
+        self.es.search.return_value = {'hits': {'hits': list(reversed(create_hits(0, 3)))}}
+
+        with override_settings(ELASTICSEARCH=self.es, ELASTICSEARCH_VERSION='5.6'):
+            hits = JobExecutionLogs(self.job_exe).get_tail(3)
+
+        self.assertListEqual([hit['_source']['message'] for hit in hits], ['line 0', 'line 1', 'line 2'])
+        self.assertEqual(self.es.search.call_args[1]['body']['size'], 3)
+
+    def test_index(self):
+        """Tests that only the daily log indices that the job execution ran within are searched"""
+
+        with override_settings(ELASTICSEARCH_LOG_INDEX_PREFIX='logstash-'):
+            index = JobExecutionLogs(self.job_exe)._get_index()
+            self.assertEqual(index, 'logstash-2018.10.01,logstash-2018.10.02,logstash-2018.10.03')
+
+            self.job_exe.started = self.job_exe.ended - datetime.timedelta(days=60)
+            self.assertEqual(JobExecutionLogs(self.job_exe)._get_index(), 'logstash-*')
+
+        with override_settings(ELASTICSEARCH_LOG_INDEX_PREFIX=None):
+            self.assertEqual(JobExecutionLogs(self.job_exe)._get_index(), '_all')
+
+    def test_stream_text(self):
+        """Tests streaming hits as plain text"""
+
+        hits = create_hits(0, 2)
+        hits.append({'_source': {'stream': 'stdout'}})  # Hits without a message are skipped
+
+        self.assertEqual(''.join(stream_text(hits)), 'line 0\nline 1')
+
+    def test_stream_json(self):
+        """Tests streaming hits as a JSON document with their total"""
+
+        hits = create_hits(0, 2)
+
+        result = json.loads(''.join(stream_json(iter(hits))))
+        self.assertListEqual(result['hits']['hits'], hits)
+        self.assertEqual(result['hits']['total'], 2)
+        self.assertDictEqual(json.loads(''.join(stream_json([]))), {'hits': {'hits': [], 'total': 0}})
@@ -16,6 +16,24 @@ class TestPendingJobs(TransactionTestCase):
     def setUp(self):
         django.setup()
 
+    def test_merge(self):
+        """Tests merging PendingJobs messages with the same and different status change times"""
+
+        when = now()
+        message_1 = PendingJobs()
+        message_1.status_change = when
+        message_1.add_job(1)
+        message_2 = PendingJobs()
+        message_2.status_change = when
+        message_2.add_job(2)
+        message_3 = PendingJobs()
+        message_3.status_change = when + datetime.timedelta(minutes=1)
+        message_3.add_job(3)
+
+        self.assertTrue(message_1.merge(message_2))
+        self.assertFalse(message_1.merge(message_3))
+        self.assertListEqual(message_1.to_json()['job_ids'], [1, 2])
+
     def test_json(self):
         """Tests coverting a PendingJobs message to and from JSON"""
 
@@ -0,0 +1,85 @@
+from __future__ import unicode_literals
+
+import copy
+
+import django
+from django.test import TestCase
+
+import job.test.utils as job_test_utils
+from job.job_type_cache import JobTypeCache
+from job.models import JobType, JobTypeRevision
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus
+
+
+class TestJobTypeCache(TestCase):
+    """Tests the JobTypeCache class"""
+
+    def setUp(self):
+        django.setup()
+
+        self.cache = JobTypeCache()
+        self.job_type = job_test_utils.create_seed_job_type()
+
+    def test_job_interface_by_revision(self):
+        """Tests that jobs of the same job type revision share one parsed interface"""
+
+        job_1 = job_test_utils.create_job(job_type=self.job_type)
+        job_2 = job_test_utils.create_job(job_type=self.job_type)
+
+        interface_1 = self.cache.get_job_interface(job_1.job_type_rev)
+        interface_2 = self.cache.get_job_interface(job_2.job_type_rev)
+        self.assertIs(interface_1, interface_2)
+
+        # A new revision gets its own interface
+        manifest = copy.deepcopy(self.job_type.manifest)
+        manifest['job']['packageVersion'] = '1.0.1'
+        job_test_utils.edit_job_type_v6(self.job_type, manifest)
+        job_type = JobType.objects.get(id=self.job_type.id)
+        job_type_rev = JobTypeRevision.objects.get_revision(job_type.name, job_type.version, job_type.revision_num)
+        interface_3 = self.cache.get_job_interface(job_type_rev)
+        self.assertIsNot(interface_3, interface_1)
+        self.assertEqual(interface_3.get_package_version(), '1.0.1')
+
+    def test_job_type_changed(self):
+        """Tests that objects parsed from a job type are parsed again after the job type is saved"""
+
+        configuration_1 = self.cache.get_job_configuration(self.job_type)
+        self.assertIs(self.cache.get_job_configuration(JobType.objects.get(id=self.job_type.id)), configuration_1)
+
+        self.job_type.configuration = {'version': '6', 'priority': 123}
+        self.job_type.save()
+        configuration_2 = self.cache.get_job_configuration(JobType.objects.get(id=self.job_type.id))
+        self.assertIsNot(configuration_2, configuration_1)
+        self.assertEqual(configuration_2.priority, 123)
+
+    def test_resources_copied(self):
+        """Tests that changing the returned resources does not change the cached resources"""
+
+        resources = self.cache.get_resources(self.job_type)
+        cpus = resources.cpus
+        resources.add(NodeResources([Cpus(10.0)]))
+
+        self.assertEqual(self.cache.get_resources(self.job_type).cpus, cpus)
+
+    def test_unsaved_job_type(self):
+        """Tests that objects parsed from an unsaved job type are not cached"""
+
+        job_type = JobType(manifest=self.job_type.manifest)
+
+        self.assertIsNot(self.cache.get_job_type_interface(job_type), self.cache.get_job_type_interface(job_type))
+
+    def test_evict_least_recently_used(self):
+        """Tests that the least recently used object is evicted when the cache is full"""
+
+        cache = JobTypeCache(max_size=2)
+        job_type_2 = job_test_utils.create_seed_job_type()
+        job_type_3 = job_test_utils.create_seed_job_type()
+
+        interface_1 = cache.get_job_type_interface(self.job_type)
+        interface_2 = cache.get_job_type_interface(job_type_2)
+        cache.get_job_type_interface(self.job_type)  # Now job_type_2 is the least recently used
+        cache.get_job_type_interface(job_type_3)
+
+        self.assertIs(cache.get_job_type_interface(self.job_type), interface_1)
+        self.assertIsNot(cache.get_job_type_interface(job_type_2), interface_2)
@@ -449,6 +449,22 @@ class TestJobManager(TransactionTestCase):
         self.assertIsNotNone(job.ended)
 
 
+    def test_update_jobs_with_input(self):
+        """Tests that the input of several jobs is saved with a single query"""
+        job_1 = job_test_utils.create_job(input={})
+        job_2 = job_test_utils.create_job(input={})
+        job_1.input = {'version': '1.0', 'input_data': [{'name': 'a', 'value': '1'}]}
+        job_2.input = {'version': '1.0', 'input_data': [{'name': 'b', 'file_id': 2}]}
+        when = timezone.now()
+
+        with self.assertNumQueries(1):
+            Job.objects.update_jobs_with_input([job_1, job_2], when)
+
+        self.assertDictEqual(Job.objects.get(id=job_1.id).input, job_1.input)
+        job_2_db = Job.objects.get(id=job_2.id)
+        self.assertDictEqual(job_2_db.input, job_2.input)
+        self.assertEqual(job_2_db.last_modified, when)
+
 class TestJob(TestCase):
 
     def setUp(self):
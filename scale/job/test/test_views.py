@@ -349,6 +349,45 @@ class TestJobsViewV6(TestCase):
         self.assertEqual(result['results'][2]['job_type']['id'], self.job_type1.id)
         self.assertEqual(result['results'][3]['job_type']['id'], self.job_type2.id)
 
+    def test_cursor(self):
+        """Tests paging through the jobs view with a cursor."""
+
+        url = '/%s/jobs/?cursor=&page_size=2' % self.api
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertNotIn('count', result)
+        self.assertListEqual([entry['id'] for entry in result['results']], [self.job1.id, self.job2.id])
+        self.assertIsNotNone(result['next'])
+
+        response = self.client.generic('GET', result['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertListEqual([entry['id'] for entry in result['results']], [self.job3.id])
+        self.assertIsNone(result['next'])
+
+    def test_cursor_invalid(self):
+        """Tests calling the jobs view with an invalid cursor."""
+
+        url = '/%s/jobs/?cursor=invalid' % self.api
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
+
+    def test_export(self):
+        """Tests streaming the filtered jobs as newline-delimited JSON."""
+
+        url = '/%s/jobs/export/?is_superseded=false' % self.api
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = b''.join(response.streaming_content).splitlines()
+        results = [json.loads(line) for line in lines]
+        self.assertListEqual([entry['id'] for entry in results], [self.job1.id, self.job2.id])
+        self.assertEqual(results[0]['job_type']['name'], self.job_type1.name)
+
 # TODO: remove when REST API v5 is removed
 class OldTestJobDetailsViewV5(TestCase):
 
@@ -3977,6 +4016,18 @@ class TestJobExecutionsViewV6(TransactionTestCase):
         #check that we order by descending exe_num
         self.assertEqual(results['results'][0]['exe_num'], 4)
 
+    def test_export(self):
+        """Tests streaming the executions of a job as newline-delimited JSON."""
+
+        url = '/%s/jobs/%d/executions/export/?status=COMPLETED' % (self.api, self.job_1.id)
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = b''.join(response.streaming_content).splitlines()
+        results = [json.loads(line) for line in lines]
+        self.assertListEqual([entry['id'] for entry in results], [self.job_exe_1b.id, self.job_exe_1c.id])
+
     def test_get_job_execution_bad_id(self):
         url = '/%s/jobs/999999999/executions/' % self.api
         response = self.client.generic('GET', url)
@@ -4188,255 +4239,290 @@ class TestOldJobExecutionsViewV5(TransactionTestCase):
 class TestJobExecutionSpecificLogViewV5(TestCase):
 
     api = 'v5'
-    
+
     def setUp(self):
         django.setup()
 
+        self.hit = {'_source': {'@timestamp': '2016-01-01T00:00:01.000Z', 'scale_order_num': 1, 'message': 'hello',
+                                'stream': 'stdout', 'scale_job_exe': 'scale_1'}}
+
     def test_bad_job_exe_id(self):
         url = '/%s/job-executions/999999/logs/combined/' % self.api
         response = self.client.generic('GET', url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, response.content)
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_json_no_time(self, mock_get_logs):
-        def new_get_log_json(include_stdout, include_stderr, since):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            return {}, now()
-        mock_get_logs.return_value.get_log_json.side_effect = new_get_log_json
+    def test_combined_log_json_no_time(self, mock_get_logs, mock_get_hits):
+        def new_get_hits(logs):
+            self.assertTrue(logs._include_stdout)
+            self.assertTrue(logs._include_stderr)
+            self.assertIsNone(logs._since)
+            return iter([self.hit])
+        mock_get_hits.side_effect = new_get_hits
 
         url = '/%s/job-executions/999999/logs/combined/?format=json' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        result = json.loads(b''.join(response.streaming_content))
+        self.assertListEqual(result['hits']['hits'], [self.hit])
+        self.assertEqual(result['hits']['total'], 1)
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_text_no_time(self, mock_get_logs):
-        def new_get_log_text(include_stdout, include_stderr, since, html):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            self.assertFalse(html)
-            return 'hello', now()
-        mock_get_logs.return_value.get_log_text.side_effect = new_get_log_text
+    def test_combined_log_text_no_time(self, mock_get_logs, mock_get_hits):
+        hit_2 = copy.deepcopy(self.hit)
+        hit_2['_source']['message'] = 'world'
+        mock_get_hits.return_value = iter([self.hit, hit_2])
 
         url = '/%s/job-executions/999999/logs/combined/?format=txt' % self.api
         response = self.client.get(url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'text/plain')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertEqual(b''.join(response.streaming_content), b'hello\nworld')
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_html_no_time(self, mock_get_logs):
-        def new_get_log_text(include_stdout, include_stderr, since, html):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            self.assertTrue(html)
-            return '<html>hello</html>', now()
-        mock_get_logs.return_value.get_log_text.side_effect = new_get_log_text
+    def test_combined_log_html_no_time(self, mock_get_logs, mock_get_hits):
+        mock_get_hits.return_value = iter([self.hit])
 
         url = '/%s/job-executions/999999/logs/combined/?format=html' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+        content = b''.join(response.streaming_content)
+        self.assertTrue(content.startswith(b'<html>'))
+        self.assertIn(b'<div class="stdout">hello</div>', content)
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_json_no_content(self, mock_get_logs):
-        def new_get_log_json(include_stdout, include_stderr, since):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            return None, now()
-        mock_get_logs.return_value.get_log_json.side_effect = new_get_log_json
+    def test_combined_log_json_no_content(self, mock_get_logs, mock_get_hits):
+        mock_get_hits.return_value = iter([])
 
         url = '/%s/job-executions/999999/logs/combined/?format=json' % self.api
         response = self.client.generic('GET', url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_stdout_log_html_no_time(self, mock_get_logs):
-        def new_get_log_text(include_stdout, include_stderr, since, html):
-            self.assertTrue(include_stdout)
-            self.assertFalse(include_stderr)
-            self.assertIsNone(since)
-            self.assertTrue(html)
-            return '<html>hello</html>', now()
-        mock_get_logs.return_value.get_log_text.side_effect = new_get_log_text
+    def test_stdout_log_html_no_time(self, mock_get_logs, mock_get_hits):
+        def new_get_hits(logs):
+            self.assertTrue(logs._include_stdout)
+            self.assertFalse(logs._include_stderr)
+            self.assertIsNone(logs._since)
+            return iter([self.hit])
+        mock_get_hits.side_effect = new_get_hits
 
         url = '/%s/job-executions/999999/logs/stdout/?format=html' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_stderr_log_html_no_time(self, mock_get_logs):
-        def new_get_log_text(include_stdout, include_stderr, since, html):
-            self.assertFalse(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            self.assertTrue(html)
-            return '<html>hello</html>', now()
-        mock_get_logs.return_value.get_log_text.side_effect = new_get_log_text
+    def test_stderr_log_html_no_time(self, mock_get_logs, mock_get_hits):
+        def new_get_hits(logs):
+            self.assertFalse(logs._include_stdout)
+            self.assertTrue(logs._include_stderr)
+            self.assertIsNone(logs._since)
+            return iter([self.hit])
+        mock_get_hits.side_effect = new_get_hits
 
         url = '/%s/job-executions/999999/logs/stderr/?format=html' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_json_with_time(self, mock_get_logs):
+    def test_combined_log_json_with_time(self, mock_get_logs, mock_get_hits):
         started = datetime.datetime(2016, 1, 1, tzinfo=utc)
 
-        def new_get_log_json(include_stdout, include_stderr, since):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertEqual(since, started)
-            return {}, now()
-        mock_get_logs.return_value.get_log_json.side_effect = new_get_log_json
+        def new_get_hits(logs):
+            self.assertTrue(logs._include_stdout)
+            self.assertTrue(logs._include_stderr)
+            self.assertEqual(logs._since, started)
+            return iter([self.hit])
+        mock_get_hits.side_effect = new_get_hits
 
         url = '/%s/job-executions/999999/logs/combined/?started=2016-01-01T00:00:00Z&format=json' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    @patch('job.views.JobExecutionLogs.get_tail', autospec=True)
+    @patch('job.views.JobExecution.objects.get_logs')
+    def test_tail(self, mock_get_logs, mock_get_tail):
+        def new_get_tail(logs, count):
+            self.assertEqual(count, 50)
+            return [self.hit]
+        mock_get_tail.side_effect = new_get_tail
+
+        url = '/%s/job-executions/999999/logs/combined/?tail=50&format=txt' % self.api
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'hello')
+
+    @patch('job.views.JobExecution.objects.get_logs')
+    def test_tail_invalid(self, mock_get_logs):
+        url = '/%s/job-executions/999999/logs/combined/?tail=0&format=txt' % self.api
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
 
 
 class TestJobExecutionSpecificLogViewV6(TestCase):
+
     api = 'v6'
 
     def setUp(self):
         django.setup()
 
+        self.hit = {'_source': {'@timestamp': '2016-01-01T00:00:01.000Z', 'scale_order_num': 1, 'message': 'hello',
+                                'stream': 'stdout', 'scale_job_exe': 'scale_1'}}
+
     def test_bad_job_exe_id(self):
         url = '/%s/job-executions/999999/logs/combined/' % self.api
         response = self.client.generic('GET', url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, response.content)
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_json_no_time(self, mock_get_logs):
-        def new_get_log_json(include_stdout, include_stderr, since):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            return {}, now()
-
-        mock_get_logs.return_value.get_log_json.side_effect = new_get_log_json
+    def test_combined_log_json_no_time(self, mock_get_logs, mock_get_hits):
+        def new_get_hits(logs):
+            self.assertTrue(logs._include_stdout)
+            self.assertTrue(logs._include_stderr)
+            self.assertIsNone(logs._since)
+            return iter([self.hit])
+        mock_get_hits.side_effect = new_get_hits
 
         url = '/%s/job-executions/999999/logs/combined/?format=json' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        result = json.loads(b''.join(response.streaming_content))
+        self.assertListEqual(result['hits']['hits'], [self.hit])
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_text_no_time(self, mock_get_logs):
-        def new_get_log_text(include_stdout, include_stderr, since, html):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            self.assertFalse(html)
-            return 'hello', now()
-
-        mock_get_logs.return_value.get_log_text.side_effect = new_get_log_text
+    def test_combined_log_text_no_time(self, mock_get_logs, mock_get_hits):
+        hit_2 = copy.deepcopy(self.hit)
+        hit_2['_source']['message'] = 'world'
+        mock_get_hits.return_value = iter([self.hit, hit_2])
 
         url = '/%s/job-executions/999999/logs/combined/?format=txt' % self.api
         response = self.client.get(url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'text/plain')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertEqual(b''.join(response.streaming_content), b'hello\nworld')
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_html_no_time(self, mock_get_logs):
-        def new_get_log_text(include_stdout, include_stderr, since, html):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            self.assertTrue(html)
-            return '<html>hello</html>', now()
-
-        mock_get_logs.return_value.get_log_text.side_effect = new_get_log_text
+    def test_combined_log_html_no_time(self, mock_get_logs, mock_get_hits):
+        mock_get_hits.return_value = iter([self.hit])
 
         url = '/%s/job-executions/999999/logs/combined/?format=html' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+        content = b''.join(response.streaming_content)
+        self.assertTrue(content.startswith(b'<html>'))
+        self.assertIn(b'<div class="stdout">hello</div>', content)
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_json_no_content(self, mock_get_logs):
-        def new_get_log_json(include_stdout, include_stderr, since):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            return None, now()
-
-        mock_get_logs.return_value.get_log_json.side_effect = new_get_log_json
+    def test_combined_log_json_no_content(self, mock_get_logs, mock_get_hits):
+        mock_get_hits.return_value = iter([])
 
         url = '/%s/job-executions/999999/logs/combined/?format=json' % self.api
         response = self.client.generic('GET', url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_stdout_log_html_no_time(self, mock_get_logs):
-        def new_get_log_text(include_stdout, include_stderr, since, html):
-            self.assertTrue(include_stdout)
-            self.assertFalse(include_stderr)
-            self.assertIsNone(since)
-            self.assertTrue(html)
-            return '<html>hello</html>', now()
-
-        mock_get_logs.return_value.get_log_text.side_effect = new_get_log_text
+    def test_stdout_log_html_no_time(self, mock_get_logs, mock_get_hits):
+        def new_get_hits(logs):
+            self.assertTrue(logs._include_stdout)
+            self.assertFalse(logs._include_stderr)
+            self.assertIsNone(logs._since)
+            return iter([self.hit])
+        mock_get_hits.side_effect = new_get_hits
 
         url = '/%s/job-executions/999999/logs/stdout/?format=html' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_stderr_log_html_no_time(self, mock_get_logs):
-        def new_get_log_text(include_stdout, include_stderr, since, html):
-            self.assertFalse(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertIsNone(since)
-            self.assertTrue(html)
-            return '<html>hello</html>', now()
-
-        mock_get_logs.return_value.get_log_text.side_effect = new_get_log_text
+    def test_stderr_log_html_no_time(self, mock_get_logs, mock_get_hits):
+        def new_get_hits(logs):
+            self.assertFalse(logs._include_stdout)
+            self.assertTrue(logs._include_stderr)
+            self.assertIsNone(logs._since)
+            return iter([self.hit])
+        mock_get_hits.side_effect = new_get_hits
 
         url = '/%s/job-executions/999999/logs/stderr/?format=html' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
 
+    @patch('job.views.JobExecutionLogs.get_hits', autospec=True)
     @patch('job.views.JobExecution.objects.get_logs')
-    def test_combined_log_json_with_time(self, mock_get_logs):
+    def test_combined_log_json_with_time(self, mock_get_logs, mock_get_hits):
         started = datetime.datetime(2016, 1, 1, tzinfo=utc)
 
-        def new_get_log_json(include_stdout, include_stderr, since):
-            self.assertTrue(include_stdout)
-            self.assertTrue(include_stderr)
-            self.assertEqual(since, started)
-            return {}, now()
-
-        mock_get_logs.return_value.get_log_json.side_effect = new_get_log_json
+        def new_get_hits(logs):
+            self.assertTrue(logs._include_stdout)
+            self.assertTrue(logs._include_stderr)
+            self.assertEqual(logs._since, started)
+            return iter([self.hit])
+        mock_get_hits.side_effect = new_get_hits
 
         url = '/%s/job-executions/999999/logs/combined/?started=2016-01-01T00:00:00Z&format=json' % self.api
         response = self.client.generic('GET', url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
-        self.assertEqual(response.accepted_media_type, 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    @patch('job.views.JobExecutionLogs.get_tail', autospec=True)
+    @patch('job.views.JobExecution.objects.get_logs')
+    def test_tail(self, mock_get_logs, mock_get_tail):
+        def new_get_tail(logs, count):
+            self.assertEqual(count, 50)
+            return [self.hit]
+        mock_get_tail.side_effect = new_get_tail
+
+        url = '/%s/job-executions/999999/logs/combined/?tail=50&format=txt' % self.api
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'hello')
+
+    @patch('job.views.JobExecution.objects.get_logs')
+    def test_tail_invalid(self, mock_get_logs):
+        url = '/%s/job-executions/999999/logs/combined/?tail=0&format=txt' % self.api
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
 
 
 class TestJobInputFilesViewV5(TestCase):
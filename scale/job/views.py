@@ -1,11 +1,12 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import itertools
 import logging
 
 import rest_framework.status as status
 from django.db import transaction
-from django.http.response import Http404, HttpResponse
+from django.http.response import Http404, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from job.seed.exceptions import InvalidSeedManifestDefinition
 from job.seed.manifest import SeedManifest
@@ -26,6 +27,7 @@ from job.configuration.json.job_config_v6 import convert_config_to_v6_json, JobC
 from job.deprecation import JobInterfaceSunset
 from job.error.mapping import create_legacy_error_mapping
 from job.exceptions import InvalidJobField
+from job.execution.logs import JobExecutionLogs, MAX_TAIL, stream_html, stream_json, stream_text
 from job.messages.cancel_jobs_bulk import create_cancel_jobs_bulk_message
 from job.serializers import (JobSerializerV5, JobSerializerV6,
                              JobDetailsSerializerV5, JobDetailsSerializerV6,
@@ -49,6 +51,7 @@ from storage.models import ScaleFile
 from storage.serializers import ScaleFileSerializerV5, ScaleFileSerializerV6
 from trigger.configuration.exceptions import InvalidTriggerRule, InvalidTriggerType, InvalidTriggerMissingConfiguration
 import util.rest as rest_util
+import util.rest_cache as rest_cache
 from util.rest import BadParameter
 from vault.exceptions import InvalidSecretsConfiguration
 
@@ -70,6 +73,7 @@ class JobTypesView(ListCreateAPIView):
         else:
             return JobTypeSerializerV5
 
+    @rest_cache.cache_response(['job_types'])
     def list(self, request):
         """Retrieves the list of all job types and returns it in JSON form
 
@@ -943,6 +947,7 @@ class JobTypesPendingView(ListAPIView):
     queryset = JobType.objects.all()
     serializer_class = JobTypePendingStatusSerializer
 
+    @rest_cache.cache_response(['job_types'], timeout=rest_cache.STATUS_TIMEOUT)
     def list(self, request):
         """Retrieves the current status of pending job types and returns it in JSON form
 
@@ -966,6 +971,7 @@ class JobTypesRunningView(ListAPIView):
     queryset = JobType.objects.all()
     serializer_class = JobTypeRunningStatusSerializer
 
+    @rest_cache.cache_response(['job_types'], timeout=rest_cache.STATUS_TIMEOUT)
     def list(self, request):
         """Retrieves the current status of running job types and returns it in JSON form
 
@@ -1012,6 +1018,7 @@ class JobTypesStatusView(ListAPIView):
     queryset = JobType.objects.all()
     serializer_class = JobTypeStatusSerializer
 
+    @rest_cache.cache_response(['job_types'], timeout=rest_cache.STATUS_TIMEOUT)
     def list(self, request):
         """Retrieves the list of all job types with status and returns it in JSON form
 
@@ -1036,6 +1043,8 @@ class JobTypesStatusView(ListAPIView):
 class JobsView(ListAPIView):
     """This view is the endpoint for retrieving a list of all available jobs."""
     queryset = Job.objects.all()
+    pagination_class = rest_util.KeysetPagination
+    export = False
 
     # TODO: remove this class and un-comment serializer declaration when REST API v5 is removed
     # serializer_class = JobSerializer
@@ -1563,6 +1572,9 @@ class JobsWithExecutionView(ListAPIView):
 class JobExecutionsView(ListAPIView):
     """This view is the endpoint for viewing job executions and their associated job_type id, name, and version"""
     queryset = JobExecution.objects.all()
+    pagination_class = rest_util.KeysetPagination
+    export = False
+    cursor_ordering = ('id',)
 
     # TODO: remove this class and un-comment serializer declaration when REST API v5 is removed
     # serializer_class = JobExecutionSerializer
@@ -1787,21 +1799,24 @@ class JobExecutionSpecificLogView(RetrieveAPIView):
             include_stdout = False
 
         started = rest_util.parse_timestamp(request, 'started', required=False)
+        tail = rest_util.parse_int(request, 'tail', required=False)
+        if tail is not None and not 0 < tail <= MAX_TAIL:
+            raise BadParameter('tail must be between 1 and %d' % MAX_TAIL)
 
+        logs = JobExecutionLogs(job_exe, include_stdout, include_stderr, started)
         if request.accepted_renderer.format == 'json':
-            logs, last_modified = job_exe.get_log_json(include_stdout, include_stderr, started)
+            stream_func, content_type = stream_json, 'application/json'
         elif request.accepted_renderer.format == 'txt':
-            logs, last_modified = job_exe.get_log_text(include_stdout, include_stderr, started, False)
+            stream_func, content_type = stream_text, 'text/plain'
         elif request.accepted_renderer.format == 'html':
-            logs, last_modified = job_exe.get_log_text(include_stdout, include_stderr, started, True)
-            if logs is not None:
-                logs = '<html><head><style>.stdout {} .stderr {color: red;}</style></head><body>' + logs + '</body></html>'
+            stream_func, content_type = stream_html, 'text/html'
         else:
             return HttpResponse('%s is not a valid content type request.' % request.accepted_renderer.content_type,
                                 content_type='text/plain', status=406)
 
-        if logs is None:
-            rsp = HttpResponse(status=204)
-        else:
-            rsp = Response(data=logs)
-        return rsp
+        # Read the first log message before streaming so that an empty log gets a 204 response
+        hits = iter(logs.get_tail(tail)) if tail else logs.get_hits()
+        first_hit = next(hits, None)
+        if first_hit is None:
+            return HttpResponse(status=204)
+        return StreamingHttpResponse(stream_func(itertools.chain([first_hit], hits)), content_type=content_type)
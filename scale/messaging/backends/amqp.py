@@ -6,15 +6,64 @@ from __future__ import unicode_literals
 
 import Queue
 import logging
-from contextlib import closing
+from collections import deque
 
 from kombu import Connection
 
 from messaging.backends.backend import MessagingBackend
+from messaging.backends.pool import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
 
+class AMQPChannel(object):
+    """Holds a long-lived broker connection along with the simple queue opened on it"""
+
+    def __init__(self, broker_url, queue_name):
+        """Constructor
+
+        :param broker_url: The URL of the broker
+        :type broker_url: string
+        :param queue_name: The name of the queue
+        :type queue_name: string
+        """
+
+        self.connection = Connection(broker_url)
+        self.connection.ensure_connection(max_retries=3)
+        self.simple_queue = self.connection.SimpleQueue(queue_name)
+        self.prefetch_count = None
+
+    def close(self):
+        """Closes the queue and its connection
+        """
+
+        try:
+            self.simple_queue.close()
+        finally:
+            self.connection.release()
+
+    def is_healthy(self):
+        """Indicates whether the connection is still open
+
+        :returns: True if the connection is open, False otherwise
+        :rtype: bool
+        """
+
+        return self.connection.connected
+
+    def set_prefetch_count(self, prefetch_count):
+        """Limits the number of unacknowledged messages the broker will push to this channel, so that a long-lived
+        consumer does not hold messages that other consumers could be processing
+
+        :param prefetch_count: The maximum number of unacknowledged messages
+        :type prefetch_count: int
+        """
+
+        if prefetch_count != self.prefetch_count:
+            self.simple_queue.consumer.qos(prefetch_count=prefetch_count)
+            self.prefetch_count = prefetch_count
+
+
 class AMQPMessagingBackend(MessagingBackend):
     """Backend supporting message passing via AMQP 0.9.1 broker, targeting RabbitMQ"""
 
@@ -24,26 +73,97 @@ class AMQPMessagingBackend(MessagingBackend):
         # Message retrieval timeout
         self._timeout = 1
 
+        # Producers and consumers use separate connections so that consuming never blocks sending
+        self._send_pool = ConnectionPool('AMQP send', self._create_channel, AMQPChannel.close,
+                                         AMQPChannel.is_healthy)
+        self._receive_pool = ConnectionPool('AMQP receive', self._create_channel, AMQPChannel.close,
+                                            AMQPChannel.is_healthy, max_idle=1)
+
+    def get_connection_metrics(self):
+        """See :meth:`messaging.backends.backend.MessagingBackend.get_connection_metrics`"""
+
+        return {'send': self._send_pool.get_metrics(), 'receive': self._receive_pool.get_metrics()}
+
     def send_messages(self, messages):
         """See :meth:`messaging.backends.backend.MessagingBackend.send_messages`"""
-        with Connection(self._broker_url) as connection:
-            with closing(connection.SimpleQueue(self._queue_name)) as simple_queue:
-                for message in messages:
-                    logger.debug('Sending message of type: %s', message['type'])
-                    simple_queue.put(message)
+
+        unsent_messages = deque(messages)
+        try:
+            self._send_messages(unsent_messages)
+        except Exception:
+            # A pooled connection may have been dropped by the broker while idle, retry the rest once on a new one
+            logger.exception('Error sending messages, retrying on a new connection')
+            self._send_messages(unsent_messages)
 
     def receive_messages(self, batch_size):
         """See :meth:`messaging.backends.backend.MessagingBackend.receive_messages`"""
-        with Connection(self._broker_url) as connection:
-            with closing(connection.SimpleQueue(self._queue_name)) as simple_queue:
-                for _ in range(batch_size):
-                    try:
-                        message = simple_queue.get(timeout=self._timeout)
-
-                        # Accept success back via generator send
-                        success = yield message.payload
-                        if success:
-                            message.ack()
-                    except Queue.Empty:
-                        # We've reached the end of the queue... exit loop
-                        break
+
+        with self._receive_pool.acquire() as channel:
+            channel.set_prefetch_count(batch_size)
+            for _ in range(batch_size):
+                try:
+                    message = channel.simple_queue.get(timeout=self._timeout)
+                except Queue.Empty:
+                    # We've reached the end of the queue... exit loop
+                    break
+
+                # Accept success back via generator send
+                success = False
+                try:
+                    success = yield message.payload
+                finally:
+                    # The connection stays open, so the message must be explicitly returned to the queue, including when
+                    # the generator is closed while the message is out
+                    if success:
+                        message.ack()
+                    else:
+                        message.requeue()
+
+    def receive_message_batch(self, batch_size):
+        """See :meth:`messaging.backends.backend.MessagingBackend.receive_message_batch`"""
+
+        with self._receive_pool.acquire() as channel:
+            channel.set_prefetch_count(batch_size)
+            messages = []
+            for _ in range(batch_size):
+                try:
+                    messages.append(channel.simple_queue.get(timeout=self._timeout))
+                except Queue.Empty:
+                    # We've reached the end of the queue... exit loop
+                    break
+            if not messages:
+                return
+
+            # Accept success of each message back via generator send
+            try:
+                successes = yield [message.payload for message in messages]
+            except GeneratorExit:
+                successes = []  # Batch was abandoned, return all messages to the queue
+            for index, message in enumerate(messages):
+                if index < len(successes) and successes[index]:
+                    message.ack()
+                else:
+                    message.requeue()
+
+    def _create_channel(self):
+        """Creates a new channel for the pools
+
+        :returns: The new channel
+        :rtype: :class:`messaging.backends.amqp.AMQPChannel`
+        """
+
+        return AMQPChannel(self._broker_url, self._queue_name)
+
+    def _send_messages(self, messages):
+        """Sends the given messages on a pooled connection, removing each message from the deque once it is sent
+
+        :param messages: JSON payload of messages
+        :type messages: :class:`collections.deque`
+        """
+
+        with self._send_pool.acquire() as channel:
+            while messages:
+                message = messages[0]
+                logger.debug('Sending message of type: %s', message['type'])
+                channel.simple_queue.put(message)
+                messages.popleft()
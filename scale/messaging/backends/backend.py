@@ -22,12 +22,23 @@ class MessagingBackend(object):
         # TODO: Transition to more advanced message routing per command message type
         self._queue_name = settings.QUEUE_NAME
 
+    def get_connection_metrics(self):
+        """Returns the connection churn metrics of this backend, a dict of connection pool name to a dict with the
+        number of connections created, discarded after an error, and reused
+
+        :return: The connection metrics
+        :rtype: dict
+        """
+
+        return {}
+
     @abstractmethod
     def send_messages(self, messages):
         """Send a collection of messages to the backend
         
-        Connections are not persisted across send_messages calls. It is recommended that if a large
-        number of messages are to be sent it be done directly in a single function call.
+        Connections are pooled and persisted across send_messages calls for the life of the process, but
+        it is still recommended that if a large number of messages are to be sent it be done directly in a
+        single function call.
 
         :param messages: JSON payload of messages
         :type messages: [dict]
@@ -37,8 +48,8 @@ class MessagingBackend(object):
     def receive_messages(self, batch_size):
         """Receive a batch of messages from the backend
 
-        Connections are not persisted across receive_messages calls. It is recommended that if a large
-        number of messages are to be retrieved it be done directly in a single function call.
+        Connections are pooled and persisted across receive_messages calls for the life of the process,
+        so a message that is not acknowledged must be explicitly returned to the queue.
 
         Implementing function must yield messages from backend. Messages must be
         in dict form. It is also the responsibility of the function to handle a boolean response
@@ -49,3 +60,19 @@ class MessagingBackend(object):
         :return: Yielded list of messages
         :rtype: Generator[dict]
         """
+
+    def receive_message_batch(self, batch_size):
+        """Receive a batch of messages from the backend all at once, so that they can be processed concurrently
+
+        Implementing function must yield a single list of messages in dict form, and only if at least one
+        message was received. It then accepts a list of booleans (one per message, in the same order) via
+        the generator send and must acknowledge / delete each message whose value is True, returning the
+        others to the queue.
+
+        :param batch_size: Maximum number of messages to be processed
+        :type batch_size: int
+        :return: Yielded list of messages
+        :rtype: Generator[[dict]]
+        """
+
+        raise NotImplementedError()
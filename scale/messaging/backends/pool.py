@@ -0,0 +1,151 @@
+"""Defines the pool that keeps messaging backend connections alive for the life of the process"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool(object):
+    """This class manages a pool of long-lived connections to a message broker. Idle connections are health checked
+    before being handed out and any connection that raises an error while in use is discarded, so the next acquisition
+    transparently reconnects. This class is thread-safe.
+    """
+
+    def __init__(self, name, create_func, close_func, is_healthy_func=None, max_idle=2):
+        """Constructor
+
+        :param name: The name of the pool, used for logging
+        :type name: string
+        :param create_func: Function that takes no arguments and returns a new connection
+        :type create_func: function
+        :param close_func: Function that takes a connection and closes it
+        :type close_func: function
+        :param is_healthy_func: Optional function that takes an idle connection and returns whether it is still usable
+        :type is_healthy_func: function
+        :param max_idle: The maximum number of idle connections to keep
+        :type max_idle: int
+        """
+
+        self._name = name
+        self._create_func = create_func
+        self._close_func = close_func
+        self._is_healthy_func = is_healthy_func
+        self._max_idle = max_idle
+
+        self._idle = []
+        self._lock = threading.Lock()
+        self._created_count = 0  # Number of connections opened
+        self._discarded_count = 0  # Number of connections closed due to errors or failed health checks
+        self._reused_count = 0  # Number of times an existing connection was handed out
+
+    @contextmanager
+    def acquire(self):
+        """Context manager that yields a healthy connection and returns it to the pool afterwards. If an exception is
+        raised within the context, the connection is discarded and the exception is re-raised.
+
+        :returns: The connection
+        :rtype: object
+        """
+
+        connection = self._get_connection()
+        try:
+            yield connection
+        except Exception:
+            self._discard(connection)
+            raise
+        except BaseException:
+            # Generator shutdown and the like are not connection problems
+            self._release(connection)
+            raise
+        else:
+            self._release(connection)
+
+    def close_all(self):
+        """Closes all idle connections
+        """
+
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+        for connection in idle:
+            self._close(connection)
+
+    def get_metrics(self):
+        """Returns the connection churn metrics for this pool
+
+        :returns: The metrics dict with created, discarded, and reused counts
+        :rtype: dict
+        """
+
+        with self._lock:
+            return {'created': self._created_count, 'discarded': self._discarded_count, 'reused': self._reused_count}
+
+    def _close(self, connection):
+        """Closes the given connection, logging any error
+
+        :param connection: The connection
+        :type connection: object
+        """
+
+        try:
+            self._close_func(connection)
+        except Exception:
+            logger.exception('Error closing %s connection', self._name)
+
+    def _discard(self, connection):
+        """Closes and forgets the given connection after an error
+
+        :param connection: The connection
+        :type connection: object
+        """
+
+        with self._lock:
+            self._discarded_count += 1
+        logger.warning('Discarding %s connection after error, will reconnect on next use', self._name)
+        self._close(connection)
+
+    def _get_connection(self):
+        """Returns a healthy idle connection or creates a new one
+
+        :returns: The connection
+        :rtype: object
+        """
+
+        while True:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                break
+            if self._is_healthy_func is None or self._is_healthy_func(connection):
+                with self._lock:
+                    self._reused_count += 1
+                return connection
+            with self._lock:
+                self._discarded_count += 1
+            logger.warning('Idle %s connection failed health check, reconnecting', self._name)
+            self._close(connection)
+
+        connection = self._create_func()
+        with self._lock:
+            self._created_count += 1
+        logger.debug('Opened new %s connection', self._name)
+        return connection
+
+    def _release(self, connection):
+        """Returns the given connection to the idle pool, closing it if the pool is full
+
+        :param connection: The connection
+        :type connection: object
+        """
+
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(connection)
+                return
+        self._close(connection)
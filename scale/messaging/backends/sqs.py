@@ -6,11 +6,16 @@ from __future__ import unicode_literals
 
 import json
 import logging
+import time
 import uuid
 
 from messaging.backends.backend import MessagingBackend
+from messaging.backends.pool import ConnectionPool
 from util.aws import AWSCredentials, SQSClient
 
+# How long (in seconds) a batch of received messages stays hidden from other consumers while its window is processed
+BATCH_VISIBILITY_TIMEOUT = 300
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,9 +30,17 @@ class SQSMessagingBackend(MessagingBackend):
         self._credentials = AWSCredentials(self._broker.get_user_name(),
                                            self._broker.get_password())
 
+        # boto3 sessions are expensive to create and their HTTP connections are kept alive, so clients are reused
+        self._pool = ConnectionPool('SQS', self._create_client, SQSClient.close)
+
+    def get_connection_metrics(self):
+        """See :meth:`messaging.backends.backend.MessagingBackend.get_connection_metrics`"""
+
+        return {'client': self._pool.get_metrics()}
+
     def send_messages(self, messages):
         """See:meth:`messaging.backends.backend.MessagingBackend.send_messages`"""
-        with SQSClient(self._credentials, self._region_name) as client:
+        with self._pool.acquire() as client:
             encoded_messages = []
             for message in messages:
                 encoded_messages.append({'Id': str(uuid.uuid4()), 'MessageBody': json.dumps(message)})
@@ -37,10 +50,48 @@ class SQSMessagingBackend(MessagingBackend):
     def receive_messages(self, batch_size):
         """See :meth:`messaging.backends.backend.MessagingBackend.receive_messages`"""
 
-        with SQSClient(self._credentials, self._region_name) as client:
+        with self._pool.acquire() as client:
             for message in client.receive_messages(self._queue_name, batch_size=batch_size):
                 # Accept success back via generator send
                 success = yield json.loads(message.body)
                 if success:
                     message.delete()
 
+    def receive_message_batch(self, batch_size):
+        """See :meth:`messaging.backends.backend.MessagingBackend.receive_message_batch`"""
+
+        with self._pool.acquire() as client:
+            # The whole window is processed before any message is deleted, so the batch is hidden long enough for the
+            # window instead of for a single message
+            messages = list(client.receive_messages(self._queue_name, batch_size=batch_size,
+                                                    visibility_timeout_seconds=BATCH_VISIBILITY_TIMEOUT))
+            if not messages:
+                return
+            started = time.time()
+
+            # Accept success of each message back via generator send
+            successes = []
+            try:
+                successes = yield [json.loads(message.body) for message in messages]
+            finally:
+                duration = time.time() - started
+                if duration >= BATCH_VISIBILITY_TIMEOUT:
+                    logger.warning('Message window took %.1f seconds, longer than the %d second visibility timeout. '
+                                   'Its messages may have been redelivered.', duration, BATCH_VISIBILITY_TIMEOUT)
+                for index, message in enumerate(messages):
+                    if index < len(successes) and successes[index]:
+                        message.delete()
+                    else:
+                        # Return failed messages to the queue now rather than after the long visibility timeout
+                        message.change_visibility(VisibilityTimeout=0)
+
+    def _create_client(self):
+        """Creates a new SQS client for the pool
+
+        :returns: The new SQS client
+        :rtype: :class:`util.aws.SQSClient`
+        """
+
+        client = SQSClient(self._credentials, self._region_name)
+        client.connect()
+        return client
@@ -0,0 +1,80 @@
+"""Defines the class that folds outgoing command messages together before they are sent"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import copy
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class MessageCoalescer(object):
+    """This class coalesces a list of outgoing command messages, folding each message into an earlier message of the
+    same type when that message type opts in by implementing
+    :meth:`messaging.messages.message.CommandMessage.merge`. Merging drops IDs that are already present, so overlapping
+    messages produced within the same send window collapse into as few messages as possible. Messages are merged into
+    copies, so the caller's messages are never changed. This class is thread-safe.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._lock = threading.Lock()
+        self._folded_counts = {}  # {Message type: Number of messages folded into another message}
+        self._merged_counts = {}  # {Message type: Number of sent messages that other messages were folded into}
+
+    def coalesce(self, commands):
+        """Coalesces the given command messages. Message order is kept, except that a folded message is delivered with
+        the earlier message it was merged into.
+
+        :param commands: The command messages to send
+        :type commands: [`messaging.messages.message.CommandMessage`]
+        :return: The coalesced command messages
+        :rtype: [`messaging.messages.message.CommandMessage`]
+        """
+
+        coalesced_commands = []
+        open_indexes = {}  # {Message type: Index of the latest coalesced command of this type that may accept merges}
+        merged_indexes = set()  # Indexes of the coalesced commands that are merged copies
+        folded_counts = {}  # {Message type: count}
+        for command in commands:
+            index = open_indexes.get(command.type)
+            if index is not None:
+                open_command = coalesced_commands[index]
+                merged_command = open_command if index in merged_indexes else copy.deepcopy(open_command)
+                if merged_command.merge(command):
+                    coalesced_commands[index] = merged_command
+                    merged_indexes.add(index)
+                    folded_counts[command.type] = folded_counts.get(command.type, 0) + 1
+                    continue
+            open_indexes[command.type] = len(coalesced_commands)
+            coalesced_commands.append(command)
+
+        if merged_indexes:
+            logger.debug('Coalesced %d message(s) into %d message(s)', len(commands), len(coalesced_commands))
+            with self._lock:
+                for message_type, count in folded_counts.items():
+                    self._folded_counts[message_type] = self._folded_counts.get(message_type, 0) + count
+                for index in merged_indexes:
+                    message_type = coalesced_commands[index].type
+                    self._merged_counts[message_type] = self._merged_counts.get(message_type, 0) + 1
+
+        return coalesced_commands
+
+    def get_metrics(self):
+        """Returns the coalescing metrics for each message type
+
+        :returns: The dict of message type to a dict with the folded and merged counts
+        :rtype: dict
+        """
+
+        with self._lock:
+            return {message_type: {'folded': count, 'merged': self._merged_counts.get(message_type, 0)}
+                    for message_type, count in self._folded_counts.items()}
+
+
+message_coalescer = MessageCoalescer()
@@ -0,0 +1,152 @@
+"""Defines the functions that wrap command message bodies in a versioned envelope for transmission to the backend"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import base64
+import json
+import numbers
+import zlib
+
+from django.conf import settings
+
+from messaging.exceptions import InvalidCommandMessage
+
+# The original envelope: {'type': <message type>, 'body': <JSON body>}. Messages without a version are this version.
+ENVELOPE_VERSION_JSON = 1
+# The compact envelope: {'version': 2, 'type': <message type>, 'body': <base64 string>} where the body is zlib
+# compressed JSON with its integer ID lists delta-encoded
+ENVELOPE_VERSION_COMPACT = 2
+SUPPORTED_ENVELOPE_VERSIONS = (ENVELOPE_VERSION_JSON, ENVELOPE_VERSION_COMPACT)
+
+# Message types whose size limit exists only to keep messages under 25 KiB can hold this many times more items when
+# the compact envelope is used
+COMPACT_CAPACITY_FACTOR = 10
+
+# Integer lists at least this long are delta-encoded
+DELTA_MIN_LENGTH = 4
+DELTA_KEY = '~d'
+
+
+def decode_message_body(message):
+    """Returns the JSON body of the given message, decoding it according to its envelope version
+
+    :param message: The message received from the backend
+    :type message: dict
+    :return: The JSON body of the message
+    :rtype: dict
+
+    :raises :class:`messaging.exceptions.InvalidCommandMessage`: If the envelope version is not supported or the body
+        cannot be decoded
+    """
+
+    version = message.get('version', ENVELOPE_VERSION_JSON)
+    if version == ENVELOPE_VERSION_JSON:
+        return message['body']
+    if version != ENVELOPE_VERSION_COMPACT:
+        raise InvalidCommandMessage('Unsupported message envelope version: %s' % version)
+
+    try:
+        body_json = zlib.decompress(base64.b64decode(message['body'])).decode('utf-8')
+        return _delta_decode(json.loads(body_json))
+    except (TypeError, ValueError, zlib.error) as ex:
+        raise InvalidCommandMessage('Invalid compact message body: %s' % ex)
+
+
+def encode_message(message_type, body, version=None):
+    """Wraps the given message body in an envelope of the given version
+
+    :param message_type: The message type
+    :type message_type: string
+    :param body: The JSON body of the message
+    :type body: dict
+    :param version: The envelope version, defaults to the MESSAGE_ENVELOPE_VERSION setting
+    :type version: int
+    :return: The message to send to the backend
+    :rtype: dict
+    """
+
+    if version is None:
+        version = settings.MESSAGE_ENVELOPE_VERSION
+
+    if version == ENVELOPE_VERSION_JSON:
+        return {'type': message_type, 'body': body}
+
+    body_json = json.dumps(_delta_encode(body), separators=(',', ':'))
+    compressed_body = base64.b64encode(zlib.compress(body_json.encode('utf-8'), 9)).decode('ascii')
+    return {'version': ENVELOPE_VERSION_COMPACT, 'type': message_type, 'body': compressed_body}
+
+
+def get_message_capacity(max_num):
+    """Returns the maximum number of items for a message type whose limit of max_num exists only to keep its messages
+    under 25 KiB, taking the configured envelope version into account
+
+    :param max_num: The maximum number of items that fit in the original JSON envelope
+    :type max_num: int
+    :return: The maximum number of items for the configured envelope
+    :rtype: int
+    """
+
+    if settings.MESSAGE_ENVELOPE_VERSION == ENVELOPE_VERSION_COMPACT:
+        return max_num * COMPACT_CAPACITY_FACTOR
+    return max_num
+
+
+def _delta_decode(value):
+    """Recursively reverses :func:`_delta_encode`
+
+    :param value: The JSON value to decode
+    :type value: object
+    :return: The decoded JSON value
+    :rtype: object
+    """
+
+    if isinstance(value, dict):
+        if len(value) == 1 and DELTA_KEY in value:
+            decoded = []
+            current = 0
+            for delta in value[DELTA_KEY]:
+                current += delta
+                decoded.append(current)
+            return decoded
+        return {key: _delta_decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_delta_decode(item) for item in value]
+    return value
+
+
+def _delta_encode(value):
+    """Recursively replaces each long list of integers in the given JSON value with the differences between consecutive
+    integers, which are small for sorted or clustered IDs and compress well
+
+    :param value: The JSON value to encode
+    :type value: object
+    :return: The encoded JSON value
+    :rtype: object
+    """
+
+    if isinstance(value, dict):
+        return {key: _delta_encode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if len(value) >= DELTA_MIN_LENGTH and all(_is_int(item) for item in value):
+            deltas = []
+            previous = 0
+            for item in value:
+                deltas.append(item - previous)
+                previous = item
+            return {DELTA_KEY: deltas}
+        return [_delta_encode(item) for item in value]
+    return value
+
+
+def _is_int(value):
+    """Indicates whether the given JSON value is an integer (booleans are not)
+
+    :param value: The JSON value
+    :type value: object
+    :return: True if the value is an integer, False otherwise
+    :rtype: bool
+    """
+
+    return isinstance(value, numbers.Integral) and not isinstance(value, bool)
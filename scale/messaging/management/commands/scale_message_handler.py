@@ -6,7 +6,9 @@ from __future__ import unicode_literals
 
 import logging
 import signal
+from multiprocessing.pool import ThreadPool
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from error.models import Error
@@ -21,6 +23,13 @@ class Command(BaseCommand):
 
     help = 'Command for retrieval and execution of CommandMessages from queue'
 
+    def add_arguments(self, parser):
+        parser.add_argument('-w', '--workers', action='store', type=int, default=settings.MESSAGE_HANDLER_WORKERS,
+                            help=('Number of worker threads, more than 1 processes batches of messages concurrently'))
+        parser.add_argument('-b', '--batch-size', action='store', type=int,
+                            default=settings.MESSAGE_HANDLER_BATCH_SIZE,
+                            help=('Maximum number of messages to prefetch when using more than 1 worker'))
+
     def handle(self, *args, **options):
         """See :meth:`django.core.management.base.BaseCommand.handle`.
 
@@ -41,9 +50,21 @@ class Command(BaseCommand):
         signal.signal(signal.SIGTERM, self.interupt)
 
         manager = CommandMessageManager()
-
-        while self.running:
-            manager.receive_messages()
+        workers = options.get('workers')
+
+        if workers > 1:
+            batch_size = options.get('batch_size')
+            logger.info('Processing up to %d messages at a time with %d workers', batch_size, workers)
+            worker_pool = ThreadPool(workers)
+            try:
+                while self.running:
+                    manager.receive_messages_concurrently(batch_size, worker_pool)
+            finally:
+                worker_pool.close()
+                worker_pool.join()
+        else:
+            while self.running:
+                manager.receive_messages()
 
         logger.info('Command completed: scale_message_handler')
 
@@ -4,11 +4,15 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import logging
+from collections import OrderedDict
 
 from django.conf import settings
+from django.db import close_old_connections
 from django.utils.timezone import now
 from six import raise_from
 
+from messaging.coalescer import message_coalescer
+from messaging.envelope import decode_message_body, encode_message
 from messaging.messages.factory import get_message_type
 from util.broker import BrokerDetails
 from .backends.factory import get_message_backend
@@ -33,17 +37,30 @@ class CommandMessageManager(object):
 
         self._backend = get_message_backend(broker_type)
 
+    def generate_status_json(self, status_dict):
+        """Generates the portion of the status JSON that describes the messaging connections and coalescing
+
+        :param status_dict: The status JSON dict
+        :type status_dict: dict
+        """
+
+        status_dict['scheduler']['messaging'] = {'connections': self._backend.get_connection_metrics(),
+                                                 'coalesced': message_coalescer.get_metrics()}
+
     def send_messages(self, commands):
         """Serialize CommandMessages and send via configured message broker
 
         The command.to_json() and command.message_type will be used to generate
-        serialized form of CommandMessage for transmission across the wire.
+        serialized form of CommandMessage for transmission across the wire, wrapped in
+        the envelope version given by the MESSAGE_ENVELOPE_VERSION setting. Messages
+        of the same type are first coalesced where the message type supports it.
 
         :param command: CommandMessages to be sent via configured broker
         :type command: [`messaging.messages.message.CommandMessage`]
         """
 
-        messages = [{"type": x.type, "body": x.to_json()} for x in commands]
+        commands = message_coalescer.coalesce(commands)
+        messages = [encode_message(x.type, x.to_json()) for x in commands]
         self._backend.send_messages(messages)
 
     def receive_messages(self):
@@ -80,6 +97,51 @@ class CommandMessageManager(object):
         except StopIteration:
             pass
 
+    def receive_messages_concurrently(self, batch_size, worker_pool):
+        """Alternate entry point to message processing that makes use of multiple cores.
+
+        This will prefetch a window of up to batch_size messages, group them by message type, and merge
+        compatible messages of the same type into a single command where the message type supports it
+        (see :meth:`messaging.messages.message.CommandMessage.merge`). The resulting groups are independent
+        and are executed concurrently on the worker pool. The downstream messages of the whole window are
+        sent together so that they can be coalesced. Each message is only acknowledged if the command for
+        its group succeeds and the downstream messages are sent, so the at-least-once delivery of the serial
+        handler is kept.
+
+        :param batch_size: The maximum number of messages to process at a time
+        :type batch_size: int
+        :param worker_pool: The pool of worker threads
+        :type worker_pool: :class:`multiprocessing.pool.ThreadPool`
+        """
+
+        message_generator = self._backend.receive_message_batch(batch_size)
+        try:
+            messages = message_generator.next()
+        except StopIteration:
+            return
+
+        successes = [False] * len(messages)
+        try:
+            groups = self._group_messages(messages)
+            logger.info('Processing %d message(s) as %d command(s)', len(messages), len(groups))
+            downstream_messages = []
+            for success, indexes, new_messages in worker_pool.map(self._execute_group, groups):
+                for index in indexes:
+                    successes[index] = success
+                downstream_messages.extend(new_messages)
+
+            try:
+                self._send_downstream(downstream_messages)
+            except Exception:
+                logger.exception('Error sending downstream messages. Messages remain on queue.')
+                successes = [False] * len(messages)
+        finally:
+            # Feed per-message success back to backend generator
+            try:
+                message_generator.send(successes)
+            except StopIteration:
+                pass
+
     @staticmethod
     def _extract_command(message):
         """Reconstitute a CommandMessage from incoming raw message payload
@@ -97,7 +159,7 @@ class CommandMessageManager(object):
 
         try:
             message_class = get_message_type(message['type'])
-            message_body = message['body']
+            message_body = decode_message_body(message)
 
             return message_class.from_json(message_body)
         except KeyError as ex:
@@ -117,6 +179,18 @@ class CommandMessageManager(object):
         """
 
         command = self._extract_command(message)
+        self._execute_command(command)
+
+    def _execute_command(self, command, send_downstream=True):
+        """Executes the given command and sends any downstream messages if it succeeds
+
+        :param command: The command to execute
+        :type command: `messaging.messages.message.CommandMessage`
+        :param send_downstream: Whether to send the downstream messages, False if the caller will send them
+        :type send_downstream: bool
+        :raises CommandMessageExecuteFailure: Failure during CommandMessage.execute
+        """
+
         start_time = now()
         logger.info('Processing message of type %s', command.type)
         try:
@@ -131,10 +205,58 @@ class CommandMessageManager(object):
             raise CommandMessageExecuteFailure
 
         # If execute is successful, we need to fire off any downstream messages
-        self._send_downstream(command.new_messages)
+        if send_downstream:
+            self._send_downstream(command.new_messages)
 
         logger.info('Successfully completed message of type %s', command.type)
 
+    def _execute_group(self, group):
+        """Executes a group of messages that have been merged into a single command. This is run within a worker
+        thread, so it manages its own database connection.
+
+        :param group: The (command, message indexes) tuple
+        :type group: tuple
+        :return: The (success, message indexes, downstream messages) tuple
+        :rtype: tuple
+        """
+
+        command, indexes = group
+        success = False
+        close_old_connections()
+        try:
+            self._execute_command(command, send_downstream=False)
+            success = True
+        except CommandMessageExecuteFailure:
+            logger.exception('CommandMessage failure during execute call. Message remains on queue.')
+        finally:
+            close_old_connections()
+        return success, indexes, command.new_messages if success else []
+
+    def _group_messages(self, messages):
+        """Reconstitutes the commands from the given message payloads, groups them by message type, and merges the
+        commands within each type where the command type allows it
+
+        :param messages: The message payloads
+        :type messages: [dict]
+        :return: The list of (command, message indexes) tuples, one per merged group of messages
+        :rtype: list
+        """
+
+        groups_by_type = OrderedDict()  # {Message type: [(command, [message index])]}
+        for index, message in enumerate(messages):
+            try:
+                command = self._extract_command(message)
+            except InvalidCommandMessage:
+                logger.exception('Exception encountered processing message payload. Message remains on queue.')
+                continue
+
+            groups = groups_by_type.setdefault(command.type, [])
+            if groups and groups[-1][0].merge(command):
+                groups[-1][1].append(index)
+            else:
+                groups.append((command, [index]))
+        return [group for groups in groups_by_type.values() for group in groups]
+
     def _send_downstream(self, messages):
         """Send any required downstream messages following a CommandMessage.execute
         :param messages: List of CommandMessage instances to send downstream
@@ -36,6 +36,19 @@ class CommandMessage(object):
         :rtype: `messaging.messages.CommandMessage`
         """
 
+    def merge(self, message):
+        """Attempts to merge the given message of the same type into this message, so that both can be processed with
+        a single execution. Subclasses that support merging should override this method; merging must not change the
+        result of executing the messages.
+
+        :param message: The message to merge into this one
+        :type message: `messaging.messages.CommandMessage`
+        :return: True if the message was merged into this one, False otherwise
+        :rtype: bool
+        """
+
+        return False
+
     @abstractmethod
     def execute(self):
         """Processing logic for all command messages should be implemented within this method.
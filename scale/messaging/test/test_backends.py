@@ -15,7 +15,8 @@ from mock import call, patch
 import messaging.backends.factory as backend_factory
 from messaging.backends.amqp import AMQPMessagingBackend
 from messaging.backends.backend import MessagingBackend
-from messaging.backends.sqs import SQSMessagingBackend
+from messaging.backends.pool import ConnectionPool
+from messaging.backends.sqs import BATCH_VISIBILITY_TIMEOUT, SQSMessagingBackend
 
 
 # Dummy class for ABC __init__ testing
@@ -49,8 +50,7 @@ class TestAMQPBackend(TestCase):
         backend = AMQPMessagingBackend()
         backend.send_messages(messages)
 
-        # Deep diving through context managers to assert put call
-        put = connection.return_value.__enter__.return_value.SimpleQueue.return_value.put
+        put = connection.return_value.SimpleQueue.return_value.put
         put.assert_called_with(messages[0])
         self.assertEquals(put.call_count, 1)
 
@@ -66,8 +66,7 @@ class TestAMQPBackend(TestCase):
         backend = AMQPMessagingBackend()
         backend.send_messages(messages)
 
-        # Deep diving through context managers to assert put call
-        put = connection.return_value.__enter__.return_value.SimpleQueue.return_value.put
+        put = connection.return_value.SimpleQueue.return_value.put
         put.assert_has_calls([call(x) for x in messages])
         self.assertEquals(put.call_count, 2)
 
@@ -79,8 +78,7 @@ class TestAMQPBackend(TestCase):
         message2 = MagicMock(payload={'type': 'echo', 'body': '2'})
         get_func = MagicMock(side_effect=[message1, message2, Queue.Empty])
 
-        # Deep diving through context managers to patch get call
-        connection.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        connection.return_value.SimpleQueue.return_value.get = get_func
 
         backend = AMQPMessagingBackend()
         generator = backend.receive_messages(5)
@@ -105,8 +103,7 @@ class TestAMQPBackend(TestCase):
         message3 = MagicMock(payload={'type': 'echo', 'body': '3'})
         get_func = MagicMock(side_effect=[message1, message2, Queue.Empty])
 
-        # Deep diving through context managers to patch get call
-        connection.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        connection.return_value.SimpleQueue.return_value.get = get_func
 
         backend = AMQPMessagingBackend()
         generator = backend.receive_messages(2)
@@ -132,8 +129,7 @@ class TestAMQPBackend(TestCase):
         message.payload = 'test'
         get_func = MagicMock(return_value=message)
 
-        # Deep diving through context managers to patch get call
-        connection.return_value.__enter__.return_value.SimpleQueue.return_value.get = get_func
+        connection.return_value.SimpleQueue.return_value.get = get_func
 
         backend = AMQPMessagingBackend()
 
@@ -145,6 +141,86 @@ class TestAMQPBackend(TestCase):
             pass
 
         message.ack.assert_not_called()
+        message.requeue.assert_called()
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_close_during_receive_message_yield(self, connection):
+        """Validate the outstanding message is requeued and the connection kept when the generator is closed"""
+
+        message = MagicMock(payload={'type': 'echo', 'body': '1'})
+        connection.return_value.SimpleQueue.return_value.get = MagicMock(return_value=message)
+
+        backend = AMQPMessagingBackend()
+        generator = backend.receive_messages(10)
+        generator.next()
+        generator.close()
+
+        message.ack.assert_not_called()
+        message.requeue.assert_called_once()
+        self.assertDictEqual(backend.get_connection_metrics()['receive'], {'created': 1, 'discarded': 0, 'reused': 0})
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_receive_message_batch(self, connection):
+        """Validate a batch of messages is retrieved at once and acknowledged individually via AMQP backend"""
+
+        message1 = MagicMock(payload={'type': 'echo', 'body': '1'})
+        message2 = MagicMock(payload={'type': 'echo', 'body': '2'})
+        get_func = MagicMock(side_effect=[message1, message2, Queue.Empty])
+        connection.return_value.SimpleQueue.return_value.get = get_func
+
+        backend = AMQPMessagingBackend()
+        generator = backend.receive_message_batch(5)
+        results = generator.next()
+        with self.assertRaises(StopIteration):
+            generator.send([True, False])
+
+        self.assertListEqual(results, [message1.payload, message2.payload])
+        message1.ack.assert_called()
+        message2.ack.assert_not_called()
+        message2.requeue.assert_called()
+        connection.return_value.SimpleQueue.return_value.consumer.qos.assert_called_with(prefetch_count=5)
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_receive_empty_message_batch(self, connection):
+        """Validate nothing is yielded when the AMQP queue is empty"""
+
+        connection.return_value.SimpleQueue.return_value.get = MagicMock(side_effect=Queue.Empty)
+
+        backend = AMQPMessagingBackend()
+        self.assertListEqual(list(backend.receive_message_batch(5)), [])
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_connection_reused(self, connection):
+        """Validate the AMQP connection is kept open and reused across calls"""
+
+        messages = [{'type': 'echo', 'body': 'yes'}]
+
+        backend = AMQPMessagingBackend()
+        backend.send_messages(messages)
+        backend.send_messages(messages)
+
+        self.assertEqual(connection.call_count, 1)
+        connection.return_value.release.assert_not_called()
+        self.assertDictEqual(backend.get_connection_metrics()['send'], {'created': 1, 'discarded': 0, 'reused': 1})
+
+    @patch('messaging.backends.amqp.Connection')
+    def test_send_reconnects_after_error(self, connection):
+        """Validate the AMQP backend discards a broken connection and resends the unsent messages on a new one"""
+
+        messages = [
+            {'type': 'echo', 'body': '1'},
+            {'type': 'echo', 'body': '2'}
+        ]
+        put = connection.return_value.SimpleQueue.return_value.put
+        put.side_effect = [None, IOError('Connection reset'), None]
+
+        backend = AMQPMessagingBackend()
+        backend.send_messages(messages)
+
+        put.assert_has_calls([call(messages[0]), call(messages[1]), call(messages[1])])
+        self.assertEqual(connection.call_count, 2)
+        connection.return_value.release.assert_called_once()
+        self.assertDictEqual(backend.get_connection_metrics()['send'], {'created': 2, 'discarded': 1, 'reused': 0})
 
 
 class TestBackendsFactory(TestCase):
@@ -181,6 +257,70 @@ class TestBackendsFactory(TestCase):
         self.assertEqual(backend_factory.get_message_backends(), backend_factory._MESSAGE_BACKENDS.keys())
 
 
+class TestConnectionPool(TestCase):
+    def setUp(self):
+        django.setup()
+
+        self.create_func = MagicMock(side_effect=lambda: MagicMock())
+        self.close_func = MagicMock()
+        self.is_healthy_func = MagicMock(return_value=True)
+        self.pool = ConnectionPool('test', self.create_func, self.close_func, self.is_healthy_func, max_idle=1)
+
+    def test_acquire_reuses_connection(self):
+        """Validate an idle connection is handed out again"""
+
+        with self.pool.acquire() as connection_1:
+            pass
+        with self.pool.acquire() as connection_2:
+            pass
+
+        self.assertIs(connection_1, connection_2)
+        self.assertEqual(self.create_func.call_count, 1)
+        self.close_func.assert_not_called()
+        self.assertDictEqual(self.pool.get_metrics(), {'created': 1, 'discarded': 0, 'reused': 1})
+
+    def test_acquire_discards_on_error(self):
+        """Validate a connection that raises an error is closed instead of being returned to the pool"""
+
+        with self.assertRaises(IOError):
+            with self.pool.acquire() as connection_1:
+                raise IOError('Connection reset')
+        with self.pool.acquire() as connection_2:
+            pass
+
+        self.assertIsNot(connection_1, connection_2)
+        self.close_func.assert_called_once_with(connection_1)
+        self.assertDictEqual(self.pool.get_metrics(), {'created': 2, 'discarded': 1, 'reused': 0})
+
+    def test_acquire_health_check(self):
+        """Validate an idle connection that fails its health check is replaced"""
+
+        with self.pool.acquire() as connection_1:
+            pass
+        self.is_healthy_func.return_value = False
+        with self.pool.acquire() as connection_2:
+            pass
+
+        self.assertIsNot(connection_1, connection_2)
+        self.close_func.assert_called_once_with(connection_1)
+        self.assertDictEqual(self.pool.get_metrics(), {'created': 2, 'discarded': 1, 'reused': 0})
+
+    def test_release_over_max_idle(self):
+        """Validate connections beyond the maximum idle count are closed when released"""
+
+        with self.pool.acquire() as connection_1:
+            with self.pool.acquire() as connection_2:
+                pass
+        self.close_func.assert_called_once_with(connection_1)
+
+        self.pool.close_all()
+        self.close_func.assert_called_with(connection_2)
+
+        with self.pool.acquire():
+            pass
+        self.assertEqual(self.create_func.call_count, 3)
+
+
 class TestMessagingBackend(TestCase):
     def setUp(self):
         django.setup()
@@ -230,7 +370,7 @@ class TestSQSBackend(TestCase):
         backend = SQSMessagingBackend()
         backend.send_messages(messages)
 
-        put = client.return_value.__enter__.return_value.send_messages
+        put = client.return_value.send_messages
         self.assertIn(json.dumps(messages[0]), str(put.mock_calls[0]))
         self.assertEquals(put.call_count, 1)
 
@@ -246,7 +386,7 @@ class TestSQSBackend(TestCase):
         backend = SQSMessagingBackend()
         backend.send_messages(messages)
 
-        put = client.return_value.__enter__.return_value.send_messages
+        put = client.return_value.send_messages
         for message in messages:
             self.assertIn(json.dumps(message), str(put.mock_calls[0]))
         self.assertEquals(put.call_count, 1)
@@ -259,7 +399,7 @@ class TestSQSBackend(TestCase):
         message2 = MagicMock(body=json.dumps({'type': 'echo', 'body': '2'}))
         get_func = MagicMock(return_value=[message1, message2])
 
-        client.return_value.__enter__.return_value.receive_messages = get_func
+        client.return_value.receive_messages = get_func
 
         backend = SQSMessagingBackend()
         generator = backend.receive_messages(5)
@@ -285,7 +425,7 @@ class TestSQSBackend(TestCase):
         message.body = json.dumps(value)
         get_func = MagicMock(return_value=[message])
 
-        client.return_value.__enter__.return_value.receive_messages = get_func
+        client.return_value.receive_messages = get_func
 
         backend = SQSMessagingBackend()
 
@@ -300,3 +440,38 @@ class TestSQSBackend(TestCase):
 
         self.assertEquals(results, [value])
         message.delete.assert_not_called()
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_receive_message_batch(self, client):
+        """Validate a batch of messages is retrieved at once and deleted individually via SQS backend"""
+
+        message1 = MagicMock(body=json.dumps({'type': 'echo', 'body': '1'}))
+        message2 = MagicMock(body=json.dumps({'type': 'echo', 'body': '2'}))
+        client.return_value.receive_messages = MagicMock(return_value=[message1, message2])
+
+        backend = SQSMessagingBackend()
+        generator = backend.receive_message_batch(5)
+        results = generator.next()
+        with self.assertRaises(StopIteration):
+            generator.send([False, True])
+
+        self.assertEqual(len(results), 2)
+        message1.delete.assert_not_called()
+        message1.change_visibility.assert_called_with(VisibilityTimeout=0)
+        message2.delete.assert_called()
+        message2.change_visibility.assert_not_called()
+        self.assertEqual(client.return_value.receive_messages.call_args[1]['visibility_timeout_seconds'],
+                         BATCH_VISIBILITY_TIMEOUT)
+
+    @patch('messaging.backends.sqs.SQSClient')
+    def test_client_reused(self, client):
+        """Validate the SQS client is created once and reused across calls"""
+
+        messages = [{'type': 'echo', 'body': 'yes'}]
+
+        backend = SQSMessagingBackend()
+        backend.send_messages(messages)
+        backend.send_messages(messages)
+
+        self.assertEqual(client.call_count, 1)
+        self.assertEqual(client.return_value.send_messages.call_count, 2)
@@ -0,0 +1,96 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+
+from batch.messages.update_batch_metrics import UpdateBatchMetrics
+from job.messages.running_jobs import RunningJobs
+from messaging.coalescer import MessageCoalescer
+from recipe.messages.update_recipe_metrics import MAX_NUM, UpdateRecipeMetrics
+
+
+class TestMessageCoalescer(TestCase):
+    def setUp(self):
+        django.setup()
+
+    def _create_update_recipe_metrics(self, recipe_ids):
+        message = UpdateRecipeMetrics()
+        for recipe_id in recipe_ids:
+            message.add_recipe(recipe_id)
+        return message
+
+    def test_coalesce(self):
+        """Validate that overlapping messages of the same type are folded together without duplicates"""
+
+        message_1 = self._create_update_recipe_metrics([1, 2])
+        message_2 = UpdateBatchMetrics()
+        message_2.add_batch(1)
+        message_3 = self._create_update_recipe_metrics([2, 3])
+        message_4 = self._create_update_recipe_metrics([3])
+
+        coalescer = MessageCoalescer()
+        commands = coalescer.coalesce([message_1, message_2, message_3, message_4])
+
+        self.assertEqual(len(commands), 2)
+        self.assertListEqual(commands[0].to_json()['recipe_ids'], [1, 2, 3])
+        self.assertIs(commands[1], message_2)
+        # The caller's messages are left unchanged
+        self.assertListEqual(message_1.to_json()['recipe_ids'], [1, 2])
+        self.assertListEqual(message_3.to_json()['recipe_ids'], [2, 3])
+        self.assertDictEqual(coalescer.get_metrics(), {message_1.type: {'folded': 2, 'merged': 1}})
+
+    def test_coalesce_full_message(self):
+        """Validate that a new message is started once a message cannot fit any more IDs"""
+
+        message_1 = self._create_update_recipe_metrics(range(MAX_NUM))
+        message_2 = self._create_update_recipe_metrics([0, MAX_NUM])
+        message_3 = self._create_update_recipe_metrics([MAX_NUM + 1])
+
+        coalescer = MessageCoalescer()
+        commands = coalescer.coalesce([message_1, message_2, message_3])
+
+        self.assertEqual(len(commands), 2)
+        self.assertIs(commands[0], message_1)
+        self.assertListEqual(commands[1].to_json()['recipe_ids'], [0, MAX_NUM, MAX_NUM + 1])
+        self.assertListEqual(message_2.to_json()['recipe_ids'], [0, MAX_NUM])
+        self.assertDictEqual(coalescer.get_metrics(), {message_1.type: {'folded': 1, 'merged': 1}})
+
+    def test_coalesce_running_jobs(self):
+        """Validate that running job messages are only folded together when they have the same start time"""
+
+        started = now()
+        message_1 = RunningJobs(started)
+        message_1.add_running_job(1, 1, 1)
+        message_2 = RunningJobs(started)
+        message_2.add_running_job(1, 1, 1)
+        message_2.add_running_job(2, 1, 1)
+        message_3 = RunningJobs(started + datetime.timedelta(seconds=1))
+        message_3.add_running_job(3, 1, 1)
+
+        coalescer = MessageCoalescer()
+        commands = coalescer.coalesce([message_1, message_2, message_3])
+
+        self.assertEqual(len(commands), 2)
+        self.assertEqual(commands[0]._count, 2)
+        self.assertIs(commands[1], message_3)
+        self.assertEqual(message_1._count, 1)
+        self.assertDictEqual(coalescer.get_metrics(), {message_1.type: {'folded': 1, 'merged': 1}})
+
+    def test_metrics_accumulate(self):
+        """Validate that the coalescing metrics add up across calls and skip messages that were not folded"""
+
+        coalescer = MessageCoalescer()
+        coalescer.coalesce([self._create_update_recipe_metrics([1]), self._create_update_recipe_metrics([2])])
+        coalescer.coalesce([self._create_update_recipe_metrics([3])])
+        message_type = UpdateRecipeMetrics().type
+        self.assertDictEqual(coalescer.get_metrics(), {message_type: {'folded': 1, 'merged': 1}})
+
+        coalescer.coalesce([self._create_update_recipe_metrics([1]), self._create_update_recipe_metrics([2]),
+                            self._create_update_recipe_metrics([3])])
+        self.assertDictEqual(coalescer.get_metrics(), {message_type: {'folded': 3, 'merged': 2}})
@@ -0,0 +1,57 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+
+import django
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from messaging.envelope import (COMPACT_CAPACITY_FACTOR, decode_message_body, encode_message,
+                                ENVELOPE_VERSION_COMPACT, ENVELOPE_VERSION_JSON, get_message_capacity)
+from messaging.exceptions import InvalidCommandMessage
+
+
+class TestEnvelope(TestCase):
+    def setUp(self):
+        django.setup()
+
+    def test_json_envelope(self):
+        """Validate the original envelope is a plain type and body dict"""
+
+        body = {'job_ids': [1, 2, 3]}
+        message = encode_message('test', body, ENVELOPE_VERSION_JSON)
+
+        self.assertDictEqual(message, {'type': 'test', 'body': body})
+        self.assertDictEqual(decode_message_body(message), body)
+
+    def test_compact_envelope(self):
+        """Validate a compact message is smaller and decodes back to the original body"""
+
+        body = {'status_change': '1970-01-01T00:00:00Z', 'job_ids': list(range(100000, 101000)),
+                'nodes': [{'id': 1, 'jobs': [{'id': 5, 'exe_num': 1}]}], 'flags': [True, False, True, True],
+                'negative': [10, 3, -7, 200]}
+        message = encode_message('test', body, ENVELOPE_VERSION_COMPACT)
+
+        self.assertEqual(message['version'], ENVELOPE_VERSION_COMPACT)
+        self.assertEqual(message['type'], 'test')
+        self.assertLess(len(json.dumps(message)) * 10, len(json.dumps(body)))
+        self.assertDictEqual(decode_message_body(json.loads(json.dumps(message))), body)
+
+    def test_unsupported_version(self):
+        """Validate an unknown envelope version or corrupt body is rejected as an invalid message"""
+
+        with self.assertRaises(InvalidCommandMessage):
+            decode_message_body({'version': 99, 'type': 'test', 'body': {}})
+        with self.assertRaises(InvalidCommandMessage):
+            decode_message_body({'version': ENVELOPE_VERSION_COMPACT, 'type': 'test', 'body': 'not compressed'})
+
+    def test_get_message_capacity(self):
+        """Validate the compact envelope increases message capacity"""
+
+        with override_settings(MESSAGE_ENVELOPE_VERSION=ENVELOPE_VERSION_JSON):
+            self.assertEqual(get_message_capacity(100), 100)
+        with override_settings(MESSAGE_ENVELOPE_VERSION=ENVELOPE_VERSION_COMPACT):
+            self.assertEqual(get_message_capacity(100), 100 * COMPACT_CAPACITY_FACTOR)
@@ -8,6 +8,7 @@ from django.test import TestCase
 from mock import MagicMock
 from mock import call, patch
 
+from messaging.envelope import encode_message, ENVELOPE_VERSION_COMPACT
 from messaging.exceptions import CommandMessageExecuteFailure, InvalidCommandMessage
 from messaging.manager import CommandMessageManager
 from messaging.messages.message import CommandMessage
@@ -95,6 +96,55 @@ class TestCommandMessageManager(TestCase):
         process_message.assert_has_calls(calls)
         self.assertEquals(process_message.call_count, 10)
 
+    def test_receive_messages_concurrently(self):
+        """Validate that receive_messages_concurrently merges messages and acknowledges each one by group result"""
+
+        class MergingCommand(CommandMessage):
+            def __init__(self, message_type, success):
+                super(MergingCommand, self).__init__(message_type)
+                self.success = success
+
+            def to_json(self):  # pragma: no cover
+                pass
+
+            @staticmethod
+            def from_json(json_dict):  # pragma: no cover
+                pass
+
+            def merge(self, message):
+                return message.type == 'merge'
+
+            def execute(self):
+                return self.success
+
+        commands = {'1': MergingCommand('merge', True), '2': MergingCommand('merge', True),
+                    '3': MergingCommand('fail', False), '4': MergingCommand('merge', True)}
+        messages = [{'type': 'test', 'body': body} for body in ['1', '2', '3', 'invalid', '4']]
+        results = []
+
+        def gen():
+            successes = yield messages
+            results.extend(successes)
+
+        manager = CommandMessageManager()
+        manager._backend = MagicMock()
+        manager._backend.receive_message_batch = MagicMock(return_value=gen())
+        manager._send_downstream = MagicMock()
+
+        def extract_command(message):
+            if message['body'] not in commands:
+                raise InvalidCommandMessage('Invalid')
+            return commands[message['body']]
+        manager._extract_command = extract_command
+
+        worker_pool = MagicMock()
+        worker_pool.map = map
+        manager.receive_messages_concurrently(10, worker_pool)
+
+        # Messages 1, 2, and 4 were merged into one successful command
+        self.assertListEqual(results, [True, True, False, False, True])
+        self.assertEqual(manager._send_downstream.call_count, 1)
+
     @patch('messaging.manager.CommandMessageManager._extract_command')
     @patch('messaging.manager.CommandMessageManager._send_downstream')
     def test_successful_process_message(self, send_downstream, extract_command):
@@ -181,6 +231,17 @@ class TestCommandMessageManager(TestCase):
         message_class.from_json.assert_called_with(message['body'])
         self.assertTrue(isinstance(result, CommandMessage))
 
+    @patch('messaging.manager.get_message_type')
+    def test_compact_extract_command(self, get_message_type):
+        """Validate a message in the compact envelope has its body decoded before deserialization"""
+
+        body = {'job_ids': [1, 2, 3, 4, 5]}
+        message = encode_message('test', body, ENVELOPE_VERSION_COMPACT)
+
+        CommandMessageManager._extract_command(message)
+
+        get_message_type.return_value.from_json.assert_called_with(body)
+
     def test_missing_type_extract_command(self):
         """Validate InvalidCommandMessage is raised when missing type key"""
         message = {'body': 'payload'}
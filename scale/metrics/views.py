@@ -9,6 +9,7 @@ from rest_framework.response import Response
 
 import metrics.registry as registry
 import util.rest as rest_util
+import util.rest_cache as rest_cache
 from metrics.registry import MetricsTypeError
 from metrics.serializers import (MetricsPlotSerializer, MetricsPlotMultiSerializer, MetricsTypeDetailsSerializer,
                                  MetricsTypeSerializer)
@@ -21,6 +22,7 @@ class MetricsView(ListAPIView):
     queryset = registry.get_metrics_types()
     serializer_class = MetricsTypeSerializer
 
+    @rest_cache.cache_response()
     def list(self, request):
         """Retrieves the metrics types and returns it in JSON form
 
@@ -1,15 +1,52 @@
 """Defines the class that represents a set of resources on a node"""
 from __future__ import unicode_literals
 
+import threading
+
 from util.exceptions import ScaleLogicBug
 
-from node.resources.resource import Cpus, Disk, Mem, Gpus
+from node.resources.resource import ScalarResource
+
+# The standard resources always occupy the first slots of every resource vector. Any other (custom) resource name is
+# assigned the next free slot the first time it is seen, so every NodeResources in the process shares one slot layout.
+CPUS_SLOT = 0
+MEM_SLOT = 1
+DISK_SLOT = 2
+GPUS_SLOT = 3
+
+_SLOT_LOCK = threading.Lock()
+_SLOT_NAMES = ['cpus', 'mem', 'disk', 'gpus']  # [Resource name]
+_SLOTS = {'cpus': CPUS_SLOT, 'mem': MEM_SLOT, 'disk': DISK_SLOT, 'gpus': GPUS_SLOT}  # {Resource name: slot}
+
+
+def get_resource_slot(name):
+    """Returns the slot index in the resource vectors for the resource with the given name, assigning a new slot if the
+    resource has not been seen before
+
+    :param name: The resource name
+    :type name: string
+    :returns: The slot index
+    :rtype: int
+    """
+
+    slot = _SLOTS.get(name)
+    if slot is None:
+        with _SLOT_LOCK:
+            slot = _SLOTS.get(name)
+            if slot is None:
+                slot = len(_SLOT_NAMES)
+                _SLOT_NAMES.append(name)
+                _SLOTS[name] = slot
+    return slot
 
 
 class NodeResources(object):
-    """This class encapsulates a set of node resources
+    """This class encapsulates a set of node resources. The resource values are stored in a compact vector of floats
+    indexed by slot (see :func:`get_resource_slot`), where None marks a custom resource (or GPUs) that is not defined.
     """
 
+    __slots__ = ('_values',)
+
     def __init__(self, resources=None):
         """Constructor
 
@@ -17,22 +54,13 @@ class NodeResources(object):
         :type resources: list
         """
 
-        self._resources = {}  # {Name: Resource}
+        # Make sure standard resources are defined
+        self._values = [0.0, 0.0, 0.0, 0.0]
         if resources:
             for resource in resources:
                 if resource.resource_type != 'SCALAR':
                     raise ScaleLogicBug('Resource type "%s" is not currently supported', resource.resource_type)
-                self._resources[resource.name] = resource
-
-        # Make sure standard resources are defined
-        if 'cpus' not in self._resources:
-            self._resources['cpus'] = Cpus(0.0)
-        if 'mem' not in self._resources:
-            self._resources['mem'] = Mem(0.0)
-        if 'disk' not in self._resources:
-            self._resources['disk'] = Disk(0.0)
-        if 'gpus' not in self._resources:
-            self._resources['gpus'] = Gpus(0.0)
+                self._set_value(get_resource_slot(resource.name), resource.value)
 
     def __str__(self):
         """Converts the resource to a readable logging string
@@ -41,7 +69,7 @@ class NodeResources(object):
         :rtype: string
         """
 
-        logging_str = ', '.join(['%.2f %s' % (resource.value, resource.name) for resource in self._resources.values()])
+        logging_str = ', '.join(['%.2f %s' % (value, _SLOT_NAMES[slot]) for slot, value in self._iter_defined()])
         return '[%s]' % logging_str
 
     @property
@@ -52,7 +80,7 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['cpus'].value
+        return self._values[CPUS_SLOT]
 
     @property
     def disk(self):
@@ -62,7 +90,7 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['disk'].value
+        return self._values[DISK_SLOT]
 
     @property
     def mem(self):
@@ -72,7 +100,7 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['mem'].value
+        return self._values[MEM_SLOT]
 
     @property
     def gpus(self):
@@ -82,17 +110,19 @@ class NodeResources(object):
         :rtype: float
         """
 
-        return self._resources['gpus'].value
+        value = self._values[GPUS_SLOT]
+        return value if value is not None else 0.0
 
     @property
     def resources(self):
-        """The list of resources
+        """The list of resources. The returned resource objects are copies, so editing them will not affect these
+        resources.
 
         :returns: The list of resources
         :rtype: list
         """
 
-        return self._resources.values()
+        return [ScalarResource(_SLOT_NAMES[slot], value) for slot, value in self._iter_defined()]
 
     def add(self, node_resources):
         """Adds the given resources
@@ -101,11 +131,16 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                self._resources[resource.name].value += resource.value  # Assumes SCALAR type
-            else:
-                self._resources[resource.name] = resource.copy()
+        values = self._values
+        other_values = node_resources._values
+        if len(other_values) > len(values):
+            values.extend([None] * (len(other_values) - len(values)))
+        for slot, value in enumerate(other_values):
+            if value is not None:
+                if values[slot] is None:
+                    values[slot] = value
+                else:
+                    values[slot] += value  # Assumes SCALAR type
 
     def copy(self):
         """Returns a deep copy of these resources. Editing one of the resources objects will not affect the other.
@@ -115,7 +150,7 @@ class NodeResources(object):
         """
 
         resources_copy = NodeResources()
-        resources_copy.add(self)
+        resources_copy._values = list(self._values)
         return resources_copy
 
     def generate_status_json(self, resources_dict, key_name):
@@ -127,15 +162,16 @@ class NodeResources(object):
         :type key_name: string
         """
 
-        for resource in self._resources.values():
-            if resource.name in resources_dict:
-                resource_dict = resources_dict[resource.name]
+        for slot, value in self._iter_defined():
+            name = _SLOT_NAMES[slot]
+            if name in resources_dict:
+                resource_dict = resources_dict[name]
             else:
                 resource_dict = {}
-                resources_dict[resource.name] = resource_dict
+                resources_dict[name] = resource_dict
 
             # Assumes SCALAR type
-            resource_dict[key_name] = resource.value
+            resource_dict[key_name] = value
 
     def get_json(self):
         """Returns these resources as a JSON schema
@@ -146,8 +182,8 @@ class NodeResources(object):
 
         from node.resources.json.resources import Resources
         resources_dict = {}
-        for resource in self._resources.values():
-            resources_dict[resource.name] = resource.value  # Assumes SCALAR type
+        for slot, value in self._iter_defined():
+            resources_dict[_SLOT_NAMES[slot]] = value  # Assumes SCALAR type
         return Resources({'resources': resources_dict}, do_validate=False)
 
     def increase_up_to(self, node_resources):
@@ -157,12 +193,10 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                if self._resources[resource.name].value < resource.value:  # Assumes SCALAR type
-                    self._resources[resource.name].value = resource.value
-            else:
-                self._resources[resource.name] = resource.copy()
+        for slot, value in node_resources._iter_defined():
+            current_value = self._get_value(slot)
+            if current_value is None or current_value < value:  # Assumes SCALAR type
+                self._set_value(slot, value)
 
     def is_equal(self, node_resources):
         """Indicates if these resources are equal. This should be used for testing only.
@@ -174,14 +208,12 @@ class NodeResources(object):
         """
 
         # Make sure they have the exact same set of resource names
-        names = set()
-        for resource in node_resources.resources:
-            names.add(resource.name)
-        if set(self._resources.keys()) != names:
+        slots = set(slot for slot, _value in self._iter_defined())
+        if slots != set(slot for slot, _value in node_resources._iter_defined()):
             return False
 
-        for resource in node_resources.resources:
-            if round(self._resources[resource.name].value, 5) != round(resource.value, 5):  # Assumes SCALAR type
+        for slot, value in node_resources._iter_defined():
+            if round(self._values[slot], 5) != round(value, 5):  # Assumes SCALAR type
                 return False
 
         return True
@@ -195,14 +227,18 @@ class NodeResources(object):
         :rtype: bool
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                if self._resources[resource.name].value < resource.value:  # Assumes SCALAR type
-                    return False
-            else:
+        values = self._values
+        num_values = len(values)
+        for slot, value in enumerate(node_resources._values):
+            if value is None:
+                continue
+            current_value = values[slot] if slot < num_values else None
+            if current_value is None:
                 # Do not have this resource, not a problem if requesting 0.0
-                if resource.value > 0.0:
+                if value > 0.0:
                     return False
+            elif current_value < value:  # Assumes SCALAR type
+                return False
 
         return True
 
@@ -213,12 +249,13 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in self._resources.values():
-            if resource.name in node_resources._resources:
-                if resource.value > node_resources._resources[resource.name].value:  # Assumes SCALAR type
-                    resource.value = node_resources._resources[resource.name].value
+        for slot, value in list(self._iter_defined()):
+            limit = node_resources._get_value(slot)
+            if limit is not None:
+                if value > limit:  # Assumes SCALAR type
+                    self._values[slot] = limit
             else:
-                self.remove_resource(resource.name)
+                self.remove_resource(_SLOT_NAMES[slot])
 
     def remove_resource(self, name):
         """Removes the resource with the given name
@@ -227,18 +264,20 @@ class NodeResources(object):
         :type name: string
         """
 
-        if name in self._resources:
-            if name in ['cpus', 'mem', 'disk']:
-                self._resources[name].value = 0.0
-            else:
-                del self._resources[name]
+        slot = _SLOTS.get(name)
+        if slot is None or self._get_value(slot) is None:
+            return
+        if slot in (CPUS_SLOT, MEM_SLOT, DISK_SLOT):
+            self._values[slot] = 0.0
+        else:
+            self._values[slot] = None
 
     def round_values(self):
         """Rounds all of the resource values
         """
 
-        for resource in self._resources.values():
-            resource.value = round(resource.value, 2)  # Assumes SCALAR type
+        for slot, value in self._iter_defined():
+            self._values[slot] = round(value, 2)  # Assumes SCALAR type
 
     def subtract(self, node_resources):
         """Subtracts the given resources
@@ -247,6 +286,103 @@ class NodeResources(object):
         :type node_resources: :class:`node.resources.NodeResources`
         """
 
-        for resource in node_resources.resources:
-            if resource.name in self._resources:
-                self._resources[resource.name].value -= resource.value  # Assumes SCALAR type
+        values = self._values
+        num_values = len(values)
+        for slot, value in enumerate(node_resources._values):
+            if value is not None and slot < num_values and values[slot] is not None:
+                values[slot] -= value  # Assumes SCALAR type
+
+    def _get_value(self, slot):
+        """Returns the value in the given slot, None if the resource is not defined
+
+        :param slot: The slot index
+        :type slot: int
+        :returns: The resource value, possibly None
+        :rtype: float
+        """
+
+        if slot < len(self._values):
+            return self._values[slot]
+        return None
+
+    def _iter_defined(self):
+        """Generates a (slot, value) tuple for each defined resource
+
+        :returns: The generator of (slot, value) tuples
+        :rtype: generator
+        """
+
+        for slot, value in enumerate(self._values):
+            if value is not None:
+                yield slot, value
+
+    def _set_value(self, slot, value):
+        """Sets the value in the given slot, growing the vector if needed
+
+        :param slot: The slot index
+        :type slot: int
+        :param value: The resource value
+        :type value: float
+        """
+
+        if slot >= len(self._values):
+            self._values.extend([None] * (slot + 1 - len(self._values)))
+        self._values[slot] = value
+
+
+class NodeResourcesBatch(object):
+    """This class stores the resources of many nodes column-wise (one list per resource slot) so that a single request
+    can be tested against every node with one pass per requested resource, rather than one object comparison per node
+    """
+
+    def __init__(self, node_resources_list):
+        """Constructor
+
+        :param node_resources_list: The list of node resources, one per row
+        :type node_resources_list: [:class:`node.resources.node_resources.NodeResources`]
+        """
+
+        self._columns = []  # [[float or None]], indexed by slot then row
+        self._num_rows = len(node_resources_list)
+        for row, node_resources in enumerate(node_resources_list):
+            self.update(row, node_resources)
+
+    def get_sufficient_rows(self, requested):
+        """Returns the rows whose resources are sufficient to meet the requested resources, in ascending row order
+
+        :param requested: The requested resources
+        :type requested: :class:`node.resources.node_resources.NodeResources`
+        :returns: The list of row indexes
+        :rtype: [int]
+        """
+
+        rows = range(self._num_rows)
+        for slot, value in requested._iter_defined():
+            if not rows:
+                break
+            if slot >= len(self._columns):
+                # No row has this resource, not a problem if requesting 0.0
+                if value > 0.0:
+                    return []
+                continue
+            column = self._columns[slot]
+            if value > 0.0:
+                rows = [row for row in rows if column[row] is not None and column[row] >= value]
+            else:
+                rows = [row for row in rows if column[row] is None or column[row] >= value]
+        return list(rows)
+
+    def update(self, row, node_resources):
+        """Replaces the resources stored in the given row
+
+        :param row: The row index
+        :type row: int
+        :param node_resources: The new resources for the row
+        :type node_resources: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        values = node_resources._values
+        while len(self._columns) < len(values):
+            self._columns.append([None] * self._num_rows)
+        for slot, column in enumerate(self._columns):
+            column[row] = values[slot] if slot < len(values) else None
@@ -0,0 +1,87 @@
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+
+from node.resources.node_resources import NodeResources, NodeResourcesBatch
+from node.resources.resource import Cpus, Disk, Gpus, Mem, ScalarResource
+
+
+class TestNodeResources(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_add_and_subtract(self):
+        """Tests adding and subtracting resources, including custom resources"""
+
+        resources = NodeResources([Cpus(1.0), Mem(10.0)])
+        resources.add(NodeResources([Cpus(2.0), Disk(5.0), ScalarResource('foo', 3.0)]))
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(3.0), Mem(10.0), Disk(5.0),
+                                                          ScalarResource('foo', 3.0)])))
+
+        resources.subtract(NodeResources([Cpus(1.0), ScalarResource('foo', 1.0), ScalarResource('bar', 1.0)]))
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(2.0), Mem(10.0), Disk(5.0),
+                                                          ScalarResource('foo', 2.0)])))
+
+    def test_copy(self):
+        """Tests that a copy is independent of the original"""
+
+        resources = NodeResources([Cpus(1.0), ScalarResource('foo', 3.0)])
+        resources_copy = resources.copy()
+        resources_copy.add(NodeResources([Cpus(1.0)]))
+
+        self.assertEqual(resources.cpus, 1.0)
+        self.assertEqual(resources_copy.cpus, 2.0)
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(1.0), ScalarResource('foo', 3.0)])))
+
+    def test_is_sufficient_to_meet(self):
+        """Tests calling is_sufficient_to_meet()"""
+
+        resources = NodeResources([Cpus(4.0), Mem(100.0), ScalarResource('foo', 1.0)])
+
+        self.assertTrue(resources.is_sufficient_to_meet(NodeResources([Cpus(4.0), Mem(50.0)])))
+        self.assertTrue(resources.is_sufficient_to_meet(NodeResources([ScalarResource('bar', 0.0)])))
+        self.assertFalse(resources.is_sufficient_to_meet(NodeResources([Cpus(5.0)])))
+        self.assertFalse(resources.is_sufficient_to_meet(NodeResources([ScalarResource('bar', 1.0)])))
+
+    def test_limit_to(self):
+        """Tests calling limit_to() removes resources missing from the limit"""
+
+        resources = NodeResources([Cpus(4.0), Mem(100.0), Gpus(1.0), ScalarResource('foo', 1.0)])
+        resources.limit_to(NodeResources([Cpus(2.0), Mem(200.0)]))
+
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(2.0), Mem(100.0)])))
+        self.assertEqual(resources.gpus, 0.0)
+        expected_dict = {'cpus': 2.0, 'mem': 100.0, 'disk': 0.0, 'gpus': 0.0}
+        self.assertDictEqual(resources.get_json().get_dict()['resources'], expected_dict)
+
+    def test_increase_up_to(self):
+        """Tests calling increase_up_to()"""
+
+        resources = NodeResources([Cpus(4.0), Mem(100.0)])
+        resources.increase_up_to(NodeResources([Cpus(2.0), Mem(200.0), ScalarResource('foo', 1.0)]))
+
+        self.assertTrue(resources.is_equal(NodeResources([Cpus(4.0), Mem(200.0), ScalarResource('foo', 1.0)])))
+
+
+class TestNodeResourcesBatch(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_get_sufficient_rows(self):
+        """Tests finding the rows that can meet a request"""
+
+        batch = NodeResourcesBatch([NodeResources([Cpus(4.0), Mem(100.0)]),
+                                    NodeResources([Cpus(8.0), Mem(50.0), ScalarResource('foo', 1.0)]),
+                                    NodeResources([Cpus(2.0), Mem(200.0)])])
+
+        self.assertListEqual(batch.get_sufficient_rows(NodeResources([Cpus(3.0)])), [0, 1])
+        self.assertListEqual(batch.get_sufficient_rows(NodeResources([Cpus(3.0), Mem(75.0)])), [0])
+        self.assertListEqual(batch.get_sufficient_rows(NodeResources([ScalarResource('foo', 1.0)])), [1])
+        self.assertListEqual(batch.get_sufficient_rows(NodeResources([Cpus(10.0)])), [])
+
+        batch.update(2, NodeResources([Cpus(16.0), Mem(200.0), ScalarResource('foo', 2.0)]))
+        self.assertListEqual(batch.get_sufficient_rows(NodeResources([Cpus(3.0), ScalarResource('foo', 1.0)])),
+                             [1, 2])
@@ -168,6 +168,37 @@ class TestProductsViewV5(TransactionTestCase):
             # Make sure country info is included
             self.assertEqual(entry['countries'][0], self.country.iso3)
 
+    def test_cursor(self):
+        """Tests paging through the product files view with a cursor."""
+
+        url = '/%s/products/?cursor=&page_size=1' % self.api
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertNotIn('count', result)
+        self.assertListEqual([entry['id'] for entry in result['results']], [self.product1.id])
+        self.assertIsNotNone(result['next'])
+
+        response = self.client.generic('GET', result['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertListEqual([entry['id'] for entry in result['results']], [self.product2c.id])
+        self.assertIsNone(result['next'])
+
+    def test_export(self):
+        """Tests streaming the filtered product files as newline-delimited JSON."""
+
+        url = '/%s/products/export/?job_type_id=%s' % (self.api, self.job_type2.id)
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = b''.join(response.streaming_content).splitlines()
+        results = [json.loads(line) for line in lines]
+        self.assertListEqual([entry['id'] for entry in results], [self.product2c.id])
+
 class TestProductDetailsViewV5(TestCase):
 
     api = 'v5'
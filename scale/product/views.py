@@ -21,6 +21,8 @@ logger = logging.getLogger(__name__)
 class ProductsView(ListAPIView):
     """This view is the endpoint for retrieving a product by filename"""
     queryset = ScaleFile.objects.all()
+    pagination_class = rest_util.KeysetPagination
+    export = False
 
     # TODO: remove when REST API v5 is removed
     def get_serializer_class(self):
@@ -0,0 +1,163 @@
+"""Defines the benchmark that checks the query plans of the queue table queries against a large seeded queue"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import logging
+
+from django.db import connection, models, transaction
+from django.utils.timezone import now
+
+from job.configuration.interface.job_interface import JobInterface
+from job.models import Job, JobType, JobTypeRevision
+from queue.models import Queue, QueueStatusCount, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
+from trigger.models import TriggerEvent
+
+# The priority bands the seeded queue models are spread across
+PRIORITIES = (1, 50, 100, 200, 500)
+# One out of this many seeded queue models is canceled
+CANCELED_RATIO = 100
+# The number of queue models the scheduler reads from the front of the queue
+QUEUE_LIMIT = 1000
+# The interface of the seeded job types
+JOB_INTERFACE = {'version': '1.4', 'command': 'benchmark_cmd', 'command_arguments': '', 'env_vars': [], 'mounts': [],
+                 'settings': [], 'input_data': [], 'output_data': [], 'shared_resources': []}
+
+logger = logging.getLogger(__name__)
+
+
+class QueueQueryBenchmark(object):
+    """This class seeds the queue table with a large number of queue models and then runs EXPLAIN ANALYZE on the
+    queries that read the queue, reporting whether each plan sorts, scans the whole table, or is answered from an index
+    alone. The seeded models are added to and deleted from the queue status counts like any other queue models, and
+    are deleted when the benchmark finishes, so it should be run against a scratch database that has been migrated.
+    """
+
+    def __init__(self, num_rows, num_job_types=20):
+        """Constructor
+
+        :param num_rows: The number of queue models to seed
+        :type num_rows: int
+        :param num_job_types: The number of job types to spread the queue models across
+        :type num_job_types: int
+        """
+
+        self._num_rows = num_rows
+        self._num_job_types = num_job_types
+        self._job_ids = []
+
+    def run(self):
+        """Runs the benchmark and returns its results
+
+        :returns: The plan summary for each query stored by query name
+        :rtype: dict
+        """
+
+        self._seed_queue()
+        try:
+            results = {}
+            for name, query in self._get_queries():
+                sql, params = query.query.sql_with_params()
+                with connection.cursor() as cursor:
+                    cursor.execute('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + sql, params)
+                    explain = cursor.fetchone()[0][0]
+                results[name] = summarize_plan(explain)
+                logger.info('Query %s: %s', name, results[name])
+        finally:
+            with transaction.atomic():
+                queue_ids = Queue.objects.filter(job_id__in=self._job_ids).values_list('id', flat=True)
+                Queue.objects.delete_queue_models(queue_ids)
+        return results
+
+    def _get_queries(self):
+        """Returns the queue queries that are benchmarked
+
+        :returns: The list of (name, queryset) tuples
+        :rtype: list
+        """
+
+        # The same query as Queue.objects.get_queue_status()
+        status_fields = ['job_type__%s' % f for f in JobType.BASE_FIELDS]
+        status_query = QueueStatusCount.objects.filter(count__gt=0)
+        status_query = status_query.values(*(status_fields + ['count', 'longest_queued', 'highest_priority']))
+        status_query = status_query.order_by('job_type__is_paused', 'highest_priority', 'longest_queued')
+        max_queue_id = Queue.objects.aggregate(max_id=models.Max('id'))['max_id'] or 0
+
+        return [('queue_fifo', Queue.objects.get_queue(QUEUE_ORDER_FIFO)[:QUEUE_LIMIT]),
+                ('queue_lifo', Queue.objects.get_queue(QUEUE_ORDER_LIFO)[:QUEUE_LIMIT]),
+                ('queue_status', status_query),
+                ('canceled_ids', Queue.objects.filter(is_canceled=True).values_list('id', flat=True)),
+                ('new_queue_models', Queue.objects.filter(id__gt=max_queue_id - QUEUE_LIMIT).order_by('id')),
+                ('all_ids', Queue.objects.values_list('id', 'is_canceled'))]
+
+    def _seed_queue(self):
+        """Creates the job types and jobs, seeds the queue table with a single INSERT ... SELECT, and adds the seeded
+        queue models to the queue status counts
+        """
+
+        when = now()
+        event = TriggerEvent.objects.create_trigger_event('BENCHMARK', None, {'version': '1.0'}, when)
+        self._job_ids = []
+        for i in range(self._num_job_types):
+            name = 'queue-benchmark-job-type-%d' % i
+            version = '%d.0.0' % (JobType.objects.filter(name=name).count() + 1)
+            job_type = JobType.objects.create_job_type_v5(name, version, JobInterface(JOB_INTERFACE))
+            job_type_rev = JobTypeRevision.objects.get_revision(job_type.name, job_type.version, job_type.revision_num)
+            job = Job.objects.create_job_v6(job_type_rev, event.id)
+            job.status = 'QUEUED'
+            job.save()
+            self._job_ids.append(job.id)
+
+        # Queue model i gets the job (and its job type) at index i % len(job_ids)
+        qry = 'WITH q AS (INSERT INTO queue (job_type_id, job_id, exe_num, input_file_size, is_canceled, priority, '
+        qry += 'timeout, interface, configuration, resources, created, queued, docker_image) '
+        qry += 'SELECT j.job_type_id, j.id, 1, 0.0, s.i %% %s = 0, (%s::integer[])[1 + s.i %% %s], 3600, '
+        qry += '\'{}\'::jsonb, \'{}\'::jsonb, \'{}\'::jsonb, %s, %s - s.i * interval \'1 millisecond\', \'\' '
+        qry += 'FROM generate_series(0, %s) s(i) JOIN job j ON j.id = (%s::integer[])[1 + s.i %% %s] '
+        qry += 'RETURNING job_type_id, priority, queued) '
+        qry += 'SELECT job_type_id, COUNT(*), MIN(priority), MIN(queued) FROM q GROUP BY job_type_id'
+        params = [CANCELED_RATIO, list(PRIORITIES), len(PRIORITIES), when, when, self._num_rows - 1, self._job_ids,
+                  len(self._job_ids)]
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                logger.info('Seeding %d queue models', self._num_rows)
+                cursor.execute(qry, params)
+                counts = cursor.fetchall()
+            # Each job type has its own longest queued time, so the counts are added one job type at a time
+            for job_type_id, count, highest_priority, longest_queued in counts:
+                QueueStatusCount.objects.add_queued({job_type_id: (count, highest_priority)}, longest_queued)
+
+        with connection.cursor() as cursor:
+            # Update the statistics and the visibility map so that the planner can choose index-only scans, VACUUM
+            # cannot run inside of a transaction so only the statistics are updated there
+            if connection.in_atomic_block:
+                cursor.execute('ANALYZE queue')
+            else:
+                cursor.execute('VACUUM ANALYZE queue')
+
+
+def summarize_plan(explain):
+    """Summarizes the given EXPLAIN ANALYZE output
+
+    :param explain: The JSON output of EXPLAIN ANALYZE for a single query
+    :type explain: dict
+    :returns: The summary with the plan's node types, indexes used, whether it sorts, scans the whole table, or reads
+        only indexes, the number of heap fetches by index-only scans, and the execution time in milliseconds
+    :rtype: dict
+    """
+
+    node_types = set()
+    index_names = set()
+    heap_fetches = 0
+    plans = [explain['Plan']]
+    while plans:
+        plan = plans.pop()
+        node_types.add(plan['Node Type'])
+        if 'Index Name' in plan:
+            index_names.add(plan['Index Name'])
+        heap_fetches += plan.get('Heap Fetches', 0)
+        plans.extend(plan.get('Plans', []))
+
+    scan_types = {node_type for node_type in node_types if node_type.endswith('Scan')}
+    return {'node_types': sorted(node_types), 'indexes': sorted(index_names), 'sort': 'Sort' in node_types,
+            'seq_scan': 'Seq Scan' in node_types, 'index_only': scan_types == {'Index Only Scan'},
+            'heap_fetches': heap_fetches, 'execution_ms': explain.get('Execution Time')}
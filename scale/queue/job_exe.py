@@ -1,6 +1,8 @@
 """Defines the class that represents queued job executions being considered for scheduling"""
 from __future__ import unicode_literals
 
+import copy
+
 from job.models import JobExecution
 from node.resources.node_resources import NodeResources
 
@@ -19,7 +21,9 @@ class QueuedJobExecution(object):
         self.is_canceled = queue.is_canceled
         self.configuration = queue.get_execution_configuration()
         self.interface = queue.get_job_interface()
+        self.job_type_id = queue.job_type_id
         self.priority = queue.priority
+        self.queued = queue.queued
         self.required_resources = queue.get_resources()
         self.scheduled_agent_id = None
 
@@ -27,6 +31,21 @@ class QueuedJobExecution(object):
         self._scheduled_node_id = None
         self._scheduled_resources = None
 
+    def copy(self):
+        """Returns a copy of this queued job execution that has not been scheduled. The copy has its own required
+        resources since scheduling may increase them, while the parsed configuration and interface are shared.
+
+        :returns: The copy of this queued job execution
+        :rtype: :class:`queue.job_exe.QueuedJobExecution`
+        """
+
+        job_exe = copy.copy(self)
+        job_exe.required_resources = self.required_resources.copy()
+        job_exe.scheduled_agent_id = None
+        job_exe._scheduled_node_id = None
+        job_exe._scheduled_resources = None
+        return job_exe
+
     def create_job_exe_model(self, framework_id, when):
         """Creates and returns a scheduled job execution model
 
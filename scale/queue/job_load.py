@@ -1,14 +1,26 @@
 """Defines the clock event processor for tracking historical job load."""
+import datetime
+
+import django.utils.timezone as timezone
+
 from job.clock import ClockEventProcessor
-from queue.models import JobLoad
+from queue.models import JobLoad, JOB_LOAD_MINUTE
+
+# If the scheduler has not recorded a job load sample within this long, the clock takes a snapshot instead
+SCHEDULER_SAMPLE_THRESHOLD = datetime.timedelta(minutes=5)
 
 
 class JobLoadProcessor(ClockEventProcessor):
-    """This class queries and stores job load statistics for tracking and trending."""
+    """This class rolls up and stores job load statistics for tracking and trending."""
 
     def process_event(self, event, last_event=None):
         """See :meth:`job.clock.ClockEventProcessor.process_event`.
 
-        Calculates metrics for the job load over time.
+        Rolls the job load samples recorded by the scheduler up into hourly and daily averages, taking a snapshot of the
+        job load first if the scheduler is not recording samples.
         """
-        JobLoad.objects.calculate()
+        when = timezone.now()
+        threshold = when - SCHEDULER_SAMPLE_THRESHOLD
+        if not JobLoad.objects.filter(period=JOB_LOAD_MINUTE, measured__gte=threshold).exists():
+            JobLoad.objects.calculate()
+        JobLoad.objects.roll_up(when)
@@ -0,0 +1,45 @@
+"""Defines the command that benchmarks the query plans of the queue table queries against a large seeded queue"""
+from __future__ import unicode_literals
+
+import json
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from queue.benchmark import QueueQueryBenchmark
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Command that benchmarks the query plans of the queue table queries against a large seeded queue
+    """
+
+    help = 'Benchmarks the query plans of the queue table queries against a large seeded queue in a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-r', '--rows', action='store', type=int, default=1000000,
+                            help='The number of queue models to seed')
+        parser.add_argument('-t', '--job-types', action='store', type=int, default=20,
+                            help='The number of job types to spread the queue models across')
+        parser.add_argument('--keepdb', action='store_true', default=False,
+                            help='Keep the test database between runs to skip its migrations')
+
+    def handle(self, *args, **options):
+        """See :meth:`django.core.management.base.BaseCommand.handle`.
+
+        This method runs the benchmark in a test database so that the configured database is never modified.
+        """
+
+        keepdb = options['keepdb']
+
+        old_name = connection.settings_dict['NAME']
+        logger.info('Creating test database for benchmark')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb)
+        try:
+            results = QueueQueryBenchmark(options['rows'], options['job_types']).run()
+            self.stdout.write(json.dumps(results, sort_keys=True))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('queue', '0018_queue_docker_image_populate'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='queue',
+            name='priority',
+            field=models.IntegerField(),
+        ),
+        migrations.AddIndex(
+            model_name='queue',
+            index=models.Index(fields=['priority', 'queued', 'id'], name='queue_fifo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='queue',
+            index=models.Index(fields=['priority', '-queued', 'id'], name='queue_lifo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='queue',
+            index=models.Index(fields=['job_type', 'priority', 'queued'], name='queue_job_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='queue',
+            index=models.Index(fields=['id', 'is_canceled'], name='queue_id_canceled_idx'),
+        ),
+        migrations.RunSQL(
+            sql='CREATE INDEX queue_canceled_idx ON queue (id) WHERE is_canceled',
+            reverse_sql='DROP INDEX queue_canceled_idx',
+        ),
+    ]
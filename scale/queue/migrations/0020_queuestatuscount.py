@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0048_auto_20180913_1632'),
+        ('queue', '0019_queue_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueueStatusCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField()),
+                ('longest_queued', models.DateTimeField(blank=True, null=True)),
+                ('highest_priority', models.IntegerField(blank=True, null=True)),
+                ('last_modified', models.DateTimeField(auto_now=True)),
+                ('job_type', models.OneToOneField(on_delete=django.db.models.deletion.PROTECT, to='job.JobType')),
+            ],
+            options={
+                'db_table': 'queue_status_count',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='queue',
+            index=models.Index(fields=['job_type', 'queued'], name='queue_job_type_queued_idx'),
+        ),
+        migrations.RunSQL(
+            sql='INSERT INTO queue_status_count (job_type_id, count, longest_queued, highest_priority, last_modified) '
+                'SELECT job_type_id, COUNT(*), MIN(queued), MIN(priority), NOW() FROM queue GROUP BY job_type_id',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
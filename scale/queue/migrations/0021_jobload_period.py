@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('queue', '0020_queuestatuscount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobload',
+            name='period',
+            field=models.CharField(choices=[('MINUTE', 'MINUTE'), ('HOUR', 'HOUR'), ('DAY', 'DAY')], default='MINUTE',
+                                   max_length=10),
+        ),
+        # The existing job loads were calculated once an hour, so they are kept as hourly job loads instead of being
+        # rolled up all at once as minute samples
+        migrations.RunSQL(
+            sql="UPDATE job_load SET period = 'HOUR'",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterIndexTogether(
+            name='jobload',
+            index_together=set([('period', 'measured')]),
+        ),
+    ]
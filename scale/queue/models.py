@@ -1,11 +1,14 @@
 """Defines the database model for a queue entry"""
 from __future__ import unicode_literals
 
+import datetime
+import json
 import logging
 
 import django.utils.timezone as timezone
 import django.contrib.postgres.fields
-from django.db import models, transaction
+from django.conf import settings
+from django.db import connection, models, transaction
 
 from error.models import Error
 from job.execution.configuration.configurators import QueuedExecutionConfigurator
@@ -14,8 +17,8 @@ from job.configuration.data.job_data import JobData as JobData_1_0
 from job.execution.configuration.json.exe_config import ExecutionConfiguration
 from job.data.job_data import JobData
 from job.deprecation import JobInterfaceSunset
-from job.seed.manifest import SeedManifest
-from job.models import Job, JobType
+from job.job_type_cache import job_type_cache
+from job.models import Job, JobType, JobTypeRevision
 from job.models import JobExecution
 from node.resources.json.resources import Resources
 from product.models import ProductFile
@@ -29,6 +32,13 @@ QUEUE_ORDER_FIFO = 'FIFO'
 QUEUE_ORDER_LIFO = 'LIFO'
 DEFAULT_QUEUE_ORDER = QUEUE_ORDER_FIFO
 
+JOB_LOAD_MINUTE = 'MINUTE'
+JOB_LOAD_HOUR = 'HOUR'
+JOB_LOAD_DAY = 'DAY'
+# The job load periods from finest to coarsest with the duration of each
+JOB_LOAD_PERIODS = [(JOB_LOAD_MINUTE, datetime.timedelta(minutes=1)), (JOB_LOAD_HOUR, datetime.timedelta(hours=1)),
+                    (JOB_LOAD_DAY, datetime.timedelta(days=1))]
+
 
 class JobLoadGroup(object):
     """Represents a group of job load models.
@@ -50,11 +60,16 @@ class JobLoadGroup(object):
 
 
 class JobLoadManager(models.Manager):
-    """This class manages the JobLoad model."""
+    """This class manages the JobLoad model. The scheduler records a job load sample every minute, which the clock rolls
+    up into hourly and daily averages. Each resolution is kept for a limited time (daily averages are kept forever) and
+    queries read the finest resolution that still covers the requested time range.
+    """
 
     @transaction.atomic
     def calculate(self):
-        """Calculates and saves new job load models grouped by job type based on a current jobs snapshot."""
+        """Calculates and saves new job load models grouped by job type based on a current jobs snapshot. This scans the
+        jobs table, so it is only used when the scheduler is not recording job load samples.
+        """
 
         # Get a list of job counts grouped by type and status
         jobs = Job.objects.filter(status__in=['PENDING', 'QUEUED', 'RUNNING'])
@@ -95,7 +110,7 @@ class JobLoadManager(models.Manager):
             JobLoad(measured=measured, pending_count=0, queued_count=0, running_count=0, total_count=0).save()
 
     def get_job_loads(self, started=None, ended=None, job_type_ids=None, job_type_names=None, job_type_categories=None,
-                      job_type_priorities=None, order=None):
+                      job_type_priorities=None, order=None, period=None):
         """Returns a list of job loads within the given time range.
 
         :param started: Query jobs updated after this amount of time.
@@ -112,12 +127,25 @@ class JobLoadManager(models.Manager):
         :type job_type_priorities: list[int]
         :param order: A list of fields to control the sort order.
         :type order: list[str]
+        :param period: The resolution of the job loads, defaults to the finest resolution that covers the time range.
+            Finer job loads that have not been rolled up into this resolution yet are included.
+        :type period: str
         :returns: The list of job loads that match the time range.
         :rtype: list[:class:`queue.models.JobLoad`]
         """
 
         # Fetch a list of job loads
-        job_loads = JobLoad.objects.all().select_related('job_type')
+        if not period:
+            period = self.get_period(started)
+        period_filter = models.Q(period=period)
+        periods = [job_load_period for job_load_period, _duration in JOB_LOAD_PERIODS]
+        for i in range(periods.index(period)):
+            finer_filter = models.Q(period=periods[i])
+            rolled_up_end = self._get_rolled_up_end(periods[i + 1])
+            if rolled_up_end:
+                finer_filter &= models.Q(measured__gte=rolled_up_end)
+            period_filter |= finer_filter
+        job_loads = JobLoad.objects.filter(period_filter).select_related('job_type')
 
         # Apply time range filtering
         if started:
@@ -142,31 +170,156 @@ class JobLoadManager(models.Manager):
             job_loads = job_loads.order_by('measured')
         return job_loads
 
+    def get_period(self, started=None):
+        """Returns the finest job load resolution that is still kept for the given start of a time range
+
+        :param started: The start of the time range, None for the beginning of time
+        :type started: :class:`datetime.datetime`
+        :returns: The job load period
+        :rtype: str
+        """
+
+        when = timezone.now()
+        if started and started >= when - datetime.timedelta(days=settings.JOB_LOAD_MINUTE_RETENTION_DAYS):
+            return JOB_LOAD_MINUTE
+        if started and started >= when - datetime.timedelta(days=settings.JOB_LOAD_HOUR_RETENTION_DAYS):
+            return JOB_LOAD_HOUR
+        return JOB_LOAD_DAY
+
     def group_by_time(self, job_loads):
-        """Groups the given job loads by job type.
+        """Groups the given job loads by time, summing the counts of all job types in the database.
 
         :param job_loads: Query jobs updated after this amount of time.
-        :type job_loads: list[:class:`queue.models.JobLoad`]
+        :type job_loads: :class:`django.db.models.query.QuerySet`
         :returns: A list of job loads grouped by job type.
         :rtype: list[:class:`queue.models.JobLoadGroup`]
         """
+
+        job_loads = job_loads.order_by('measured').values('measured')
+        job_loads = job_loads.annotate(pending_count=models.Sum('pending_count'),
+                                       queued_count=models.Sum('queued_count'),
+                                       running_count=models.Sum('running_count'))
+
         results = []
         for job_load in job_loads:
-            if not results or results[-1].time != job_load.measured:
-                results.append(JobLoadGroup(job_load.measured))
-            results[-1].pending_count += job_load.pending_count
-            results[-1].queued_count += job_load.queued_count
-            results[-1].running_count += job_load.running_count
+            results.append(JobLoadGroup(job_load['measured'], job_load['pending_count'], job_load['queued_count'],
+                                        job_load['running_count']))
         return results
 
+    @transaction.atomic
+    def record(self, running_counts, measured):
+        """Records a job load sample. The running counts come from the scheduler's running job executions, the queued
+        counts from the queue status counts, and the pending counts from the index on job status, so the jobs table is
+        never scanned.
+
+        :param running_counts: The number of running job executions stored by job type ID
+        :type running_counts: dict
+        :param measured: When the sample was taken
+        :type measured: :class:`datetime.datetime`
+        """
+
+        pending_counts = {}
+        pending_qry = Job.objects.filter(status='PENDING').values('job_type_id').annotate(count=models.Count('id'))
+        for count_dict in pending_qry.order_by():
+            pending_counts[count_dict['job_type_id']] = count_dict['count']
+        queued_counts = {}
+        for job_type_id, count in QueueStatusCount.objects.filter(count__gt=0).values_list('job_type_id', 'count'):
+            queued_counts[job_type_id] = count
+
+        job_loads = []
+        for job_type_id in set(pending_counts) | set(queued_counts) | set(running_counts):
+            pending_count = pending_counts.get(job_type_id, 0)
+            queued_count = queued_counts.get(job_type_id, 0)
+            running_count = running_counts.get(job_type_id, 0)
+            job_loads.append(JobLoad(job_type_id=job_type_id, measured=measured, pending_count=pending_count,
+                                     queued_count=queued_count, running_count=running_count,
+                                     total_count=pending_count + queued_count + running_count))
+        if not job_loads:
+            # Save an empty record as a place holder so that every sample is counted in the rollups
+            job_loads.append(JobLoad(measured=measured, pending_count=0, queued_count=0, running_count=0,
+                                     total_count=0))
+        self.bulk_create(job_loads)
+
+    @transaction.atomic
+    def roll_up(self, when):
+        """Rolls the complete hours of minute samples up into hourly averages and the complete days of hourly averages
+        up into daily averages, and then deletes the samples and averages that are past their retention
+
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        current_hour = when.replace(minute=0, second=0, microsecond=0)
+        current_day = current_hour.replace(hour=0)
+        self._roll_up_period(JOB_LOAD_MINUTE, JOB_LOAD_HOUR, 'hour', current_hour)
+        self._roll_up_period(JOB_LOAD_HOUR, JOB_LOAD_DAY, 'day', current_day)
+
+        minute_expired = when - datetime.timedelta(days=settings.JOB_LOAD_MINUTE_RETENTION_DAYS)
+        hour_expired = when - datetime.timedelta(days=settings.JOB_LOAD_HOUR_RETENTION_DAYS)
+        self.filter(period=JOB_LOAD_MINUTE, measured__lt=minute_expired).delete()
+        self.filter(period=JOB_LOAD_HOUR, measured__lt=hour_expired).delete()
+
+    def _get_rolled_up_end(self, period):
+        """Returns the end of the last job load bucket that has been rolled up into the given period
+
+        :param period: The job load period
+        :type period: str
+        :returns: The end of the last rolled up bucket, None if nothing has been rolled up into the period
+        :rtype: :class:`datetime.datetime`
+        """
+
+        last_rolled_up = self.filter(period=period).aggregate(last=models.Max('measured'))['last']
+        if not last_rolled_up:
+            return None
+        return last_rolled_up + dict(JOB_LOAD_PERIODS)[period]
+
+    def _roll_up_period(self, from_period, to_period, date_part, ended):
+        """Rolls the job loads of the given period up into averages of a coarser period. Each average is the sum of the
+        counts in the bucket divided by the number of distinct sample times in the bucket, so a job type with no load
+        in some of the samples is averaged correctly. Buckets that have already been rolled up are skipped.
+
+        :param from_period: The period of the job loads to roll up
+        :type from_period: str
+        :param to_period: The period of the averages to create
+        :type to_period: str
+        :param date_part: The Postgres date_trunc() field matching the period of the averages
+        :type date_part: str
+        :param ended: The end of the last complete bucket
+        :type ended: :class:`datetime.datetime`
+        """
+
+        qry = self.filter(period=from_period, measured__lt=ended)
+        rolled_up_end = self._get_rolled_up_end(to_period)
+        if rolled_up_end:
+            qry = qry.filter(measured__gte=rolled_up_end)
+        started = qry.aggregate(first=models.Min('measured'))['first']
+        if not started:
+            return
+
+        sql = 'INSERT INTO job_load (job_type_id, measured, period, pending_count, queued_count, running_count, '
+        sql += 'total_count) SELECT l.job_type_id, s.bucket, %s, ROUND(SUM(l.pending_count)::numeric / s.samples), '
+        sql += 'ROUND(SUM(l.queued_count)::numeric / s.samples), ROUND(SUM(l.running_count)::numeric / s.samples), '
+        sql += 'ROUND(SUM(l.total_count)::numeric / s.samples) FROM job_load l JOIN ('
+        sql += 'SELECT date_trunc(%s, measured) AS bucket, COUNT(DISTINCT measured) AS samples FROM job_load '
+        sql += 'WHERE period = %s AND measured >= %s AND measured < %s GROUP BY 1) s '
+        sql += 'ON date_trunc(%s, l.measured) = s.bucket '
+        sql += 'WHERE l.period = %s AND l.measured >= %s AND l.measured < %s '
+        sql += 'GROUP BY l.job_type_id, s.bucket, s.samples'
+        params = [to_period, date_part, from_period, started, ended, date_part, from_period, started, ended]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            logger.info('Rolled %s job loads up into %d %s job load(s)', from_period, cursor.rowcount, to_period)
+
 
 class JobLoad(models.Model):
     """Represents the load counts for each job type at various points in time.
 
     :keyword job_type: The type of job being measured.
     :type job_type: :class:`django.db.models.ForeignKey`
-    :keyword measured: When the counts were actually measured.
+    :keyword measured: When the counts were actually measured, or the start of the hour or day for averages.
     :type measured: :class:`django.db.models.DateTimeField`
+    :keyword period: The resolution of the counts: a single sample (MINUTE), or an hourly or daily average.
+    :type period: :class:`django.db.models.CharField`
 
     :keyword pending_count: The number of jobs in pending status for the type.
     :type pending_count: :class:`django.db.models.IntegerField`
@@ -177,9 +330,15 @@ class JobLoad(models.Model):
     :keyword total_count: The number of jobs in pending, queued, or running status for the type.
     :type total_count: :class:`django.db.models.IntegerField`
     """
+    PERIODS = (
+        (JOB_LOAD_MINUTE, JOB_LOAD_MINUTE),
+        (JOB_LOAD_HOUR, JOB_LOAD_HOUR),
+        (JOB_LOAD_DAY, JOB_LOAD_DAY),
+    )
 
     job_type = models.ForeignKey('job.JobType', on_delete=models.PROTECT, blank=True, null=True)
     measured = models.DateTimeField(db_index=True)
+    period = models.CharField(choices=PERIODS, default=JOB_LOAD_MINUTE, max_length=10)
 
     pending_count = models.IntegerField()
     queued_count = models.IntegerField()
@@ -191,6 +350,7 @@ class JobLoad(models.Model):
     class Meta(object):
         """meta information for the db"""
         db_table = 'job_load'
+        index_together = ['period', 'measured']
 
 
 class QueueStatus(object):
@@ -225,6 +385,28 @@ class QueueManager(models.Manager):
 
         self.filter(job_id__in=job_ids).update(is_canceled=True)
 
+    def delete_queue_models(self, queue_ids):
+        """Deletes the queue models with the given IDs and removes them from the queue status counts. The caller must be
+        within an atomic transaction.
+
+        :param queue_ids: The IDs of the queue models to delete
+        :type queue_ids: list
+        """
+
+        queue_ids = list(queue_ids)
+        if not queue_ids:
+            return
+
+        job_type_counts = {}
+        qry = 'WITH d AS (DELETE FROM queue WHERE id IN %s RETURNING job_type_id) '
+        qry += 'SELECT job_type_id, COUNT(*) FROM d GROUP BY job_type_id'
+        with connection.cursor() as cursor:
+            cursor.execute(qry, [tuple(queue_ids)])
+            for job_type_id, count in cursor.fetchall():
+                job_type_counts[job_type_id] = count
+
+        QueueStatusCount.objects.remove_queued(job_type_counts)
+
     def get_queue(self, order_mode, ignore_job_type_ids=None):
         """Returns the list of queue models sorted according to their priority first, and then according to the provided
         mode
@@ -242,22 +424,25 @@ class QueueManager(models.Manager):
         if ignore_job_type_ids:
             query = query.exclude(job_type_id__in=ignore_job_type_ids)
 
+        # The ID breaks ties so that these orderings match the queue_fifo_idx and queue_lifo_idx indexes
         if order_mode == QUEUE_ORDER_FIFO:
-            return query.order_by('priority', 'queued')
+            return query.order_by('priority', 'queued', 'id')
         elif order_mode == QUEUE_ORDER_LIFO:
-            return query.order_by('priority', '-queued')
+            return query.order_by('priority', '-queued', 'id')
         return query.order_by('priority')
 
     def get_queue_status(self):
-        """Returns the current status of the queue with statistics broken down by job type.
+        """Returns the current status of the queue with statistics broken down by job type. The statistics are read from
+        the incrementally maintained queue status counts, so this takes time proportional to the number of queued job
+        types rather than the number of queued jobs.
 
         :returns: A list of each job type with calculated statistics.
         :rtype: list[:class:`queue.models.QueueStatus`]
         """
 
-        status_dicts = Queue.objects.values(*['job_type__%s' % f for f in JobType.BASE_FIELDS])
-        status_dicts = status_dicts.annotate(count=models.Count('job_type'), longest_queued=models.Min('queued'),
-                                             highest_priority=models.Min('priority'))
+        status_fields = ['job_type__%s' % f for f in JobType.BASE_FIELDS]
+        status_dicts = QueueStatusCount.objects.filter(count__gt=0)
+        status_dicts = status_dicts.values(*(status_fields + ['count', 'longest_queued', 'highest_priority']))
         status_dicts = status_dicts.order_by('job_type__is_paused', 'highest_priority', 'longest_queued')
 
         # Convert each result to a real job type model with added statistics
@@ -276,6 +461,10 @@ class QueueManager(models.Manager):
         Any jobs that are not in a valid status for being queued, are without job input, or are superseded will be
         ignored.
 
+        The jobs are moved to QUEUED with a single UPDATE and their queue models are created with a single INSERT ...
+        SELECT that copies the job fields in the database. Only the execution configuration, resources, and priority
+        are generated for each job, everything derived from a job type revision is generated once per revision.
+
         :param jobs: The job models to put on the queue
         :type jobs: list
         :param requeue: Whether this is a re-queue (True) or a first queue (False)
@@ -293,8 +482,15 @@ class QueueManager(models.Manager):
         if not queued_job_ids:
             return queued_job_ids  # Done if nothing was queued
 
-        # Retrieve the related job_type, job_type_rev, and batch models for the queued jobs
-        queued_jobs = Job.objects.get_jobs_with_related(queued_job_ids)
+        # Retrieve the queued jobs and then their job types, job type revisions, and batches with one query each, so the
+        # large manifest and definition fields are not joined onto every job row
+        queued_jobs = list(Job.objects.filter(id__in=queued_job_ids))
+        job_types = JobType.objects.in_bulk({job.job_type_id for job in queued_jobs})
+        job_type_revs = JobTypeRevision.objects.in_bulk({job.job_type_rev_id for job in queued_jobs})
+        batch_priorities = self._get_batch_priorities({job.batch_id for job in queued_jobs if job.batch_id})
+        for job in queued_jobs:
+            job.job_type = job_types[job.job_type_id]
+            job.job_type_rev = job_type_revs[job.job_type_rev_id]
 
         # Query for all input files of the queued jobs
         input_files = {}
@@ -305,45 +501,46 @@ class QueueManager(models.Manager):
             for input_file in ScaleFile.objects.get_files_for_queued_jobs(input_file_ids):
                 input_files[input_file.id] = input_file
 
-        # Bulk create queue models
-        queues = []
+        # Generate the queue fields that are the same for every job of a job type revision
+        revision_fields = {}  # {Job type revision ID: (Docker image, Timeout, Interface dict)}
+        for job_type_rev in job_type_revs.values():
+            job_type = job_types[job_type_rev.job_type_id]
+            timeout = None
+            if JobInterfaceSunset.is_seed_dict(job_type.manifest):
+                timeout = job_type_cache.get_job_type_interface(job_type).get_timeout()
+            interface_dict = job_type_cache.get_job_interface(job_type_rev).get_dict()
+            revision_fields[job_type_rev.id] = (job_type_rev.docker_image, timeout, interface_dict)
+
+        # Generate the queue fields that are specific to each job
+        job_fields = []  # [(Job ID, Priority, Configuration dict, Resources dict)]
+        job_type_counts = {}  # {Job type ID: (Count, Highest priority)}
+        resources_dicts = {}  # {(Job type ID, Input file size): Resources dict}
         configurator = QueuedExecutionConfigurator(input_files)
         for job in queued_jobs:
             config = configurator.configure_queued_job(job)
 
-            manifest = None
-            if JobInterfaceSunset.is_seed_dict(job.job_type.manifest):
-                manifest = SeedManifest(job.job_type.manifest)
+            resources_key = (job.job_type_id, job.input_file_size)
+            if resources_key not in resources_dicts:
+                resources_dicts[resources_key] = job.get_resources().get_json().get_dict()
 
             if priority:
                 queued_priority = priority
             elif job.priority:
                 queued_priority = job.priority
-            elif job.batch and self.batch.get_configuration().priority:
-                queued_priority = self.batch.get_configuration().priority
+            elif job.batch_id and batch_priorities.get(job.batch_id):
+                queued_priority = batch_priorities[job.batch_id]
+            else:
+                queued_priority = job_type_cache.get_job_configuration(job.job_type).priority
+
+            job_fields.append((job.id, queued_priority, config.get_dict(), resources_dicts[resources_key]))
+            if job.job_type_id in job_type_counts:
+                count, highest_priority = job_type_counts[job.job_type_id]
+                job_type_counts[job.job_type_id] = (count + 1, min(highest_priority, queued_priority))
             else:
-                queued_priority = job.job_type.get_job_configuration().priority
-
-            queue = Queue()
-            # select_related from get_jobs_with_related above will only make a single query
-            queue.docker_image = job.job_type_rev.docker_image
-            queue.job_type_id = job.job_type_id
-            queue.job_id = job.id
-            queue.recipe_id = job.recipe_id
-            queue.batch_id = job.batch_id
-            queue.exe_num = job.num_exes
-            queue.input_file_size = job.input_file_size if job.input_file_size else 0.0
-            queue.is_canceled = False
-            queue.priority = queued_priority
-            queue.timeout = manifest.get_timeout() if manifest else job.timeout
-            queue.interface = job.get_job_interface().get_dict()
-            queue.configuration = config.get_dict()
-            queue.resources = job.get_resources().get_json().get_dict()
-            queue.queued = when_queued
-            queues.append(queue)
-
-        if queues:
-            self.bulk_create(queues)
+                job_type_counts[job.job_type_id] = (1, queued_priority)
+
+        self._insert_queue_rows(revision_fields, job_fields, when_queued)
+        QueueStatusCount.objects.add_queued(job_type_counts, when_queued)
 
         return queued_job_ids
 
@@ -537,6 +734,62 @@ class QueueManager(models.Manager):
         if jobs_to_pending:
             Job.objects.update_status(jobs_to_pending, 'PENDING', when)
 
+    def _get_batch_priorities(self, batch_ids):
+        """Returns the priorities configured for the batches with the given IDs
+
+        :param batch_ids: The batch IDs
+        :type batch_ids: set
+        :returns: The configured priority (possibly None) stored by batch ID
+        :rtype: dict
+        """
+
+        if not batch_ids:
+            return {}
+
+        from batch.models import Batch
+        batch_priorities = {}
+        for batch in Batch.objects.filter(id__in=batch_ids).only('id', 'configuration').iterator():
+            batch_priorities[batch.id] = batch.get_configuration().priority
+        return batch_priorities
+
+    def _insert_queue_rows(self, revision_fields, job_fields, when_queued):
+        """Creates the queue models for the given queued jobs with a single INSERT ... SELECT. The job fields that are
+        copied onto the queue models are read directly from the job table. Each revision's fields are sent to the
+        database once, no matter how many of its jobs are being queued.
+
+        :param revision_fields: The (Docker image, timeout, interface dict) fields stored by job type revision ID, a
+            None timeout means the job's own timeout is used
+        :type revision_fields: dict
+        :param job_fields: The list of (job ID, priority, configuration dict, resources dict) tuples
+        :type job_fields: list
+        :param when_queued: The time that the jobs were queued
+        :type when_queued: :class:`datetime.datetime`
+        """
+
+        if not job_fields:
+            return
+
+        params = []
+        revision_values = []
+        for job_type_rev_id, (docker_image, timeout, interface_dict) in revision_fields.items():
+            revision_values.append('(%s::integer, %s::text, %s::integer, %s::jsonb)')
+            params.extend([job_type_rev_id, docker_image, timeout, json.dumps(interface_dict)])
+        job_values = []
+        for job_id, priority, configuration_dict, resources_dict in job_fields:
+            job_values.append('(%s::integer, %s::integer, %s::jsonb, %s::jsonb)')
+            params.extend([job_id, priority, json.dumps(configuration_dict), json.dumps(resources_dict)])
+        params.extend([when_queued, when_queued])
+
+        qry = 'WITH r (job_type_rev_id, docker_image, timeout, interface) AS (VALUES %s), ' % ', '.join(revision_values)
+        qry += 'q (job_id, priority, configuration, resources) AS (VALUES %s) ' % ', '.join(job_values)
+        qry += 'INSERT INTO queue (job_type_id, job_id, recipe_id, batch_id, exe_num, input_file_size, is_canceled, '
+        qry += 'priority, timeout, interface, configuration, resources, created, queued, docker_image) '
+        qry += 'SELECT j.job_type_id, j.id, j.recipe_id, j.batch_id, j.num_exes, COALESCE(j.input_file_size, 0.0), '
+        qry += 'false, q.priority, COALESCE(r.timeout, j.timeout), r.interface, q.configuration, q.resources, %s, %s, '
+        qry += 'r.docker_image FROM job j JOIN q ON j.id = q.job_id JOIN r ON j.job_type_rev_id = r.job_type_rev_id'
+        with connection.cursor() as cursor:
+            cursor.execute(qry, params)
+
 
 class Queue(models.Model):
     """Represents a job execution that is queued and ready to be run on a node
@@ -584,7 +837,7 @@ class Queue(models.Model):
 
     input_file_size = models.FloatField()
     is_canceled = models.BooleanField(default=False)
-    priority = models.IntegerField(db_index=True)
+    priority = models.IntegerField()
     timeout = models.IntegerField()
 
     interface = django.contrib.postgres.fields.JSONField(default=dict)
@@ -628,3 +881,153 @@ class Queue(models.Model):
     class Meta(object):
         """meta information for the db"""
         db_table = 'queue'
+        # The ordering indexes let get_queue() walk the queue in either order without sorting it, and the job type
+        # indexes let the queue status counts find the highest priority and longest queued time of a job type without
+        # scanning its queue models. The partial index on canceled models (migration 0019) keeps the scheduler's
+        # per-cycle canceled check small.
+        indexes = [
+            models.Index(fields=['priority', 'queued', 'id'], name='queue_fifo_idx'),
+            models.Index(fields=['priority', '-queued', 'id'], name='queue_lifo_idx'),
+            models.Index(fields=['job_type', 'priority', 'queued'], name='queue_job_type_idx'),
+            models.Index(fields=['job_type', 'queued'], name='queue_job_type_queued_idx'),
+            models.Index(fields=['id', 'is_canceled'], name='queue_id_canceled_idx'),
+        ]
+
+
+class QueueStatusCountManager(models.Manager):
+    """Provides additional methods for maintaining the queue status counts. The counts are updated in the same
+    transactions that add and delete queue models, so reading the queue status never aggregates the queue table itself.
+    Rows are always updated in job type ID order so that concurrent updates cannot deadlock.
+    """
+
+    def add_queued(self, job_type_counts, when_queued):
+        """Adds the given newly queued job executions to the counts
+
+        :param job_type_counts: The (count, highest priority) of the new queue models stored by job type ID
+        :type job_type_counts: dict
+        :param when_queued: When the job executions were queued
+        :type when_queued: :class:`datetime.datetime`
+        """
+
+        if not job_type_counts:
+            return
+
+        params = []
+        values = []
+        for job_type_id in sorted(job_type_counts):
+            count, highest_priority = job_type_counts[job_type_id]
+            values.append('(%s, %s, %s, %s, %s)')
+            params.extend([job_type_id, count, when_queued, highest_priority, timezone.now()])
+
+        qry = 'INSERT INTO queue_status_count (job_type_id, count, longest_queued, highest_priority, last_modified) '
+        qry += 'VALUES %s ' % ', '.join(values)
+        qry += 'ON CONFLICT (job_type_id) DO UPDATE SET count = queue_status_count.count + EXCLUDED.count, '
+        qry += 'longest_queued = LEAST(queue_status_count.longest_queued, EXCLUDED.longest_queued), '
+        qry += 'highest_priority = LEAST(queue_status_count.highest_priority, EXCLUDED.highest_priority), '
+        qry += 'last_modified = EXCLUDED.last_modified'
+        with connection.cursor() as cursor:
+            cursor.execute(qry, params)
+
+    def reconcile(self):
+        """Recalculates the counts from the queue table, correcting any drift, and returns the number of job types whose
+        counts were corrected. The counts table is locked against updates while it is recalculated.
+
+        :returns: The number of job types whose counts were corrected
+        :rtype: int
+        """
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('LOCK TABLE queue_status_count IN EXCLUSIVE MODE')
+
+            actual_counts = {}
+            qry = Queue.objects.values('job_type_id').annotate(count=models.Count('id'),
+                                                                longest_queued=models.Min('queued'),
+                                                                highest_priority=models.Min('priority'))
+            for count_dict in qry:
+                actual_counts[count_dict['job_type_id']] = count_dict
+
+            num_corrected = 0
+            when = timezone.now()
+            for status_count in self.all().order_by('job_type_id'):
+                count_dict = actual_counts.pop(status_count.job_type_id, None)
+                if not count_dict:
+                    status_count.delete()
+                    num_corrected += 1
+                elif (status_count.count, status_count.longest_queued, status_count.highest_priority) != (
+                        count_dict['count'], count_dict['longest_queued'], count_dict['highest_priority']):
+                    self.filter(id=status_count.id).update(count=count_dict['count'],
+                                                           longest_queued=count_dict['longest_queued'],
+                                                           highest_priority=count_dict['highest_priority'],
+                                                           last_modified=when)
+                    num_corrected += 1
+
+            # Job types that are queued but missing from the counts
+            for job_type_id in sorted(actual_counts):
+                count_dict = actual_counts[job_type_id]
+                self.create(job_type_id=job_type_id, count=count_dict['count'],
+                            longest_queued=count_dict['longest_queued'],
+                            highest_priority=count_dict['highest_priority'])
+                num_corrected += 1
+
+        if num_corrected:
+            logger.warning('Corrected the queue status counts of %d job type(s)', num_corrected)
+        return num_corrected
+
+    def remove_queued(self, job_type_counts):
+        """Removes the given deleted queue models from the counts. The longest queued time and highest priority of each
+        job type are looked up again from the queue table's job type indexes.
+
+        :param job_type_counts: The number of deleted queue models stored by job type ID
+        :type job_type_counts: dict
+        """
+
+        if not job_type_counts:
+            return
+
+        params = []
+        values = []
+        for job_type_id in sorted(job_type_counts):
+            values.append('(%s, %s)')
+            params.extend([job_type_id, job_type_counts[job_type_id]])
+        params.append(timezone.now())
+
+        qry = 'UPDATE queue_status_count c SET count = GREATEST(c.count - d.count, 0), '
+        qry += 'longest_queued = (SELECT MIN(q.queued) FROM queue q WHERE q.job_type_id = c.job_type_id), '
+        qry += 'highest_priority = (SELECT MIN(q.priority) FROM queue q WHERE q.job_type_id = c.job_type_id), '
+        qry += 'last_modified = %%s FROM (VALUES %s) d (job_type_id, count) ' % ', '.join(values)
+        qry += 'WHERE c.job_type_id = d.job_type_id'
+        with connection.cursor() as cursor:
+            # Lock the rows in job type ID order before updating them
+            cursor.execute('SELECT id FROM queue_status_count WHERE job_type_id IN %s ORDER BY job_type_id FOR UPDATE',
+                           [tuple(job_type_counts.keys())])
+            cursor.execute(qry, params)
+            cursor.execute('DELETE FROM queue_status_count WHERE count = 0 OR longest_queued IS NULL')
+
+
+class QueueStatusCount(models.Model):
+    """Represents the incrementally maintained queue status counts for a job type
+
+    :keyword job_type: The job type being counted
+    :type job_type: :class:`django.db.models.OneToOneField`
+    :keyword count: The number of queued job executions for the job type
+    :type count: :class:`django.db.models.IntegerField`
+    :keyword longest_queued: When the oldest queued job execution for the job type was queued
+    :type longest_queued: :class:`django.db.models.DateTimeField`
+    :keyword highest_priority: The priority of the most important queued job execution for the job type
+    :type highest_priority: :class:`django.db.models.IntegerField`
+    :keyword last_modified: When the counts were last modified
+    :type last_modified: :class:`django.db.models.DateTimeField`
+    """
+
+    job_type = models.OneToOneField('job.JobType', on_delete=models.PROTECT)
+    count = models.IntegerField()
+    longest_queued = models.DateTimeField(blank=True, null=True)
+    highest_priority = models.IntegerField(blank=True, null=True)
+    last_modified = models.DateTimeField(auto_now=True)
+
+    objects = QueueStatusCountManager()
+
+    class Meta(object):
+        """meta information for the db"""
+        db_table = 'queue_status_count'
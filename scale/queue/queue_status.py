@@ -0,0 +1,14 @@
+"""Defines the clock event processor for reconciling the queue status counts."""
+from job.clock import ClockEventProcessor
+from queue.models import QueueStatusCount
+
+
+class QueueStatusProcessor(ClockEventProcessor):
+    """This class corrects any drift between the queue status counts and the queue."""
+
+    def process_event(self, event, last_event=None):
+        """See :meth:`job.clock.ClockEventProcessor.process_event`.
+
+        Recalculates the queue status counts from the queue.
+        """
+        QueueStatusCount.objects.reconcile()
@@ -0,0 +1,57 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+
+from queue.benchmark import QueueQueryBenchmark, summarize_plan
+from queue.models import Queue, QueueStatusCount
+
+
+class TestQueueQueryBenchmark(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_run(self):
+        """Tests running a small benchmark"""
+
+        results = QueueQueryBenchmark(num_rows=500, num_job_types=3).run()
+
+        self.assertSetEqual(set(results.keys()), {'queue_fifo', 'queue_lifo', 'queue_status', 'canceled_ids',
+                                                  'new_queue_models', 'all_ids'})
+        for summary in results.values():
+            self.assertIsNotNone(summary['execution_ms'])
+            self.assertGreater(len(summary['node_types']), 0)
+
+        # The benchmark leaves no queue models or queue status counts behind
+        self.assertEqual(Queue.objects.count(), 0)
+        self.assertEqual(QueueStatusCount.objects.count(), 0)
+
+
+class TestSummarizePlan(TestCase):
+
+    def test_index_only(self):
+        """Tests summarizing a plan that reads only an index"""
+
+        scan = {'Node Type': 'Index Only Scan', 'Index Name': 'queue_fifo_idx', 'Heap Fetches': 3}
+        explain = {'Plan': {'Node Type': 'Limit', 'Plans': [scan]}, 'Execution Time': 0.5}
+
+        summary = summarize_plan(explain)
+        self.assertListEqual(summary['node_types'], ['Index Only Scan', 'Limit'])
+        self.assertListEqual(summary['indexes'], ['queue_fifo_idx'])
+        self.assertTrue(summary['index_only'])
+        self.assertFalse(summary['sort'])
+        self.assertFalse(summary['seq_scan'])
+        self.assertEqual(summary['heap_fetches'], 3)
+        self.assertEqual(summary['execution_ms'], 0.5)
+
+    def test_sort(self):
+        """Tests summarizing a plan that sorts the whole table"""
+
+        explain = {'Plan': {'Node Type': 'Sort', 'Plans': [{'Node Type': 'Seq Scan'}]}, 'Execution Time': 100.0}
+
+        summary = summarize_plan(explain)
+        self.assertTrue(summary['sort'])
+        self.assertTrue(summary['seq_scan'])
+        self.assertFalse(summary['index_only'])
@@ -2,6 +2,7 @@ from __future__ import unicode_literals
 
 import django
 from django.test import TestCase
+from django.utils.timezone import now
 
 import job.test.utils as job_test_utils
 from queue.models import JobLoad
@@ -24,3 +25,14 @@ class TestJobLoadProcessor(TestCase):
 
         job_loads = JobLoad.objects.values()
         self.assertEqual(job_loads.count(), 1)
+
+    def test_process_event_scheduler_recording(self):
+        """Tests that the Job Load Processor does not take a snapshot when the scheduler is recording samples"""
+        JobLoad.objects.record({}, now())
+
+        event = job_test_utils.create_clock_event()
+        self.processor.process_event(event)
+
+        job_loads = JobLoad.objects.values()
+        self.assertEqual(job_loads.count(), 1)
+        self.assertIsNone(job_loads[0]['job_type_id'])
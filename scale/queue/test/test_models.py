@@ -4,9 +4,10 @@ import datetime
 import time
 
 import django
-from django.utils.timezone import now
+from django.utils.timezone import now, utc
 from django.test import TestCase, TransactionTestCase
 
+import batch.test.utils as batch_test_utils
 import job.test.utils as job_test_utils
 import product.test.utils as product_test_utils
 import queue.test.utils as queue_test_utils
@@ -14,11 +15,12 @@ import recipe.test.utils as recipe_test_utils
 import storage.test.utils as storage_test_utils
 import source.test.utils as source_test_utils
 import trigger.test.utils as trigger_test_utils
+from batch.configuration.configuration import BatchConfiguration
 from error.models import reset_error_cache
 from job.configuration.data.job_data import JobData
 from job.configuration.results.job_results import JobResults
 from job.models import Job
-from queue.models import JobLoad, Queue, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
+from queue.models import JobLoad, Queue, QueueStatusCount, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
 from recipe.configuration.data.recipe_data import LegacyRecipeData
 from recipe.configuration.definition.recipe_definition import LegacyRecipeDefinition as RecipeDefinition
 from recipe.handlers.graph_delta import RecipeGraphDelta
@@ -99,6 +101,76 @@ class TestJobLoadManager(TestCase):
             else:
                 self.fail('Found unexpected job type: %i' % result.job_type_id)
 
+    def test_record(self):
+        """Tests recording a job load sample from the running counts, the queue status counts, and the pending jobs."""
+
+        job_type1 = job_test_utils.create_job_type()
+        job_test_utils.create_job(job_type=job_type1, status='PENDING')
+        job_test_utils.create_job(job_type=job_type1, status='BLOCKED')
+        job_type2 = job_test_utils.create_job_type()
+        queue_test_utils.create_queue(job_type=job_type2)
+        queue_test_utils.create_queue(job_type=job_type2)
+        when = now()
+
+        JobLoad.objects.record({job_type2.id: 3}, when)
+
+        results = {job_load.job_type_id: job_load for job_load in JobLoad.objects.all()}
+        self.assertSetEqual(set(results.keys()), {job_type1.id, job_type2.id})
+        self.assertEqual(results[job_type1.id].pending_count, 1)
+        self.assertEqual(results[job_type1.id].total_count, 1)
+        self.assertEqual(results[job_type2.id].queued_count, 2)
+        self.assertEqual(results[job_type2.id].running_count, 3)
+        self.assertEqual(results[job_type2.id].total_count, 5)
+        self.assertEqual(results[job_type2.id].measured, when)
+        self.assertEqual(results[job_type2.id].period, 'MINUTE')
+
+    def test_roll_up(self):
+        """Tests rolling minute samples up into hourly averages and deleting expired samples."""
+
+        job_type1 = job_test_utils.create_job_type()
+        job_type2 = job_test_utils.create_job_type()
+        when = datetime.datetime(2018, 10, 1, 12, 30, tzinfo=utc)
+        hour = datetime.datetime(2018, 10, 1, 11, tzinfo=utc)
+        JobLoad.objects.record({job_type1.id: 4, job_type2.id: 1}, hour)
+        JobLoad.objects.record({job_type1.id: 2}, hour + datetime.timedelta(minutes=1))
+        JobLoad.objects.record({job_type1.id: 5}, when)  # Current hour is not rolled up yet
+        JobLoad.objects.record({job_type1.id: 1}, when - datetime.timedelta(days=3))  # Expired
+
+        JobLoad.objects.roll_up(when)
+        JobLoad.objects.roll_up(when)  # Rolling up again does not duplicate the averages
+
+        hourly = {job_load.job_type_id: job_load for job_load in JobLoad.objects.filter(period='HOUR',
+                                                                                        measured=hour)}
+        self.assertEqual(len(hourly), 2)
+        self.assertEqual(hourly[job_type1.id].running_count, 3)
+        self.assertEqual(hourly[job_type2.id].running_count, 1)  # Rounded from 0.5
+        self.assertEqual(JobLoad.objects.filter(period='MINUTE').count(), 3)
+
+        # The hourly averages replace the minute samples they were rolled up from, newer samples are included
+        job_loads = JobLoad.objects.get_job_loads(started=hour, period='HOUR')
+        results = JobLoad.objects.group_by_time(job_loads)
+        self.assertListEqual([result.time for result in results], [hour, when])
+        self.assertEqual(results[0].running_count, 4)
+        self.assertEqual(results[1].running_count, 5)
+
+    def test_group_by_time(self):
+        """Tests grouping job loads by time."""
+
+        job_type1 = job_test_utils.create_job_type()
+        job_type2 = job_test_utils.create_job_type()
+        when1 = now() - datetime.timedelta(minutes=1)
+        when2 = now()
+        JobLoad.objects.record({job_type1.id: 1, job_type2.id: 2}, when1)
+        JobLoad.objects.record({job_type1.id: 3}, when2)
+
+        results = JobLoad.objects.group_by_time(JobLoad.objects.all())
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].time, when1)
+        self.assertEqual(results[0].running_count, 3)
+        self.assertEqual(results[1].time, when2)
+        self.assertEqual(results[1].running_count, 3)
+
 
 class TestQueueManager(TransactionTestCase):
 
@@ -143,6 +215,59 @@ class TestQueueManager(TransactionTestCase):
             else:
                 self.assertEqual(queue.id, queue_1.id)
 
+    def test_get_queue_status(self):
+        """Tests calling QueueManager.get_queue_status() with queue models added and deleted"""
+
+        time_1 = now()
+        time_2 = time_1 + datetime.timedelta(seconds=1)
+        job_type = job_test_utils.create_job_type()
+        queue_1 = queue_test_utils.create_queue(job_type=job_type, priority=50, queued=time_1)
+        queue_test_utils.create_queue(job_type=job_type, priority=100, queued=time_2)
+        queue_3 = queue_test_utils.create_queue(priority=200, queued=time_2)
+
+        statuses = Queue.objects.get_queue_status()
+        self.assertEqual(len(statuses), 2)
+        self.assertEqual(statuses[0].job_type.id, job_type.id)
+        self.assertEqual(statuses[0].count, 2)
+        self.assertEqual(statuses[0].longest_queued, time_1)
+        self.assertEqual(statuses[0].highest_priority, 50)
+
+        # Deleting queue models updates the highest priority and longest queued time and removes empty job types
+        Queue.objects.delete_queue_models([queue_1.id, queue_3.id])
+        statuses = Queue.objects.get_queue_status()
+        self.assertEqual(len(statuses), 1)
+        self.assertEqual(statuses[0].count, 1)
+        self.assertEqual(statuses[0].longest_queued, time_2)
+        self.assertEqual(statuses[0].highest_priority, 100)
+
+
+class TestQueueStatusCountManager(TransactionTestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_reconcile(self):
+        """Tests calling QueueStatusCountManager.reconcile() to correct counts that have drifted"""
+
+        queue_1 = queue_test_utils.create_queue(priority=50)
+        queue_2 = queue_test_utils.create_queue(priority=100)
+        queue_3 = queue_test_utils.create_queue(priority=200)
+
+        # Drift: a queue model deleted behind the counts' back, a count that is wrong, and a missing count
+        Queue.objects.filter(id=queue_1.id).delete()
+        QueueStatusCount.objects.filter(job_type_id=queue_2.job_type_id).update(count=10)
+        QueueStatusCount.objects.filter(job_type_id=queue_3.job_type_id).delete()
+
+        self.assertEqual(QueueStatusCount.objects.reconcile(), 3)
+        counts = {count.job_type_id: count for count in QueueStatusCount.objects.all()}
+        self.assertEqual(len(counts), 2)
+        self.assertEqual(counts[queue_2.job_type_id].count, 1)
+        self.assertEqual(counts[queue_3.job_type_id].count, 1)
+        self.assertEqual(counts[queue_3.job_type_id].highest_priority, 200)
+
+        # Nothing left to correct
+        self.assertEqual(QueueStatusCount.objects.reconcile(), 0)
+
 
 class TestQueueManagerHandleJobCancellation(TransactionTestCase):
 
@@ -254,6 +379,60 @@ class TestQueueManagerHandleJobCancellation(TransactionTestCase):
         self.assertEqual(final_job.status, 'CANCELED')
 
 
+class TestQueueManagerQueueJobs(TransactionTestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_successful(self):
+        """Tests calling QueueManager.queue_jobs() successfully with jobs of different job types"""
+
+        job_type_1 = job_test_utils.create_seed_job_type()
+        job_type_2 = job_test_utils.create_seed_job_type()
+        job_1 = job_test_utils.create_job(job_type=job_type_1, status='FAILED', input_file_size=20.0)
+        job_2 = job_test_utils.create_job(job_type=job_type_1, status='FAILED', priority=None)
+        job_3 = job_test_utils.create_job(job_type=job_type_2, status='FAILED', priority=None)
+        job_4 = job_test_utils.create_job(job_type=job_type_2, status='COMPLETED')
+
+        job_ids = Queue.objects.queue_jobs([job_1, job_2, job_3, job_4], requeue=True)
+
+        self.assertListEqual(job_ids, [job_1.id, job_2.id, job_3.id])
+        queues = {queue.job_id: queue for queue in Queue.objects.filter(job_id__in=job_ids)}
+        self.assertEqual(len(queues), 3)
+        job_1 = Job.objects.get(id=job_1.id)
+        self.assertEqual(job_1.status, 'QUEUED')
+        self.assertEqual(queues[job_1.id].exe_num, 2)
+        self.assertEqual(queues[job_1.id].job_type_id, job_type_1.id)
+        self.assertEqual(queues[job_1.id].input_file_size, 20.0)
+        self.assertEqual(queues[job_1.id].queued, job_1.queued)
+        self.assertEqual(queues[job_1.id].priority, 100)
+        self.assertEqual(queues[job_1.id].timeout, job_type_1.get_job_interface().get_timeout())
+        self.assertEqual(queues[job_1.id].docker_image, job_1.job_type_rev.docker_image)
+        self.assertDictEqual(queues[job_1.id].interface, job_1.get_job_interface().get_dict())
+        self.assertEqual(queues[job_2.id].priority, job_type_1.get_job_configuration().priority)
+        self.assertEqual(queues[job_3.id].job_type_id, job_type_2.id)
+        self.assertDictEqual(queues[job_3.id].resources, job_3.get_resources().get_json().get_dict())
+
+    def test_successful_batch_priority(self):
+        """Tests calling QueueManager.queue_jobs() with a job that gets its priority from its batch"""
+
+        configuration = BatchConfiguration()
+        configuration.priority = 999
+        batch = batch_test_utils.create_batch(configuration=configuration)
+        job = job_test_utils.create_job(status='FAILED', priority=None)
+        job.batch = batch
+        job.save()
+
+        Queue.objects.queue_jobs([job], requeue=True, priority=None)
+        self.assertEqual(Queue.objects.get(job_id=job.id).priority, 999)
+
+        # An explicit priority overrides the batch priority
+        Queue.objects.filter(job_id=job.id).delete()
+        job = Job.objects.get(id=job.id)
+        Queue.objects.queue_jobs([job], requeue=True, priority=50)
+        self.assertEqual(Queue.objects.get(job_id=job.id).priority, 50)
+
+
 class TestQueueManagerQueueNewJob(TransactionTestCase):
 
     def setUp(self):
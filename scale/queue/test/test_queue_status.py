@@ -0,0 +1,29 @@
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+
+import job.test.utils as job_test_utils
+import queue.test.utils as queue_test_utils
+from queue.models import QueueStatusCount
+from queue.queue_status import QueueStatusProcessor
+
+
+class TestQueueStatusProcessor(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.processor = QueueStatusProcessor()
+
+        self.queue = queue_test_utils.create_queue()
+        QueueStatusCount.objects.all().delete()
+
+    def test_process_event(self):
+        """This method tests the Queue Status Processor"""
+        event = job_test_utils.create_clock_event()
+        self.processor.process_event(event)
+
+        status_count = QueueStatusCount.objects.get()
+        self.assertEqual(status_count.job_type_id, self.queue.job_type_id)
+        self.assertEqual(status_count.count, 1)
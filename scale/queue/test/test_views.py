@@ -93,9 +93,9 @@ class TestJobLoadView(TransactionTestCase):
         self.assertEqual(result['results'][0]['pending_count'], 1)
 
     def test_max_duration(self):
-        """Tests calling the job load view with time values that define a range greater than 31 days"""
+        """Tests calling the job load view with time values that define a range greater than 366 days"""
 
-        url = rest_util.get_url('/load/?started=2015-01-01T00:00:00Z&ended=2015-02-02T00:00:00Z')
+        url = rest_util.get_url('/load/?started=2015-01-01T00:00:00Z&ended=2016-01-03T00:00:00Z')
         response = self.client.generic('GET', url)
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.content)
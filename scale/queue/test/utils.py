@@ -3,7 +3,7 @@ import django.utils.timezone as timezone
 
 import job.test.utils as job_test_utils
 from job.execution.configuration.json.exe_config import ExecutionConfiguration
-from queue.models import JobLoad, Queue
+from queue.models import JobLoad, Queue, QueueStatusCount
 from node.resources.node_resources import NodeResources
 from node.resources.resource import Cpus, Disk, Mem, Gpus
 
@@ -55,8 +55,10 @@ def create_queue(job_type=None, priority=1, timeout=3600, cpus_required=1.0, mem
     job = job_test_utils.create_job(job_type=job_type, status='QUEUED')
     resources = NodeResources([Cpus(cpus_required), Mem(mem_required), Disk(disk_total_required), Gpus(gpus_required)])
 
-    return Queue.objects.create(job_type=job.job_type, job=job, exe_num=job.num_exes, priority=priority,
-                                timeout=timeout, input_file_size=disk_in_required,
-                                interface=job.get_job_interface().get_dict(),
-                                configuration=ExecutionConfiguration().get_dict(),
-                                resources=resources.get_json().get_dict(), queued=queued)
+    queue = Queue.objects.create(job_type=job.job_type, job=job, exe_num=job.num_exes, priority=priority,
+                                 timeout=timeout, input_file_size=disk_in_required,
+                                 interface=job.get_job_interface().get_dict(),
+                                 configuration=ExecutionConfiguration().get_dict(),
+                                 resources=resources.get_json().get_dict(), queued=queued)
+    QueueStatusCount.objects.add_queued({job.job_type_id: (1, priority)}, queued)
+    return queue
@@ -40,7 +40,7 @@ class JobLoadView(ListAPIView):
         """
         started = rest_util.parse_timestamp(request, 'started', default_value=rest_util.get_relative_days(7))
         ended = rest_util.parse_timestamp(request, 'ended', required=False)
-        rest_util.check_time_range(started, ended, max_duration=datetime.timedelta(days=31))
+        rest_util.check_time_range(started, ended, max_duration=datetime.timedelta(days=366))
 
         job_type_ids = rest_util.parse_int_list(request, 'job_type_id', required=False)
         job_type_names = rest_util.parse_string_list(request, 'job_type_name', required=False)
@@ -31,3 +31,15 @@ class RecipeConfig(AppConfig):
         add_message_type(SupersedeRecipeNodes)
         add_message_type(UpdateRecipeMetrics)
         add_message_type(UpdateRecipes)
+
+        # Invalidate cached recipe type responses when recipe types change
+        from recipe.models import RecipeType, RecipeTypeRevision
+        from util.rest_cache import invalidate_on_change
+
+        invalidate_on_change(RecipeType, 'recipe_types')
+        invalidate_on_change(RecipeTypeRevision, 'recipe_types')
+
+        # Remove cached compiled definitions when recipe type revisions change
+        from recipe.definition.compiled import clear_on_change
+
+        clear_on_change(RecipeTypeRevision)
@@ -0,0 +1,137 @@
+"""Defines the class and process-wide cache for the compiled definitions of recipe type revisions"""
+from __future__ import unicode_literals
+
+import threading
+from collections import OrderedDict
+
+from django.db.models.signals import post_delete, post_save
+
+from recipe.definition.json.definition_v6 import RecipeDefinitionV6
+from recipe.deprecation import RecipeDefinitionSunset
+
+# The most compiled definitions kept in the cache, the least recently used are evicted first
+MAX_COMPILED_DEFINITIONS = 1000
+
+_COMPILED_DEFINITIONS = OrderedDict()  # {(Revision ID, Revision number): CompiledRecipeDefinition}
+_COMPILED_DEFINITIONS_LOCK = threading.Lock()
+
+
+class CompiledRecipeDefinition(object):
+    """Represents the parsed definition of a recipe type revision. The definition JSON is only parsed, and the
+    topological order of its nodes only calculated, the first time each form of the definition is requested. The
+    returned objects are shared by every caller and must not be modified.
+    """
+
+    def __init__(self, definition_dict):
+        """Constructor
+
+        :param definition_dict: The JSON definition of the recipe type revision
+        :type definition_dict: dict
+        """
+
+        self._definition_dict = definition_dict
+        self._definition = None
+        self._legacy_definition = None
+        self._legacy_graph = None
+        self._lock = threading.Lock()
+
+    def get_definition(self):
+        """Returns the recipe definition, with its topological order already calculated
+
+        :returns: The recipe definition
+        :rtype: :class:`recipe.definition.definition.RecipeDefinition`
+        """
+
+        if self._definition is None:
+            with self._lock:
+                if self._definition is None:
+                    definition = RecipeDefinitionV6(definition=self._definition_dict, do_validate=False).get_definition()
+                    definition.get_topological_order()
+                    self._definition = definition
+        return self._definition
+
+    def get_legacy_definition(self):
+        """Returns the legacy recipe definition
+
+        :returns: The legacy recipe definition
+        :rtype: :class:`recipe.configuration.definition.recipe_definition.LegacyRecipeDefinition` or
+            :class:`recipe.seed.recipe_definition.RecipeDefinition`
+        """
+
+        if self._legacy_definition is None:
+            with self._lock:
+                if self._legacy_definition is None:
+                    self._legacy_definition = RecipeDefinitionSunset.create(self._definition_dict)
+        return self._legacy_definition
+
+    def get_legacy_graph(self):
+        """Returns the graph of the legacy recipe definition, with its topological order already calculated
+
+        :returns: The recipe graph
+        :rtype: :class:`recipe.handlers.graph.RecipeGraph`
+        """
+
+        if self._legacy_graph is None:
+            legacy_definition = self.get_legacy_definition()
+            with self._lock:
+                if self._legacy_graph is None:
+                    graph = legacy_definition.get_graph()
+                    graph.get_topological_order()
+                    self._legacy_graph = graph
+        return self._legacy_graph
+
+
+def clear_compiled_definitions(revision_id=None):
+    """Removes the compiled definition of the given recipe type revision from the cache, or every compiled definition if
+    no revision is given
+
+    :param revision_id: The ID of the recipe type revision
+    :type revision_id: int
+    """
+
+    with _COMPILED_DEFINITIONS_LOCK:
+        if revision_id is None:
+            _COMPILED_DEFINITIONS.clear()
+            return
+        for key in [key for key in _COMPILED_DEFINITIONS if key[0] == revision_id]:
+            del _COMPILED_DEFINITIONS[key]
+
+
+def clear_on_change(model):
+    """Registers the given recipe type revision model so that saving or deleting one of its instances removes the
+    instance's compiled definition from the cache of this process. Revisions are never changed once they are created, so
+    this only matters to code that replaces a revision, such as unit tests.
+
+    :param model: The recipe type revision model class
+    :type model: :class:`django.db.models.Model`
+    """
+
+    def receiver(sender, instance, **kwargs):
+        clear_compiled_definitions(instance.id)
+
+    dispatch_uid = 'compiled_definition_%s' % model._meta.label
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=dispatch_uid)
+
+
+def get_compiled_definition(recipe_type_rev):
+    """Returns the compiled definition of the given recipe type revision, compiling and caching it if needed
+
+    :param recipe_type_rev: The recipe type revision
+    :type recipe_type_rev: :class:`recipe.models.RecipeTypeRevision`
+    :returns: The compiled definition
+    :rtype: :class:`recipe.definition.compiled.CompiledRecipeDefinition`
+    """
+
+    if recipe_type_rev.id is None:
+        return CompiledRecipeDefinition(recipe_type_rev.definition)
+
+    key = (recipe_type_rev.id, recipe_type_rev.revision_num)
+    with _COMPILED_DEFINITIONS_LOCK:
+        compiled = _COMPILED_DEFINITIONS.pop(key, None)
+        if compiled is None:
+            compiled = CompiledRecipeDefinition(recipe_type_rev.definition)
+        _COMPILED_DEFINITIONS[key] = compiled
+        while len(_COMPILED_DEFINITIONS) > MAX_COMPILED_DEFINITIONS:
+            _COMPILED_DEFINITIONS.popitem(last=False)
+    return compiled
@@ -0,0 +1,107 @@
+"""Defines the process-wide cache of the diffs between recipe type revisions, backed by the diffs saved in the
+database"""
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from recipe.definition.compiled import get_compiled_definition
+from recipe.diff.diff import RecipeDiff
+from recipe.diff.json.diff_v6 import convert_recipe_diff_to_v6_json, RecipeDiffV6
+from recipe.models import RecipeTypeRevisionDiff
+
+# The most diffs kept in the cache, the least recently used are evicted first
+MAX_RECIPE_DIFFS = 1000
+
+_RECIPE_DIFFS = OrderedDict()  # {Key: (Previous compiled definition, Compiled definition, RecipeDiff)}
+_RECIPE_DIFFS_LOCK = threading.Lock()
+
+
+def clear_recipe_diffs():
+    """Removes every diff from the cache
+    """
+
+    with _RECIPE_DIFFS_LOCK:
+        _RECIPE_DIFFS.clear()
+
+
+def get_recipe_diff(prev_revision, revision, forced_nodes=None):
+    """Returns the diff from the given previous recipe type revision to the given revision with the given nodes
+    forced to reprocess. A diff only depends upon the two revisions and the forced nodes, so it is calculated once,
+    saved in the database for the other processes, and shared by every recipe being reprocessed from the previous
+    revision to the new one. The returned diff must not be modified.
+
+    :param prev_revision: The previous recipe type revision
+    :type prev_revision: :class:`recipe.models.RecipeTypeRevision`
+    :param revision: The new recipe type revision
+    :type revision: :class:`recipe.models.RecipeTypeRevision`
+    :param forced_nodes: The nodes forced to reprocess, possibly None
+    :type forced_nodes: :class:`recipe.diff.forced_nodes.ForcedNodes`
+    :returns: The recipe diff
+    :rtype: :class:`recipe.diff.diff.RecipeDiff`
+    """
+
+    prev_compiled = get_compiled_definition(prev_revision)
+    compiled = get_compiled_definition(revision)
+    if prev_revision.id is None or revision.id is None:
+        return _create_recipe_diff(prev_compiled, compiled, forced_nodes)
+
+    forced_key = forced_nodes.get_key() if forced_nodes else None
+    key = (prev_revision.id, prev_revision.revision_num, revision.id, revision.revision_num, forced_key)
+    with _RECIPE_DIFFS_LOCK:
+        cached = _RECIPE_DIFFS.pop(key, None)
+        # Only use the cached diff if the compiled definitions it was calculated from have not since been replaced
+        if cached and cached[0] is prev_compiled and cached[1] is compiled:
+            _RECIPE_DIFFS[key] = cached
+            return cached[2]
+
+    forced_nodes_fingerprint = _get_forced_nodes_fingerprint(forced_key)
+    diff_json = RecipeTypeRevisionDiff.objects.get_diff_json(prev_revision.id, revision.id, forced_nodes_fingerprint)
+    if diff_json is not None:
+        diff = RecipeDiffV6(diff=diff_json, do_validate=False).get_diff(forced_nodes)
+    else:
+        diff = _create_recipe_diff(prev_compiled, compiled, forced_nodes)
+        diff_json = convert_recipe_diff_to_v6_json(diff).get_dict()
+        RecipeTypeRevisionDiff.objects.save_diff_json(prev_revision.id, revision.id, forced_nodes_fingerprint,
+                                                      diff_json)
+
+    with _RECIPE_DIFFS_LOCK:
+        _RECIPE_DIFFS[key] = (prev_compiled, compiled, diff)
+        while len(_RECIPE_DIFFS) > MAX_RECIPE_DIFFS:
+            _RECIPE_DIFFS.popitem(last=False)
+    return diff
+
+
+def _get_forced_nodes_fingerprint(forced_key):
+    """Returns the fingerprint that the saved diffs use for the given forced nodes key
+
+    :param forced_key: The key of the forced nodes, possibly None
+    :type forced_key: tuple
+    :returns: The fingerprint, blank if there are no forced nodes
+    :rtype: string
+    """
+
+    if forced_key is None:
+        return ''
+    return hashlib.sha1(json.dumps(forced_key)).hexdigest()
+
+
+def _create_recipe_diff(prev_compiled, compiled, forced_nodes):
+    """Calculates the diff between the given compiled definitions with the given nodes forced to reprocess
+
+    :param prev_compiled: The previous compiled definition
+    :type prev_compiled: :class:`recipe.definition.compiled.CompiledRecipeDefinition`
+    :param compiled: The new compiled definition
+    :type compiled: :class:`recipe.definition.compiled.CompiledRecipeDefinition`
+    :param forced_nodes: The nodes forced to reprocess, possibly None
+    :type forced_nodes: :class:`recipe.diff.forced_nodes.ForcedNodes`
+    :returns: The recipe diff
+    :rtype: :class:`recipe.diff.diff.RecipeDiff`
+    """
+
+    diff = RecipeDiff(prev_compiled.get_definition(), compiled.get_definition())
+    if forced_nodes:
+        diff.set_force_reprocess(forced_nodes)
+    return diff
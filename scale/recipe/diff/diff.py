@@ -14,8 +14,9 @@ class RecipeDiff(object):
     """Represents the diff (difference) betweeen two different recipe definitions
     """
 
-    def __init__(self, prev_recipe_definition, recipe_definition):
-        """Constructor
+    def __init__(self, prev_recipe_definition=None, recipe_definition=None):
+        """Constructor. If the recipe definitions are not provided, the diff is left empty so that it can be populated
+        from its JSON.
 
         :param prev_recipe_definition: The previous recipe definition
         :type prev_recipe_definition: :class:`recipe.definition.definition.RecipeDefinition`
@@ -27,8 +28,9 @@ class RecipeDiff(object):
         self.reasons = []
         self.graph = {}  # {Name: NodeDiff}
 
-        self._compare_input_interfaces(prev_recipe_definition, recipe_definition)
-        self._create_diff_graph(prev_recipe_definition, recipe_definition)
+        if prev_recipe_definition is not None and recipe_definition is not None:
+            self._compare_input_interfaces(prev_recipe_definition, recipe_definition)
+            self._create_diff_graph(prev_recipe_definition, recipe_definition)
 
     def get_nodes_to_copy(self):
         """Returns a dict of node diffs for the nodes that should be copied during a reprocess
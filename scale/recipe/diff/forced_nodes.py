@@ -56,6 +56,19 @@ class ForcedNodes(object):
 
         return forced_nodes
 
+    def get_key(self):
+        """Returns a hashable key that is equal for every forced nodes object that forces the same nodes to reprocess
+
+        :returns: The key
+        :rtype: tuple
+        """
+
+        if self.all_nodes:
+            return (True,)
+
+        subrecipe_keys = tuple(sorted((name, nodes.get_key()) for name, nodes in self._subrecipe_nodes.items()))
+        return (False, tuple(sorted(self._nodes)), subrecipe_keys)
+
     def get_forced_node_names(self):
         """Returns the forced node names
 
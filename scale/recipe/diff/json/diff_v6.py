@@ -4,7 +4,10 @@ from __future__ import unicode_literals
 from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
+from recipe.definition.node import JobNodeDefinition, RecipeNodeDefinition
+from recipe.diff.diff import Reason, RecipeDiff
 from recipe.diff.exceptions import InvalidDiff
+from recipe.diff.node import Change, create_diff_for_node
 
 
 SCHEMA_VERSION = '6'
@@ -344,6 +347,68 @@ class RecipeDiffV6(object):
 
         return self._diff
 
+    def get_diff(self, forced_nodes=None):
+        """Returns the recipe diff represented by this JSON. The nodes are not compared again, their diffs are populated
+        from the JSON.
+
+        :param forced_nodes: The nodes that were forced to reprocess when the diff was created, possibly None
+        :type forced_nodes: :class:`recipe.diff.forced_nodes.ForcedNodes`
+        :returns: The recipe diff
+        :rtype: :class:`recipe.diff.diff.RecipeDiff`
+        """
+
+        diff = RecipeDiff()
+        diff.can_be_reprocessed = self._diff['can_be_reprocessed']
+        diff.reasons = [Reason(r['name'], r['description']) for r in self._diff['reasons']]
+
+        for node_name, node_dict in self._diff['nodes'].items():
+            diff.graph[node_name] = self._get_node_diff(node_name, node_dict, diff.can_be_reprocessed, forced_nodes)
+        for node_name, node_dict in self._diff['nodes'].items():
+            for dependency_dict in node_dict['dependencies']:
+                diff.graph[node_name].add_dependency(diff.graph[dependency_dict['name']])
+
+        return diff
+
+    def _get_node_diff(self, node_name, node_dict, diff_can_be_reprocessed, forced_nodes):
+        """Returns the node diff for the given node JSON dict, without its dependencies
+
+        :param node_name: The name of the node
+        :type node_name: string
+        :param node_dict: The node JSON dict
+        :type node_dict: dict
+        :param diff_can_be_reprocessed: Whether the top-level diff can be reprocessed
+        :type diff_can_be_reprocessed: bool
+        :param forced_nodes: The nodes that were forced to reprocess when the diff was created, possibly None
+        :type forced_nodes: :class:`recipe.diff.forced_nodes.ForcedNodes`
+        :returns: The node diff
+        :rtype: :class:`recipe.diff.node.NodeDiff`
+        """
+
+        type_dict = node_dict['node_type']
+        if type_dict['node_type'] == JobNodeDefinition.NODE_TYPE:
+            node = JobNodeDefinition(node_name, type_dict['job_type_name'], type_dict['job_type_version'],
+                                     type_dict['job_type_revision'])
+        else:
+            node = RecipeNodeDefinition(node_name, type_dict['recipe_type_name'], type_dict['recipe_type_revision'])
+
+        node_diff = create_diff_for_node(node, diff_can_be_reprocessed, node_dict['status'])
+        node_diff.prev_node_type = node_dict.get('prev_node_type')
+        node_diff.reprocess_new_node = node_dict['reprocess_new_node']
+        node_diff.force_reprocess = node_dict['force_reprocess']
+        node_diff.changes = [Change(c['name'], c['description']) for c in node_dict['changes']]
+
+        if node.node_type == JobNodeDefinition.NODE_TYPE:
+            node_diff.prev_job_type_name = type_dict.get('prev_job_type_name')
+            node_diff.prev_job_type_version = type_dict.get('prev_job_type_version')
+            node_diff.prev_revision_num = type_dict.get('prev_job_type_revision')
+        else:
+            node_diff.prev_recipe_type_name = type_dict.get('prev_recipe_type_name')
+            node_diff.prev_revision_num = type_dict.get('prev_recipe_type_revision')
+            if node_diff.force_reprocess and forced_nodes:
+                node_diff.force_reprocess_nodes = forced_nodes.get_forced_nodes_for_subrecipe(node_name)
+
+        return node_diff
+
     def _populate_default_values(self):
         """Populates any missing required values with defaults
         """
@@ -16,6 +16,7 @@ class RecipeGraph(object):
         self.inputs = {}  # {Input name: Input}
         self._nodes = {}  # {Job name: Node}
         self._root_nodes = {}  # {Job name: Node}
+        self._topological_order = None  # Cached topological ordering of the nodes (list of job names)
 
     def add_dependency(self, parent_job_name, child_job_name, connections):
         """Adds a dependency that one job has upon another job
@@ -41,6 +42,7 @@ class RecipeGraph(object):
         parent_node.add_child(child_node)
         if child_job_name in self._root_nodes:
             del self._root_nodes[child_job_name]
+        self._topological_order = None  # Invalidate cache
 
     def add_input(self, recipe_input):
         """Adds a recipe input to this graph
@@ -68,6 +70,7 @@ class RecipeGraph(object):
         node = RecipeNode(job_name, job_type_name, job_type_version)
         self._nodes[job_name] = node
         self._root_nodes[job_name] = node
+        self._topological_order = None  # Invalidate cache
 
     def add_recipe_input_connection(self, recipe_input, job_name, job_input):
         """Adds a recipe input connection from the given recipe input to the given job input
@@ -109,6 +112,18 @@ class RecipeGraph(object):
         :rtype: [string]
         """
 
+        if self._topological_order is None:
+            self._topological_order = self._calculate_topological_order()
+
+        return list(self._topological_order)
+
+    def _calculate_topological_order(self):
+        """Calculates a valid topological ordering (dependency order) for the recipe jobs
+
+        :returns: The list of job names in topological ordering
+        :rtype: [string]
+        """
+
         results = []
         perm_set = set()
         temp_set = set()
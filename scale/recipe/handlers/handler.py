@@ -5,6 +5,8 @@ import logging
 
 from job.configuration.data.exceptions import InvalidData
 from job.models import Job
+from recipe.deprecation import RecipeDataSunset
+from recipe.handlers.plan import RecipePlan
 
 logger = logging.getLogger(__name__)
 
@@ -14,20 +16,23 @@ class RecipeHandler(object):
 
     BLOCKING_STATUSES = ['BLOCKED', 'FAILED', 'CANCELED']
 
-    def __init__(self, recipe, recipe_jobs):
+    def __init__(self, recipe, recipe_jobs, plan=None):
         """Constructor
 
         :param recipe: The recipe model with related recipe_type_rev model
         :type recipe: :class:`recipe.models.Recipe`
         :param recipe_jobs: The list of recipe_job models with related job and job_type_rev models
         :type recipe_jobs: list
+        :param plan: The plan of the recipe's type revision, created from the recipe if not provided
+        :type plan: :class:`recipe.handlers.plan.RecipePlan`
         """
 
         self.recipe = recipe
         self.recipe_jobs = []
 
-        self._data = recipe.get_recipe_data()
-        self._graph = recipe.get_recipe_definition().get_graph()
+        self._plan = plan if plan else RecipePlan.from_revision(recipe.recipe_type_rev)
+        self._data = RecipeDataSunset.create(self._plan.definition, recipe.input)
+        self._graph = self._plan.graph
         self._jobs_by_id = {}  # {Job ID: Recipe Job}
         self._jobs_by_name = {}  # {Job Name: Recipe Job}
 
@@ -53,9 +58,20 @@ class RecipeHandler(object):
         :rtype: [:class:`job.models.Job`]
         """
 
+        return self.get_blocked_and_pending_jobs()[0]
+
+    def get_blocked_and_pending_jobs(self):
+        """Returns the jobs within this recipe that should be updated to BLOCKED status and the jobs that should be
+        updated to PENDING status, evaluated in a single pass over the recipe graph
+
+        :returns: The list of jobs that should be updated to BLOCKED and the list that should be updated to PENDING
+        :rtype: ([:class:`job.models.Job`], [:class:`job.models.Job`])
+        """
+
         statuses = {}  # {Job name: status}
         jobs_to_blocked = []
-        for job_name in self._graph.get_topological_order():
+        jobs_to_pending = []
+        for job_name in self._plan.topological_order:
             job = self._jobs_by_name[job_name].job
             node = self._graph.get_node(job_name)
             if job.status in ['PENDING', 'BLOCKED']:
@@ -70,10 +86,12 @@ class RecipeHandler(object):
                         jobs_to_blocked.append(job)
                 else:
                     statuses[job_name] = 'PENDING'
+                    if job.status != 'PENDING':
+                        jobs_to_pending.append(job)
             else:
                 statuses[job_name] = job.status
 
-        return jobs_to_blocked
+        return jobs_to_blocked, jobs_to_pending
 
     def get_dependent_job_ids(self, job_id):
         """Returns the IDs of the jobs that depend upon the job with the given ID
@@ -103,7 +121,7 @@ class RecipeHandler(object):
 
         jobs_to_queue = []
 
-        for job_name in self._graph.get_topological_order():
+        for job_name in self._plan.topological_order:
             job = self._jobs_by_name[job_name].job
             if job.status != 'PENDING':
                 continue  # Only PENDING jobs are able to be queued
@@ -135,14 +153,14 @@ class RecipeHandler(object):
 
         # Compile all of the job outputs in the recipe
         job_outputs = {}  # {Job name: Job results}
-        for job_name in self._graph.get_topological_order():
+        for job_name in self._plan.topological_order:
             job = self._jobs_by_name[job_name].job
             if job.has_output():
                 job_outputs[job_name] = job.get_job_results()
 
         # Find jobs without input yet that have parents ready to pass on outputs
         jobs_with_new_inputs = []
-        for job_name in self._graph.get_topological_order():
+        for job_name in self._plan.topological_order:
             job = self._jobs_by_name[job_name].job
             node = self._graph.get_node(job_name)
             if job.has_input():
@@ -174,7 +192,7 @@ class RecipeHandler(object):
 
         jobs_to_queue = []
 
-        for job_name in self._graph.get_topological_order():
+        for job_name in self._plan.topological_order:
             job = self._jobs_by_name[job_name].job
             if job.can_be_queued():
                 jobs_to_queue.append(job)
@@ -196,7 +214,7 @@ class RecipeHandler(object):
         batch_id = self.recipe.batch_id
         # TODO: this only works for 1 job per job name
         superseded_jobs = {}  # {Job name: Job}
-        for job_tuple in self.recipe.get_recipe_definition().get_jobs_to_create():
+        for job_tuple in self._plan.get_jobs_to_create():
             job_name = job_tuple[0]
             job_type = job_tuple[1]
             if job_name in self._jobs_by_name:
@@ -223,27 +241,7 @@ class RecipeHandler(object):
         :rtype: [:class:`job.models.Job`]
         """
 
-        statuses = {}  # {Job name: status}
-        jobs_to_pending = []
-        for job_name in self._graph.get_topological_order():
-            job = self._jobs_by_name[job_name].job
-            node = self._graph.get_node(job_name)
-            if job.status in ['PENDING', 'BLOCKED']:
-                should_be_blocked = False
-                for parent_node in node.parents:
-                    if statuses[parent_node.node_name] in RecipeHandler.BLOCKING_STATUSES:
-                        should_be_blocked = True
-                        break
-                if should_be_blocked:
-                    statuses[job_name] = 'BLOCKED'
-                else:
-                    statuses[job_name] = 'PENDING'
-                    if job.status != 'PENDING':
-                        jobs_to_pending.append(job)
-            else:
-                statuses[job_name] = job.status
-
-        return jobs_to_pending
+        return self.get_blocked_and_pending_jobs()[1]
 
     def is_completed(self):
         """Indicates whether this recipe has been completed
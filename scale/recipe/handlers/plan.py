@@ -0,0 +1,61 @@
+"""Defines the class for the evaluation plan shared by the recipes of a recipe type revision"""
+from __future__ import unicode_literals
+
+from recipe.definition.compiled import get_compiled_definition
+
+
+class RecipePlan(object):
+    """Represents the parts of a recipe definition that are needed to evaluate a recipe: the parsed definition, its
+    graph, the topological order of its jobs, and the job types of the jobs to create. These only depend upon the recipe
+    type revision, so a single plan is computed once and shared by every recipe of the revision.
+    """
+
+    def __init__(self, definition, graph=None):
+        """Constructor
+
+        :param definition: The recipe definition
+        :type definition: :class:`recipe.configuration.definition.recipe_definition.LegacyRecipeDefinition` or
+            :class:`recipe.seed.recipe_definition.RecipeDefinition`
+        :param graph: The graph of the recipe definition, created from the definition if not provided
+        :type graph: :class:`recipe.handlers.graph.RecipeGraph`
+        """
+
+        self.definition = definition
+        self.graph = graph if graph else definition.get_graph()
+        self.topological_order = self.graph.get_topological_order()
+        self._jobs_to_create = None
+
+    @staticmethod
+    def from_revision(recipe_type_rev):
+        """Creates the plan for the given recipe type revision. The parsed definition and graph of the revision are
+        shared with every other plan of the revision in this process, while the job types are queried by each plan.
+
+        :param recipe_type_rev: The recipe type revision
+        :type recipe_type_rev: :class:`recipe.models.RecipeTypeRevision`
+        :returns: The recipe plan
+        :rtype: :class:`recipe.handlers.plan.RecipePlan`
+        """
+
+        compiled = get_compiled_definition(recipe_type_rev)
+        return RecipePlan(compiled.get_legacy_definition(), compiled.get_legacy_graph())
+
+    def get_jobs_to_create(self):
+        """Returns the list of job names and types to create for a recipe, in the order that they should be created. The
+        job types are only queried the first time this is called.
+
+        :returns: List of tuples with each job's name and type
+        :rtype: [(str, :class:`job.models.JobType`)]
+        """
+
+        if self._jobs_to_create is None:
+            self._jobs_to_create = self.definition.get_jobs_to_create()
+        return self._jobs_to_create
+
+    def get_num_jobs(self):
+        """Returns the number of jobs in each recipe of this plan
+
+        :returns: The number of jobs
+        :rtype: int
+        """
+
+        return len(self.topological_order)
@@ -10,7 +10,7 @@ from django.utils.timezone import now
 from data.data.exceptions import InvalidData
 from messaging.messages.message import CommandMessage
 from recipe.definition.node import JobNodeDefinition, RecipeNodeDefinition
-from recipe.diff.diff import RecipeDiff
+from recipe.diff.cache import get_recipe_diff
 from recipe.diff.json.forced_nodes_v6 import convert_forced_nodes_to_v6, ForcedNodesV6
 from recipe.messages.process_recipe_input import create_process_recipe_input_messages
 from recipe.messages.supersede_recipe_nodes import create_supersede_recipe_nodes_messages
@@ -340,23 +340,21 @@ class CreateRecipes(CommandMessage):
         superseded_recipe_ids = [r.id for r in self._superseded_recipes]
         Recipe.objects.supersede_recipes(superseded_recipe_ids, self._when)
 
-        # Get superseded recipe definitions and calculate diffs
+        # Get superseded recipe definitions and calculate diffs, one for each distinct superseded revision
+        superseded_rev_ids = {r.recipe_type_rev_id for r in self._superseded_recipes}
         revision_tuples = [(self.recipe_type_name, self.recipe_type_rev_num)]
-        revs = RecipeTypeRevision.objects.get_revisions(superseded_recipe_ids, revision_tuples)
+        revs = RecipeTypeRevision.objects.get_revisions(superseded_rev_ids, revision_tuples)
         for rev in revs.values():
             if rev.recipe_type.name == self.recipe_type_name:
                 if rev.revision_num == self.recipe_type_rev_num:
                     new_rev = rev
                     break
-        diffs = {rev_id: RecipeDiff(rev.get_definition(), new_rev.get_definition()) for rev_id, rev in revs.items()}
-        if self.forced_nodes:
-            for diff in diffs.values():
-                diff.set_force_reprocess(self.forced_nodes)
+        diffs = {rev_id: get_recipe_diff(revs[rev_id], new_rev, self.forced_nodes) for rev_id in superseded_rev_ids}
 
         # Create new recipe models
         cannot_reprocess_count = 0
         for superseded_recipe in self._superseded_recipes:
-            if diffs[superseded_recipe].can_be_reprocessed:
+            if diffs[superseded_recipe.recipe_type_rev_id].can_be_reprocessed:
                 try:
                     recipe = Recipe.objects.create_recipe_v6(new_rev, self.event_id, batch_id=self.batch_id,
                                                              superseded_recipe=superseded_recipe,
@@ -379,8 +377,8 @@ class CreateRecipes(CommandMessage):
             if rev_id not in pairs_by_rev_id:
                 pairs_by_rev_id[rev_id] = []
             pairs_by_rev_id[rev_id].append(pair)
-        for rev_id, diff in diffs.items():
-            self._recipe_diffs.append(_RecipeDiff(diff, pairs_by_rev_id[rev_id]))
+        for rev_id, pairs in pairs_by_rev_id.items():
+            self._recipe_diffs.append(_RecipeDiff(diffs[rev_id], pairs))
 
         return recipes
 
@@ -436,11 +434,10 @@ class CreateRecipes(CommandMessage):
                 rev_id = recipe.superseded_recipe.recipe_type_rev_id
                 old_revision = revs_by_id[rev_id]
                 new_revision = revs_by_tuple[(recipe.recipe_type.name, recipe.recipe_type_rev.revision_num)]
-                diff = RecipeDiff(old_revision.get_definition(), new_revision.get_definition())
+                sub_forced_nodes = None
                 if self.forced_nodes:
                     sub_forced_nodes = self.forced_nodes.get_forced_nodes_for_subrecipe(node_name)
-                    if sub_forced_nodes:
-                        diff.set_force_reprocess(sub_forced_nodes)
+                diff = get_recipe_diff(old_revision, new_revision, sub_forced_nodes)
                 self._recipe_diffs.append(_RecipeDiff(diff, [pair]))
 
         return sub_recipes.values()
@@ -469,9 +466,7 @@ class CreateRecipes(CommandMessage):
             for pair_tuple, pairs in pair_dict.items():
                 old_revision = revs[pair_tuple[0]]
                 new_revision = revs[pair_tuple[1]]
-                diff = RecipeDiff(old_revision.get_definition(), new_revision.get_definition())
-                if self.forced_nodes:
-                    diff.set_force_reprocess(self.forced_nodes)
+                diff = get_recipe_diff(old_revision, new_revision, self.forced_nodes)
                 self._recipe_diffs.append(_RecipeDiff(diff, pairs))
         elif self.create_recipes_type == SUB_RECIPE_TYPE:
             node_names = [sub.node_name for sub in self.sub_recipes]
@@ -493,11 +488,10 @@ class CreateRecipes(CommandMessage):
                         pair = _RecipePair(recipe.superseded_recipe, recipe)
                         old_revision = revs[recipe.superseded_recipe.recipe_type_rev_id]
                         new_revision = revs[recipe.recipe_type_rev_id]
-                        diff = RecipeDiff(old_revision.get_definition(), new_revision.get_definition())
+                        sub_forced_nodes = None
                         if self.forced_nodes:
                             sub_forced_nodes = self.forced_nodes.get_forced_nodes_for_subrecipe(node_name)
-                            if sub_forced_nodes:
-                                diff.set_force_reprocess(sub_forced_nodes)
+                        diff = get_recipe_diff(old_revision, new_revision, sub_forced_nodes)
                         self._recipe_diffs.append(_RecipeDiff(diff, [pair]))
 
         return recipes
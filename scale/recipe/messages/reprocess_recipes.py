@@ -10,6 +10,7 @@ from job.messages.cancel_jobs import create_cancel_jobs_messages
 from job.messages.unpublish_jobs import create_unpublish_jobs_messages
 from job.models import Job
 from messaging.messages.message import CommandMessage
+from recipe.definition.compiled import get_compiled_definition
 from recipe.handlers.graph_delta import RecipeGraphDelta
 from recipe.messages.process_recipe_input import create_process_recipe_input_messages
 from recipe.models import Recipe, RecipeNode, RecipeTypeRevision
@@ -211,17 +212,22 @@ class ReprocessRecipes(CommandMessage):
         unpublish_job_ids = []
         recipe_job_models = []
         recipe_job_count = 0
-        new_graph = revisions[new_revision_id].get_recipe_definition().get_graph()
+        new_graph = get_compiled_definition(revisions[new_revision_id]).get_legacy_graph()
+        graph_deltas = {}  # {Revision ID: RecipeGraphDelta}
 
         for recipe in recipes:
             job_ids = recipe_job_ids[recipe.superseded_recipe_id]  # Get job IDs for superseded recipe
-            old_graph = revisions[recipe.recipe_type_rev_id].get_recipe_definition().get_graph()
-            names = old_graph.get_topological_order() if all_jobs else job_names
 
-            # Compute the job differences between recipe revisions (force reprocess for jobs in job_names)
-            graph_delta = RecipeGraphDelta(old_graph, new_graph)
-            for job_name in names:
-                graph_delta.reprocess_identical_node(job_name)
+            # Compute the job differences between recipe revisions (force reprocess for jobs in job_names), which only
+            # depend upon the revisions so they are computed once for each revision
+            graph_delta = graph_deltas.get(recipe.recipe_type_rev_id)
+            if not graph_delta:
+                old_graph = get_compiled_definition(revisions[recipe.recipe_type_rev_id]).get_legacy_graph()
+                names = old_graph.get_topological_order() if all_jobs else job_names
+                graph_delta = RecipeGraphDelta(old_graph, new_graph)
+                for job_name in names:
+                    graph_delta.reprocess_identical_node(job_name)
+                graph_deltas[recipe.recipe_type_rev_id] = graph_delta
 
             # Jobs that are identical from old recipe to new recipe are just copied to new recipe
             if not msg_already_run:
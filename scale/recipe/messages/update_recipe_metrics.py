@@ -3,6 +3,8 @@ from __future__ import unicode_literals
 
 import logging
 
+from django.db import transaction
+
 from messaging.messages.message import CommandMessage
 from recipe.models import Recipe
 
@@ -95,6 +97,19 @@ class UpdateRecipeMetrics(CommandMessage):
 
         return len(self._recipe_ids) < MAX_NUM
 
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        recipe_ids = set(self._recipe_ids)
+        new_recipe_ids = [recipe_id for recipe_id in message._recipe_ids if recipe_id not in recipe_ids]
+        if len(self._recipe_ids) + len(new_recipe_ids) > MAX_NUM:
+            return False
+
+        for recipe_id in new_recipe_ids:
+            self.add_recipe(recipe_id)
+        return True
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
@@ -116,18 +131,19 @@ class UpdateRecipeMetrics(CommandMessage):
         """See :meth:`messaging.messages.message.CommandMessage.execute`
         """
 
-        Recipe.objects.update_recipe_metrics(self._recipe_ids)
+        from batch.messages.update_batch_metrics import create_update_batch_metrics_messages
+        from batch.models import Batch
+
+        # Changes to top-level batch recipes and their jobs are applied to the batches in the same transaction
+        with transaction.atomic():
+            deltas = Recipe.objects.update_recipe_metrics(self._recipe_ids)
+            Batch.objects.apply_metrics_deltas(deltas)
 
         # If any of these recipes are sub-recipes, update the metrics of the recipes that contain these
         self.new_messages.extend(create_update_recipe_metrics_messages_from_sub_recipes(self._recipe_ids))
 
-        # For any top-level recipes (not a sub-recipe) update any batches that these recipes belong to
-        from batch.messages.update_batch_metrics import create_update_batch_metrics_messages
-        batch_ids = set()
-        qry = Recipe.objects.filter(id__in=self._recipe_ids, recipe__isnull=True, batch__isnull=False).only('batch_id')
-        for recipe in qry:
-            batch_ids.add(recipe.batch_id)
-        if batch_ids:
-            self.new_messages.extend(create_update_batch_metrics_messages(batch_ids))
+        # Batches whose durations cannot be updated incrementally are recounted
+        if deltas.batch_ids_to_reconcile:
+            self.new_messages.extend(create_update_batch_metrics_messages(deltas.batch_ids_to_reconcile))
 
         return True
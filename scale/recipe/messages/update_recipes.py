@@ -11,6 +11,8 @@ from job.messages.pending_jobs import create_pending_jobs_messages
 from job.messages.process_job_input import create_process_job_input_messages
 from job.models import Job
 from messaging.messages.message import CommandMessage
+from recipe.messages.update_recipe_metrics import create_update_recipe_metrics_messages
+from recipe.handlers.plan import RecipePlan
 from recipe.models import Recipe, RecipeNode
 
 # This is the maximum number of recipe models that can fit in one message. This maximum ensures that every message of
@@ -94,6 +96,19 @@ class UpdateRecipes(CommandMessage):
 
         return self._count < MAX_NUM
 
+    def merge(self, message):
+        """See :meth:`messaging.messages.message.CommandMessage.merge`
+        """
+
+        recipe_ids = set(self._recipe_ids)
+        new_recipe_ids = [recipe_id for recipe_id in message._recipe_ids if recipe_id not in recipe_ids]
+        if self._count + len(new_recipe_ids) > MAX_NUM:
+            return False
+
+        for recipe_id in new_recipe_ids:
+            self.add_recipe(recipe_id)
+        return True
+
     def to_json(self):
         """See :meth:`messaging.messages.message.CommandMessage.to_json`
         """
@@ -119,7 +134,6 @@ class UpdateRecipes(CommandMessage):
         blocked_job_ids = set()
         pending_job_ids = set()
         completed_recipe_ids = []
-        updated_batch_ids = []
         num_jobs_with_input = 0
         job_ids_ready_for_first_queue = []
 
@@ -127,19 +141,26 @@ class UpdateRecipes(CommandMessage):
             # Lock recipes
             Recipe.objects.get_locked_recipes(self._recipe_ids)
 
-            # Process all recipe handlers
+            # Process the recipes grouped by recipe type revision so that each revision's plan is computed once
+            plans = {}  # {Recipe type revision ID: Recipe plan}
             recipes = list(Recipe.objects.get_recipes_with_definitions(self._recipe_ids))
+            recipes.sort(key=lambda recipe: recipe.recipe_type_rev_id, reverse=True)
             while len(recipes) > 0:
                 # Gather up a list of recipes that doesn't exceed the job number limit
-                recipe_list = [recipes.pop()]
-                # TODO: eventually use job count per recipe, right now assume 10
-                num_jobs = 10
-                while len(recipes) > 0 and num_jobs + 10 < MAX_JOBS_AT_A_TIME:
-                    num_jobs += 10
+                recipe_list = []
+                num_jobs = 0
+                while len(recipes) > 0:
+                    recipe = recipes[-1]
+                    if recipe.recipe_type_rev_id not in plans:
+                        plans[recipe.recipe_type_rev_id] = RecipePlan.from_revision(recipe.recipe_type_rev)
+                    recipe_num_jobs = plans[recipe.recipe_type_rev_id].get_num_jobs()
+                    if recipe_list and num_jobs + recipe_num_jobs > MAX_JOBS_AT_A_TIME:
+                        break
+                    num_jobs += recipe_num_jobs
                     recipe_list.append(recipes.pop())
 
                 # Process handlers for the list of recipes
-                handlers = Recipe.objects.get_recipe_handlers(recipe_list)
+                handlers = Recipe.objects.get_recipe_handlers(recipe_list, plans)
 
                 # Create any jobs needed
                 jobs_to_create = []
@@ -169,21 +190,20 @@ class UpdateRecipes(CommandMessage):
                 if recipe_jobs_to_create:
                     RecipeNode.objects.bulk_create(recipe_jobs_to_create)
 
+                jobs_with_input = []
                 for handler in handlers:
-                    for blocked_job in handler.get_blocked_jobs():
+                    blocked_jobs, pending_jobs = handler.get_blocked_and_pending_jobs()
+                    for blocked_job in blocked_jobs:
                         blocked_job_ids.add(blocked_job.id)
-                    for pending_job in handler.get_pending_jobs():
+                    for pending_job in pending_jobs:
                         pending_job_ids.add(pending_job.id)
-                    jobs_with_input = handler.get_jobs_ready_for_input()
-                    num_jobs_with_input += len(jobs_with_input)
-                    for job in jobs_with_input:
-                        job.update_database_with_input(when)
+                    jobs_with_input.extend(handler.get_jobs_ready_for_input())
                     for job in handler.get_jobs_ready_for_first_queue():
                         job_ids_ready_for_first_queue.append(job.id)
                     if handler.is_completed() and not handler.recipe.is_completed:
                         completed_recipe_ids.append(handler.recipe.id)
-                        if handler.recipe.batch_id:
-                            updated_batch_ids.append(handler.recipe.batch_id)
+                num_jobs_with_input += len(jobs_with_input)
+                Job.objects.update_jobs_with_input(jobs_with_input, when)
 
             Recipe.objects.complete_recipes(completed_recipe_ids, when)
 
@@ -192,6 +212,8 @@ class UpdateRecipes(CommandMessage):
         self.new_messages.extend(create_pending_jobs_messages(pending_job_ids, when))
         # Jobs ready for their first queue need to have their input processed
         self.new_messages.extend(create_process_job_input_messages(job_ids_ready_for_first_queue))
+        # Completed recipes need their completion counted in the metrics of their containing recipes and batches
+        self.new_messages.extend(create_update_recipe_metrics_messages(completed_recipe_ids))
 
         logger.info('Found %d job(s) that should transition to BLOCKED', len(blocked_job_ids))
         logger.info('Found %d job(s) that should transition to PENDING', len(pending_job_ids))
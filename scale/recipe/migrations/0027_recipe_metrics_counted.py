@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0049_job_modified_id_idx'),
+        ('recipe', '0026_auto_20180723_1914'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='counted_completed',
+            field=models.NullBooleanField(),
+        ),
+        migrations.AddField(
+            model_name='recipenode',
+            name='counted_status',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        # The existing batch metrics were counted from the current top-level batch recipes and their jobs
+        migrations.RunSQL(
+            sql='UPDATE recipe SET counted_completed = is_completed '
+                'WHERE batch_id IS NOT NULL AND recipe_id IS NULL',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql='UPDATE recipe_node rn SET counted_status = j.status FROM job j, recipe r '
+                'WHERE rn.job_id = j.id AND rn.recipe_id = r.id AND r.batch_id IS NOT NULL AND r.recipe_id IS NULL',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
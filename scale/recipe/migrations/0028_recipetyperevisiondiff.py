@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0027_recipe_metrics_counted'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeTypeRevisionDiff',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('forced_nodes_key', models.CharField(blank=True, max_length=40)),
+                ('diff', django.contrib.postgres.fields.jsonb.JSONField(default=dict)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('prev_recipe_type_rev', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='recipe.RecipeTypeRevision')),
+                ('recipe_type_rev', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='recipe.RecipeTypeRevision')),
+            ],
+            options={
+                'db_table': 'recipe_type_revision_diff',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='recipetyperevisiondiff',
+            unique_together=set([('prev_recipe_type_rev', 'recipe_type_rev', 'forced_nodes_key')]),
+        ),
+    ]
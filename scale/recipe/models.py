@@ -2,23 +2,26 @@
 from __future__ import unicode_literals
 
 import copy
+import json
 from collections import namedtuple
 
 import django.contrib.postgres.fields
 from django.db import connection, models, transaction
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils.timezone import now
 
+from batch.metrics_deltas import BatchMetricsDeltas, RECIPE_METRICS_FIELDS
 from data.data.data import Data
 from data.data.json.data_v1 import convert_data_to_v1_json
 from data.data.json.data_v6 import convert_data_to_v6_json, DataV6
 from data.interface.parameter import FileParameter
 from job.models import Job, JobType
-from recipe.definition.json.definition_v6 import RecipeDefinitionV6
+from recipe.definition.compiled import get_compiled_definition
 from recipe.deprecation import RecipeDefinitionSunset, RecipeDataSunset
 from recipe.exceptions import CreateRecipeError, ReprocessError, SupersedeError
 from recipe.handlers.graph_delta import RecipeGraphDelta
 from recipe.handlers.handler import RecipeHandler
+from recipe.handlers.plan import RecipePlan
 from recipe.instance.recipe import RecipeInstance
 from recipe.triggers.configuration.trigger_rule import RecipeTriggerRuleConfiguration
 from storage.models import ScaleFile
@@ -469,23 +472,29 @@ class RecipeManager(models.Manager):
             return handlers[0]
         return None
 
-    def get_recipe_handlers(self, recipes):
-        """Returns the handlers for the given recipes
+    def get_recipe_handlers(self, recipes, plans=None):
+        """Returns the handlers for the given recipes. The recipes of each recipe type revision share a single plan.
 
         :param recipes: The recipe models with recipe_type_rev models populated
         :type recipes: list
+        :param plans: The recipe plans stored by recipe type revision ID, new plans are added to it
+        :type plans: dict
         :returns: The recipe handlers
         :rtype: list
         """
 
         recipe_dict = {recipe.id: recipe for recipe in recipes}
         handlers = []
+        if plans is None:
+            plans = {}
 
         recipe_jobs_dict = RecipeNode.objects.get_recipe_jobs(recipe_dict.keys())
         for recipe_id in recipe_dict.keys():
             recipe = recipe_dict[recipe_id]
+            if recipe.recipe_type_rev_id not in plans:
+                plans[recipe.recipe_type_rev_id] = RecipePlan.from_revision(recipe.recipe_type_rev)
             recipe_jobs = recipe_jobs_dict[recipe_id] if recipe_id in recipe_jobs_dict else []
-            handler = RecipeHandler(recipe, recipe_jobs)
+            handler = RecipeHandler(recipe, recipe_jobs, plans[recipe.recipe_type_rev_id])
             handlers.append(handler)
 
         return handlers
@@ -875,37 +884,92 @@ class RecipeManager(models.Manager):
         qry.update(is_superseded=True, superseded=when, last_modified=now())
 
     def update_recipe_metrics(self, recipe_ids):
-        """Updates the metrics for the recipes with the given IDs
+        """Updates the metrics for the recipes with the given IDs. Each recipe's metrics are recounted from its own
+        nodes. The changes to the top-level batch recipes since they were last counted in their batches, along with the
+        status changes of the jobs within them, are returned so that the batches can be updated without recounting every
+        recipe and job in the batch. The returned deltas must be applied within the same transaction.
 
         :param recipe_ids: The recipe IDs
         :type recipe_ids: list
+        :returns: The changes to the metrics of the recipes' batches
+        :rtype: :class:`batch.metrics_deltas.BatchMetricsDeltas`
         """
 
+        deltas = BatchMetricsDeltas()
         if not recipe_ids:
-            return
-
-        qry = 'UPDATE recipe r SET jobs_total = s.jobs_total, jobs_pending = s.jobs_pending, '
-        qry += 'jobs_blocked = s.jobs_blocked, jobs_queued = s.jobs_queued, jobs_running = s.jobs_running, '
-        qry += 'jobs_failed = s.jobs_failed, jobs_completed = s.jobs_completed, jobs_canceled = s.jobs_canceled, '
-        qry += 'sub_recipes_total = s.sub_recipes_total, sub_recipes_completed = s.sub_recipes_completed, '
-        qry += 'last_modified = %s FROM ('
-        qry += 'SELECT rn.recipe_id, COUNT(j.id) + COALESCE(SUM(r.jobs_total), 0) AS jobs_total, '
-        qry += 'COUNT(j.id) FILTER(WHERE status = \'PENDING\') + COALESCE(SUM(r.jobs_pending), 0) AS jobs_pending, '
-        qry += 'COUNT(j.id) FILTER(WHERE status = \'BLOCKED\') + COALESCE(SUM(r.jobs_blocked), 0) AS jobs_blocked, '
-        qry += 'COUNT(j.id) FILTER(WHERE status = \'QUEUED\') + COALESCE(SUM(r.jobs_queued), 0) AS jobs_queued, '
-        qry += 'COUNT(j.id) FILTER(WHERE status = \'RUNNING\') + COALESCE(SUM(r.jobs_running), 0) AS jobs_running, '
-        qry += 'COUNT(j.id) FILTER(WHERE status = \'FAILED\') + COALESCE(SUM(r.jobs_failed), 0) AS jobs_failed, '
-        qry += 'COUNT(j.id) FILTER(WHERE status = \'COMPLETED\') '
-        qry += '+ COALESCE(SUM(r.jobs_completed), 0) AS jobs_completed, '
-        qry += 'COUNT(j.id) FILTER(WHERE status = \'CANCELED\') + COALESCE(SUM(r.jobs_canceled), 0) AS jobs_canceled, '
-        qry += 'COUNT(r.id) + COALESCE(SUM(r.sub_recipes_total), 0) AS sub_recipes_total, '
-        qry += 'COUNT(r.id) FILTER(WHERE r.is_completed) '
-        qry += '+ COALESCE(SUM(r.sub_recipes_completed), 0) AS sub_recipes_completed '
-        qry += 'FROM recipe_node rn LEFT OUTER JOIN job j ON rn.job_id = j.id '
-        qry += 'LEFT OUTER JOIN recipe r ON rn.sub_recipe_id = r.id WHERE rn.recipe_id IN %s GROUP BY rn.recipe_id) s '
-        qry += 'WHERE r.id = s.recipe_id'
+            return deltas
+
+        with transaction.atomic():
+            # Lock the recipes in ID order so that concurrent updates cannot deadlock
+            batch_recipes = {}  # {Recipe ID: Recipe model with the metrics last counted in its batch}
+            qry = self.select_for_update().filter(id__in=recipe_ids).order_by('id')
+            for recipe in qry.only('id', 'batch', 'recipe', 'counted_completed', *RECIPE_METRICS_FIELDS):
+                if recipe.batch_id and not recipe.recipe_id:
+                    batch_recipes[recipe.id] = recipe
+
+            qry = 'UPDATE recipe r SET jobs_total = s.jobs_total, jobs_pending = s.jobs_pending, '
+            qry += 'jobs_blocked = s.jobs_blocked, jobs_queued = s.jobs_queued, jobs_running = s.jobs_running, '
+            qry += 'jobs_failed = s.jobs_failed, jobs_completed = s.jobs_completed, jobs_canceled = s.jobs_canceled, '
+            qry += 'sub_recipes_total = s.sub_recipes_total, sub_recipes_completed = s.sub_recipes_completed, '
+            qry += 'last_modified = %s FROM ('
+            qry += 'SELECT rn.recipe_id, COUNT(j.id) + COALESCE(SUM(r.jobs_total), 0) AS jobs_total, '
+            qry += 'COUNT(j.id) FILTER(WHERE status = \'PENDING\') + COALESCE(SUM(r.jobs_pending), 0) AS jobs_pending, '
+            qry += 'COUNT(j.id) FILTER(WHERE status = \'BLOCKED\') + COALESCE(SUM(r.jobs_blocked), 0) AS jobs_blocked, '
+            qry += 'COUNT(j.id) FILTER(WHERE status = \'QUEUED\') + COALESCE(SUM(r.jobs_queued), 0) AS jobs_queued, '
+            qry += 'COUNT(j.id) FILTER(WHERE status = \'RUNNING\') + COALESCE(SUM(r.jobs_running), 0) AS jobs_running, '
+            qry += 'COUNT(j.id) FILTER(WHERE status = \'FAILED\') + COALESCE(SUM(r.jobs_failed), 0) AS jobs_failed, '
+            qry += 'COUNT(j.id) FILTER(WHERE status = \'COMPLETED\') '
+            qry += '+ COALESCE(SUM(r.jobs_completed), 0) AS jobs_completed, '
+            qry += 'COUNT(j.id) FILTER(WHERE status = \'CANCELED\') '
+            qry += '+ COALESCE(SUM(r.jobs_canceled), 0) AS jobs_canceled, '
+            qry += 'COUNT(r.id) + COALESCE(SUM(r.sub_recipes_total), 0) AS sub_recipes_total, '
+            qry += 'COUNT(r.id) FILTER(WHERE r.is_completed) '
+            qry += '+ COALESCE(SUM(r.sub_recipes_completed), 0) AS sub_recipes_completed '
+            qry += 'FROM recipe_node rn LEFT OUTER JOIN job j ON rn.job_id = j.id '
+            qry += 'LEFT OUTER JOIN recipe r ON rn.sub_recipe_id = r.id '
+            qry += 'WHERE rn.recipe_id IN %s GROUP BY rn.recipe_id) s '
+            qry += 'WHERE r.id = s.recipe_id'
+            with connection.cursor() as cursor:
+                cursor.execute(qry, [now(), tuple(recipe_ids)])
+
+            if batch_recipes:
+                self._add_batch_metrics_deltas(batch_recipes, deltas)
+
+        return deltas
+
+    def _add_batch_metrics_deltas(self, batch_recipes, deltas):
+        """Adds the changes to the given locked top-level batch recipes and their jobs since they were last counted in
+        their batches to the given deltas, and marks the recipes and jobs as counted
+
+        :param batch_recipes: The recipe models with the metrics last counted in their batches, stored by recipe ID
+        :type batch_recipes: dict
+        :param deltas: The batch metrics deltas
+        :type deltas: :class:`batch.metrics_deltas.BatchMetricsDeltas`
+        """
+
+        recipe_ids = list(batch_recipes.keys())
+        for recipe in self.filter(id__in=recipe_ids).only('id', 'batch', *RECIPE_METRICS_FIELDS):
+            old_recipe = batch_recipes[recipe.id]
+            old_metrics = None
+            if old_recipe.counted_completed is not None:
+                old_metrics = {field_name: getattr(old_recipe, field_name) for field_name in RECIPE_METRICS_FIELDS}
+                old_metrics['is_completed'] = old_recipe.counted_completed
+            new_metrics = {field_name: getattr(recipe, field_name) for field_name in RECIPE_METRICS_FIELDS}
+            deltas.add_recipe(recipe.batch_id, old_metrics, new_metrics)
+        self.filter(id__in=recipe_ids).update(counted_completed=F('is_completed'))
+
+        # Mark each job that changed status since it was last counted, the joined copy of the node has the old status
+        qry = 'UPDATE recipe_node rn SET counted_status = j.status '
+        qry += 'FROM recipe_node o JOIN job j ON o.job_id = j.id '
+        qry += 'LEFT OUTER JOIN job_exe_end je ON je.job_id = j.id AND je.exe_num = j.num_exes '
+        qry += 'WHERE rn.id = o.id AND rn.recipe_id IN %s AND rn.counted_status IS DISTINCT FROM j.status '
+        qry += 'RETURNING rn.recipe_id, rn.node_name, o.counted_status, j.status, j.ended - j.started, '
+        qry += 'je.seed_ended - je.seed_started'
         with connection.cursor() as cursor:
-            cursor.execute(qry, [now(), tuple(recipe_ids)])
+            cursor.execute(qry, [tuple(recipe_ids)])
+            for row in cursor.fetchall():
+                batch_id = batch_recipes[row[0]].batch_id
+                deltas.add_job(batch_id, row[1], row[2], row[3], job_duration=row[4], seed_duration=row[5])
 
     # TODO: remove this once job failure, completion, cancellation, and requeue have moved to messaging system
     def _get_recipe_handlers(self, recipe_ids):
@@ -1023,6 +1087,9 @@ class Recipe(models.Model):
     :type sub_recipes_completed: :class:`django.db.models.IntegerField`
     :keyword is_completed: Whether this recipe has completed all of its jobs
     :type is_completed: :class:`django.db.models.BooleanField`
+    :keyword counted_completed: The is_completed value of this top-level recipe when its metrics were last counted in
+        the metrics of its batch, null if the recipe has not been counted
+    :type counted_completed: :class:`django.db.models.NullBooleanField`
 
     :keyword created: When the recipe was created
     :type created: :class:`django.db.models.DateTimeField`
@@ -1069,6 +1136,7 @@ class Recipe(models.Model):
     sub_recipes_total = models.IntegerField(default=0)
     sub_recipes_completed = models.IntegerField(default=0)
     is_completed = models.BooleanField(default=False)
+    counted_completed = models.NullBooleanField()
 
     created = models.DateTimeField(auto_now_add=True)
     completed = models.DateTimeField(blank=True, null=True)
@@ -1466,6 +1534,9 @@ class RecipeNode(models.Model):
     :keyword sub_recipe: If not null, this node is a recipe node and this field is the sub-recipe that the recipe
         contains
     :type sub_recipe: :class:`django.db.models.ForeignKey`
+    :keyword counted_status: The status of the node's job when it was last counted in the metrics of its batch, null if
+        the job has not been counted
+    :type counted_status: :class:`django.db.models.CharField`
     """
 
     recipe = models.ForeignKey('recipe.Recipe', related_name='contains', on_delete=models.PROTECT)
@@ -1474,6 +1545,7 @@ class RecipeNode(models.Model):
     job = models.ForeignKey('job.Job', blank=True, null=True, on_delete=models.PROTECT)
     sub_recipe = models.ForeignKey('recipe.Recipe', related_name='contained_by', blank=True, null=True,
                                    on_delete=models.PROTECT)
+    counted_status = models.CharField(blank=True, max_length=50, null=True)
 
     objects = RecipeNodeManager()
 
@@ -1956,13 +2028,14 @@ class RecipeTypeRevision(models.Model):
     objects = RecipeTypeRevisionManager()
 
     def get_definition(self):
-        """Returns the definition for this recipe type revision
+        """Returns the definition for this recipe type revision. The definition is parsed once per process and shared, so
+        it must not be modified.
 
         :returns: The definition for this revision
         :rtype: :class:`recipe.definition.definition.RecipeDefinition`
         """
 
-        return RecipeDefinitionV6(definition=self.definition, do_validate=False).get_definition()
+        return get_compiled_definition(self).get_definition()
 
     def get_input_interface(self):
         """Returns the input interface for this revision
@@ -1997,3 +2070,80 @@ class RecipeTypeRevision(models.Model):
         """meta information for the db"""
         db_table = 'recipe_type_revision'
         unique_together = ('recipe_type', 'revision_num')
+
+
+class RecipeTypeRevisionDiffManager(models.Manager):
+    """Provides additional methods for handling the diffs between recipe type revisions
+    """
+
+    def get_diff_json(self, prev_recipe_type_rev_id, recipe_type_rev_id, forced_nodes_key):
+        """Returns the saved JSON of the diff between the given recipe type revisions with the given forced nodes
+
+        :param prev_recipe_type_rev_id: The ID of the previous recipe type revision
+        :type prev_recipe_type_rev_id: int
+        :param recipe_type_rev_id: The ID of the new recipe type revision
+        :type recipe_type_rev_id: int
+        :param forced_nodes_key: The fingerprint of the nodes forced to reprocess, blank if there are none
+        :type forced_nodes_key: string
+        :returns: The v6 JSON of the diff, possibly None if the diff has not been saved
+        :rtype: dict
+        """
+
+        diffs = self.filter(prev_recipe_type_rev_id=prev_recipe_type_rev_id, recipe_type_rev_id=recipe_type_rev_id,
+                            forced_nodes_key=forced_nodes_key).values_list('diff', flat=True)
+        for diff in diffs:
+            return diff
+        return None
+
+    def save_diff_json(self, prev_recipe_type_rev_id, recipe_type_rev_id, forced_nodes_key, diff):
+        """Saves the JSON of the diff between the given recipe type revisions with the given forced nodes. If the diff
+        has already been saved, by this or another process, the saved diff is kept.
+
+        :param prev_recipe_type_rev_id: The ID of the previous recipe type revision
+        :type prev_recipe_type_rev_id: int
+        :param recipe_type_rev_id: The ID of the new recipe type revision
+        :type recipe_type_rev_id: int
+        :param forced_nodes_key: The fingerprint of the nodes forced to reprocess, blank if there are none
+        :type forced_nodes_key: string
+        :param diff: The v6 JSON of the diff
+        :type diff: dict
+        """
+
+        qry = 'INSERT INTO recipe_type_revision_diff '
+        qry += '(prev_recipe_type_rev_id, recipe_type_rev_id, forced_nodes_key, diff, created) '
+        qry += 'VALUES (%s, %s, %s, %s::jsonb, %s) '
+        qry += 'ON CONFLICT (prev_recipe_type_rev_id, recipe_type_rev_id, forced_nodes_key) DO NOTHING'
+        with connection.cursor() as cursor:
+            cursor.execute(qry, [prev_recipe_type_rev_id, recipe_type_rev_id, forced_nodes_key, json.dumps(diff),
+                                 now()])
+
+
+class RecipeTypeRevisionDiff(models.Model):
+    """Represents the diff from one recipe type revision to another with a set of nodes forced to reprocess. Revisions
+    never change once they are created, so a saved diff is shared by every process that reprocesses recipes between
+    the two revisions.
+
+    :keyword prev_recipe_type_rev: The previous recipe type revision
+    :type prev_recipe_type_rev: :class:`django.db.models.ForeignKey`
+    :keyword recipe_type_rev: The new recipe type revision
+    :type recipe_type_rev: :class:`django.db.models.ForeignKey`
+    :keyword forced_nodes_key: The fingerprint of the nodes forced to reprocess, blank if there are none
+    :type forced_nodes_key: :class:`django.db.models.CharField`
+    :keyword diff: The v6 JSON of the diff
+    :type diff: :class:`django.contrib.postgres.fields.JSONField`
+    :keyword created: When this diff was saved
+    :type created: :class:`django.db.models.DateTimeField`
+    """
+
+    prev_recipe_type_rev = models.ForeignKey('recipe.RecipeTypeRevision', related_name='+', on_delete=models.CASCADE)
+    recipe_type_rev = models.ForeignKey('recipe.RecipeTypeRevision', related_name='+', on_delete=models.CASCADE)
+    forced_nodes_key = models.CharField(blank=True, max_length=40)
+    diff = django.contrib.postgres.fields.JSONField(default=dict)
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = RecipeTypeRevisionDiffManager()
+
+    class Meta(object):
+        """meta information for the db"""
+        db_table = 'recipe_type_revision_diff'
+        unique_together = ('prev_recipe_type_rev', 'recipe_type_rev', 'forced_nodes_key')
@@ -0,0 +1,51 @@
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+from mock import patch
+
+import recipe.definition.compiled as compiled_module
+import recipe.test.utils as recipe_test_utils
+from recipe.definition.compiled import clear_compiled_definitions, get_compiled_definition
+from recipe.handlers.plan import RecipePlan
+from recipe.models import RecipeTypeRevision
+
+
+class TestCompiledRecipeDefinition(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        clear_compiled_definitions()
+        self.recipe_type = recipe_test_utils.create_recipe_type()
+        self.revision = RecipeTypeRevision.objects.get_revision(self.recipe_type.name, 1)
+
+    def test_shared_definition(self):
+        """Tests that every model of a revision shares the same parsed definition and graph"""
+
+        other_revision = RecipeTypeRevision.objects.get(id=self.revision.id)
+
+        self.assertIs(self.revision.get_definition(), other_revision.get_definition())
+        plan_1 = RecipePlan.from_revision(self.revision)
+        plan_2 = RecipePlan.from_revision(other_revision)
+        self.assertIsNot(plan_1, plan_2)
+        self.assertIs(plan_1.graph, plan_2.graph)
+
+    def test_clear_on_save(self):
+        """Tests that saving a revision removes its compiled definition from the cache"""
+
+        compiled = get_compiled_definition(self.revision)
+        self.revision.save()
+
+        self.assertIsNot(get_compiled_definition(self.revision), compiled)
+
+    @patch.object(compiled_module, 'MAX_COMPILED_DEFINITIONS', 1)
+    def test_evict_least_recently_used(self):
+        """Tests that the least recently used compiled definition is evicted when the cache is full"""
+
+        recipe_type_2 = recipe_test_utils.create_recipe_type()
+        revision_2 = RecipeTypeRevision.objects.get_revision(recipe_type_2.name, 1)
+        compiled = get_compiled_definition(self.revision)
+        get_compiled_definition(revision_2)
+
+        self.assertIsNot(get_compiled_definition(self.revision), compiled)
@@ -11,6 +11,7 @@ from recipe.configuration.definition.recipe_definition import LegacyRecipeDefini
 from recipe.definition.definition import RecipeDefinition
 from recipe.diff.diff import RecipeDiff
 from recipe.diff.exceptions import InvalidDiff
+from recipe.diff.forced_nodes import ForcedNodes
 from recipe.diff.json.diff_v6 import convert_diff_to_v6, convert_recipe_diff_to_v6_json, RecipeDiffV6
 from recipe.handlers.graph import RecipeGraph
 from recipe.handlers.graph_delta import RecipeGraphDelta
@@ -369,6 +370,58 @@ class TestRecipeDiffV6(TestCase):
         RecipeDiffV6(diff=json.get_dict(), do_validate=True)  # Revalidate
         self.assertFalse(json.get_dict()['can_be_reprocessed'])
 
+    def test_get_diff(self):
+        """Tests calling RecipeDiffV6.get_diff() with the JSON of a diff containing a variety of changes"""
+
+        interface = Interface()
+        interface.add_parameter(FileParameter('file_param_1', ['image/gif']))
+
+        definition_1 = RecipeDefinition(interface)
+        definition_1.add_job_node('A', 'job_type_1', '1.0', 1)
+        definition_1.add_job_node('B', 'job_type_2', '2.0', 1)
+        definition_1.add_job_node('C', 'job_type_3', '1.0', 2)
+        definition_1.add_recipe_node('D', 'recipe_type_1', 1)
+        definition_1.add_dependency('A', 'B')
+        definition_1.add_dependency('A', 'C')
+        definition_1.add_dependency('C', 'D')
+        definition_1.add_recipe_input_connection('A', 'input_1', 'file_param_1')
+        definition_1.add_dependency_input_connection('B', 'b_input_1', 'A', 'a_output_1')
+        definition_1.add_dependency_input_connection('C', 'c_input_1', 'A', 'a_output_2')
+        definition_1.add_dependency_input_connection('D', 'd_input_1', 'C', 'c_output_1')
+
+        definition_2 = RecipeDefinition(interface)
+        # Node B is deleted
+        definition_2.add_job_node('A', 'job_type_1', '1.0', 1)
+        definition_2.add_job_node('C', 'job_type_3', '2.1', 1)  # Change to job type version and revision
+        definition_2.add_recipe_node('D', 'recipe_type_1', 1)
+        definition_2.add_recipe_node('F', 'recipe_type_2', 5)  # New node
+        definition_2.add_dependency('A', 'C')
+        definition_2.add_dependency('C', 'D')
+        definition_2.add_dependency('D', 'F')
+        definition_2.add_recipe_input_connection('A', 'input_1', 'file_param_1')
+        definition_2.add_dependency_input_connection('C', 'c_input_1', 'A', 'a_output_2')
+        definition_2.add_dependency_input_connection('D', 'd_input_1', 'C', 'c_output_1')
+        definition_2.add_dependency_input_connection('F', 'f_input_1', 'D', 'd_output_1')
+
+        recipe_d_forced_nodes = ForcedNodes()
+        recipe_d_forced_nodes.add_node('1')
+        forced_nodes = ForcedNodes()
+        forced_nodes.add_node('A')
+        forced_nodes.add_subrecipe('D', recipe_d_forced_nodes)
+        diff = RecipeDiff(definition_1, definition_2)
+        diff.set_force_reprocess(forced_nodes)
+        diff_dict = convert_recipe_diff_to_v6_json(diff).get_dict()
+
+        new_diff = RecipeDiffV6(diff=diff_dict, do_validate=True).get_diff(forced_nodes)
+
+        self.assertDictEqual(convert_recipe_diff_to_v6_json(new_diff).get_dict(), diff_dict)
+        self.assertSetEqual(set(new_diff.get_nodes_to_copy().keys()), set(diff.get_nodes_to_copy().keys()))
+        self.assertSetEqual(set(new_diff.get_nodes_to_supersede().keys()), {'A', 'B', 'C', 'D'})
+        self.assertSetEqual(set(new_diff.get_nodes_to_recursively_supersede().keys()), {'D'})
+        self.assertSetEqual(set(new_diff.get_nodes_to_unpublish().keys()), {'B'})
+        self.assertSetEqual(new_diff.graph['D'].force_reprocess_nodes.get_forced_node_names(), {'1'})
+        self.assertListEqual(new_diff.graph['C'].changes, diff.graph['C'].changes)
+
     def test_init_validation(self):
         """Tests the validation done in __init__"""
 
@@ -0,0 +1,69 @@
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+from mock import patch
+
+import recipe.test.utils as recipe_test_utils
+from recipe.definition.compiled import clear_compiled_definitions
+from recipe.diff.cache import clear_recipe_diffs, get_recipe_diff
+from recipe.diff.forced_nodes import ForcedNodes
+from recipe.models import RecipeTypeRevision, RecipeTypeRevisionDiff
+
+
+class TestRecipeDiffCache(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        clear_recipe_diffs()
+        recipe_type_1 = recipe_test_utils.create_recipe_type()
+        recipe_type_2 = recipe_test_utils.create_recipe_type()
+        self.revision_1 = RecipeTypeRevision.objects.get_revision(recipe_type_1.name, 1)
+        self.revision_2 = RecipeTypeRevision.objects.get_revision(recipe_type_2.name, 1)
+
+    def test_shared_diff(self):
+        """Tests that the diff between two revisions is calculated once for each set of forced nodes"""
+
+        forced_nodes_1 = ForcedNodes()
+        forced_nodes_1.add_node('node_a')
+        forced_nodes_1.add_node('node_b')
+        forced_nodes_2 = ForcedNodes()
+        forced_nodes_2.add_node('node_b')
+        forced_nodes_2.add_node('node_a')
+
+        diff = get_recipe_diff(self.revision_1, self.revision_2)
+        self.assertIs(get_recipe_diff(self.revision_1, self.revision_2), diff)
+        self.assertIsNot(get_recipe_diff(self.revision_2, self.revision_1), diff)
+
+        forced_diff = get_recipe_diff(self.revision_1, self.revision_2, forced_nodes_1)
+        self.assertIsNot(forced_diff, diff)
+        self.assertIs(get_recipe_diff(self.revision_1, self.revision_2, forced_nodes_2), forced_diff)
+
+    def test_saved_diff(self):
+        """Tests that a diff saved by another process is loaded instead of calculated"""
+
+        forced_nodes = ForcedNodes()
+        forced_nodes.add_node('node_a')
+        diff = get_recipe_diff(self.revision_1, self.revision_2, forced_nodes)
+        get_recipe_diff(self.revision_1, self.revision_2)
+        self.assertEqual(RecipeTypeRevisionDiff.objects.count(), 2)
+
+        # Forget the diffs of this process
+        clear_recipe_diffs()
+        with patch('recipe.diff.cache._create_recipe_diff') as mock_create:
+            saved_diff = get_recipe_diff(self.revision_1, self.revision_2, forced_nodes)
+        self.assertFalse(mock_create.called)
+
+        self.assertIsNot(saved_diff, diff)
+        self.assertSetEqual(set(saved_diff.graph.keys()), set(diff.graph.keys()))
+        self.assertSetEqual(set(saved_diff.get_nodes_to_supersede().keys()), set(diff.get_nodes_to_supersede().keys()))
+        self.assertEqual(RecipeTypeRevisionDiff.objects.count(), 2)
+
+    def test_replaced_definition(self):
+        """Tests that a cached diff is not reused once a compiled definition it was calculated from is replaced"""
+
+        diff = get_recipe_diff(self.revision_1, self.revision_2)
+        clear_compiled_definitions(self.revision_1.id)
+
+        self.assertIsNot(get_recipe_diff(self.revision_1, self.revision_2), diff)
@@ -1,8 +1,12 @@
 from __future__ import unicode_literals
 
+import datetime
+
 import django
 from django.test import TestCase
+from django.utils.timezone import now
 
+from batch.models import Batch, BatchMetrics
 from batch.test import utils as batch_test_utils
 from job.models import Job
 from job.test import utils as job_test_utils
@@ -123,11 +127,15 @@ class TestUpdateRecipes(TestCase):
         self.assertEqual(recipe_2.jobs_completed, 2)
         self.assertEqual(recipe_2.jobs_canceled, 1)
 
-        # Make sure message is created to update batch metrics
-        self.assertEqual(len(message.new_messages), 1)
-        msg = message.new_messages[0]
-        self.assertEqual(msg.type, 'update_batch_metrics')
-        self.assertListEqual(msg._batch_ids, [batch.id])
+        # Make sure the batch metrics are updated from the deltas, executing again must not count anything twice
+        self.assertEqual(len(message.new_messages), 0)
+        batch = Batch.objects.get(id=batch.id)
+        self.assertEqual(batch.recipes_total, 1)
+        self.assertEqual(batch.recipes_completed, 0)
+        self.assertEqual(batch.jobs_total, 9)
+        self.assertEqual(batch.jobs_pending, 3)
+        self.assertEqual(batch.jobs_completed, 2)
+        self.assertEqual(batch.jobs_canceled, 1)
 
         # Test executing message again
         message_json_dict = message.to_json()
@@ -155,7 +163,81 @@ class TestUpdateRecipes(TestCase):
         self.assertEqual(recipe_2.jobs_completed, 2)
         self.assertEqual(recipe_2.jobs_canceled, 1)
 
-        # Make sure message is created to update batch metrics
+        # Make sure the batch metrics are updated from the deltas, executing again must not count anything twice
+        self.assertEqual(len(message.new_messages), 0)
+        batch = Batch.objects.get(id=batch.id)
+        self.assertEqual(batch.recipes_total, 1)
+        self.assertEqual(batch.recipes_completed, 0)
+        self.assertEqual(batch.jobs_total, 9)
+        self.assertEqual(batch.jobs_pending, 3)
+        self.assertEqual(batch.jobs_completed, 2)
+        self.assertEqual(batch.jobs_canceled, 1)
+
+    def test_execute_batch_job_deltas(self):
+        """Tests calling UpdateRecipeMetrics.execute() successfully where job status changes are applied to the
+        metrics per job name of a batch
+        """
+
+        job_type = job_test_utils.create_job_type()
+        definition = {
+            'version': '1.0',
+            'input_data': [],
+            'jobs': [{
+                'name': 'a',
+                'job_type': {
+                    'name': job_type.name,
+                    'version': job_type.version,
+                },
+            }]
+        }
+        recipe_type = recipe_test_utils.create_recipe_type(definition=definition)
+        batch = batch_test_utils.create_batch(recipe_type=recipe_type)
+        recipe = recipe_test_utils.create_recipe(batch=batch, recipe_type=recipe_type)
+        started = now()
+        job_1 = job_test_utils.create_job(status='COMPLETED', started=started,
+                                          ended=started + datetime.timedelta(minutes=1))
+        job_2 = job_test_utils.create_job(status='RUNNING', started=started)
+        recipe_test_utils.create_recipe_job(recipe=recipe, job=job_1, job_name='a')
+        recipe_test_utils.create_recipe_job(recipe=recipe, job=job_2, job_name='a')
+
+        message = UpdateRecipeMetrics()
+        message.add_recipe(recipe.id)
+        message.execute()
+
+        metrics = BatchMetrics.objects.get(batch_id=batch.id, job_name='a')
+        self.assertEqual(metrics.jobs_total, 2)
+        self.assertEqual(metrics.jobs_running, 1)
+        self.assertEqual(metrics.jobs_completed, 1)
+        self.assertEqual(metrics.min_job_duration, datetime.timedelta(minutes=1))
+        self.assertEqual(metrics.avg_job_duration, datetime.timedelta(minutes=1))
+        self.assertEqual(metrics.max_job_duration, datetime.timedelta(minutes=1))
+
+        # Job 2 completes
+        Job.objects.filter(id=job_2.id).update(status='COMPLETED', ended=started + datetime.timedelta(minutes=3))
+        message = UpdateRecipeMetrics()
+        message.add_recipe(recipe.id)
+        message.execute()
+
+        metrics = BatchMetrics.objects.get(batch_id=batch.id, job_name='a')
+        self.assertEqual(metrics.jobs_total, 2)
+        self.assertEqual(metrics.jobs_running, 0)
+        self.assertEqual(metrics.jobs_completed, 2)
+        self.assertEqual(metrics.job_duration_count, 2)
+        self.assertEqual(metrics.min_job_duration, datetime.timedelta(minutes=1))
+        self.assertEqual(metrics.avg_job_duration, datetime.timedelta(minutes=2))
+        self.assertEqual(metrics.max_job_duration, datetime.timedelta(minutes=3))
+        self.assertEqual(len(message.new_messages), 0)
+
+        # Job 1 leaves COMPLETED, so its duration can only be removed by recounting the batch
+        Job.objects.filter(id=job_1.id).update(status='FAILED')
+        message = UpdateRecipeMetrics()
+        message.add_recipe(recipe.id)
+        message.execute()
+
+        metrics = BatchMetrics.objects.get(batch_id=batch.id, job_name='a')
+        self.assertEqual(metrics.jobs_total, 2)
+        self.assertEqual(metrics.jobs_failed, 1)
+        self.assertEqual(metrics.jobs_completed, 1)
         self.assertEqual(len(message.new_messages), 1)
         msg = message.new_messages[0]
         self.assertEqual(msg.type, 'update_batch_metrics')
@@ -282,11 +364,15 @@ class TestUpdateRecipes(TestCase):
         self.assertEqual(recipe_2.sub_recipes_total, 3)
         self.assertEqual(recipe_2.sub_recipes_completed, 2)
 
-        # Make sure message is created to update batch metrics
-        self.assertEqual(len(message.new_messages), 1)
-        msg = message.new_messages[0]
-        self.assertEqual(msg.type, 'update_batch_metrics')
-        self.assertListEqual(msg._batch_ids, [batch.id])
+        # Make sure the batch metrics are updated from the deltas, executing again must not count anything twice
+        self.assertEqual(len(message.new_messages), 0)
+        batch = Batch.objects.get(id=batch.id)
+        self.assertEqual(batch.recipes_total, 4)
+        self.assertEqual(batch.recipes_completed, 2)
+        self.assertEqual(batch.jobs_total, 49)
+        self.assertEqual(batch.jobs_pending, 5)
+        self.assertEqual(batch.jobs_completed, 29)
+        self.assertEqual(batch.jobs_canceled, 2)
 
         # Test executing message again
         message_json_dict = message.to_json()
@@ -318,11 +404,15 @@ class TestUpdateRecipes(TestCase):
         self.assertEqual(recipe_2.sub_recipes_total, 3)
         self.assertEqual(recipe_2.sub_recipes_completed, 2)
 
-        # Make sure message is created to update batch metrics
-        self.assertEqual(len(message.new_messages), 1)
-        msg = message.new_messages[0]
-        self.assertEqual(msg.type, 'update_batch_metrics')
-        self.assertListEqual(msg._batch_ids, [batch.id])
+        # Make sure the batch metrics are updated from the deltas, executing again must not count anything twice
+        self.assertEqual(len(message.new_messages), 0)
+        batch = Batch.objects.get(id=batch.id)
+        self.assertEqual(batch.recipes_total, 4)
+        self.assertEqual(batch.recipes_completed, 2)
+        self.assertEqual(batch.jobs_total, 49)
+        self.assertEqual(batch.jobs_pending, 5)
+        self.assertEqual(batch.jobs_completed, 29)
+        self.assertEqual(batch.jobs_canceled, 2)
 
     def test_execute_with_top_level_recipe(self):
         """Tests calling UpdateRecipeMetrics.execute() successfully where a message needs to be sent to update a
@@ -9,7 +9,7 @@ from batch.test import utils as batch_test_utils
 from job.configuration.results.job_results import JobResults
 from job.models import Job
 from job.test import utils as job_test_utils
-from recipe.messages.update_recipes import UpdateRecipes
+from recipe.messages.update_recipes import MAX_NUM, UpdateRecipes
 from recipe.models import RecipeNode
 from recipe.test import utils as recipe_test_utils
 from storage.test import utils as storage_test_utils
@@ -20,6 +20,23 @@ class TestUpdateRecipes(TestCase):
     def setUp(self):
         django.setup()
 
+    def test_merge(self):
+        """Tests merging UpdateRecipes messages up to the maximum message size"""
+
+        message_1 = UpdateRecipes()
+        message_1.add_recipe(1)
+        message_1.add_recipe(2)
+        message_2 = UpdateRecipes()
+        message_2.add_recipe(2)
+        message_2.add_recipe(3)
+        message_3 = UpdateRecipes()
+        for recipe_id in range(MAX_NUM):
+            message_3.add_recipe(recipe_id + 10)
+
+        self.assertTrue(message_1.merge(message_2))
+        self.assertListEqual(message_1.to_json()['recipe_ids'], [1, 2, 3])
+        self.assertFalse(message_1.merge(message_3))
+
     def test_json(self):
         """Tests coverting a UpdateRecipes message to and from JSON"""
 
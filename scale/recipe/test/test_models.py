@@ -356,6 +356,21 @@ class TestRecipeManager(TransactionTestCase):
             recipe_ids.add(handler.recipe.id)
         self.assertSetEqual(recipe_ids, {self.recipe_a.id, self.recipe_b.id})
 
+    def test_get_recipe_handlers_shared_plan(self):
+        """Tests that the handlers for recipes of the same recipe type revision share a single plan"""
+
+        recipe_type = recipe_test_utils.create_recipe_type()
+        recipe_1 = recipe_test_utils.create_recipe(recipe_type=recipe_type)
+        recipe_2 = recipe_test_utils.create_recipe(recipe_type=recipe_type)
+        recipes = Recipe.objects.get_recipes_with_definitions([recipe_1.id, recipe_2.id])
+
+        plans = {}
+        handlers = Recipe.objects.get_recipe_handlers(recipes, plans)
+
+        self.assertEqual(len(handlers), 2)
+        self.assertListEqual(plans.keys(), [recipe_1.recipe_type_rev_id])
+        self.assertIs(handlers[0]._plan, handlers[1]._plan)
+
     def test_process_recipe_input(self):
         """Tests calling RecipeManager.process_recipe_input()"""
 
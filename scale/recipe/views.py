@@ -13,6 +13,7 @@ from rest_framework.views import APIView
 
 import trigger.handler as trigger_handler
 import util.rest as rest_util
+import util.rest_cache as rest_cache
 from recipe.models import Recipe, RecipeInputFile, RecipeType
 from recipe.configuration.data.exceptions import InvalidRecipeConnection
 from recipe.configuration.definition.exceptions import InvalidDefinition
@@ -42,6 +43,7 @@ class RecipeTypesView(GenericAPIView):
         else:
             return RecipeTypeSerializerV5
 
+    @rest_cache.cache_response(['job_types', 'recipe_types'])
     def get(self, request):
         """Retrieves the list of all recipe types returns it in JSON form
 
@@ -28,6 +28,7 @@ LOGGING_ADDRESS = os.environ.get('SCALE_LOGGING_ADDRESS', LOGGING_ADDRESS)
 LOGGING_HEALTH_ADDRESS = os.environ.get('SCALE_LOGGING_HEALTH_ADDRESS', LOGGING_HEALTH_ADDRESS)
 ELASTICSEARCH_URLS = os.environ.get('SCALE_ELASTICSEARCH_URLS', ELASTICSEARCH_URLS)
 ELASTICSEARCH_VERSION = os.environ.get('SCALE_ELASTICSEARCH_VERSION', "2.4")
+ELASTICSEARCH_LOG_INDEX_PREFIX = os.environ.get('SCALE_ELASTICSEARCH_LOG_INDEX_PREFIX', 'logstash-')
 ELASTICSEARCH_LB = os.environ.get('SCALE_ELASTICSEARCH_LB', 'true').lower() in ['true', '1', 't']
 if ELASTICSEARCH_URLS:
     if ELASTICSEARCH_LB:
@@ -52,6 +53,9 @@ if ELASTICSEARCH_URLS:
 # Broker URL for connection to messaging backend. Bootstrap must populate.
 BROKER_URL = os.environ.get('SCALE_BROKER_URL', BROKER_URL)
 QUEUE_NAME = os.environ.get('SCALE_QUEUE_NAME', QUEUE_NAME)
+MESSAGE_HANDLER_WORKERS = int(os.environ.get('SCALE_MESSAGE_HANDLER_WORKERS', MESSAGE_HANDLER_WORKERS))
+MESSAGE_HANDLER_BATCH_SIZE = int(os.environ.get('SCALE_MESSAGE_HANDLER_BATCH_SIZE', MESSAGE_HANDLER_BATCH_SIZE))
+MESSAGE_ENVELOPE_VERSION = int(os.environ.get('SCALE_MESSAGE_ENVELOPE_VERSION', MESSAGE_ENVELOPE_VERSION))
 
 DB_HOST = os.environ.get('SCALE_DB_HOST', '')
 if DB_HOST == '':
@@ -87,6 +91,18 @@ MESOS_MASTER = os.environ.get('MESOS_MASTER_URL', 'zk://master.mesos:2181/mesos'
 # Zookeeper URL for scheduler leader election. If this is None, only a single scheduler is used.
 SCHEDULER_ZK = os.environ.get('SCALE_ZK_URL', 'zk://master.mesos:2181/scale')
 
+# Scheduling cycles slower than this many seconds cause the next cycle to be profiled
+if os.environ.get('SCALE_SCHEDULING_PROFILE_THRESHOLD'):
+    SCHEDULING_PROFILE_THRESHOLD = float(os.environ['SCALE_SCHEDULING_PROFILE_THRESHOLD'])
+
+# Seconds that REST view responses are cached
+REST_CACHE_TIMEOUT = int(os.environ.get('SCALE_REST_CACHE_TIMEOUT', 30))
+
+# Days that per-minute and hourly job load samples are kept
+JOB_LOAD_MINUTE_RETENTION_DAYS = int(os.environ.get('SCALE_JOB_LOAD_MINUTE_RETENTION_DAYS',
+                                                    JOB_LOAD_MINUTE_RETENTION_DAYS))
+JOB_LOAD_HOUR_RETENTION_DAYS = int(os.environ.get('SCALE_JOB_LOAD_HOUR_RETENTION_DAYS', JOB_LOAD_HOUR_RETENTION_DAYS))
+
 # The full name for the Scale Docker image (without version tag)
 SCALE_DOCKER_IMAGE = os.environ.get('SCALE_DOCKER_IMAGE', SCALE_DOCKER_IMAGE)
 
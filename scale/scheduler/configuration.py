@@ -2,6 +2,7 @@
 from __future__ import unicode_literals
 
 from queue.models import DEFAULT_QUEUE_ORDER
+from scheduler.models import DEFAULT_PLACEMENT_MODE
 
 
 DEFAULT_NUM_MESSAGE_HANDLERS = 0
@@ -19,11 +20,13 @@ class SchedulerConfiguration(object):
 
         self.is_paused = True
         self.num_message_handlers = DEFAULT_NUM_MESSAGE_HANDLERS
+        self.placement_mode = DEFAULT_PLACEMENT_MODE
         self.queue_mode = DEFAULT_QUEUE_ORDER
         self.system_logging_level = DEFAULT_LOGGING_LEVEL
 
         if scheduler:
             self.is_paused = scheduler.is_paused
             self.num_message_handlers = scheduler.num_message_handlers
+            self.placement_mode = scheduler.placement_mode
             self.queue_mode = scheduler.queue_mode
             self.system_logging_level = scheduler.system_logging_level
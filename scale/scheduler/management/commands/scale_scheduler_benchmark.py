@@ -0,0 +1,56 @@
+"""Defines the command that benchmarks the scheduler against simulated agents without a Mesos master"""
+from __future__ import unicode_literals
+
+import json
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from scheduler.scheduling.benchmark import SchedulingBenchmark
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Command that benchmarks the scheduler against simulated agents without a Mesos master
+    """
+
+    help = 'Benchmarks the scheduler against simulated agents in a scratch test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-a', '--agents', action='store', default='10,100,500,2000',
+                            help='Comma-separated list of the cluster sizes (number of agents) to benchmark')
+        parser.add_argument('-t', '--job-types', action='store', type=int, default=20,
+                            help='The number of job types to seed')
+        parser.add_argument('-j', '--jobs', action='store', type=int, default=5000,
+                            help='The number of queued jobs to seed for each cluster size')
+        parser.add_argument('-c', '--cycles', action='store', type=int, default=20,
+                            help='The maximum number of scheduling cycles to run for each cluster size')
+        parser.add_argument('-s', '--seed', action='store', type=int, default=0,
+                            help='The seed for the randomly generated jobs')
+        parser.add_argument('--keepdb', action='store_true', default=False,
+                            help='Keep the test database between runs to skip its migrations')
+
+    def handle(self, *args, **options):
+        """See :meth:`django.core.management.base.BaseCommand.handle`.
+
+        This method runs the benchmark in a test database so that the configured database is never modified.
+        """
+
+        cluster_sizes = [int(size) for size in options['agents'].split(',')]
+        keepdb = options['keepdb']
+
+        old_name = connection.settings_dict['NAME']
+        logger.info('Creating test database for benchmark')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb)
+        try:
+            for num_agents in cluster_sizes:
+                logger.info('Benchmarking scheduler with %d agent(s)', num_agents)
+                benchmark = SchedulingBenchmark(num_agents, options['job_types'], options['jobs'],
+                                                options['cycles'], options['seed'])
+                results = benchmark.run()
+                self.stdout.write(json.dumps(results, sort_keys=True))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
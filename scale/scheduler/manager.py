@@ -32,12 +32,14 @@ class SchedulerManager(object):
         self.hostname = None
         self.mesos_address = None
 
+        self._job_considered_count = 0  # Number of queued job executions considered for placement since last JSON
         self._job_fin_count = 0  # Number of job executions finished since last status JSON
         self._job_launch_count = 0  # Number of new job executions scheduled since last status JSON
         self._last_json = now()  # Last time status JSON was generated
         self._lock = threading.Lock()
         self._new_offer_count = 0  # Number of new offers received since last status JSON
         self._offer_launch_count = 0  # Number of offers used in launches since last status JSON
+        self._placement_secs = 0.0  # Number of seconds spent placing queued job executions since last status JSON
         self._task_fin_count = 0  # Number of tasks finished since last status JSON
         self._task_launch_count = 0  # Number of tasks launched since last status JSON
         self._task_update_count = 0  # Number of task updates since last status JSON
@@ -55,6 +57,19 @@ class SchedulerManager(object):
         with self._lock:
             self._new_offer_count += new_offer_count
 
+    def add_placement_counts(self, job_considered_count, duration):
+        """Add metric counts from a pass of placing queued job executions onto nodes
+
+        :param job_considered_count: The number of queued job executions that were considered for placement
+        :type job_considered_count: int
+        :param duration: How long the placement pass took
+        :type duration: :class:`datetime.timedelta`
+        """
+
+        with self._lock:
+            self._job_considered_count += job_considered_count
+            self._placement_secs += duration.total_seconds()
+
     def add_scheduling_counts(self, job_launch_count, task_launch_count, offer_launch_count):
         """Add metric counts from a round of scheduling
 
@@ -98,18 +113,22 @@ class SchedulerManager(object):
             when = now()
             state = self._state
             last_json = self._last_json
+            job_considered_count = self._job_considered_count
             job_fin_count = self._job_fin_count
             job_launch_count = self._job_launch_count
             new_offer_count = self._new_offer_count
             offer_launch_count = self._offer_launch_count
+            placement_secs = self._placement_secs
             task_fin_count = self._task_fin_count
             task_launch_count = self._task_launch_count
             task_update_count = self._task_update_count
             self._last_json = when
+            self._job_considered_count = 0
             self._job_fin_count = 0
             self._job_launch_count = 0
             self._new_offer_count = 0
             self._offer_launch_count = 0
+            self._placement_secs = 0.0
             self._task_fin_count = 0
             self._task_launch_count = 0
             self._task_update_count = 0
@@ -117,6 +136,11 @@ class SchedulerManager(object):
         mesos_address = self.mesos_address
 
         duration = (when - last_json).total_seconds()
+        job_considered_per_sec = self._round_count_per_sec(job_considered_count / duration)
+        if placement_secs > 0.0:
+            placement_jobs_per_sec = self._round_count_per_sec(job_considered_count / placement_secs)
+        else:
+            placement_jobs_per_sec = 0.0
         job_fin_per_sec = self._round_count_per_sec(job_fin_count / duration)
         job_launch_per_sec = self._round_count_per_sec(job_launch_count / duration)
         new_offer_per_sec = self._round_count_per_sec(new_offer_count / duration)
@@ -133,10 +157,12 @@ class SchedulerManager(object):
         metrics_dict = {'new_offers_per_sec': new_offer_per_sec, 'task_updates_per_sec': task_update_per_sec,
                         'tasks_finished_per_sec': task_fin_per_sec, 'jobs_finished_per_sec': job_fin_per_sec,
                         'jobs_launched_per_sec': job_launch_per_sec, 'tasks_launched_per_sec': task_launch_per_sec,
-                        'offers_launched_per_sec': offer_launch_per_sec}
+                        'offers_launched_per_sec': offer_launch_per_sec,
+                        'jobs_considered_per_sec': job_considered_per_sec,
+                        'placement_jobs_per_sec': placement_jobs_per_sec}
         state_dict = {'name': state.state, 'title': state.title, 'description': state.description}
         status_dict['scheduler'] = {'hostname': self.hostname, 'mesos': mesos_dict, 'metrics': metrics_dict,
-                                    'state': state_dict}
+                                    'placement_mode': self.config.placement_mode, 'state': state_dict}
 
     def sync_with_database(self):
         """Syncs with the database to retrieve an updated scheduler model
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0012_remove_scheduler_resource_level'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduler',
+            name='placement_mode',
+            field=models.CharField(choices=[('SCORE', 'SCORE'), ('BEST_FIT', 'BEST_FIT'), ('FIRST_FIT_DECREASING', 'FIRST_FIT_DECREASING'), ('SPREAD', 'SPREAD')], default='SCORE', max_length=50),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0013_scheduler_placement_mode'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulerStatusSection',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(db_index=True)),
+                ('status', django.contrib.postgres.fields.jsonb.JSONField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'scheduler_status_section',
+            },
+        ),
+        migrations.AddField(
+            model_name='scheduler',
+            name='status_timestamp',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='scheduler',
+            name='status_version',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
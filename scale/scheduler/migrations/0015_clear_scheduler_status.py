@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0014_scheduler_status_sections'),
+    ]
+
+    operations = [
+        # The deprecated status column is no longer written, so its last (possibly large) value is cleared
+        migrations.RunSQL(
+            sql="UPDATE scheduler SET status = '{}'::jsonb",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -11,6 +11,13 @@ from queue.models import Queue, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
 
 logger = logging.getLogger(__name__)
 
+PLACEMENT_MODE_SCORE = 'SCORE'
+PLACEMENT_MODE_BEST_FIT = 'BEST_FIT'
+PLACEMENT_MODE_FIRST_FIT_DECREASING = 'FIRST_FIT_DECREASING'
+PLACEMENT_MODE_SPREAD = 'SPREAD'
+DEFAULT_PLACEMENT_MODE = PLACEMENT_MODE_SCORE
+
+
 class SchedulerManager(models.Manager):
     """Provides additional methods for handling scheduler db entry
     """
@@ -27,6 +34,24 @@ class SchedulerManager(models.Manager):
             logger.exception('Initial database import missing master scheduler: 1')
             raise
 
+    def get_status_sections(self, since_version=0):
+        """Returns the sections of the scheduler status JSON that have changed after the given status version
+
+        :param since_version: The status version, 0 to return all sections
+        :type since_version: int
+        :returns: A tuple of the current status version, the time the status was last generated (possibly None), and
+            the dict of changed sections stored by name. Each section is a tuple of the version in which it last
+            changed and its JSON contents, which are None if the section no longer exists.
+        :rtype: tuple
+        """
+
+        scheduler = self.all().only('status_version', 'status_timestamp').get(pk=1)
+        sections = {}
+        if scheduler.status_version > since_version:
+            for section in SchedulerStatusSection.objects.filter(version__gt=since_version).iterator():
+                sections[section.name] = (section.version, section.status)
+        return scheduler.status_version, scheduler.status_timestamp, sections
+
     def initialize_scheduler(self):
         """Initializes the scheduler table by creating a model if one does not already exist
         """
@@ -44,7 +69,7 @@ class SchedulerManager(models.Manager):
         """
         scheduler = None
         try:
-            scheduler = Scheduler.objects.get(pk=1)
+            scheduler = Scheduler.objects.all().defer('status').get(pk=1)
             return not scheduler.is_paused
         except Scheduler.DoesNotExist:
             logger.warning('Unable to check master scheduler status.')
@@ -60,6 +85,29 @@ class SchedulerManager(models.Manager):
 
         self.all().update(**new_data)
 
+    def update_status(self, changed_sections, when):
+        """Stores the given changed sections of the scheduler status JSON under a new status version, and records when
+        the status was generated. Unchanged sections are not rewritten.
+
+        :param changed_sections: The changed sections stored by name, a value of None removes the section
+        :type changed_sections: dict
+        :param when: The time the status was generated
+        :type when: :class:`datetime.datetime`
+        """
+
+        with transaction.atomic():
+            if not changed_sections:
+                self.all().update(status_timestamp=when)
+                return
+
+            scheduler = self.select_for_update().only('status_version').get(pk=1)
+            version = scheduler.status_version + 1
+            for name, section in changed_sections.items():
+                num_updated = SchedulerStatusSection.objects.filter(name=name).update(version=version, status=section)
+                if not num_updated:
+                    SchedulerStatusSection.objects.create(name=name, version=version, status=section)
+            self.all().update(status_version=version, status_timestamp=when)
+
     def update_master(self, hostname, port):
         """Update mesos master information.
 
@@ -132,6 +180,17 @@ class Scheduler(models.Model):
     :type is_paused: :class:`django.db.models.BooleanField()`
     :keyword num_message_handlers: The number of message handlers to have scheduled 
     :type num_message_handlers: :class:`django.db.models.IntegerField`
+    :keyword queue_mode: The mode determining how to order the queue (FIFO or LIFO)
+    :type queue_mode: :class:`django.db.models.CharField`
+    :keyword placement_mode: The strategy used to select the node on which each new job execution is placed
+    :type placement_mode: :class:`django.db.models.CharField`
+    :keyword status: Deprecated, the scheduler status JSON is now stored in
+        :class:`scheduler.models.SchedulerStatusSection` and this field is no longer updated
+    :type status: :class:`django.contrib.postgres.fields.JSONField`
+    :keyword status_version: The version of the scheduler status JSON, incremented whenever a section changes
+    :type status_version: :class:`django.db.models.BigIntegerField`
+    :keyword status_timestamp: When the scheduler status JSON was last generated
+    :type status_timestamp: :class:`django.db.models.DateTimeField`
     :keyword system_logging_level: The logging level for all scale system components
     :type system_logging_level: :class:`django.db.models.CharField`
     :keyword master_hostname: The full domain-qualified hostname of the Mesos master
@@ -144,11 +203,20 @@ class Scheduler(models.Model):
         (QUEUE_ORDER_FIFO, QUEUE_ORDER_FIFO),
         (QUEUE_ORDER_LIFO, QUEUE_ORDER_LIFO),
     )
+    PLACEMENT_MODES = (
+        (PLACEMENT_MODE_SCORE, PLACEMENT_MODE_SCORE),
+        (PLACEMENT_MODE_BEST_FIT, PLACEMENT_MODE_BEST_FIT),
+        (PLACEMENT_MODE_FIRST_FIT_DECREASING, PLACEMENT_MODE_FIRST_FIT_DECREASING),
+        (PLACEMENT_MODE_SPREAD, PLACEMENT_MODE_SPREAD),
+    )
 
     is_paused = models.BooleanField(default=False)
     num_message_handlers = models.IntegerField(default=1)
     queue_mode = models.CharField(choices=QUEUE_MODES, default=QUEUE_ORDER_FIFO, max_length=50)
+    placement_mode = models.CharField(choices=PLACEMENT_MODES, default=DEFAULT_PLACEMENT_MODE, max_length=50)
     status = django.contrib.postgres.fields.JSONField(default=dict)
+    status_version = models.BigIntegerField(default=0)
+    status_timestamp = models.DateTimeField(blank=True, null=True)
     master_hostname = models.CharField(max_length=250, default='localhost')
     master_port = models.IntegerField(default=5050)
     system_logging_level = models.CharField(max_length=10, default='INFO')
@@ -158,3 +226,24 @@ class Scheduler(models.Model):
     class Meta(object):
         """meta information for the db"""
         db_table = 'scheduler'
+
+
+class SchedulerStatusSection(models.Model):
+    """Represents one top-level section of the scheduler status JSON. Sections are only rewritten when they change, so
+    that clients can request just the sections that changed since a given status version.
+
+    :keyword name: The name of the section (its key in the status JSON)
+    :type name: :class:`django.db.models.CharField`
+    :keyword version: The status version in which this section last changed
+    :type version: :class:`django.db.models.BigIntegerField`
+    :keyword status: The JSON contents of the section, None if the section was removed
+    :type status: :class:`django.contrib.postgres.fields.JSONField`
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(db_index=True)
+    status = django.contrib.postgres.fields.JSONField(blank=True, null=True)
+
+    class Meta(object):
+        """meta information for the db"""
+        db_table = 'scheduler_status_section'
@@ -32,6 +32,7 @@ from scheduler.sync.job_type_manager import job_type_mgr
 from scheduler.sync.workspace_manager import workspace_mgr
 from scheduler.task.manager import task_update_mgr
 from scheduler.tasks.manager import system_task_mgr
+from scheduler.threads.job_load import JobLoadThread
 from scheduler.threads.messaging import MessagingThread
 from scheduler.threads.recon import ReconciliationThread
 from scheduler.threads.schedule import SchedulingThread
@@ -60,6 +61,7 @@ class ScaleScheduler(MesosScheduler):
         self._master_hostname = None
         self._master_port = None
 
+        self._job_load_thread = None
         self._messaging_thread = None
         self._recon_thread = None
         self._scheduler_status_thread = None
@@ -97,6 +99,11 @@ class ScaleScheduler(MesosScheduler):
         messaging_thread.daemon = True
         messaging_thread.start()
 
+        self._job_load_thread = JobLoadThread()
+        job_load_thread = threading.Thread(target=self._job_load_thread.run)
+        job_load_thread.daemon = True
+        job_load_thread.start()
+
         self._recon_thread = ReconciliationThread()
         recon_thread = threading.Thread(target=self._recon_thread.run)
         recon_thread.daemon = True
@@ -448,6 +455,7 @@ class ScaleScheduler(MesosScheduler):
         """
 
         logger.info('Scheduler shutdown invoked, stopping background threads')
+        self._job_load_thread.shutdown()
         self._messaging_thread.shutdown()
         self._recon_thread.shutdown()
         self._scheduler_status_thread.shutdown()
@@ -0,0 +1,290 @@
+"""Defines the harness that benchmarks the scheduling manager against simulated agents and a seeded queue"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import logging
+import random
+import time
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from job.configuration.interface.job_interface import JobInterface
+from job.execution.configuration.json.exe_config import ExecutionConfiguration
+from job.execution.manager import job_exe_mgr
+from job.models import Job, JobType, JobTypeRevision, TaskUpdate
+from job.tasks.manager import task_mgr
+from job.tasks.update import TaskStatusUpdate
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Disk, Mem
+from queue.models import Queue
+from scheduler.cleanup.manager import cleanup_mgr
+from scheduler.manager import scheduler_mgr
+from scheduler.models import Scheduler
+from scheduler.node.agent import Agent
+from scheduler.node.manager import node_mgr
+from scheduler.resources.manager import resource_mgr
+from scheduler.resources.offer import ResourceOffer
+from scheduler.scheduling.manager import SchedulingManager
+from scheduler.scheduling.profiler import LatencyHistogram
+from scheduler.sync.job_type_manager import job_type_mgr
+from scheduler.sync.workspace_manager import workspace_mgr
+from scheduler.tasks.manager import system_task_mgr
+from trigger.models import TriggerEvent
+
+# The framework ID the simulated scheduler registers with
+FRAMEWORK_ID = 'scale-benchmark'
+# The resources each simulated agent offers every cycle
+AGENT_CPUS = 32.0
+AGENT_MEM = 131072.0
+AGENT_DISK = 1048576.0
+# The choices of resources required by the seeded queued jobs
+JOB_CPUS = (0.5, 1.0, 2.0, 4.0)
+JOB_MEM = (256.0, 512.0, 1024.0, 4096.0)
+JOB_DISK = (100.0, 500.0, 2000.0)
+JOB_PRIORITIES = (1, 50, 100, 200)
+# The interface of the seeded job types
+JOB_INTERFACE = {'version': '1.4', 'command': 'benchmark_cmd', 'command_arguments': '', 'env_vars': [], 'mounts': [],
+                 'settings': [], 'input_data': [], 'output_data': [], 'shared_resources': []}
+# The most rounds of setup tasks run to make the nodes ready, each round finishes the tasks that are ready to launch
+MAX_SETUP_ROUNDS = 5
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedDriver(object):
+    """This class stands in for the Mesos scheduler driver, recording the launched tasks instead of sending them to a
+    Mesos master
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self.launched_offer_ids = set()
+        self.launched_task_count = 0
+
+    def launchTasks(self, offer_ids, tasks):
+        """Records the tasks launched with the given offers, see the Mesos scheduler driver
+
+        :param offer_ids: The IDs of the accepted offers
+        :type offer_ids: list
+        :param tasks: The Mesos tasks to launch
+        :type tasks: list
+        """
+
+        for offer_id in offer_ids:
+            self.launched_offer_ids.add(offer_id.value)
+        self.launched_task_count += len(tasks)
+
+
+class SchedulingBenchmark(object):
+    """This class benchmarks :meth:`scheduler.scheduling.manager.SchedulingManager.perform_scheduling` without a Mesos
+    master. It registers simulated agents with the node manager, seeds the queue with jobs of randomly chosen job types
+    and resources, and then runs scheduling cycles, offering the full resources of every agent before each cycle so
+    that the scheduler is measured instead of the capacity of the simulated cluster. Offers left unused by a cycle are
+    rescinded, as Mesos would. All database changes are rolled back when the benchmark finishes, so it should be run
+    against a scratch database that has been migrated.
+    """
+
+    def __init__(self, num_agents, num_job_types, num_jobs, num_cycles, seed=0):
+        """Constructor
+
+        :param num_agents: The number of simulated agents
+        :type num_agents: int
+        :param num_job_types: The number of job types to seed
+        :type num_job_types: int
+        :param num_jobs: The number of queued jobs to seed
+        :type num_jobs: int
+        :param num_cycles: The maximum number of scheduling cycles to run, fewer are run if the queue is emptied
+        :type num_cycles: int
+        :param seed: The seed for the random job types and resources
+        :type seed: int
+        """
+
+        self._num_agents = num_agents
+        self._num_job_types = num_job_types
+        self._num_jobs = num_jobs
+        self._num_cycles = num_cycles
+        self._random = random.Random(seed)
+
+        self._agents = []
+        self._offer_ids = set()
+
+    def run(self):
+        """Runs the benchmark and returns its results
+
+        :returns: The results with the number of cycles run, the number of jobs scheduled, the jobs scheduled per second
+            of scheduling time, the cycle latencies in seconds, and the mean number of database queries per cycle
+        :rtype: dict
+        """
+
+        try:
+            with transaction.atomic():
+                self._setup_cluster()
+                self._seed_queue()
+                results = self._run_cycles()
+                transaction.set_rollback(True)
+        finally:
+            self._clear_managers()
+
+        return results
+
+    def _clear_managers(self):
+        """Clears all of the in-memory scheduler state
+        """
+
+        job_exe_mgr.clear()
+        node_mgr.clear()
+        resource_mgr.clear()
+        task_mgr.clear()
+
+    def _complete_setup_tasks(self):
+        """Launches the database update task and the initial cleanup, health check, and image pull tasks of the nodes,
+        and finishes them with the same task updates that Mesos would send, so that the nodes become ready for new jobs
+        """
+
+        for _ in range(MAX_SETUP_ROUNDS):
+            when = now()
+            tasks = system_task_mgr.get_tasks_to_schedule(when)
+            for node in node_mgr.get_nodes():
+                tasks.extend(node.get_next_tasks(when))
+            if not tasks:
+                break
+
+            task_mgr.launch_tasks(tasks, when)
+            for status in ('TASK_RUNNING', 'TASK_FINISHED'):
+                for task in tasks:
+                    task_update_model = TaskUpdate(task_id=task.id, status=status, timestamp=now())
+                    task_update = TaskStatusUpdate(task_update_model, task.agent_id, {})
+                    task_mgr.handle_task_update(task_update)
+                    node_mgr.handle_task_update(task_update)
+                    system_task_mgr.handle_task_update(task_update)
+
+    def _offer_resources(self, cycle):
+        """Rescinds the offers left unused by the last cycle and offers the full resources of every agent
+
+        :param cycle: The number of the cycle about to run
+        :type cycle: int
+        """
+
+        if self._offer_ids:
+            resource_mgr.rescind_offers(list(self._offer_ids))
+
+        when = now()
+        offers = []
+        for agent in self._agents:
+            offer_id = '%s-offer-%d' % (agent.agent_id, cycle)
+            resources = NodeResources([Cpus(AGENT_CPUS), Mem(AGENT_MEM), Disk(AGENT_DISK)])
+            offers.append(ResourceOffer(offer_id, agent.agent_id, FRAMEWORK_ID, resources, when))
+        resource_mgr.add_new_offers(offers)
+        self._offer_ids = {offer.id for offer in offers}
+
+    def _run_cycles(self):
+        """Runs the scheduling cycles and returns the results
+
+        :returns: The results
+        :rtype: dict
+        """
+
+        manager = SchedulingManager()
+        driver = SimulatedDriver()
+        histogram = LatencyHistogram()
+        jobs_scheduled = 0
+        query_count = 0
+        scheduling_secs = 0.0
+
+        cycle = 0
+        while cycle < self._num_cycles and jobs_scheduled < self._num_jobs:
+            self._offer_resources(cycle)
+            running_count = len(job_exe_mgr.get_running_job_exes())
+
+            with CaptureQueriesContext(connection) as queries:
+                started = time.time()
+                manager.perform_scheduling(driver, now())
+                duration = time.time() - started
+
+            cycle_jobs_scheduled = len(job_exe_mgr.get_running_job_exes()) - running_count
+            logger.info('Benchmark cycle %d scheduled %d job(s) in %.3f seconds with %d queries', cycle,
+                        cycle_jobs_scheduled, duration, len(queries))
+            histogram.add_sample(duration)
+            jobs_scheduled += cycle_jobs_scheduled
+            query_count += len(queries)
+            scheduling_secs += duration
+            self._offer_ids -= driver.launched_offer_ids
+            cycle += 1
+
+        latency_dict = histogram.generate_status_json()
+        del latency_dict['count']
+        return {'num_agents': self._num_agents, 'num_cycles': cycle, 'jobs_scheduled': jobs_scheduled,
+                'jobs_per_sec': round(jobs_scheduled / scheduling_secs, 1) if scheduling_secs else 0.0,
+                'cycle_latency': latency_dict,
+                'queries_per_cycle': round(query_count / cycle, 1) if cycle else 0.0}
+
+    def _seed_queue(self):
+        """Creates the job types and queues the jobs
+        """
+
+        when = now()
+        event = TriggerEvent.objects.create_trigger_event('BENCHMARK', None, {'version': '1.0'}, when)
+        job_types = []
+        for i in range(self._num_job_types):
+            name = 'benchmark-job-type-%d' % i
+            version = '%d.0.0' % (JobType.objects.filter(name=name).count() + 1)
+            job_types.append(JobType.objects.create_job_type_v5(name, version, JobInterface(JOB_INTERFACE),
+                                                                priority=self._random.choice(JOB_PRIORITIES)))
+        job_type_revs = {}  # {Job type ID: Job type revision}
+        for job_type in job_types:
+            job_type_revs[job_type.id] = JobTypeRevision.objects.get_revision(job_type.name, job_type.version,
+                                                                              job_type.revision_num)
+
+        jobs = []
+        for _ in range(self._num_jobs):
+            job_type = self._random.choice(job_types)
+            job = Job.objects.create_job_v6(job_type_revs[job_type.id], event.id)
+            job.status = 'QUEUED'
+            job.num_exes = 1
+            job.input = {'version': '1.0', 'input_data': [], 'output_data': []}
+            job.input_file_size = 10.0
+            job.queued = when
+            job.last_status_change = when
+            jobs.append(job)
+        Job.objects.bulk_create(jobs, batch_size=1000)
+
+        configuration = ExecutionConfiguration().get_dict()
+        interfaces = {}  # {Job type ID: Job interface dict}
+        queues = []
+        for job in jobs:
+            if job.job_type_id not in interfaces:
+                interfaces[job.job_type_id] = job.get_job_interface().get_dict()
+            resources = NodeResources([Cpus(self._random.choice(JOB_CPUS)), Mem(self._random.choice(JOB_MEM)),
+                                       Disk(self._random.choice(JOB_DISK))])
+            queues.append(Queue(job_type_id=job.job_type_id, job_id=job.id, exe_num=job.num_exes,
+                                priority=self._random.choice(JOB_PRIORITIES), timeout=3600,
+                                input_file_size=job.input_file_size, interface=interfaces[job.job_type_id],
+                                configuration=configuration, resources=resources.get_json().get_dict(),
+                                queued=when))
+        Queue.objects.bulk_create(queues, batch_size=1000)
+
+        job_type_mgr.sync_with_database()
+
+    def _setup_cluster(self):
+        """Registers the simulated agents and marks their nodes ready to run new jobs
+        """
+
+        self._clear_managers()
+
+        Scheduler.objects.initialize_scheduler()
+        Scheduler.objects.update(num_message_handlers=0)  # Message handler tasks would compete with the jobs
+        scheduler_mgr.sync_with_database()
+        scheduler_mgr.update_from_mesos(framework_id=FRAMEWORK_ID)
+        workspace_mgr.sync_with_database()
+
+        self._agents = [Agent('benchmark-agent-%d' % i, 'benchmark-host-%d' % i) for i in range(self._num_agents)]
+        node_mgr.register_agents(self._agents)
+        node_mgr.sync_with_database(scheduler_mgr.config)
+
+        self._complete_setup_tasks()
+        cleanup_mgr.update_nodes(node_mgr.get_nodes())
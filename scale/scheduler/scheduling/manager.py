@@ -18,13 +18,15 @@ from job.models import Job, JobExecution, JobExecutionEnd
 from job.tasks.manager import task_mgr
 from mesos_api.tasks import create_mesos_task
 from node.resources.node_resources import NodeResources
-from queue.job_exe import QueuedJobExecution
 from queue.models import Queue
 from scheduler.cleanup.manager import cleanup_mgr
 from scheduler.manager import scheduler_mgr
 from scheduler.node.manager import node_mgr
 from scheduler.resources.agent import ResourceSet
 from scheduler.resources.manager import resource_mgr
+from scheduler.scheduling.placement import create_placement_strategy
+from scheduler.scheduling.profiler import scheduling_profiler
+from scheduler.scheduling.queue_index import QueueIndex
 from scheduler.scheduling.scheduling_node import SchedulingNode
 from scheduler.sync.job_type_manager import job_type_mgr
 from scheduler.sync.workspace_manager import workspace_mgr
@@ -55,6 +57,7 @@ class SchedulingManager(object):
         """Constructor
         """
 
+        self._queue_index = QueueIndex()
         self._waiting_tasks = {}  # {Task ID: int}
 
     def perform_scheduling(self, driver, when):
@@ -74,35 +77,41 @@ class SchedulingManager(object):
             # Don't schedule anything until the scheduler has connected to Mesos
             return 0
 
-        job_types = job_type_mgr.get_job_types()
-        job_type_resources = job_type_mgr.get_job_type_resources()
-        tasks = task_mgr.get_all_tasks()
-        running_job_exes = job_exe_mgr.get_running_job_exes()
-        workspaces = workspace_mgr.get_workspaces()
+        with scheduling_profiler.time_cycle():
+            job_types = job_type_mgr.get_job_types()
+            job_type_resources = job_type_mgr.get_job_type_resources()
+            tasks = task_mgr.get_all_tasks()
+            running_job_exes = job_exe_mgr.get_running_job_exes()
+            workspaces = workspace_mgr.get_workspaces()
 
-        nodes = self._prepare_nodes(tasks, running_job_exes, when)
-        fulfilled_nodes = self._schedule_waiting_tasks(nodes, running_job_exes, when)
+            with scheduling_profiler.time_phase('prepare_nodes'):
+                nodes = self._prepare_nodes(tasks, running_job_exes, when)
+            with scheduling_profiler.time_phase('schedule_waiting_tasks'):
+                fulfilled_nodes = self._schedule_waiting_tasks(nodes, running_job_exes, when)
 
-        sys_tasks_scheduled = self._schedule_system_tasks(fulfilled_nodes, job_type_resources, when)
+            with scheduling_profiler.time_phase('schedule_system_tasks'):
+                sys_tasks_scheduled = self._schedule_system_tasks(fulfilled_nodes, job_type_resources, when)
 
-        job_exe_count = 0
-        if sys_tasks_scheduled:
-            # Only schedule new job executions if all needed system tasks have been scheduled
-            job_type_limits = self._calculate_job_type_limits(job_types, running_job_exes)
-            job_exe_count = self._schedule_new_job_exes(framework_id, fulfilled_nodes, job_types, job_type_limits,
-                                                        job_type_resources, workspaces)
-        else:
-            # TODO: this is a good place for a scheduler warning in the status JSON
-            logger.warning('No new jobs scheduled due to waiting system tasks')
+            job_exe_count = 0
+            if sys_tasks_scheduled:
+                # Only schedule new job executions if all needed system tasks have been scheduled
+                job_type_limits = self._calculate_job_type_limits(job_types, running_job_exes)
+                job_exe_count = self._schedule_new_job_exes(framework_id, fulfilled_nodes, job_types,
+                                                            job_type_limits, job_type_resources, workspaces)
+            else:
+                # TODO: this is a good place for a scheduler warning in the status JSON
+                logger.warning('No new jobs scheduled due to waiting system tasks')
 
-        if framework_id != scheduler_mgr.framework_id:
-            logger.warning('Scheduler framework ID changed, skipping task launch')
-            return 0
+            if framework_id != scheduler_mgr.framework_id:
+                logger.warning('Scheduler framework ID changed, skipping task launch')
+                return 0
 
-        self._allocate_offers(nodes)
-        task_count, offer_count = self._launch_tasks(driver, nodes)
-        scheduler_mgr.add_scheduling_counts(job_exe_count, task_count, offer_count)
-        return task_count
+            with scheduling_profiler.time_phase('allocate_offers'):
+                self._allocate_offers(nodes)
+            with scheduling_profiler.time_phase('launch_tasks'):
+                task_count, offer_count = self._launch_tasks(driver, nodes)
+            scheduler_mgr.add_scheduling_counts(job_exe_count, task_count, offer_count)
+            return task_count
 
     def _allocate_offers(self, nodes):
         """Allocates resource offers to the node
@@ -293,8 +302,8 @@ class SchedulingManager(object):
         return scheduling_nodes
 
     def _process_queue(self, nodes, job_types, job_type_limits, job_type_resources, workspaces):
-        """Retrieves the top of the queue and schedules new job executions on available nodes as resources and limits
-        allow
+        """Syncs the queue index, walks the top of the queue, and schedules new job executions on available nodes as
+        resources and limits allow
 
         :param nodes: The dict of scheduling nodes stored by node ID for all nodes ready to accept new job executions
         :type nodes: dict
@@ -314,9 +323,11 @@ class SchedulingManager(object):
         ignore_job_type_ids = self._calculate_job_types_to_ignore(job_types, job_type_limits)
         started = now()
 
-        for queue in Queue.objects.get_queue(scheduler_mgr.config.queue_mode, ignore_job_type_ids)[:QUEUE_LIMIT]:
-            job_exe = QueuedJobExecution(queue)
-
+        self._queue_index.sync_with_database(scheduler_mgr.config.queue_mode, started)
+        strategy = create_placement_strategy(scheduler_mgr.config.placement_mode, nodes, job_type_resources)
+        job_exes = strategy.order_job_exes(self._queue_index.get_job_exes(ignore_job_type_ids, QUEUE_LIMIT))
+        considered_count = 0
+        for job_exe in job_exes:
             # Canceled job executions get processed as scheduled executions
             if job_exe.is_canceled:
                 scheduled_job_executions.append(job_exe)
@@ -327,7 +338,7 @@ class SchedulingManager(object):
                 break
 
             # Make sure execution's job type and workspaces have been synced to the scheduler
-            job_type_id = queue.job_type_id
+            job_type_id = job_exe.job_type_id
             if job_type_id not in job_types:
                 continue
             workspace_names = job_exe.configuration.get_input_workspace_names()
@@ -343,12 +354,14 @@ class SchedulingManager(object):
                 continue
 
             # Try to schedule job execution and adjust job type limit if needed
-            if self._schedule_new_job_exe(job_exe, nodes, job_type_resources):
+            considered_count += 1
+            if self._schedule_new_job_exe(job_exe, nodes, strategy):
                 scheduled_job_executions.append(job_exe)
                 if job_type_id in job_type_limits:
                     job_type_limits[job_type_id] -= 1
 
         duration = now() - started
+        scheduler_mgr.add_placement_counts(considered_count, duration)
         msg = 'Processing queue took %.3f seconds'
         if duration > PROCESS_QUEUE_WARN_THRESHOLD:
             logger.warning(msg, duration.total_seconds())
@@ -421,7 +434,7 @@ class SchedulingManager(object):
                 job_exe_mgr.add_canceled_job_exes(canceled_job_exe_end_models)
 
             # Delete queue models
-            Queue.objects.filter(id__in=queue_ids).delete()
+            Queue.objects.delete_queue_models(queue_ids)
 
         duration = now() - started
         msg = 'Queries to process scheduled jobs took %.3f seconds'
@@ -432,53 +445,32 @@ class SchedulingManager(object):
 
         return running_job_exes
 
-    def _schedule_new_job_exe(self, job_exe, nodes, job_type_resources):
+    def _schedule_new_job_exe(self, job_exe, nodes, strategy):
         """Schedules the given job execution on the queue on one of the available nodes, if possible
 
         :param job_exe: The job execution to schedule
         :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
         :param nodes: The dict of available scheduling nodes stored by node ID
         :type nodes: dict
-        :param job_type_resources: The list of all of the job type resource requirements
-        :type job_type_resources: list
+        :param strategy: The strategy that selects the node for the job execution
+        :type strategy: :class:`scheduler.scheduling.placement.PlacementStrategy`
         :returns: True if scheduled, False otherwise
         :rtype: bool
         """
 
-        best_scheduling_node = None
-        best_scheduling_score = None
-        best_reservation_node = None
-        best_reservation_score = None
-
-        for node in nodes.values():
-            # Check node for scheduling this job execution
-            score = node.score_job_exe_for_scheduling(job_exe, job_type_resources)
-            if score is not None:
-                # Job execution could be scheduled on this node, check its score
-                if best_scheduling_node is None or score < best_scheduling_score:
-                    # This is the best node for scheduling so far
-                    best_scheduling_node = node
-                    best_scheduling_score = score
-                    best_reservation_node = None  # No need to reserve a node if we can schedule the job execution
-                    best_reservation_score = None  # No need to reserve a node if we can schedule the job execution
-            if best_scheduling_node is None:
-                # No nodes yet to schedule this job execution on, check whether we should reserve this node
-                score = node.score_job_exe_for_reservation(job_exe, job_type_resources)
-                if score is not None:
-                    # Job execution could reserve this node, check its score
-                    if best_reservation_node is None or score < best_reservation_score:
-                        # This is the best node to reserve so far
-                        best_reservation_node = node
-                        best_reservation_score = score
-
-        # Schedule the job execution on the best node
-        if best_scheduling_node:
-            if best_scheduling_node.accept_new_job_exe(job_exe):
+        # Schedule the job execution on the node selected by the placement strategy
+        scheduling_node = strategy.select_node(job_exe)
+        if scheduling_node:
+            if scheduling_node.accept_new_job_exe(job_exe):
+                strategy.node_changed(scheduling_node)
                 return True
+            return False
 
-        # Could not schedule job execution, reserve a node to run this execution if possible
-        if best_reservation_node:
-            del nodes[best_reservation_node.node_id]
+        # Could not find a node for job execution, reserve a node to run this execution if possible
+        reservation_node = strategy.select_reservation_node(job_exe)
+        if reservation_node:
+            del nodes[reservation_node.node_id]
+            strategy.node_removed(reservation_node)
 
         return False
 
@@ -508,10 +500,13 @@ class SchedulingManager(object):
                 available_nodes[node.node_id] = node
 
         try:
-            scheduled_job_exes = self._process_queue(available_nodes, job_types, job_type_limits, job_type_resources,
-                                                     workspaces)
-            running_job_exes = self._process_scheduled_job_executions(framework_id, scheduled_job_exes, job_types,
-                                                                      workspaces)
+            with scheduling_profiler.time_phase('process_queue'):
+                scheduled_job_exes = self._process_queue(available_nodes, job_types, job_type_limits,
+                                                         job_type_resources, workspaces)
+            with scheduling_profiler.time_phase('process_scheduled_job_executions'):
+                running_job_exes = self._process_scheduled_job_executions(framework_id, scheduled_job_exes,
+                                                                          job_types, workspaces)
+            self._queue_index.remove_job_exes([job_exe.id for job_exe in scheduled_job_exes])
             all_running_job_exes = []
             for node_id in running_job_exes:
                 all_running_job_exes.extend(running_job_exes[node_id])
@@ -535,6 +530,8 @@ class SchedulingManager(object):
                             len(node_ids))
         except DatabaseError:
             logger.exception('Error occurred while scheduling new jobs from the queue')
+            # The queue table may have changed underneath the index (e.g. purged jobs), so fully reconcile next time
+            self._queue_index.invalidate()
             job_exe_count = 0
             for node in available_nodes.values():
                 node.reset_new_job_exes()
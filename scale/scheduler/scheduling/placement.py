@@ -0,0 +1,210 @@
+"""Defines the strategies that select the node on which a new job execution is placed"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from node.resources.node_resources import NodeResourcesBatch
+from scheduler.models import PLACEMENT_MODE_BEST_FIT, PLACEMENT_MODE_FIRST_FIT_DECREASING, PLACEMENT_MODE_SPREAD
+
+
+def create_placement_strategy(placement_mode, nodes, job_type_resources):
+    """Creates and returns the placement strategy for the given placement mode
+
+    :param placement_mode: The placement mode from the scheduler configuration
+    :type placement_mode: string
+    :param nodes: The dict of available scheduling nodes stored by node ID
+    :type nodes: dict
+    :param job_type_resources: The list of all of the job type resource requirements
+    :type job_type_resources: list
+    :returns: The placement strategy
+    :rtype: :class:`scheduler.scheduling.placement.PlacementStrategy`
+    """
+
+    if placement_mode == PLACEMENT_MODE_BEST_FIT:
+        return BestFitPlacementStrategy(nodes, job_type_resources)
+    elif placement_mode == PLACEMENT_MODE_SPREAD:
+        return SpreadPlacementStrategy(nodes, job_type_resources)
+    elif placement_mode == PLACEMENT_MODE_FIRST_FIT_DECREASING:
+        return FirstFitDecreasingPlacementStrategy(nodes, job_type_resources)
+    return ScorePlacementStrategy(nodes, job_type_resources)
+
+
+class PlacementStrategy(object):
+    """Abstract base class for a strategy that selects the node on which a new job execution is placed. A strategy is
+    created for a single pass over the queue and must be told when nodes change or are removed.
+    """
+
+    def __init__(self, nodes, job_type_resources):
+        """Constructor
+
+        :param nodes: The dict of available scheduling nodes stored by node ID
+        :type nodes: dict
+        :param job_type_resources: The list of all of the job type resource requirements
+        :type job_type_resources: list
+        """
+
+        self._nodes = nodes
+        self._job_type_resources = job_type_resources
+
+    def node_changed(self, node):
+        """Indicates that the remaining resources of the given node have changed
+
+        :param node: The scheduling node
+        :type node: :class:`scheduler.scheduling.scheduling_node.SchedulingNode`
+        """
+
+        pass
+
+    def node_removed(self, node):
+        """Indicates that the given node is no longer available for placement
+
+        :param node: The scheduling node
+        :type node: :class:`scheduler.scheduling.scheduling_node.SchedulingNode`
+        """
+
+        pass
+
+    def order_job_exes(self, job_exes):
+        """Returns the given queued job executions in the order in which they should be placed. By default the queue
+        order is kept.
+
+        :param job_exes: The queued job executions in queue order
+        :type job_exes: [:class:`queue.job_exe.QueuedJobExecution`]
+        :returns: The queued job executions in placement order
+        :rtype: [:class:`queue.job_exe.QueuedJobExecution`]
+        """
+
+        return job_exes
+
+    def select_node(self, job_exe):
+        """Returns the node on which the given job execution should be scheduled, possibly None
+
+        :param job_exe: The job execution to place
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :returns: The scheduling node, possibly None
+        :rtype: :class:`scheduler.scheduling.scheduling_node.SchedulingNode`
+        """
+
+        raise NotImplementedError()
+
+    def select_reservation_node(self, job_exe):
+        """Returns the best node for the given job execution to reserve (temporarily blocking additional job executions
+        of lower priority), possibly None. This is only called when the job execution could not be scheduled.
+
+        :param job_exe: The job execution that could not be scheduled
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :returns: The scheduling node to reserve, possibly None
+        :rtype: :class:`scheduler.scheduling.scheduling_node.SchedulingNode`
+        """
+
+        best_reservation_node = None
+        best_reservation_score = None
+        for node in self._nodes.values():
+            score = node.score_job_exe_for_reservation(job_exe, self._job_type_resources)
+            if score is not None:
+                if best_reservation_node is None or score < best_reservation_score:
+                    best_reservation_node = node
+                    best_reservation_score = score
+        return best_reservation_node
+
+    def _get_sufficient_nodes(self, resources):
+        """Returns the available nodes that have sufficient remaining resources to meet the given resources
+
+        :param resources: The required resources
+        :type resources: :class:`node.resources.node_resources.NodeResources`
+        :returns: The list of scheduling nodes
+        :rtype: [:class:`scheduler.scheduling.scheduling_node.SchedulingNode`]
+        """
+
+        return [node for node in self._nodes.values() if node.remaining_resources.is_sufficient_to_meet(resources)]
+
+
+class ScorePlacementStrategy(PlacementStrategy):
+    """Scores every node and selects the one that leaves the fewest job types able to fit, reducing fragmentation. This
+    is the original scheduling heuristic and the most thorough. The remaining resources of all nodes are kept in a
+    :class:`node.resources.node_resources.NodeResourcesBatch` so that only the nodes able to fit the job execution are
+    scored.
+    """
+
+    def __init__(self, nodes, job_type_resources):
+        """See :meth:`scheduler.scheduling.placement.PlacementStrategy.__init__`
+        """
+
+        super(ScorePlacementStrategy, self).__init__(nodes, job_type_resources)
+        self._node_list = list(nodes.values())
+        self._rows = {node.node_id: row for row, node in enumerate(self._node_list)}  # {Node ID: row}
+        self._batch = NodeResourcesBatch([node.remaining_resources for node in self._node_list])
+
+    def node_changed(self, node):
+        """See :meth:`scheduler.scheduling.placement.PlacementStrategy.node_changed`
+        """
+
+        self._batch.update(self._rows[node.node_id], node.remaining_resources)
+
+    def select_node(self, job_exe):
+        """See :meth:`scheduler.scheduling.placement.PlacementStrategy.select_node`
+        """
+
+        best_scheduling_node = None
+        best_scheduling_score = None
+        for row in self._batch.get_sufficient_rows(job_exe.required_resources):
+            node = self._node_list[row]
+            if node.node_id not in self._nodes:
+                continue  # Node was reserved
+            score = node.score_job_exe_for_scheduling(job_exe, self._job_type_resources)
+            if score is not None:
+                if best_scheduling_node is None or score < best_scheduling_score:
+                    best_scheduling_node = node
+                    best_scheduling_score = score
+        return best_scheduling_node
+
+
+class BestFitPlacementStrategy(PlacementStrategy):
+    """Selects the node with the least remaining resources that can still fit the job execution, packing nodes tightly
+    """
+
+    def select_node(self, job_exe):
+        """See :meth:`scheduler.scheduling.placement.PlacementStrategy.select_node`
+        """
+
+        nodes = self._get_sufficient_nodes(job_exe.required_resources)
+        return min(nodes, key=_get_remaining_key) if nodes else None
+
+
+class FirstFitDecreasingPlacementStrategy(BestFitPlacementStrategy):
+    """Places the largest job executions of each priority level first, each on the tightest node that fits. Queue order
+    is only changed within a priority level, so higher priority job executions are still placed first.
+    """
+
+    def order_job_exes(self, job_exes):
+        """See :meth:`scheduler.scheduling.placement.PlacementStrategy.order_job_exes`
+        """
+
+        def placement_key(job_exe):
+            resources = job_exe.required_resources
+            return job_exe.priority, -resources.cpus, -resources.mem, -resources.disk
+
+        return sorted(job_exes, key=placement_key)
+
+
+class SpreadPlacementStrategy(PlacementStrategy):
+    """Selects the node with the most remaining resources, spreading job executions evenly across the cluster"""
+
+    def select_node(self, job_exe):
+        """See :meth:`scheduler.scheduling.placement.PlacementStrategy.select_node`
+        """
+
+        nodes = self._get_sufficient_nodes(job_exe.required_resources)
+        return max(nodes, key=_get_remaining_key) if nodes else None
+
+
+def _get_remaining_key(node):
+    """Returns the key that orders scheduling nodes by their remaining CPUs, then memory, then disk, and then node ID
+
+    :param node: The scheduling node
+    :type node: :class:`scheduler.scheduling.scheduling_node.SchedulingNode`
+    :returns: The sort key
+    :rtype: tuple
+    """
+
+    remaining = node.remaining_resources
+    return remaining.cpus, remaining.mem, remaining.disk, node.node_id
@@ -0,0 +1,237 @@
+"""Defines the classes that profile the phases of each scheduling cycle"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import cProfile
+import datetime
+import logging
+import pstats
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.utils.timezone import now
+
+# Number of most recent samples kept for each phase
+WINDOW_SIZE = 500
+# Minimum time between two profiled cycles, so that a scheduler that is consistently slow is not profiled every cycle
+PROFILE_MIN_INTERVAL = datetime.timedelta(minutes=5)
+# Number of functions logged from a cycle profile
+PROFILE_NUM_FUNCTIONS = 25
+
+# The phases of a scheduling cycle, in order
+PHASES = ('prepare_nodes', 'schedule_waiting_tasks', 'schedule_system_tasks', 'process_queue',
+          'process_scheduled_job_executions', 'allocate_offers', 'launch_tasks')
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram(object):
+    """This class keeps a rolling window of the most recent latency samples and calculates their percentiles. This
+    class is NOT thread-safe.
+    """
+
+    def __init__(self, window_size=WINDOW_SIZE):
+        """Constructor
+
+        :param window_size: The number of most recent samples to keep
+        :type window_size: int
+        """
+
+        self._count = 0  # Number of samples added in total
+        self._samples = deque(maxlen=window_size)
+
+    def add_sample(self, duration):
+        """Adds a latency sample
+
+        :param duration: The latency in seconds
+        :type duration: float
+        """
+
+        self._count += 1
+        self._samples.append(duration)
+
+    def generate_status_json(self):
+        """Returns the JSON that describes the samples in the current window, all latencies are in seconds
+
+        :returns: The JSON dict
+        :rtype: dict
+        """
+
+        samples = sorted(self._samples)
+        status_dict = {'count': self._count}
+        if not samples:
+            for name in ('last', 'mean', 'p50', 'p95', 'p99', 'max'):
+                status_dict[name] = None
+            return status_dict
+
+        status_dict['last'] = round(self._samples[-1], 4)
+        status_dict['mean'] = round(sum(samples) / len(samples), 4)
+        status_dict['p50'] = round(self._percentile(samples, 50), 4)
+        status_dict['p95'] = round(self._percentile(samples, 95), 4)
+        status_dict['p99'] = round(self._percentile(samples, 99), 4)
+        status_dict['max'] = round(samples[-1], 4)
+        return status_dict
+
+    @staticmethod
+    def _percentile(sorted_samples, percent):
+        """Returns the given percentile of the sorted samples using the nearest-rank method
+
+        :param sorted_samples: The samples in ascending order, must not be empty
+        :type sorted_samples: list
+        :param percent: The percentile in the range 1-100
+        :type percent: int
+        :returns: The sample at the percentile
+        :rtype: float
+        """
+
+        rank = -(-percent * len(sorted_samples) // 100)  # Ceiling division
+        return sorted_samples[max(rank, 1) - 1]
+
+
+class SchedulingProfiler(object):
+    """This class records the duration of each phase of the scheduling cycles. When the SCHEDULING_PROFILE_THRESHOLD
+    setting is set, a cycle slower than the threshold causes the next cycle to be run under cProfile and its hottest
+    functions to be logged. Cycles and phases must only be timed within the scheduling thread, but this class is
+    thread-safe.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._lock = threading.Lock()
+        self._cycle_histogram = LatencyHistogram()
+        self._phase_histograms = {phase: LatencyHistogram() for phase in PHASES}
+        self._slow_cycle_count = 0  # Number of cycles slower than the profile threshold
+        self._profiled_cycle_count = 0  # Number of cycles that were profiled
+
+        # Only used within the scheduling thread
+        self._last_profiled = None  # When the last profiled cycle finished
+        self._profile_next_cycle = False
+
+    def generate_status_json(self, status_dict):
+        """Generates the portion of the status JSON that describes the scheduling cycle latencies
+
+        :param status_dict: The status JSON dict
+        :type status_dict: dict
+        """
+
+        with self._lock:
+            cycle_dict = self._cycle_histogram.generate_status_json()
+            phases_dict = {phase: histogram.generate_status_json() for phase, histogram in
+                           self._phase_histograms.items()}
+            slow_cycle_count = self._slow_cycle_count
+            profiled_cycle_count = self._profiled_cycle_count
+
+        status_dict['scheduling'] = {'cycle': cycle_dict, 'phases': phases_dict, 'slow_cycles': slow_cycle_count,
+                                     'profiled_cycles': profiled_cycle_count}
+
+    @contextmanager
+    def time_cycle(self):
+        """Context manager that times a scheduling cycle, profiling it if a previous cycle was slow
+        """
+
+        profile = None
+        if self._profile_next_cycle:
+            self._profile_next_cycle = False
+            profile = cProfile.Profile()
+            profile.enable()
+
+        started = now()
+        try:
+            yield
+        finally:
+            duration = (now() - started).total_seconds()
+            if profile:
+                profile.disable()
+                self._log_profile(profile, duration)
+            self._finish_cycle(duration, was_profiled=profile is not None)
+
+    @contextmanager
+    def time_phase(self, phase):
+        """Context manager that times a phase of the current scheduling cycle
+
+        :param phase: The name of the phase, one of PHASES
+        :type phase: string
+        """
+
+        started = now()
+        try:
+            yield
+        finally:
+            duration = (now() - started).total_seconds()
+            with self._lock:
+                self._phase_histograms[phase].add_sample(duration)
+
+    def _finish_cycle(self, duration, was_profiled):
+        """Records a finished cycle and determines whether the next cycle should be profiled
+
+        :param duration: The duration of the cycle in seconds
+        :type duration: float
+        :param was_profiled: Whether the cycle was profiled
+        :type was_profiled: bool
+        """
+
+        when = now()
+        threshold = settings.SCHEDULING_PROFILE_THRESHOLD
+        is_slow = threshold is not None and duration > threshold
+
+        with self._lock:
+            self._cycle_histogram.add_sample(duration)
+            if is_slow:
+                self._slow_cycle_count += 1
+            if was_profiled:
+                self._profiled_cycle_count += 1
+
+        if was_profiled:
+            self._last_profiled = when
+        elif is_slow:
+            if self._last_profiled is None or when - self._last_profiled >= PROFILE_MIN_INTERVAL:
+                logger.warning('Scheduling cycle took %.3f seconds, profiling the next cycle', duration)
+                self._profile_next_cycle = True
+
+    def _log_profile(self, profile, duration):
+        """Logs the functions that took the most time in a profiled cycle
+
+        :param profile: The profile of the cycle
+        :type profile: :class:`cProfile.Profile`
+        :param duration: The duration of the cycle in seconds
+        :type duration: float
+        """
+
+        try:
+            stats = pstats.Stats(profile, stream=_LogStream())
+            stats.sort_stats('cumulative')
+            logger.warning('Profile of scheduling cycle that took %.3f seconds:', duration)
+            stats.print_stats(PROFILE_NUM_FUNCTIONS)
+        except Exception:
+            logger.exception('Error logging scheduling cycle profile')
+
+
+class _LogStream(object):
+    """File-like object that logs each line written to it"""
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._buffer = ''
+
+    def write(self, text):
+        """Logs each complete line of the given text
+
+        :param text: The text to write
+        :type text: string
+        """
+
+        self._buffer += text
+        while '\n' in self._buffer:
+            line, self._buffer = self._buffer.split('\n', 1)
+            if line.strip():
+                logger.warning(line)
+
+
+scheduling_profiler = SchedulingProfiler()
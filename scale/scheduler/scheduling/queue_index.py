@@ -0,0 +1,269 @@
+"""Defines the class that maintains the scheduler's in-memory index of the queue"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import bisect
+import datetime
+import heapq
+import logging
+
+from django.db.models import Max
+from django.utils.timezone import utc
+
+from queue.job_exe import QueuedJobExecution
+from queue.models import Queue, QUEUE_ORDER_LIFO
+
+# How often the index is fully reconciled against the queue table
+FULL_SYNC_PERIOD = datetime.timedelta(seconds=30)
+# Maximum number of queue models to retrieve in a single query when loading the index
+LOAD_BATCH_SIZE = 1000
+# Maximum number of queue models loaded from the top of the queue by a full sync, the rest of the queue is loaded by
+# later full syncs as the top of the queue is scheduled
+MAX_INDEX_SIZE = 50000
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=utc)
+
+logger = logging.getLogger(__name__)
+
+
+class QueueIndex(object):
+    """This class maintains an in-memory index of the queued job executions, ordered by priority and then queued time.
+    Each queue model is retrieved and converted into a :class:`queue.job_exe.QueuedJobExecution` once and each
+    scheduling cycle is handed fresh, unscheduled copies of them. The index is kept in sync incrementally: new queue
+    models are pulled by ascending ID and canceled flags are refreshed. The queue models handed out each cycle are
+    checked against the database first, so models deleted by other processes are dropped before they can be scheduled.
+    A periodic full reconciliation removes every deleted model and loads the top of the queue (at most MAX_INDEX_SIZE
+    models), picking up any models that were committed out of ID order. This class is NOT thread-safe and should only be
+    used within the scheduling thread.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._job_exes = {}  # {Queue ID: QueuedJobExecution}
+        self._keys = {}  # {Queue ID: (Job Type ID, sort key)}
+        self._keys_by_job_type = {}  # {Job Type ID: Sorted list of sort keys}
+        self._is_partial = False  # Whether the last full sync left part of the queue unloaded
+        self._last_full_sync = None
+        self._max_queue_id = 0
+        self._order_mode = None
+
+    @property
+    def count(self):
+        """Returns the number of queued job executions in the index
+
+        :returns: The number of queued job executions
+        :rtype: int
+        """
+
+        return len(self._job_exes)
+
+    def get_job_exes(self, ignore_job_type_ids=None, limit=None):
+        """Returns copies of the queued job executions at the top of the queue in scheduling order. The queue models of
+        the returned executions are first checked against the database: deleted models are removed from the index and
+        canceled flags are refreshed.
+
+        :param ignore_job_type_ids: The set of job type IDs to ignore
+        :type ignore_job_type_ids: set
+        :param limit: The maximum number of queued job executions to return, possibly None for no limit
+        :type limit: int
+        :returns: The list of queued job executions
+        :rtype: [:class:`queue.job_exe.QueuedJobExecution`]
+        """
+
+        queue_ids = self._get_top_queue_ids(ignore_job_type_ids, limit)
+        # Replace any deleted executions with the next ones in the queue
+        while self._reconcile(queue_ids):
+            queue_ids = self._get_top_queue_ids(ignore_job_type_ids, limit)
+
+        if self._is_partial and limit is not None and self.count < limit:
+            # The loaded part of the queue is running low, load more of the queue on the next sync
+            self.invalidate()
+
+        return [self._job_exes[queue_id].copy() for queue_id in queue_ids]
+
+    def invalidate(self):
+        """Forces a full reconciliation with the database on the next sync
+        """
+
+        self._last_full_sync = None
+
+    def remove_job_exes(self, queue_ids):
+        """Removes the queued job executions with the given queue IDs from the index
+
+        :param queue_ids: The queue IDs to remove
+        :type queue_ids: list
+        """
+
+        for queue_id in queue_ids:
+            if queue_id not in self._job_exes:
+                continue
+            del self._job_exes[queue_id]
+            job_type_id, key = self._keys.pop(queue_id)
+            keys = self._keys_by_job_type[job_type_id]
+            index = bisect.bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                del keys[index]
+            if not keys:
+                del self._keys_by_job_type[job_type_id]
+
+    def sync_with_database(self, order_mode, when):
+        """Syncs the index with the queue table in the database
+
+        :param order_mode: The mode determining how to order the queue (FIFO or LIFO)
+        :type order_mode: string
+        :param when: The current time
+        :type when: :class:`datetime.datetime`
+        """
+
+        if order_mode != self._order_mode:
+            self._order_mode = order_mode
+            self._rebuild_keys()
+
+        if self._last_full_sync is None or when - self._last_full_sync >= FULL_SYNC_PERIOD:
+            self._full_sync()
+            self._last_full_sync = when
+        else:
+            self._incremental_sync()
+
+    def _add_queue_models(self, queues):
+        """Adds the given queue models to the index
+
+        :param queues: The queue models
+        :type queues: iterator
+        """
+
+        for queue in queues:
+            if queue.id in self._job_exes:
+                continue
+            job_exe = QueuedJobExecution(queue)
+            self._job_exes[queue.id] = job_exe
+            self._insert_key(job_exe)
+            self._max_queue_id = max(self._max_queue_id, queue.id)
+
+    def _create_key(self, job_exe):
+        """Creates the sort key for the given queued job execution using the current order mode
+
+        :param job_exe: The queued job execution
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        :returns: The sort key
+        :rtype: tuple
+        """
+
+        queued = (job_exe.queued - EPOCH).total_seconds()
+        if self._order_mode == QUEUE_ORDER_LIFO:
+            queued = -queued
+        return job_exe.priority, queued, job_exe.id
+
+    def _full_sync(self):
+        """Reconciles the entire index against the queue table and loads the top of the queue
+        """
+
+        self._reconcile(list(self._job_exes.keys()))
+
+        # Newer queue models are pulled by incremental syncs, even when they are not loaded from the top of the queue
+        max_queue_id = Queue.objects.aggregate(Max('id'))['id__max']
+        if max_queue_id:
+            self._max_queue_id = max(self._max_queue_id, max_queue_id)
+
+        top_ids = list(Queue.objects.get_queue(self._order_mode).values_list('id', flat=True)[:MAX_INDEX_SIZE + 1])
+        self._is_partial = len(top_ids) > MAX_INDEX_SIZE
+        missing_ids = sorted(queue_id for queue_id in top_ids[:MAX_INDEX_SIZE] if queue_id not in self._job_exes)
+        for i in range(0, len(missing_ids), LOAD_BATCH_SIZE):
+            self._add_queue_models(Queue.objects.filter(id__in=missing_ids[i:i + LOAD_BATCH_SIZE]).iterator())
+
+    def _get_top_queue_ids(self, ignore_job_type_ids, limit):
+        """Returns the queue IDs at the top of the queue in scheduling order
+
+        :param ignore_job_type_ids: The set of job type IDs to ignore
+        :type ignore_job_type_ids: set
+        :param limit: The maximum number of queue IDs to return, possibly None for no limit
+        :type limit: int
+        :returns: The list of queue IDs
+        :rtype: list
+        """
+
+        key_lists = []
+        for job_type_id, keys in self._keys_by_job_type.items():
+            if not ignore_job_type_ids or job_type_id not in ignore_job_type_ids:
+                key_lists.append(keys)
+
+        # Each job type's keys are already sorted, so a heap merge walks the queue in order without a full sort
+        queue_ids = []
+        for key in heapq.merge(*key_lists):
+            if limit is not None and len(queue_ids) >= limit:
+                break
+            queue_ids.append(key[-1])
+        return queue_ids
+
+    def _incremental_sync(self):
+        """Pulls newly queued job executions and canceled flags from the queue table
+        """
+
+        self._add_queue_models(Queue.objects.filter(id__gt=self._max_queue_id).order_by('id').iterator())
+        self._mark_canceled(Queue.objects.filter(is_canceled=True).values_list('id', flat=True))
+
+    def _insert_key(self, job_exe):
+        """Inserts the sort key for the given queued job execution
+
+        :param job_exe: The queued job execution
+        :type job_exe: :class:`queue.job_exe.QueuedJobExecution`
+        """
+
+        key = self._create_key(job_exe)
+        self._keys[job_exe.id] = (job_exe.job_type_id, key)
+        if job_exe.job_type_id in self._keys_by_job_type:
+            bisect.insort(self._keys_by_job_type[job_exe.job_type_id], key)
+        else:
+            self._keys_by_job_type[job_exe.job_type_id] = [key]
+
+    def _mark_canceled(self, queue_ids):
+        """Marks the queued job executions with the given queue IDs as canceled
+
+        :param queue_ids: The queue IDs of the canceled executions
+        :type queue_ids: iterator
+        """
+
+        for queue_id in queue_ids:
+            if queue_id in self._job_exes:
+                self._job_exes[queue_id].is_canceled = True
+
+    def _reconcile(self, queue_ids):
+        """Checks the given indexed queue IDs against the queue table, removing the executions whose queue models have
+        been deleted and marking the ones that have been canceled
+
+        :param queue_ids: The queue IDs to check
+        :type queue_ids: list
+        :returns: True if any executions were removed, False otherwise
+        :rtype: bool
+        """
+
+        current_ids = set()
+        canceled_ids = []
+        for i in range(0, len(queue_ids), LOAD_BATCH_SIZE):
+            qry = Queue.objects.filter(id__in=queue_ids[i:i + LOAD_BATCH_SIZE]).values_list('id', 'is_canceled')
+            for queue_id, is_canceled in qry:
+                current_ids.add(queue_id)
+                if is_canceled:
+                    canceled_ids.append(queue_id)
+        self._mark_canceled(canceled_ids)
+
+        removed_ids = [queue_id for queue_id in queue_ids if queue_id not in current_ids]
+        if removed_ids:
+            logger.info('Removing %d deleted queued job execution(s) from the queue index', len(removed_ids))
+            self.remove_job_exes(removed_ids)
+        return bool(removed_ids)
+
+    def _rebuild_keys(self):
+        """Rebuilds all of the sort keys, needed when the order mode changes
+        """
+
+        self._keys = {}
+        self._keys_by_job_type = {}
+        for job_exe in self._job_exes.values():
+            key = self._create_key(job_exe)
+            self._keys[job_exe.id] = (job_exe.job_type_id, key)
+            self._keys_by_job_type.setdefault(job_exe.job_type_id, []).append(key)
+        for keys in self._keys_by_job_type.values():
+            keys.sort()
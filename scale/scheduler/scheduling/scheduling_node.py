@@ -53,6 +53,17 @@ class SchedulingNode(object):
         self._task_resources = resource_set.task_resources
         self._watermark_resources = resource_set.watermark_resources
 
+    @property
+    def remaining_resources(self):
+        """Returns the resources on this node that are still available for scheduling. The returned resources must
+        not be modified.
+
+        :returns: The remaining resources
+        :rtype: :class:`node.resources.node_resources.NodeResources`
+        """
+
+        return self._remaining_resources
+
     def accept_job_exe_next_task(self, job_exe, waiting_tasks):
         """Asks the node if it can accept the next task for the given job execution. If the next task is waiting on
         resources, the task is added to the given waiting list. This should be used for job executions that have already
@@ -0,0 +1,77 @@
+"""Defines the cache that keeps a copy of the scheduler status JSON within each web server process"""
+from __future__ import unicode_literals
+
+import threading
+
+from django.utils.timezone import now
+
+from scheduler.models import Scheduler
+
+# The scheduler is considered offline if its status JSON is older than this threshold
+STATUS_FRESHNESS_THRESHOLD = 12.0  # seconds
+
+
+def is_status_fresh(status_timestamp):
+    """Indicates whether the scheduler status was generated recently. If not, the scheduler is assumed to be down.
+
+    :param status_timestamp: When the status was last generated, possibly None
+    :type status_timestamp: :class:`datetime.datetime`
+    :returns: True if the status is fresh, False otherwise
+    :rtype: bool
+    """
+
+    if not status_timestamp:  # Status has never been generated
+        return False
+    return (now() - status_timestamp).total_seconds() <= STATUS_FRESHNESS_THRESHOLD
+
+
+class SchedulerStatusCache(object):
+    """This class caches the sections of the scheduler status JSON along with their status versions. Each request only
+    reads the current status version from the database, plus the sections that changed since the cached version, so the
+    full status is never re-read while it stays unchanged. This class is thread-safe.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        self._lock = threading.Lock()
+        self._version = 0
+        self._sections = {}  # {Section name: (Version, JSON section)}
+
+    def clear(self):
+        """Clears the cache
+        """
+
+        with self._lock:
+            self._version = 0
+            self._sections = {}
+
+    def get_status(self, since_version=0):
+        """Returns the scheduler status sections that changed after the given status version
+
+        :param since_version: The status version already known by the client, 0 to return all sections
+        :type since_version: int
+        :returns: A tuple of the current status version, the time the status was last generated (possibly None), and
+            the dict of changed sections stored by name. A section that was removed after since_version has a value of
+            None, removed sections are not included when since_version is 0.
+        :rtype: tuple
+        """
+
+        with self._lock:
+            version, timestamp, changed_sections = Scheduler.objects.get_status_sections(self._version)
+            if version < self._version:
+                # The status versions were reset, so reload everything
+                version, timestamp, changed_sections = Scheduler.objects.get_status_sections()
+                self._sections = {}
+            self._sections.update(changed_sections)
+            self._version = version
+
+            sections = {}
+            for name, (section_version, section) in self._sections.items():
+                if section_version > since_version and (section is not None or since_version):
+                    sections[name] = section
+            return version, timestamp, sections
+
+
+status_cache = SchedulerStatusCache()
@@ -1,6 +1,8 @@
 """Defines the class for a message handler task"""
 from __future__ import unicode_literals
 
+from django.conf import settings
+
 from job.tasks.base_task import AtomicCounter
 from node.resources.node_resources import NodeResources
 from node.resources.resource import Cpus, Mem
@@ -28,7 +30,8 @@ class MessageHandlerTask(SystemTask):
 
         self._add_database_docker_params()
         self._add_messaging_docker_params()
-        self._command_arguments = 'scale_message_handler'
+        self._command_arguments = 'scale_message_handler --workers %d --batch-size %d' % (
+            settings.MESSAGE_HANDLER_WORKERS, settings.MESSAGE_HANDLER_BATCH_SIZE)
 
         # System task properties
         self.task_type = 'message-handler'
@@ -39,4 +42,5 @@ class MessageHandlerTask(SystemTask):
         """See :meth:`job.tasks.base_task.Task.get_resources`
         """
 
-        return NodeResources([Cpus(0.5), Mem(512.0)])
+        # Each additional worker thread gets its share of a CPU
+        return NodeResources([Cpus(0.5 * settings.MESSAGE_HANDLER_WORKERS), Mem(512.0)])
@@ -64,5 +64,7 @@ class SystemTask(Task):
             messaging_params.append(DockerParameter('env', 'SCALE_BROKER_URL=%s' % broker_url))
         if queue_name:
             messaging_params.append(DockerParameter('env', 'SCALE_QUEUE_NAME=%s' % queue_name))
+        messaging_params.append(DockerParameter('env', 'SCALE_MESSAGE_ENVELOPE_VERSION=%d' %
+                                                settings.MESSAGE_ENVELOPE_VERSION))
 
         self._docker_params.extend(messaging_params)
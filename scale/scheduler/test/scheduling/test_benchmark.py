@@ -0,0 +1,38 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+
+from error.models import reset_error_cache
+from job.models import Job
+from queue.models import Queue
+from scheduler.node.manager import node_mgr
+from scheduler.scheduling.benchmark import SchedulingBenchmark
+
+
+class TestSchedulingBenchmark(TestCase):
+
+    fixtures = ['basic_job_errors.json']
+
+    def setUp(self):
+        django.setup()
+
+        reset_error_cache()
+
+    def test_run(self):
+        """Tests running a small benchmark"""
+
+        benchmark = SchedulingBenchmark(num_agents=2, num_job_types=2, num_jobs=10, num_cycles=3)
+        results = benchmark.run()
+
+        self.assertEqual(results['num_agents'], 2)
+        self.assertEqual(results['jobs_scheduled'], 10)
+        self.assertGreaterEqual(results['num_cycles'], 1)
+        self.assertGreater(results['queries_per_cycle'], 0)
+        self.assertIsNotNone(results['cycle_latency']['p99'])
+
+        # The benchmark leaves no data or scheduler state behind
+        self.assertEqual(Queue.objects.count(), 0)
+        self.assertEqual(Job.objects.count(), 0)
+        self.assertListEqual(node_mgr.get_nodes(), [])
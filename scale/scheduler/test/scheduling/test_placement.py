@@ -0,0 +1,101 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import django
+from django.test import TestCase
+from mock import MagicMock
+
+from node.resources.node_resources import NodeResources
+from node.resources.resource import Cpus, Disk, Mem
+from scheduler.models import PLACEMENT_MODE_BEST_FIT, PLACEMENT_MODE_FIRST_FIT_DECREASING, PLACEMENT_MODE_SPREAD
+from scheduler.resources.agent import ResourceSet
+from scheduler.scheduling.placement import (BestFitPlacementStrategy, create_placement_strategy,
+                                            FirstFitDecreasingPlacementStrategy, ScorePlacementStrategy,
+                                            SpreadPlacementStrategy)
+from scheduler.scheduling.scheduling_node import SchedulingNode
+
+
+class TestPlacement(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.node_1 = self._create_scheduling_node(1, NodeResources([Cpus(4.0), Mem(1024.0), Disk(1024.0)]))
+        self.node_2 = self._create_scheduling_node(2, NodeResources([Cpus(16.0), Mem(512.0), Disk(1024.0)]))
+        self.node_3 = self._create_scheduling_node(3, NodeResources([Cpus(8.0), Mem(2048.0), Disk(1024.0)]))
+        self.nodes = {1: self.node_1, 2: self.node_2, 3: self.node_3}
+
+    def _create_job_exe(self, resources, priority=100):
+        job_exe = MagicMock()
+        job_exe.priority = priority
+        job_exe.required_resources = resources
+        return job_exe
+
+    def _create_scheduling_node(self, node_id, offered_resources):
+        node = MagicMock()
+        node.hostname = 'host_%d' % node_id
+        node.id = node_id
+        node.is_ready_for_new_job = MagicMock()
+        node.is_ready_for_new_job.return_value = True
+        node.is_ready_for_next_job_task = MagicMock()
+        node.is_ready_for_next_job_task.return_value = True
+        resource_set = ResourceSet(offered_resources, NodeResources(), offered_resources)
+        return SchedulingNode('agent_%d' % node_id, node, [], [], resource_set)
+
+    def test_create_placement_strategy(self):
+        """Tests creating the placement strategy for each mode"""
+
+        self.assertIsInstance(create_placement_strategy(PLACEMENT_MODE_BEST_FIT, self.nodes, []),
+                              BestFitPlacementStrategy)
+        self.assertIsInstance(create_placement_strategy(PLACEMENT_MODE_SPREAD, self.nodes, []),
+                              SpreadPlacementStrategy)
+        self.assertIsInstance(create_placement_strategy(PLACEMENT_MODE_FIRST_FIT_DECREASING, self.nodes, []),
+                              FirstFitDecreasingPlacementStrategy)
+        self.assertIsInstance(create_placement_strategy('UNKNOWN', self.nodes, []), ScorePlacementStrategy)
+
+    def test_best_fit(self):
+        """Tests that the best fit strategy selects the tightest node that fits"""
+
+        strategy = BestFitPlacementStrategy(self.nodes, [])
+
+        # Node 3 has the fewest CPUs that fit, but node 2 is the only one with enough CPUs and memory
+        job_exe = self._create_job_exe(NodeResources([Cpus(6.0), Mem(256.0)]))
+        self.assertEqual(strategy.select_node(job_exe).node_id, 3)
+        job_exe = self._create_job_exe(NodeResources([Cpus(10.0), Mem(256.0)]))
+        self.assertEqual(strategy.select_node(job_exe).node_id, 2)
+        job_exe = self._create_job_exe(NodeResources([Cpus(10.0), Mem(1024.0)]))
+        self.assertIsNone(strategy.select_node(job_exe))
+
+    def test_removed_node(self):
+        """Tests that a node removed for a reservation is no longer selected"""
+
+        strategy = BestFitPlacementStrategy(self.nodes, [])
+        job_exe = self._create_job_exe(NodeResources([Cpus(6.0)]))
+        self.assertEqual(strategy.select_node(job_exe).node_id, 3)
+
+        del self.nodes[3]
+        strategy.node_removed(self.node_3)
+        self.assertEqual(strategy.select_node(job_exe).node_id, 2)
+
+    def test_spread(self):
+        """Tests that the spread strategy selects the node with the most remaining resources"""
+
+        strategy = SpreadPlacementStrategy(self.nodes, [])
+
+        job_exe = self._create_job_exe(NodeResources([Cpus(1.0), Mem(256.0)]))
+        node = strategy.select_node(job_exe)
+        self.assertEqual(node.node_id, 2)
+        node.accept_new_job_exe(self._create_job_exe(NodeResources([Cpus(10.0)])))
+        strategy.node_changed(node)
+        self.assertEqual(strategy.select_node(job_exe).node_id, 3)
+
+    def test_first_fit_decreasing_order(self):
+        """Tests that first fit decreasing orders job executions by size within each priority"""
+
+        strategy = FirstFitDecreasingPlacementStrategy(self.nodes, [])
+        job_exe_1 = self._create_job_exe(NodeResources([Cpus(1.0)]), priority=100)
+        job_exe_2 = self._create_job_exe(NodeResources([Cpus(4.0)]), priority=100)
+        job_exe_3 = self._create_job_exe(NodeResources([Cpus(1.0)]), priority=1)
+
+        ordered = strategy.order_job_exes([job_exe_1, job_exe_2, job_exe_3])
+        self.assertListEqual(ordered, [job_exe_3, job_exe_2, job_exe_1])
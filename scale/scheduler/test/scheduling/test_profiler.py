@@ -0,0 +1,132 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils.timezone import now
+from mock import patch
+
+from scheduler.scheduling.profiler import LatencyHistogram, PHASES, SchedulingProfiler
+
+
+class TestLatencyHistogram(TestCase):
+
+    def test_percentiles(self):
+        """Tests calculating the percentiles of the samples"""
+
+        histogram = LatencyHistogram()
+        for i in range(1, 101):
+            histogram.add_sample(i / 100.0)
+
+        status_dict = histogram.generate_status_json()
+        self.assertEqual(status_dict['count'], 100)
+        self.assertEqual(status_dict['last'], 1.0)
+        self.assertEqual(status_dict['p50'], 0.5)
+        self.assertEqual(status_dict['p95'], 0.95)
+        self.assertEqual(status_dict['p99'], 0.99)
+        self.assertEqual(status_dict['max'], 1.0)
+
+    def test_rolling_window(self):
+        """Tests that only the most recent samples are used for the percentiles"""
+
+        histogram = LatencyHistogram(window_size=2)
+        histogram.add_sample(10.0)
+        histogram.add_sample(1.0)
+        histogram.add_sample(2.0)
+
+        status_dict = histogram.generate_status_json()
+        self.assertEqual(status_dict['count'], 3)
+        self.assertEqual(status_dict['max'], 2.0)
+        self.assertEqual(status_dict['p50'], 1.0)
+
+    def test_no_samples(self):
+        """Tests generating the JSON without any samples"""
+
+        status_dict = LatencyHistogram().generate_status_json()
+        self.assertEqual(status_dict['count'], 0)
+        self.assertIsNone(status_dict['p99'])
+
+
+class TestSchedulingProfiler(TestCase):
+
+    def setUp(self):
+        # Each call to now() advances the clock by one second
+        started = now()
+        self.clock = (started + datetime.timedelta(seconds=i) for i in range(1000))
+
+    def test_time_phases(self):
+        """Tests timing the phases of a cycle"""
+
+        profiler = SchedulingProfiler()
+        with profiler.time_cycle():
+            with profiler.time_phase('process_queue'):
+                pass
+
+        status_dict = {}
+        profiler.generate_status_json(status_dict)
+        scheduling_dict = status_dict['scheduling']
+        self.assertEqual(scheduling_dict['cycle']['count'], 1)
+        self.assertSetEqual(set(scheduling_dict['phases'].keys()), set(PHASES))
+        self.assertEqual(scheduling_dict['phases']['process_queue']['count'], 1)
+        self.assertEqual(scheduling_dict['phases']['launch_tasks']['count'], 0)
+
+    def test_phase_timed_on_error(self):
+        """Tests that a phase that raises an error is still timed"""
+
+        profiler = SchedulingProfiler()
+        with self.assertRaises(ValueError):
+            with profiler.time_cycle():
+                with profiler.time_phase('launch_tasks'):
+                    raise ValueError()
+
+        status_dict = {}
+        profiler.generate_status_json(status_dict)
+        self.assertEqual(status_dict['scheduling']['cycle']['count'], 1)
+        self.assertEqual(status_dict['scheduling']['phases']['launch_tasks']['count'], 1)
+
+    @override_settings(SCHEDULING_PROFILE_THRESHOLD=0.5)
+    @patch('scheduler.scheduling.profiler.now')
+    @patch('scheduler.scheduling.profiler.SchedulingProfiler._log_profile')
+    def test_slow_cycle_profiles_next_cycle(self, mock_log_profile, mock_now):
+        """Tests that a slow cycle causes the next cycle to be profiled, but not every cycle after that"""
+
+        mock_now.side_effect = lambda: next(self.clock)
+        profiler = SchedulingProfiler()
+        with profiler.time_cycle():
+            pass
+        self.assertFalse(mock_log_profile.called)
+
+        with profiler.time_cycle():
+            pass
+        self.assertEqual(mock_log_profile.call_count, 1)
+
+        # Profiling is rate limited
+        with profiler.time_cycle():
+            pass
+        with profiler.time_cycle():
+            pass
+        self.assertEqual(mock_log_profile.call_count, 1)
+
+        status_dict = {}
+        profiler.generate_status_json(status_dict)
+        self.assertEqual(status_dict['scheduling']['slow_cycles'], 4)
+        self.assertEqual(status_dict['scheduling']['profiled_cycles'], 1)
+
+    @override_settings(SCHEDULING_PROFILE_THRESHOLD=None)
+    @patch('scheduler.scheduling.profiler.now')
+    @patch('scheduler.scheduling.profiler.SchedulingProfiler._log_profile')
+    def test_profiling_disabled(self, mock_log_profile, mock_now):
+        """Tests that no cycle is profiled when the threshold is not set"""
+
+        mock_now.side_effect = lambda: next(self.clock)
+        profiler = SchedulingProfiler()
+        for _ in range(3):
+            with profiler.time_cycle():
+                pass
+
+        self.assertFalse(mock_log_profile.called)
+        status_dict = {}
+        profiler.generate_status_json(status_dict)
+        self.assertEqual(status_dict['scheduling']['slow_cycles'], 0)
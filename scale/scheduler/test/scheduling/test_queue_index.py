@@ -0,0 +1,150 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+
+import django
+from django.test import TestCase
+from django.utils.timezone import now
+from mock import patch
+
+from job.test import utils as job_test_utils
+from queue.models import Queue, QUEUE_ORDER_FIFO, QUEUE_ORDER_LIFO
+from queue.test import utils as queue_test_utils
+import scheduler.scheduling.queue_index as queue_index_module
+from scheduler.scheduling.queue_index import FULL_SYNC_PERIOD, QueueIndex
+
+
+class TestQueueIndex(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.job_type_1 = job_test_utils.create_job_type()
+        self.job_type_2 = job_test_utils.create_job_type()
+        when = now()
+        self.queue_1 = queue_test_utils.create_queue(job_type=self.job_type_1, priority=100,
+                                                     queued=when - datetime.timedelta(minutes=3))
+        self.queue_2 = queue_test_utils.create_queue(job_type=self.job_type_2, priority=100,
+                                                     queued=when - datetime.timedelta(minutes=2))
+        self.queue_3 = queue_test_utils.create_queue(job_type=self.job_type_1, priority=50,
+                                                     queued=when - datetime.timedelta(minutes=1))
+
+    def test_fifo_order(self):
+        """Tests that the index returns queued job executions in priority then FIFO order"""
+
+        index = QueueIndex()
+        index.sync_with_database(QUEUE_ORDER_FIFO, now())
+
+        queue_ids = [job_exe.id for job_exe in index.get_job_exes()]
+        self.assertListEqual(queue_ids, [self.queue_3.id, self.queue_1.id, self.queue_2.id])
+
+    def test_lifo_order(self):
+        """Tests that the index returns queued job executions in priority then LIFO order, including a mode switch"""
+
+        index = QueueIndex()
+        index.sync_with_database(QUEUE_ORDER_FIFO, now())
+        index.sync_with_database(QUEUE_ORDER_LIFO, now())
+
+        queue_ids = [job_exe.id for job_exe in index.get_job_exes()]
+        self.assertListEqual(queue_ids, [self.queue_3.id, self.queue_2.id, self.queue_1.id])
+
+    def test_ignore_and_limit(self):
+        """Tests that the index honors ignored job types and the limit"""
+
+        index = QueueIndex()
+        index.sync_with_database(QUEUE_ORDER_FIFO, now())
+
+        queue_ids = [job_exe.id for job_exe in index.get_job_exes({self.job_type_1.id})]
+        self.assertListEqual(queue_ids, [self.queue_2.id])
+        queue_ids = [job_exe.id for job_exe in index.get_job_exes(limit=2)]
+        self.assertListEqual(queue_ids, [self.queue_3.id, self.queue_1.id])
+
+    def test_incremental_sync(self):
+        """Tests that an incremental sync picks up new and canceled queue models"""
+
+        when = now()
+        index = QueueIndex()
+        index.sync_with_database(QUEUE_ORDER_FIFO, when)
+
+        queue_4 = queue_test_utils.create_queue(job_type=self.job_type_2, priority=1)
+        Queue.objects.cancel_queued_jobs([self.queue_1.job_id])
+        index.sync_with_database(QUEUE_ORDER_FIFO, when + datetime.timedelta(seconds=1))
+
+        job_exes = index.get_job_exes()
+        self.assertEqual(index.count, 4)
+        self.assertEqual(job_exes[0].id, queue_4.id)
+        self.assertTrue(job_exes[2].is_canceled)
+
+    def test_deleted_not_returned(self):
+        """Tests that queue models deleted elsewhere are never returned, even before a full sync"""
+
+        when = now()
+        index = QueueIndex()
+        index.sync_with_database(QUEUE_ORDER_FIFO, when)
+
+        Queue.objects.filter(id=self.queue_3.id).delete()
+        index.sync_with_database(QUEUE_ORDER_FIFO, when + datetime.timedelta(seconds=1))
+
+        queue_ids = [job_exe.id for job_exe in index.get_job_exes(limit=2)]
+        self.assertListEqual(queue_ids, [self.queue_1.id, self.queue_2.id])
+        self.assertEqual(index.count, 2)
+
+    def test_full_sync_removes_deleted(self):
+        """Tests that a full sync removes queue models that were deleted elsewhere"""
+
+        when = now()
+        index = QueueIndex()
+        index.sync_with_database(QUEUE_ORDER_FIFO, when)
+
+        Queue.objects.filter(id=self.queue_2.id).delete()
+        index.sync_with_database(QUEUE_ORDER_FIFO, when + FULL_SYNC_PERIOD)
+        self.assertEqual(index.count, 2)
+
+        queue_ids = [job_exe.id for job_exe in index.get_job_exes()]
+        self.assertListEqual(queue_ids, [self.queue_3.id, self.queue_1.id])
+
+    @patch.object(queue_index_module, 'MAX_INDEX_SIZE', 2)
+    def test_bounded_full_sync(self):
+        """Tests that a full sync only loads the top of the queue and loads the rest once the index runs low"""
+
+        when = now()
+        index = QueueIndex()
+        index.sync_with_database(QUEUE_ORDER_FIFO, when)
+        self.assertEqual(index.count, 2)
+
+        job_exes = index.get_job_exes(limit=3)
+        self.assertListEqual([job_exe.id for job_exe in job_exes], [self.queue_3.id, self.queue_1.id])
+        index.remove_job_exes([self.queue_3.id, self.queue_1.id])
+        Queue.objects.filter(id__in=[self.queue_3.id, self.queue_1.id]).delete()
+
+        # The index ran low, so the next sync is a full sync that loads the rest of the queue
+        index.sync_with_database(QUEUE_ORDER_FIFO, when + datetime.timedelta(seconds=1))
+        queue_ids = [job_exe.id for job_exe in index.get_job_exes(limit=3)]
+        self.assertListEqual(queue_ids, [self.queue_2.id])
+
+    def test_fresh_copies(self):
+        """Tests that each call returns unscheduled copies that do not share their required resources"""
+
+        index = QueueIndex()
+        index.sync_with_database(QUEUE_ORDER_FIFO, now())
+
+        job_exe_1 = index.get_job_exes(limit=1)[0]
+        job_exe_1.scheduled('agent_1', 1, job_exe_1.required_resources)
+        job_exe_2 = index.get_job_exes(limit=1)[0]
+
+        self.assertEqual(job_exe_1.id, job_exe_2.id)
+        self.assertIsNot(job_exe_1, job_exe_2)
+        self.assertIsNot(job_exe_1.required_resources, job_exe_2.required_resources)
+        self.assertIsNone(job_exe_2.scheduled_agent_id)
+
+    def test_remove_job_exes(self):
+        """Tests removing scheduled job executions from the index"""
+
+        index = QueueIndex()
+        index.sync_with_database(QUEUE_ORDER_FIFO, now())
+        index.remove_job_exes([self.queue_3.id, self.queue_2.id])
+
+        queue_ids = [job_exe.id for job_exe in index.get_job_exes()]
+        self.assertListEqual(queue_ids, [self.queue_1.id])
+        self.assertEqual(index.count, 1)
@@ -12,6 +12,7 @@ from rest_framework import status
 import util.rest as rest_util
 from mesos_api.api import HardwareResources, MesosError, SchedulerInfo
 from scheduler.models import Scheduler
+from scheduler.status_cache import status_cache
 from scheduler.threads.scheduler_status import SchedulerStatusThread
 from util.parse import datetime_to_string
 
@@ -168,6 +169,7 @@ class TestStatusView(TestCase):
     def setUp(self):
         django.setup()
         Scheduler.objects.create(id=1, master_hostname='master', master_port=5050)
+        status_cache.clear()
 
     def test_status_empty_dict(self):
         """Test getting scheduler status with empty initialization"""
@@ -217,6 +219,66 @@ class TestStatusView(TestCase):
         result = json.loads(response.content)
         self.assertEqual(result['timestamp'], datetime_to_string(when))
 
+    def test_status_etag_and_delta(self):
+        """Test getting an unchanged scheduler status and only the sections changed since a version"""
+
+        status_thread = SchedulerStatusThread()
+        status_thread._generate_status_json(now())
+
+        url = '/v6/status/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        version = json.loads(response.content)['version']
+        etag = response['ETag']
+        self.assertEqual(etag, 'W/"%d"' % version)
+
+        # Regenerating the same status does not change the version
+        status_thread._generate_status_json(now())
+        response = self.client.generic('GET', url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED, response.content)
+
+        Scheduler.objects.update_status({'num_offers': 5}, now())
+        url = '/v6/status/?since_version=%d' % version
+        response = self.client.generic('GET', url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        result = json.loads(response.content)
+        self.assertEqual(result['version'], version + 1)
+        self.assertEqual(result['num_offers'], 5)
+        self.assertNotIn('nodes', result)
+
+    def test_status_after_restart(self):
+        """Test that a restarted status thread removes stale sections and does not rewrite unchanged ones"""
+
+        Scheduler.objects.update_status({'old_section': {'count': 1}}, now())
+        status_thread = SchedulerStatusThread()
+        status_thread._generate_status_json(now())
+        version, _, sections = Scheduler.objects.get_status_sections()
+        self.assertIsNone(sections['old_section'][1])
+
+        # A new thread, as after a scheduler restart, starts from the stored sections
+        status_thread = SchedulerStatusThread()
+        status_thread._generate_status_json(now())
+        self.assertEqual(Scheduler.objects.get_status_sections()[0], version)
+
+    def test_scheduling_status(self):
+        """Test getting the scheduling cycle latencies"""
+
+        url = '/v6/status/scheduling/'
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
+
+        when = now()
+        status_thread = SchedulerStatusThread()
+        status_thread._generate_status_json(when)
+
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        result = json.loads(response.content)
+        self.assertEqual(result['timestamp'], datetime_to_string(when))
+        self.assertIn('process_queue', result['phases'])
+        self.assertIn('p99', result['cycle'])
+        self.assertIn('considered_per_sec', result['jobs'])
+
     # TODO: remove when REST API v4 is removed
     @patch('mesos_api.api.get_scheduler')
     def test_status_success_v4(self, mock_get_scheduler):
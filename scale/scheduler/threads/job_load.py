@@ -0,0 +1,37 @@
+"""Defines the class that manages the job load background thread"""
+from __future__ import unicode_literals
+
+import datetime
+
+from django.utils.timezone import now
+
+from job.execution.manager import job_exe_mgr
+from queue.models import JobLoad
+from scheduler.threads.base_thread import BaseSchedulerThread
+
+
+THROTTLE = datetime.timedelta(minutes=1)
+WARN_THRESHOLD = datetime.timedelta(seconds=5)
+
+
+class JobLoadThread(BaseSchedulerThread):
+    """This class manages the job load background thread for the scheduler. It records a job load sample every minute
+    using the scheduler's running job executions instead of scanning the jobs table.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+
+        super(JobLoadThread, self).__init__('Job load', THROTTLE, WARN_THRESHOLD)
+
+    def _execute(self):
+        """See :meth:`scheduler.threads.base_thread.BaseSchedulerThread._execute`
+        """
+
+        running_counts = {}
+        for running_job_exe in job_exe_mgr.get_running_job_exes():
+            job_type_id = running_job_exe.job_type_id
+            running_counts[job_type_id] = running_counts.get(job_type_id, 0) + 1
+
+        JobLoad.objects.record(running_counts, now())
@@ -2,19 +2,21 @@
 from __future__ import unicode_literals
 
 import datetime
+import json
 
 from django.utils.timezone import now
 
 from job.execution.manager import job_exe_mgr
 from job.tasks.manager import task_mgr
+from messaging.manager import CommandMessageManager
 from scheduler.manager import scheduler_mgr
 from scheduler.models import Scheduler
 from scheduler.node.manager import node_mgr
 from scheduler.resources.manager import resource_mgr
+from scheduler.scheduling.profiler import scheduling_profiler
 from scheduler.sync.job_type_manager import job_type_mgr
 from scheduler.tasks.manager import system_task_mgr
 from scheduler.threads.base_thread import BaseSchedulerThread
-from util.parse import datetime_to_string
 
 
 THROTTLE = datetime.timedelta(seconds=5)
@@ -30,6 +32,8 @@ class SchedulerStatusThread(BaseSchedulerThread):
 
         super(SchedulerStatusThread, self).__init__('Scheduler status', THROTTLE, WARN_THRESHOLD)
 
+        self._section_json = None  # {Section name: Serialized JSON of the section as last stored}
+
     def _execute(self):
         """See :meth:`scheduler.threads.base_thread.BaseSchedulerThread._execute`
         """
@@ -37,18 +41,40 @@ class SchedulerStatusThread(BaseSchedulerThread):
         self._generate_status_json(now())
 
     def _generate_status_json(self, when):
-        """Generates the scheduler status JSON
+        """Generates the scheduler status JSON and stores the top-level sections that have changed since the last time
 
         :param when: The current time
         :type when: :class:`datetime.datetime`
         """
 
-        status_dict = {'timestamp': datetime_to_string(when)}
+        status_dict = {}
         scheduler_mgr.generate_status_json(status_dict)
+        CommandMessageManager().generate_status_json(status_dict)
         system_task_mgr.generate_status_json(status_dict)
         node_mgr.generate_status_json(status_dict)
         resource_mgr.generate_status_json(status_dict)
         job_exe_mgr.generate_status_json(status_dict['nodes'], when)
         task_mgr.generate_status_json(status_dict['nodes'])
         job_type_mgr.generate_status_json(status_dict)
-        Scheduler.objects.all().update(status=status_dict)
+        scheduling_profiler.generate_status_json(status_dict)
+
+        if self._section_json is None:
+            # Start from the sections stored by the previous scheduler so that unchanged sections are not rewritten and
+            # sections that no longer exist are removed
+            sections = Scheduler.objects.get_status_sections()[2]
+            self._section_json = {name: json.dumps(section[1], sort_keys=True) for name, section in sections.items()
+                                  if section[1] is not None}
+
+        # Only the sections whose contents changed are written
+        changed_sections = {}
+        section_json = {}
+        for name, section in status_dict.items():
+            section_json[name] = json.dumps(section, sort_keys=True)
+            if self._section_json.get(name) != section_json[name]:
+                changed_sections[name] = section
+        for name in self._section_json:
+            if name not in status_dict:
+                changed_sections[name] = None
+
+        Scheduler.objects.update_status(changed_sections, when)
+        self._section_json = section_json
@@ -7,13 +7,14 @@ import rest_framework.status as status
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.http.response import Http404
-from django.utils.dateparse import parse_datetime
-from django.utils.timezone import now
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 
+import util.rest as rest_util
 from scheduler.models import Scheduler
 from scheduler.serializers import SchedulerSerializerV5, SchedulerSerializerV6
+from scheduler.status_cache import is_status_fresh, status_cache
+from util.parse import datetime_to_string
 
 
 logger = logging.getLogger(__name__)
@@ -191,9 +192,6 @@ class SchedulerView(GenericAPIView):
 class StatusView(GenericAPIView):
     """This view is the endpoint for viewing overall system information"""
 
-    # The scheduler is considered offline if its status JSON is older than this threshold
-    STATUS_FRESHNESS_THRESHOLD = 12.0  # seconds
-
     def get(self, request):
         """Gets high level status information
 
@@ -234,16 +232,13 @@ class StatusView(GenericAPIView):
         :returns: the HTTP response to send back to the user
         """
 
-        status_dict = Scheduler.objects.get_master().status
-
-        if not status_dict:  # Empty dict from model initialization
-            return Response(status=status.HTTP_204_NO_CONTENT)
+        _version, status_timestamp, sections = status_cache.get_status()
 
-        # If status dict has not been updated recently, assume scheduler is down
-        status_timestamp = parse_datetime(status_dict['timestamp'])
-        if (now() - status_timestamp).total_seconds() > StatusView.STATUS_FRESHNESS_THRESHOLD:
+        if not is_status_fresh(status_timestamp):
             return Response(status=status.HTTP_204_NO_CONTENT)
 
+        status_dict = {'timestamp': datetime_to_string(status_timestamp)}
+        status_dict.update(sections)
         return Response(status_dict)
 
     def get_v6(self, request):
@@ -255,16 +250,61 @@ class StatusView(GenericAPIView):
         :returns: the HTTP response to send back to the user
         """
 
-        status_dict = Scheduler.objects.get_master().status
+        since_version = rest_util.parse_int(request, 'since_version', 0)
+        version, status_timestamp, sections = status_cache.get_status(since_version)
 
-        if not status_dict:  # Empty dict from model initialization
+        if not is_status_fresh(status_timestamp):
             return Response(status=status.HTTP_204_NO_CONTENT)
 
-        # If status dict has not been updated recently, assume scheduler is down
-        status_timestamp = parse_datetime(status_dict['timestamp'])
-        if (now() - status_timestamp).total_seconds() > StatusView.STATUS_FRESHNESS_THRESHOLD:
+        # The version only changes when the status contents change, the timestamp is not part of the entity tag
+        etag = 'W/"%d"' % version
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        status_dict = {'timestamp': datetime_to_string(status_timestamp), 'version': version}
+        status_dict.update(sections)
+        return Response(status_dict, headers={'ETag': etag})
+
+
+class SchedulingStatusView(GenericAPIView):
+    """This view is the endpoint for viewing the scheduling cycle latencies"""
+
+    def get(self, request):
+        """Gets the scheduling cycle latencies
+
+        :param request: the HTTP GET request
+        :type request: :class:`rest_framework.request.Request`
+        :rtype: :class:`rest_framework.response.Response`
+        :returns: the HTTP response to send back to the user
+        """
+
+        if request.version == 'v6':
+            return self.get_v6(request)
+
+        raise Http404()
+
+    def get_v6(self, request):
+        """The v6 version to get the scheduling cycle latencies
+
+        :param request: the HTTP GET request
+        :type request: :class:`rest_framework.request.Request`
+        :rtype: :class:`rest_framework.response.Response`
+        :returns: the HTTP response to send back to the user
+        """
+
+        _version, status_timestamp, sections = status_cache.get_status()
+
+        if not is_status_fresh(status_timestamp) or sections.get('scheduling') is None:
             return Response(status=status.HTTP_204_NO_CONTENT)
 
+        status_dict = {'timestamp': datetime_to_string(status_timestamp)}
+        status_dict.update(sections['scheduling'])
+
+        # The job counts are the placement metrics reported by the scheduler
+        metrics = sections['scheduler']['metrics'] if sections.get('scheduler') else {}
+        status_dict['jobs'] = {'considered_per_sec': metrics.get('jobs_considered_per_sec'),
+                               'placement_jobs_per_sec': metrics.get('placement_jobs_per_sec'),
+                               'launched_per_sec': metrics.get('jobs_launched_per_sec')}
         return Response(status_dict)
 
 
@@ -34,3 +34,9 @@ class StorageConfig(AppConfig):
         from messaging.messages.factory import add_message_type
 
         add_message_type(DeleteFiles)
+
+        # Invalidate cached workspace responses when workspaces change
+        from storage.models import Workspace
+        from util.rest_cache import invalidate_on_change
+
+        invalidate_on_change(Workspace, 'workspaces')
@@ -62,7 +62,9 @@ class Broker(object):
 
         The files list contains the ScaleFile models representing the files to be deleted. The broker should only delete
         each file itself and not any parent directories. If the update model flag is set each file model should be
-        updated and saved when a delete is successful, including fields such as is_deleted and deleted.
+        marked with :meth:`storage.models.ScaleFile.set_deleted` when its delete is successful. The broker should not
+        save the models, the workspace saves the deleted files in batches afterwards (even if the broker fails part of
+        the way through).
 
         :param volume_path: Absolute path to the local container location onto which the volume file system was mounted,
             None if this broker does not use a container volume
@@ -165,9 +167,10 @@ class Broker(object):
 
         The file_moves list contains named tuples that each contain a ScaleFile model to be moved and the new relative
         file_path field for the new location of the file. The broker is expected to set the file_path field of each
-        ScaleFile model to its new location (which the broker may alter) and is free to alter any additional fields as
-        necessary. The broker is responsible for saving any changes to models when a move is successful The directories
-        in the new file_path may not exist, so it is the responsibility of the broker to create them if necessary.
+        ScaleFile model to its new location (which the broker may alter). The broker should not save the models, the
+        workspace saves the new file_path of each file whose move was successful in batches afterwards (even if the
+        broker fails part of the way through). The directories in the new file_path may not exist, so it is the
+        responsibility of the broker to create them if necessary.
 
         If a file does not exist in its expected location, raise a MissingFile exception.
 
@@ -35,9 +35,8 @@ class HostBroker(Broker):
                 os.remove(path_to_delete)
 
                 if update_model:
-                    # Update model attributes
+                    # Update model attributes, the workspace saves them
                     scale_file.set_deleted()
-                    scale_file.save()
 
     def download_files(self, volume_path, file_downloads):
         """See :meth:`storage.brokers.broker.Broker.download_files`
@@ -122,9 +121,8 @@ class HostBroker(Broker):
             logger.info('Setting file permissions for %s', full_new_path)
             os.chmod(full_new_path, 0644)
 
-            # Update model attributes
+            # Update model attributes, the workspace saves them
             file_move.file.file_path = file_move.new_path
-            file_move.file.save()
 
     def upload_files(self, volume_path, file_uploads):
         """See :meth:`storage.brokers.broker.Broker.upload_files`
@@ -5,7 +5,9 @@ import logging
 import os
 import ssl
 import time
+from multiprocessing.pool import ThreadPool
 
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, NoCredentialsError
 
 import storage.settings as settings
@@ -14,9 +16,14 @@ from storage.brokers.exceptions import InvalidBrokerConfiguration
 from storage.exceptions import MissingFile
 from util.aws import S3Client, AWSClient
 from util.command import execute_command_line
-from util.exceptions import FileDoesNotExist
 from util.validation import ValidationWarning
 
+MB = 1024 * 1024
+# S3 rejects multipart transfers whose parts (other than the last) are smaller than this
+MIN_MULTIPART_CHUNK_SIZE_MB = 5
+# The optional broker configuration fields that tune transfers, each is a positive integer
+TRANSFER_FIELDS = ('max_concurrency', 'multipart_threshold_mb', 'multipart_chunk_size_mb', 'multipart_concurrency')
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,46 +38,55 @@ class S3Broker(Broker):
         self._credentials = None
         self._bucket_name = None
         self._region_name = None
+        self._max_concurrency = settings.S3_MAX_CONCURRENCY
+        self._transfer_config = TransferConfig(multipart_threshold=settings.S3_MULTIPART_THRESHOLD_MB * MB,
+                                               multipart_chunksize=settings.S3_MULTIPART_CHUNK_SIZE_MB * MB,
+                                               max_concurrency=settings.S3_MULTIPART_CONCURRENCY)
 
     def delete_files(self, volume_path, files, update_model=True):
         """See :meth:`storage.brokers.broker.Broker.delete_files`"""
 
         with S3Client(self._credentials, self._region_name) as client:
-            for scale_file in files:
-                s3_object = client.get_object(self._bucket_name, scale_file.file_path)
+            self._delete_objects(client, files)
 
-                self._delete_file(s3_object, scale_file)
-
-                if update_model:
-                    # Update model attributes
-                    scale_file.set_deleted()
-                    scale_file.save()
+        if update_model:
+            for scale_file in files:
+                # Update model attributes, the workspace saves them
+                scale_file.set_deleted()
 
     def download_files(self, volume_path, file_downloads):
         """See :meth:`storage.brokers.broker.Broker.download_files`"""
 
+        s3_downloads = []
+        for file_download in file_downloads:
+            # If file supports partial mount and volume is configured attempt sym-link
+            if file_download.partial and self._volume:
+                logger.debug('Partial S3 file accessed by mounted bucket.')
+                path_to_download = os.path.join(volume_path, file_download.file.file_path)
+
+                logger.info('Checking path %s', path_to_download)
+                if not os.path.exists(path_to_download):
+                    raise MissingFile(file_download.file.file_name)
+
+                # Create symlink to the file in the host mount
+                logger.info('Creating link %s -> %s', file_download.local_path, path_to_download)
+                execute_command_line(['ln', '-s', path_to_download, file_download.local_path])
+            # Fall-back to default S3 file download
+            else:
+                s3_downloads.append(file_download)
+
+        if not s3_downloads:
+            return
+
         with S3Client(self._credentials, self._region_name) as client:
-            for file_download in file_downloads:
-                # If file supports partial mount and volume is configured attempt sym-link
-                if file_download.partial and self._volume:
-                    logger.debug('Partial S3 file accessed by mounted bucket.')
-                    path_to_download = os.path.join(volume_path, file_download.file.file_path)
-
-                    logger.info('Checking path %s', path_to_download)
-                    if not os.path.exists(path_to_download):
-                        raise MissingFile(file_download.file.file_name)
-
-                    # Create symlink to the file in the host mount
-                    logger.info('Creating link %s -> %s', file_download.local_path, path_to_download)
-                    execute_command_line(['ln', '-s', path_to_download, file_download.local_path])
-                # Fall-back to default S3 file download
-                else:
-                    try:
-                        s3_object = client.get_object(self._bucket_name, file_download.file.file_path)
-                    except FileDoesNotExist:
-                        raise MissingFile(file_download.file.file_name)
-
-                    self._download_file(s3_object, file_download.file, file_download.local_path)
+            # A missing file is reported by the download itself, so no request is made to validate the objects
+            transfers = [(client.get_object(self._bucket_name, file_download.file.file_path, False), file_download)
+                         for file_download in s3_downloads]
+
+            def download(transfer):
+                s3_object, file_download = transfer
+                self._download_file(s3_object, file_download.file, file_download.local_path)
+            self._run_transfers('Downloaded', download, transfers)
 
     def list_files(self, volume_path, recursive):
         """See :meth:`storage.brokers.broker.Broker.list_files`
@@ -94,34 +110,48 @@ class S3Broker(Broker):
             volume.host = True
             self._volume = volume
 
+        self._max_concurrency = config.get('max_concurrency', settings.S3_MAX_CONCURRENCY)
+        threshold = config.get('multipart_threshold_mb', settings.S3_MULTIPART_THRESHOLD_MB)
+        chunk_size = config.get('multipart_chunk_size_mb', settings.S3_MULTIPART_CHUNK_SIZE_MB)
+        self._transfer_config = TransferConfig(multipart_threshold=threshold * MB, multipart_chunksize=chunk_size * MB,
+                                               max_concurrency=config.get('multipart_concurrency',
+                                                                          settings.S3_MULTIPART_CONCURRENCY))
+
     def move_files(self, volume_path, file_moves):
         """See :meth:`storage.brokers.broker.Broker.move_files`"""
 
         with S3Client(self._credentials, self._region_name) as client:
-            for file_move in file_moves:
-                try:
-                    s3_object_src = client.get_object(self._bucket_name, file_move.file.file_path)
-                except FileDoesNotExist:
-                    raise MissingFile(file_move.file.file_name)
-                s3_object_dest = client.get_object(self._bucket_name, file_move.new_path, False)
+            transfers = [(client.get_object(self._bucket_name, file_move.file.file_path, False),
+                          client.get_object(self._bucket_name, file_move.new_path, False), file_move)
+                         for file_move in file_moves]
+
+            def copy(transfer):
+                s3_object_src, s3_object_dest, file_move = transfer
+                self._copy_file(s3_object_src, s3_object_dest, file_move.file, file_move.new_path)
+            self._run_transfers('Copied', copy, transfers)
 
-                self._move_file(s3_object_src, s3_object_dest, file_move.file, file_move.new_path)
+            # S3 does not support an atomic move, so the originals are deleted once every copy has succeeded
+            self._delete_objects(client, [file_move.file for file_move in file_moves])
 
-                # Update model attributes
-                file_move.file.file_path = file_move.new_path
-                file_move.file.save()
+        for file_move in file_moves:
+            # Update model attributes, the workspace saves them
+            file_move.file.file_path = file_move.new_path
 
     def upload_files(self, volume_path, file_uploads):
         """See :meth:`storage.brokers.broker.Broker.upload_files`"""
 
         with S3Client(self._credentials, self._region_name) as client:
-            for file_upload in file_uploads:
-                s3_object = client.get_object(self._bucket_name, file_upload.file.file_path, False)
+            transfers = [(client.get_object(self._bucket_name, file_upload.file.file_path, False), file_upload)
+                         for file_upload in file_uploads]
 
+            def upload(transfer):
+                s3_object, file_upload = transfer
                 self._upload_file(s3_object, file_upload.file, file_upload.local_path)
+            self._run_transfers('Uploaded', upload, transfers)
 
-                # Create new model
-                file_upload.file.save()
+        for file_upload in file_uploads:
+            # Create new model
+            file_upload.file.save()
 
     def validate_configuration(self, config):
         """See :meth:`storage.brokers.broker.Broker.validate_configuration`"""
@@ -129,6 +159,12 @@ class S3Broker(Broker):
         warnings = []
         if 'bucket_name' not in config or not config['bucket_name']:
             raise InvalidBrokerConfiguration('INVALID_BROKER', 'S3 broker requires "bucket_name" to be populated')
+        for field in TRANSFER_FIELDS:
+            if field in config and (not isinstance(config[field], int) or config[field] < 1):
+                raise InvalidBrokerConfiguration('INVALID_BROKER', 'S3 broker "%s" must be a positive integer' % field)
+        if config.get('multipart_chunk_size_mb', MIN_MULTIPART_CHUNK_SIZE_MB) < MIN_MULTIPART_CHUNK_SIZE_MB:
+            msg = 'S3 broker "multipart_chunk_size_mb" must be at least %i' % MIN_MULTIPART_CHUNK_SIZE_MB
+            raise InvalidBrokerConfiguration('INVALID_BROKER', msg)
         region_name = config.get('region_name')
 
         credentials = AWSClient.instantiate_credentials_from_config(config)
@@ -143,6 +179,44 @@ class S3Broker(Broker):
 
         return warnings
 
+    def _copy_file(self, s3_object_src, s3_object_dest, scale_file, path, retries=settings.S3_RETRY_COUNT):
+        """Copies a file within the S3 file system. The copy is performed by S3 (server-side), in parts for large files.
+
+        This method will attempt to retry the copy if :class:`ssl.SSLError` is raised up to a number of retries given.
+
+        :param s3_object_src: The S3 object representing the source of the file to copy.
+        :type s3_object_src: :class:`boto3.s3.Object`
+        :param s3_object_dest: The S3 object representing the destination of the file to copy.
+        :type s3_object_dest: :class:`boto3.s3.Object`
+        :param scale_file: The model associated with the file to copy.
+        :type scale_file: :class:`storage.models.ScaleFile`
+        :param path: The destination path for the file copy.
+        :type path: string
+
+        :raises :class:`storage.exceptions.MissingFile`: If the source file does not exist
+        """
+
+        logger.info('Copying %s -> %s', scale_file.file_path, path)
+        copy_source = {
+            'Bucket': s3_object_src.bucket_name,
+            'Key': s3_object_src.key,
+        }
+
+        for attempt in range(retries):
+            try:
+                s3_object_dest.copy(copy_source, ExtraArgs=self._get_extra_args(scale_file),
+                                    Config=self._transfer_config)
+                return
+            except ClientError as err:
+                if _is_missing(err):
+                    raise MissingFile(scale_file.file_name)
+                raise
+            except ssl.SSLError:
+                if attempt >= retries:
+                    raise
+                time.sleep(settings.S3_RETRY_DELAY * attempt)
+                logger.exception('Retrying S3 copy attempt: %i', attempt + 1)
+
     def _delete_file(self, s3_object, scale_file, retries=settings.S3_RETRY_COUNT):
         """Deletes a file from the S3 file system.
 
@@ -165,10 +239,33 @@ class S3Broker(Broker):
                 time.sleep(settings.S3_RETRY_DELAY * attempt)
                 logger.exception('Retrying S3 delete attempt: %i', attempt + 1)
 
+    def _delete_objects(self, client, files):
+        """Deletes the given files from the S3 file system in batches. Any file that fails to delete in a batch is then
+        deleted on its own so that the failure is retried and its error is raised.
+
+        :param client: The S3 client
+        :type client: :class:`util.aws.S3Client`
+        :param files: The models associated with the files to delete
+        :type files: list
+        """
+
+        if not files:
+            return
+
+        logger.info('Deleting %i files', len(files))
+        errors = client.delete_objects(self._bucket_name, [scale_file.file_path for scale_file in files])
+        for scale_file in files:
+            if scale_file.file_path in errors:
+                logger.warning('Batch delete of %s failed: %s', scale_file.file_path, errors[scale_file.file_path])
+                s3_object = client.get_object(self._bucket_name, scale_file.file_path, False)
+                self._delete_file(s3_object, scale_file)
+
     def _download_file(self, s3_object, scale_file, path, retries=settings.S3_RETRY_COUNT):
-        """Downloads a file in S3 storage to the local file system.
+        """Downloads a file in S3 storage to the local file system. Large files are downloaded with concurrent ranged
+        requests.
 
-        This method will attempt to retry the delete if :class:`ssl.SSLError` is raised up to a number of retries given.
+        This method will attempt to retry the download if :class:`ssl.SSLError` is raised up to a number of retries
+        given.
 
         :param s3_object: The S3 object representing the file to download.
         :type s3_object: :class:`boto3.s3.Object`
@@ -176,66 +273,80 @@ class S3Broker(Broker):
         :type scale_file: :class:`storage.models.ScaleFile`
         :param path: The destination path for the file download.
         :type path: string
+
+        :raises :class:`storage.exceptions.MissingFile`: If the file does not exist
         """
 
         logger.info('Downloading %s -> %s', scale_file.file_path, path)
         for attempt in range(retries):
             try:
-                s3_object.download_file(path)
+                s3_object.download_file(path, Config=self._transfer_config)
                 return
+            except ClientError as err:
+                if _is_missing(err):
+                    raise MissingFile(scale_file.file_name)
+                raise
             except ssl.SSLError:
                 if attempt >= retries:
                     raise
                 time.sleep(settings.S3_RETRY_DELAY * attempt)
                 logger.exception('Retrying S3 download attempt: %i', attempt + 1)
 
-    def _move_file(self, s3_object_src, s3_object_dest, scale_file, path, retries=settings.S3_RETRY_COUNT):
-        """Moves a file within the S3 file system.
-
-        Note that S3 does not support an atomic move, so this operation is implemented as a copy and delete.
-
-        This method will attempt to retry the move if :class:`ssl.SSLError` is raised up to a number of retries given.
-        Note that since S3 does not support an atomic move, this method copies the file to the new destination and then
-        attempts to delete the original file content.
+    def _get_extra_args(self, scale_file):
+        """Returns the S3 arguments for writing the given file
 
-        :param s3_object_src: The S3 object representing the source of the file to move.
-        :type s3_object_src: :class:`boto3.s3.Object`
-        :param s3_object_dest: The S3 object representing the destination of the file to move.
-        :type s3_object_dest: :class:`boto3.s3.Object`
-        :param scale_file: The model associated with the file to move.
+        :param scale_file: The model associated with the file to write.
         :type scale_file: :class:`storage.models.ScaleFile`
-        :param path: The destination path for the file move.
-        :type path: string
+        :returns: The arguments
+        :rtype: dict
         """
 
-        logger.info('Copying %s -> %s', scale_file.file_path, path)
         options = dict()
-        options['CopySource'] = {
-            'Bucket': s3_object_src.bucket_name,
-            'Key': s3_object_src.key,
-        }
         options['StorageClass'] = settings.S3_STORAGE_CLASS
         if settings.S3_SERVER_SIDE_ENCRYPTION:
             options['ServerSideEncryption'] = settings.S3_SERVER_SIDE_ENCRYPTION
         if scale_file.media_type:
             options['ContentType'] = scale_file.media_type
+        return options
+
+    def _run_transfers(self, action, transfer_func, transfers):
+        """Runs the given transfer function on each of the given transfers, using up to the configured number of
+        threads, and logs the throughput. Once every transfer has finished, the first error (if any) is raised.
+
+        :param action: The name of the transfer action for logging
+        :type action: string
+        :param transfer_func: The function that performs a single transfer, called with a tuple ending in the file
+            download, move, or upload
+        :type transfer_func: function
+        :param transfers: The transfer tuples
+        :type transfers: list
+        """
 
-        for attempt in range(retries):
+        if not transfers:
+            return
+
+        started = time.time()
+        num_threads = min(self._max_concurrency, len(transfers))
+        if num_threads == 1:
+            for transfer in transfers:
+                transfer_func(transfer)
+        else:
+            pool = ThreadPool(num_threads)
             try:
-                s3_object_dest.copy_from(**options)
-                break
-            except ssl.SSLError:
-                if attempt >= retries:
-                    raise
-                time.sleep(settings.S3_RETRY_DELAY * attempt)
-                logger.exception('Retrying S3 copy attempt: %i', attempt + 1)
+                pool.map(transfer_func, transfers)
+            finally:
+                pool.close()
+                pool.join()
 
-        self._delete_file(s3_object_src, scale_file)
+        duration = max(time.time() - started, 0.001)
+        num_bytes = sum(transfer[-1].file.file_size or 0 for transfer in transfers)
+        logger.info('%s %i files (%.1f MiB) in %.3f seconds with %i threads: %.1f MiB/s', action, len(transfers),
+                    float(num_bytes) / MB, duration, num_threads, num_bytes / duration / MB)
 
     def _upload_file(self, s3_object, scale_file, path, retries=settings.S3_RETRY_COUNT):
-        """Uploads a file in local storage to the S3 remote file system.
+        """Uploads a file in local storage to the S3 remote file system. Large files are uploaded in parts.
 
-        This method will attempt to retry the delete if :class:`ssl.SSLError` is raised up to a number of retries given.
+        This method will attempt to retry the upload if :class:`ssl.SSLError` is raised up to a number of retries given.
 
         :param s3_object: The S3 object representing the file to upload.
         :type s3_object: :class:`boto3.s3.Object`
@@ -245,20 +356,27 @@ class S3Broker(Broker):
         :type path: string
         """
 
-        options = dict()
-        options['StorageClass'] = settings.S3_STORAGE_CLASS
-        if settings.S3_SERVER_SIDE_ENCRYPTION:
-            options['ServerSideEncryption'] = settings.S3_SERVER_SIDE_ENCRYPTION
-        if scale_file.media_type:
-            options['ContentType'] = scale_file.media_type
+        options = self._get_extra_args(scale_file)
 
         logger.info('Uploading %s -> %s', path, scale_file.file_path)
         for attempt in range(retries):
             try:
-                s3_object.upload_file(path, options)
+                s3_object.upload_file(path, options, Config=self._transfer_config)
                 return
             except ssl.SSLError:
                 if attempt >= retries:
                     raise
                 time.sleep(settings.S3_RETRY_DELAY * attempt)
                 logger.exception('Retrying S3 upload attempt: %i', attempt + 1)
+
+
+def _is_missing(err):
+    """Indicates whether the given S3 error is due to a missing object
+
+    :param err: The S3 error
+    :type err: :class:`botocore.exceptions.ClientError`
+    :returns: True if the object is missing, False otherwise
+    :rtype: bool
+    """
+
+    return err.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 404
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storage', '0012_auto_20180920_1320'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scalefile',
+            index=models.Index(fields=['last_modified', 'id'], name='scale_file_modified_id_idx'),
+        ),
+    ]
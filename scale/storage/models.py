@@ -11,7 +11,7 @@ import django.contrib.gis.db.models as models
 import django.contrib.gis.geos as geos
 import django.utils.timezone as timezone
 import django.contrib.postgres.fields
-from django.db import transaction
+from django.db import connection, transaction
 
 import storage.geospatial_utils as geospatial_utils
 from storage.brokers.factory import get_broker
@@ -31,6 +31,9 @@ logger = logging.getLogger(__name__)
 # Allow alphanumerics, dashes, underscores, and spaces
 VALID_TAG_PATTERN = re.compile('^[a-zA-Z0-9\\-_ ]+$')
 
+# The number of file models updated by a single UPDATE statement
+FILE_UPDATE_BATCH_SIZE = 1000
+
 
 class CountryDataManager(models.Manager):
     """Provides additional methods for handling country data
@@ -436,8 +439,8 @@ class ScaleFileManager(models.Manager):
 
     def move_files(self, file_moves):
         """Moves the given files to the new file system paths. Each ScaleFile model should have its related workspace
-        field populated. This method will update the file_path field in each ScaleFile model to the new path (it may
-        also change other ScaleFile fields) and save the changes in the database.
+        field populated. This method will update the file_path field in each ScaleFile model to the new path and save
+        the changes in the database.
 
         :param file_moves: List of files to move
         :type file_moves: [:class:`storage.brokers.broker.FileMove`]
@@ -468,6 +471,47 @@ class ScaleFileManager(models.Manager):
             wp_file_moves = wp_dict[wp_id][1]
             workspace.move_files(wp_file_moves)
 
+    def save_deleted_files(self, files):
+        """Saves the deleted state of the given file models that brokers have marked as deleted, updating the models in
+        batches so that each batch costs a single UPDATE. Every file is given the same deleted timestamp.
+
+        :param files: The file models that have been deleted
+        :type files: [:class:`storage.models.ScaleFile`]
+        """
+
+        when = timezone.now()
+        for scale_file in files:
+            scale_file.deleted = when
+            scale_file.unpublished = when
+            scale_file.last_modified = when
+
+        file_ids = [scale_file.id for scale_file in files]
+        for i in xrange(0, len(file_ids), FILE_UPDATE_BATCH_SIZE):
+            self.filter(id__in=file_ids[i:i + FILE_UPDATE_BATCH_SIZE]).update(is_deleted=True, deleted=when,
+                                                                              is_published=False, unpublished=when,
+                                                                              last_modified=when)
+
+    def save_file_paths(self, files):
+        """Saves the file_path field of the given file models that brokers have moved, updating the models in batches
+        so that each batch costs a single UPDATE
+
+        :param files: The file models that have been moved
+        :type files: [:class:`storage.models.ScaleFile`]
+        """
+
+        when = timezone.now()
+        for i in xrange(0, len(files), FILE_UPDATE_BATCH_SIZE):
+            batch = files[i:i + FILE_UPDATE_BATCH_SIZE]
+            qry = 'UPDATE scale_file sf SET file_path = v.file_path, last_modified = %s '
+            qry += 'FROM (VALUES %s) AS v(id, file_path) WHERE sf.id = v.id'
+            qry = qry % ('%s', ', '.join(['(%s, %s)'] * len(batch)))
+            params = [when]
+            for scale_file in batch:
+                scale_file.last_modified = when
+                params.extend([scale_file.id, scale_file.file_path])
+            with connection.cursor() as cursor:
+                cursor.execute(qry, params)
+
     def upload_files(self, workspace, file_uploads):
         """Uploads the given files from the given local file system paths into the given workspace. Each ScaleFile model
         should have its file_path field populated with the relative location where the file should be stored within the
@@ -801,6 +845,7 @@ class ScaleFile(models.Model):
     class Meta(object):
         """meta information for the db"""
         db_table = 'scale_file'
+        indexes = [models.Index(fields=['last_modified', 'id'], name='scale_file_modified_id_idx')]
 
 WorkspaceValidation = namedtuple('WorkspaceValidation', ['is_valid', 'errors', 'warnings'])
 
@@ -1102,7 +1147,13 @@ class Workspace(models.Model):
         """
 
         volume_path = self._get_volume_path()
-        self.get_broker().delete_files(volume_path, files)
+        was_deleted = {scale_file.id for scale_file in files if scale_file.is_deleted}
+        try:
+            self.get_broker().delete_files(volume_path, files)
+        finally:
+            # Save the files the broker deleted, even if it failed part of the way through
+            deleted_files = [f for f in files if f.is_deleted and f.id not in was_deleted]
+            ScaleFile.objects.save_deleted_files(deleted_files)
 
     def download_files(self, file_downloads):
         """Downloads the given files to the given local file system paths using the workspace's broker. If this
@@ -1202,7 +1253,13 @@ class Workspace(models.Model):
         """
 
         volume_path = self._get_volume_path()
-        self.get_broker().move_files(volume_path, file_moves)
+        old_paths = [file_move.file.file_path for file_move in file_moves]
+        try:
+            self.get_broker().move_files(volume_path, file_moves)
+        finally:
+            # Save the files the broker moved, even if it failed part of the way through
+            moved_files = [fm.file for fm, old_path in zip(file_moves, old_paths) if fm.file.file_path != old_path]
+            ScaleFile.objects.save_file_paths(moved_files)
 
     def upload_files(self, file_uploads):
         """Uploads the given files from the given local file system paths and saves the ScaleFile models in the
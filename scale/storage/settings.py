@@ -11,3 +11,13 @@ S3_RETRY_COUNT = getattr(settings, 'S3_RETRY_COUNT', 3)
 
 # The delay between retry attempts
 S3_RETRY_DELAY = getattr(settings, 'S3_RETRY_DELAY', 60)  # 1 minute
+
+# The number of files an S3 workspace transfers at the same time
+S3_MAX_CONCURRENCY = getattr(settings, 'S3_MAX_CONCURRENCY', 10)
+
+# Files at least this large are transferred in parts, each part using its own (ranged) request
+S3_MULTIPART_THRESHOLD_MB = getattr(settings, 'S3_MULTIPART_THRESHOLD_MB', 64)
+S3_MULTIPART_CHUNK_SIZE_MB = getattr(settings, 'S3_MULTIPART_CHUNK_SIZE_MB', 16)
+
+# The number of parts of a single file that are transferred at the same time
+S3_MULTIPART_CONCURRENCY = getattr(settings, 'S3_MULTIPART_CONCURRENCY', 4)
@@ -1,8 +1,10 @@
 from __future__ import unicode_literals
 
 import os
+from multiprocessing.pool import ThreadPool
 
 import django
+from botocore.exceptions import ClientError
 from django.test import TestCase
 from mock import MagicMock, Mock, call, mock_open, patch
 
@@ -10,6 +12,7 @@ import storage.test.utils as storage_test_utils
 from storage.brokers.broker import FileDownload, FileMove, FileUpload
 from storage.brokers.exceptions import InvalidBrokerConfiguration
 from storage.brokers.s3_broker import S3Broker
+from storage.exceptions import MissingFile
 from util.aws import S3Client
 
 
@@ -33,10 +36,8 @@ class TestS3Broker(TestCase):
     def test_delete_files(self, mock_client_class):
         """Tests deleting files successfully"""
 
-        s3_object_1 = MagicMock()
-        s3_object_2 = MagicMock()
         mock_client = MagicMock(S3Client)
-        mock_client.get_object.side_effect = [s3_object_1, s3_object_2]
+        mock_client.delete_objects.return_value = {}
         mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
 
         file_path_1 = os.path.join('my_dir', 'my_file.txt')
@@ -49,13 +50,34 @@ class TestS3Broker(TestCase):
         self.broker.delete_files(None, [file_1, file_2])
 
         # Check results
-        self.assertTrue(s3_object_1.delete.called)
-        self.assertTrue(s3_object_2.delete.called)
+        mock_client.delete_objects.assert_called_once_with('my_bucket.domain.com', [file_path_1, file_path_2])
+        self.assertFalse(mock_client.get_object.called)
         self.assertTrue(file_1.is_deleted)
         self.assertIsNotNone(file_1.deleted)
         self.assertTrue(file_2.is_deleted)
         self.assertIsNotNone(file_2.deleted)
 
+    @patch('storage.brokers.s3_broker.S3Client')
+    def test_delete_files_batch_error(self, mock_client_class):
+        """Tests that a file that fails to delete in a batch is deleted on its own"""
+
+        s3_object = MagicMock()
+        mock_client = MagicMock(S3Client)
+        mock_client.get_object.return_value = s3_object
+        mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
+
+        file_1 = storage_test_utils.create_file(file_path=os.path.join('my_dir', 'my_file.txt'))
+        file_2 = storage_test_utils.create_file(file_path=os.path.join('my_dir', 'my_file.json'))
+        mock_client.delete_objects.return_value = {file_2.file_path: 'InternalError'}
+
+        # Call method to test
+        self.broker.delete_files(None, [file_1, file_2], update_model=False)
+
+        # Check results
+        mock_client.get_object.assert_called_once_with('my_bucket.domain.com', file_2.file_path, False)
+        self.assertTrue(s3_object.delete.called)
+        self.assertFalse(file_1.is_deleted)
+
     @patch('os.path.exists')
     @patch('storage.brokers.s3_broker.S3Client')
     def test_download_files(self, mock_client_class, mock_exists):
@@ -88,6 +110,43 @@ class TestS3Broker(TestCase):
         # Check results
         self.assertTrue(s3_object_1.download_file.called)
         self.assertTrue(s3_object_2.download_file.called)
+        mock_client.get_object.assert_has_calls([call('my_bucket.domain.com', workspace_path_file_1, False),
+                                                 call('my_bucket.domain.com', workspace_path_file_2, False)])
+
+    @patch('storage.brokers.s3_broker.S3Client')
+    def test_download_files_missing(self, mock_client_class):
+        """Tests downloading a file that is missing from the bucket"""
+
+        s3_object = MagicMock()
+        s3_object.download_file.side_effect = ClientError({'Error': {'Code': '404'},
+                                                           'ResponseMetadata': {'HTTPStatusCode': 404}}, 'HeadObject')
+        mock_client = MagicMock(S3Client)
+        mock_client.get_object.return_value = s3_object
+        mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
+
+        scale_file = storage_test_utils.create_file(file_path=os.path.join('my_wrk_dir', 'my_file.txt'))
+        file_download = FileDownload(scale_file, os.path.join('my_dir', 'my_file.txt'), False)
+
+        self.assertRaises(MissingFile, self.broker.download_files, None, [file_download])
+
+    @patch('storage.brokers.s3_broker.S3Client')
+    def test_download_files_parallel(self, mock_client_class):
+        """Tests that many files are downloaded by a pool of threads"""
+
+        mock_client = MagicMock(S3Client)
+        mock_client.get_object.side_effect = lambda bucket_name, key_name, validate: MagicMock(key=key_name)
+        mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
+
+        file_downloads = []
+        for i in range(25):
+            scale_file = storage_test_utils.create_file(file_path='my_wrk_dir/my_file_%i.txt' % i)
+            file_downloads.append(FileDownload(scale_file, 'my_dir/my_file_%i.txt' % i, False))
+
+        with patch('storage.brokers.s3_broker.ThreadPool', wraps=ThreadPool) as mock_pool_class:
+            self.broker.download_files(None, file_downloads)
+
+        mock_pool_class.assert_called_once_with(self.broker._max_concurrency)
+        self.assertEqual(mock_client.get_object.call_count, 25)
 
     # Patching in storage.brokers.s3_broker as opposed to util.aws / util.command because patch must be applied where
     # import is made, not on source
@@ -141,6 +200,25 @@ class TestS3Broker(TestCase):
         self.assertEqual(broker._credentials.access_key_id, 'ABC')
         self.assertEqual(broker._credentials.secret_access_key, '123')
 
+    def test_load_configuration_transfer(self):
+        """Tests loading a configuration that tunes the transfers"""
+
+        json_config = {
+            'type': S3Broker().broker_type,
+            'bucket_name': 'my_bucket.domain.com',
+            'max_concurrency': 32,
+            'multipart_threshold_mb': 100,
+            'multipart_chunk_size_mb': 50,
+            'multipart_concurrency': 8,
+        }
+        broker = S3Broker()
+        broker.load_configuration(json_config)
+
+        self.assertEqual(broker._max_concurrency, 32)
+        self.assertEqual(broker._transfer_config.multipart_threshold, 100 * 1024 * 1024)
+        self.assertEqual(broker._transfer_config.multipart_chunksize, 50 * 1024 * 1024)
+        self.assertEqual(broker._transfer_config.max_concurrency, 8)
+
     def test_load_configuration_whitespace_filled_host_path(self):
         """Tests loading a valid configuration successfully while purging empty host_path value"""
 
@@ -161,18 +239,17 @@ class TestS3Broker(TestCase):
         self.assertEqual(broker._credentials.access_key_id, 'ABC')
         self.assertEqual(broker._credentials.secret_access_key, '123')
 
-    @patch('os.path.exists')
     @patch('storage.brokers.s3_broker.S3Client')
-    def test_move_files(self, mock_client_class, mock_exists):
+    def test_move_files(self, mock_client_class):
         """Tests moving files successfully"""
 
-        mock_exists.return_value = True
-        s3_object_1a = MagicMock()
+        s3_object_1a = MagicMock(bucket_name='my_bucket.domain.com', key='my_dir_1/my_file.txt')
         s3_object_1b = MagicMock()
-        s3_object_2a = MagicMock()
+        s3_object_2a = MagicMock(bucket_name='my_bucket.domain.com', key='my_dir_2/my_file.json')
         s3_object_2b = MagicMock()
         mock_client = MagicMock(S3Client)
         mock_client.get_object.side_effect = [s3_object_1a, s3_object_1b, s3_object_2a, s3_object_2b]
+        mock_client.delete_objects.return_value = {}
         mock_client_class.return_value.__enter__ = Mock(return_value=mock_client)
 
         file_name_1 = 'my_file.txt'
@@ -191,10 +268,12 @@ class TestS3Broker(TestCase):
         self.broker.move_files(None, [file_1_mv, file_2_mv])
 
         # Check results
-        self.assertTrue(s3_object_1b.copy_from.called)
-        self.assertTrue(s3_object_1a.delete.called)
-        self.assertTrue(s3_object_2b.copy_from.called)
-        self.assertTrue(s3_object_2a.delete.called)
+        self.assertDictEqual(s3_object_1b.copy.call_args[0][0], {'Bucket': 'my_bucket.domain.com',
+                                                                'Key': old_workspace_path_1})
+        self.assertDictEqual(s3_object_2b.copy.call_args[0][0], {'Bucket': 'my_bucket.domain.com',
+                                                                'Key': old_workspace_path_2})
+        mock_client.delete_objects.assert_called_once_with('my_bucket.domain.com', [old_workspace_path_1,
+                                                                                     old_workspace_path_2])
         self.assertEqual(file_1.file_path, new_workspace_path_1)
         self.assertEqual(file_2.file_path, new_workspace_path_2)
 
@@ -268,3 +347,18 @@ class TestS3Broker(TestCase):
         broker = S3Broker()
 
         self.assertRaises(InvalidBrokerConfiguration, broker.validate_configuration, json_config)
+
+    def test_validate_configuration_invalid_transfer(self):
+        """Tests validating a configuration with invalid transfer settings"""
+
+        json_config = {
+            'type': S3Broker().broker_type,
+            'bucket_name': 'my_bucket.domain.com',
+            'max_concurrency': 0,
+        }
+        broker = S3Broker()
+        self.assertRaises(InvalidBrokerConfiguration, broker.validate_configuration, json_config)
+
+        del json_config['max_concurrency']
+        json_config['multipart_chunk_size_mb'] = 1
+        self.assertRaises(InvalidBrokerConfiguration, broker.validate_configuration, json_config)
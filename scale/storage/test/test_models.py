@@ -347,6 +347,84 @@ class TestScaleFileManagerMoveFiles(TestCase):
         self.assertRaises(DeletedFile, ScaleFile.objects.move_files, files)
 
 
+class TestScaleFileManagerSaveFiles(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+    def test_save_deleted_files(self):
+        """Tests saving the deleted state of files with a single update"""
+
+        file_1 = storage_test_utils.create_file()
+        file_2 = storage_test_utils.create_file()
+        file_3 = storage_test_utils.create_file()
+        file_1.set_deleted()
+        file_2.set_deleted()
+
+        with self.assertNumQueries(1):
+            ScaleFile.objects.save_deleted_files([file_1, file_2])
+
+        file_1 = ScaleFile.objects.get(id=file_1.id)
+        self.assertTrue(file_1.is_deleted)
+        self.assertFalse(file_1.is_published)
+        self.assertIsNotNone(file_1.deleted)
+        self.assertEqual(ScaleFile.objects.get(id=file_2.id).deleted, file_1.deleted)
+        self.assertFalse(ScaleFile.objects.get(id=file_3.id).is_deleted)
+
+    @patch('storage.models.FILE_UPDATE_BATCH_SIZE', 2)
+    def test_save_file_paths(self):
+        """Tests saving the new paths of moved files with an update per batch"""
+
+        files = [storage_test_utils.create_file(file_path='old/path/file_%i.txt' % i) for i in range(3)]
+        for i, scale_file in enumerate(files):
+            scale_file.file_path = 'new/path/file_%i.txt' % i
+
+        with self.assertNumQueries(2):
+            ScaleFile.objects.save_file_paths(files)
+
+        for i, scale_file in enumerate(files):
+            self.assertEqual(ScaleFile.objects.get(id=scale_file.id).file_path, 'new/path/file_%i.txt' % i)
+
+
+class TestWorkspaceSaveFiles(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        self.workspace = storage_test_utils.create_workspace()
+        self.workspace._broker = MagicMock()
+        self.workspace._broker.volume = None
+
+    def test_delete_files_partial(self):
+        """Tests that the files a broker deleted are saved even when the broker fails part of the way through"""
+
+        file_1 = storage_test_utils.create_file(workspace=self.workspace)
+        file_2 = storage_test_utils.create_file(workspace=self.workspace)
+
+        def delete_files(volume_path, files):
+            files[0].set_deleted()
+            raise IOError('Failed to delete')
+        self.workspace._broker.delete_files.side_effect = delete_files
+
+        self.assertRaises(IOError, self.workspace.delete_files, [file_1, file_2])
+        self.assertTrue(ScaleFile.objects.get(id=file_1.id).is_deleted)
+        self.assertFalse(ScaleFile.objects.get(id=file_2.id).is_deleted)
+
+    def test_move_files(self):
+        """Tests that only the files a broker moved are saved"""
+
+        file_1 = storage_test_utils.create_file(workspace=self.workspace, file_path='old/file_1.txt')
+        file_2 = storage_test_utils.create_file(workspace=self.workspace, file_path='old/file_2.txt')
+
+        def move_files(volume_path, file_moves):
+            file_moves[0].file.file_path = file_moves[0].new_path
+        self.workspace._broker.move_files.side_effect = move_files
+
+        self.workspace.move_files([FileMove(file_1, 'new/file_1.txt'), FileMove(file_2, 'new/file_2.txt')])
+        self.assertEqual(ScaleFile.objects.get(id=file_1.id).file_path, 'new/file_1.txt')
+        self.assertEqual(ScaleFile.objects.get(id=file_2.id).file_path, 'old/file_2.txt')
+
+
 class TestScaleFileManagerUploadFiles(TestCase):
 
     def setUp(self):
@@ -286,6 +286,38 @@ class TestFilesViewV6(TestCase):
             # Make sure country info is included
             self.assertEqual(entry['countries'][0], self.country.iso3)
 
+    def test_cursor(self):
+        """Tests paging through the files view with a cursor."""
+
+        url = '/%s/files/?cursor=&page_size=1' % self.api
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertNotIn('count', result)
+        self.assertListEqual([entry['id'] for entry in result['results']], [self.file1.id])
+        self.assertIsNotNone(result['next'])
+
+        response = self.client.generic('GET', result['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        result = json.loads(response.content)
+        self.assertListEqual([entry['id'] for entry in result['results']], [self.file2.id])
+        self.assertIsNone(result['next'])
+
+    def test_export(self):
+        """Tests streaming the filtered files as newline-delimited JSON."""
+
+        url = '/%s/files/export/?job_type_id=%s' % (self.api, self.job_type1.id)
+        response = self.client.generic('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = b''.join(response.streaming_content).splitlines()
+        results = [json.loads(line) for line in lines]
+        self.assertListEqual([entry['id'] for entry in results], [self.file1.id])
+        self.assertEqual(results[0]['file_name'], self.file1.file_name)
+
 class TestFileDetailsViewV6(TestCase):
     api = 'v6'
     
@@ -11,6 +11,7 @@ from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
 import util.rest as rest_util
+import util.rest_cache as rest_cache
 from util.rest import BadParameter
 from util.rest import title_to_name
 from storage.configuration.workspace_configuration import WorkspaceConfiguration
@@ -26,6 +27,8 @@ logger = logging.getLogger(__name__)
 class FilesView(ListAPIView):
     """This view is the endpoint for retrieving source/product files"""
     queryset = ScaleFile.objects.all()
+    pagination_class = rest_util.KeysetPagination
+    export = False
     
     def get_serializer_class(self):
         """Returns the appropriate serializer based off the requests version of the REST API"""
@@ -214,6 +217,7 @@ class WorkspacesView(ListCreateAPIView):
         elif self.request.version == 'v4':
             return WorkspaceSerializerV5
         
+    @rest_cache.cache_response(['workspaces'])
     def list(self, request):
         """Retrieves the list of all workspaces and returns it in JSON form
 
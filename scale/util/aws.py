@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 
 AWSCredentials = namedtuple('AWSCredentials', ['access_key_id', 'secret_access_key'])
 
+# The most keys S3 accepts in a single DeleteObjects request
+S3_MAX_DELETE_KEYS = 1000
+
 
 class AWSClient(object):
     """Manages automatically creating and destroying clients to AWS services."""
@@ -41,6 +44,25 @@ class AWSClient(object):
     def __enter__(self):
         """Callback handles creating a new client for AWS access."""
 
+        self.connect()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Callback handles destroying an existing client."""
+
+        self.close()
+
+    def close(self):
+        """Destroys the client. boto3 clients hold no resources that must be released, so this only drops them."""
+
+        self._client = None
+        self._resource = None
+
+    def connect(self):
+        """Creates a new client for AWS access. Long-lived owners, such as connection pools, call this directly instead
+        of using the client as a context manager.
+        """
+
         logger.debug('Setting up AWS client...')
 
         session_args = {}
@@ -53,11 +75,6 @@ class AWSClient(object):
 
         self._client = self._session.client(self._resource_name, config=self._config)
         self._resource = self._session.resource(self._resource_name, config=self._config)
-        return self
-
-    def __exit__(self, type, value, traceback):
-        """Callback handles destroying an existing client."""
-        pass
 
     @staticmethod
     def instantiate_credentials_from_config(config):
@@ -103,8 +120,11 @@ class SQSClient(AWSClient):
         """
         AWSClient.__init__(self, 'sqs', None, credentials, region_name)
 
+        # Queue resources are cached by name so the queue URL is only looked up once per client
+        self._queues = {}
+
     def get_queue_by_name(self, queue_name):
-        """Gets a SQS queue by the given name
+        """Gets a SQS queue by the given name. The queue is looked up once and then cached for the life of this client.
 
         :param queue_name: The unique name of the SQS queue
         :type queue_name: string
@@ -112,7 +132,11 @@ class SQSClient(AWSClient):
         :rtype: :class:`boto3.sqs.Queue`
         """
 
-        return self._resource.get_queue_by_name(QueueName=queue_name)
+        queue = self._queues.get(queue_name)
+        if queue is None:
+            queue = self._resource.get_queue_by_name(QueueName=queue_name)
+            self._queues[queue_name] = queue
+        return queue
 
     def send_message(self, queue_name, message):
         """Send a message to SQS queue.
@@ -192,6 +216,32 @@ class S3Client(AWSClient):
         config = Config(s3={'addressing_style': getattr(settings, 'S3_ADDRESSING_STYLE', 'auto')})
         AWSClient.__init__(self, 's3', config, credentials, region_name)
 
+    def delete_objects(self, bucket_name, key_names):
+        """Deletes the S3 objects with the given identifiers, batching up to 1000 keys in each request. Keys that do not
+        exist are treated as successfully deleted by S3.
+
+        :param bucket_name: The unique name of the bucket that contains the objects.
+        :type bucket_name: string
+        :param key_names: The unique names of the objects to delete.
+        :type key_names: list
+        :returns: The keys that failed to delete, mapped to their S3 error codes.
+        :rtype: dict
+
+        :raises :class:`botocore.exceptions.ClientError`: If a request is invalid.
+        """
+
+        errors = {}
+        for i in xrange(0, len(key_names), S3_MAX_DELETE_KEYS):
+            batch = key_names[i:i + S3_MAX_DELETE_KEYS]
+            logger.debug('Deleting %i S3 objects from bucket: %s', len(batch), bucket_name)
+            response = self._client.delete_objects(Bucket=bucket_name, Delete={
+                'Objects': [{'Key': key_name} for key_name in batch],
+                'Quiet': True,
+            })
+            for error in response.get('Errors', []):
+                errors[error['Key']] = error.get('Code')
+        return errors
+
     def get_bucket(self, bucket_name, validate=True):
         """Gets a reference to an S3 bucket with the given identifier.
 
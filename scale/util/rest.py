@@ -1,9 +1,13 @@
 """Defines utilities for building RESTful APIs."""
 from __future__ import unicode_literals
 
+import base64
 import datetime
+import json
 import uuid
+from collections import OrderedDict
 
+from django.http import StreamingHttpResponse
 from django.template.defaultfilters import slugify
 import django.utils.timezone as timezone
 import rest_framework.pagination as pagination
@@ -13,7 +17,10 @@ import rest_framework.status as status
 from django.conf import settings
 from django.conf.urls import include, url
 from rest_framework.exceptions import APIException
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import replace_query_param
 
 import util.parse as parse_util
 
@@ -25,6 +32,143 @@ class DefaultPagination(pagination.PageNumberPagination):
     max_page_size = 1000
 
 
+class KeysetPagination(DefaultPagination):
+    """Paging system that adds a keyset (cursor) mode to the default page number mode for large list endpoints.
+
+    Passing the cursor parameter (empty for the first page) switches to keyset mode: results are ordered by the view's
+    cursor_ordering fields (last_modified and id by default), each page starts after the last row of the previous page
+    and the response only has a next link, so no COUNT or OFFSET queries are run however deep the client pages. The
+    order parameter is ignored in keyset mode.
+
+    Views whose export attribute is True stream every filtered row as newline-delimited JSON instead, reading the rows
+    in keyset chunks so that memory use is constant.
+    """
+    cursor_query_param = 'cursor'
+    default_ordering = ('last_modified', 'id')
+    export_chunk_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """See :meth:`rest_framework.pagination.BasePagination.paginate_queryset`"""
+
+        self._is_keyset = False
+        self._export_queryset = None
+        self.request = request
+        self.ordering = getattr(view, 'cursor_ordering', self.default_ordering)
+
+        if getattr(view, 'export', False):
+            # The rows are read and serialized while the response streams
+            self._export_queryset = queryset
+            self._export_view = view
+            return []
+        if self.cursor_query_param not in request.query_params:
+            return super(KeysetPagination, self).paginate_queryset(queryset, request, view)
+
+        self._is_keyset = True
+        self.page_size = self.get_page_size(request)
+        cursor = self._decode_cursor(queryset.model, request.query_params[self.cursor_query_param])
+        page = list(self._get_chunk(queryset, cursor, self.page_size + 1))
+        self._next_cursor = None
+        if len(page) > self.page_size:
+            page = page[:self.page_size]
+            self._next_cursor = self._encode_cursor(page[-1])
+        return page
+
+    def get_paginated_response(self, data):
+        """See :meth:`rest_framework.pagination.BasePagination.get_paginated_response`"""
+
+        if self._export_queryset is not None:
+            response = StreamingHttpResponse(self._stream_ndjson(), content_type='application/x-ndjson')
+            response['Content-Disposition'] = 'attachment; filename="export.ndjson"'
+            return response
+        if not self._is_keyset:
+            return super(KeysetPagination, self).get_paginated_response(data)
+
+        next_link = None
+        if self._next_cursor:
+            url = self.request.build_absolute_uri()
+            next_link = replace_query_param(url, self.cursor_query_param, self._next_cursor)
+        return Response(OrderedDict([('next', next_link), ('results', data)]))
+
+    def _decode_cursor(self, model, encoded):
+        """Decodes the given cursor into the ordering values of the last row of the previous page
+
+        :param model: The model being paged
+        :type model: :class:`django.db.models.Model`
+        :param encoded: The encoded cursor, empty for the first page
+        :type encoded: string
+        :returns: The ordering values, None for the first page
+        :rtype: list
+
+        :raises :class:`util.rest.BadParameter`: If the cursor is invalid.
+        """
+
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if len(values) != len(self.ordering):
+                raise ValueError('Wrong number of cursor values')
+            for i, name in enumerate(self.ordering):
+                if model._meta.get_field(name).get_internal_type() == 'DateTimeField':
+                    values[i] = parse_util.parse_datetime(values[i])
+        except (TypeError, ValueError):
+            raise BadParameter('Invalid cursor: %s' % encoded)
+        return values
+
+    def _encode_cursor(self, obj):
+        """Encodes the ordering values of the given row into a cursor
+
+        :param obj: The last row of the page
+        :type obj: :class:`django.db.models.Model`
+        :returns: The encoded cursor
+        :rtype: string
+        """
+
+        values = [getattr(obj, name) for name in self.ordering]
+        values = [value.isoformat() if isinstance(value, datetime.datetime) else value for value in values]
+        return base64.urlsafe_b64encode(json.dumps(values))
+
+    def _get_chunk(self, queryset, cursor, limit):
+        """Returns the given number of rows of the queryset that come after the given cursor
+
+        :param queryset: The queryset being paged
+        :type queryset: :class:`django.db.models.query.QuerySet`
+        :param cursor: The ordering values of the last row of the previous chunk, None for the first chunk
+        :type cursor: list
+        :param limit: The maximum number of rows to return
+        :type limit: int
+        :returns: The rows
+        :rtype: :class:`django.db.models.query.QuerySet`
+        """
+
+        if cursor:
+            # A row comparison lets Postgres seek straight to the cursor in an index on the ordering columns
+            opts = queryset.model._meta
+            columns = ['"%s"."%s"' % (opts.db_table, opts.get_field(name).column) for name in self.ordering]
+            where = '(%s) > (%s)' % (', '.join(columns), ', '.join(['%s'] * len(columns)))
+            queryset = queryset.extra(where=[where], params=cursor)
+        return queryset.order_by(*self.ordering)[:limit]
+
+    def _stream_ndjson(self):
+        """Generates the newline-delimited JSON lines of every row of the exported queryset
+
+        :returns: The generator of lines
+        :rtype: generator
+        """
+
+        cursor = None
+        while True:
+            chunk = list(self._get_chunk(self._export_queryset, cursor, self.export_chunk_size))
+            if not chunk:
+                break
+            serializer = self._export_view.get_serializer(chunk, many=True)
+            for row in serializer.data:
+                yield json.dumps(row, cls=JSONEncoder) + '\n'
+            if len(chunk) < self.export_chunk_size:
+                break
+            cursor = [getattr(chunk[-1], name) for name in self.ordering]
+
+
 class ModelIdSerializer(serializers.Serializer):
     """Converts a model to a lightweight place holder object with only an identifier to REST output"""
     id = serializers.IntegerField()
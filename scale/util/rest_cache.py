@@ -0,0 +1,149 @@
+"""Defines the cache of REST responses for read-heavy views that change rarely"""
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+# The name of the Django cache that holds the responses
+CACHE_NAME = 'rest'
+# Responses of views that count jobs are only cached for this many seconds since jobs change constantly
+STATUS_TIMEOUT = 5
+
+logger = logging.getLogger(__name__)
+
+
+def cache_response(group_names=None, timeout=None):
+    """Decorator for the GET methods of REST views that caches the successful responses by request URL (the scheme,
+    host, and path, which includes the API version) and normalized query parameters. The host is part of the key since
+    responses contain absolute links, such as pagination links. The cached responses of a group are invalidated whenever
+    one of the models registered with :meth:`invalidate_on_change` for that group changes within a process that shares
+    the cache. With the default local memory cache, other web server processes only see the change once their cached
+    responses expire. Every response has an ETag and a request with a matching If-None-Match header gets a 304
+    response. The X-Cache header of each response tells whether it was a cache HIT or MISS. Caching is disabled when
+    the REST_CACHE_TIMEOUT setting is 0.
+
+    :param group_names: The names of the groups whose changes invalidate the cached responses
+    :type group_names: list
+    :param timeout: The number of seconds to cache the responses, defaults to the REST_CACHE_TIMEOUT setting
+    :type timeout: int
+    :returns: The decorator
+    :rtype: function
+    """
+
+    group_names = sorted(group_names or [])
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(view, request, *args, **kwargs):
+            if not settings.REST_CACHE_TIMEOUT or request.method != 'GET':
+                return func(view, request, *args, **kwargs)
+
+            cache = caches[CACHE_NAME]
+            key = _get_key(cache, request, group_names)
+            cached = cache.get(key)
+            if cached is None:
+                response = func(view, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                content = json.dumps(response.data, cls=JSONEncoder)
+                etag = '"%s"' % hashlib.md5(content.encode('utf-8')).hexdigest()
+                cache.set(key, (content, etag), timeout or settings.REST_CACHE_TIMEOUT)
+                cache_status = 'MISS'
+            else:
+                content, etag = cached
+                response = None
+                cache_status = 'HIT'
+
+            if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            elif response is None:
+                response = Response(json.loads(content, object_pairs_hook=OrderedDict))
+            response['ETag'] = etag
+            response['X-Cache'] = cache_status
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate(group_name):
+    """Invalidates all of the cached responses of the given group
+
+    :param group_name: The name of the group
+    :type group_name: string
+    """
+
+    caches[CACHE_NAME].set(_get_group_key(group_name), uuid.uuid4().hex, None)
+    logger.debug('Invalidated cached %s responses', group_name)
+
+
+def invalidate_on_change(model, group_name):
+    """Registers the given model so that saving or deleting one of its instances invalidates the cached responses of the
+    given group once the transaction that made the change commits, so that a concurrent request cannot cache the old
+    data again. Changes made with QuerySet.update() or raw SQL do not send signals, those are picked up once the cached
+    responses expire.
+
+    :param model: The model class
+    :type model: :class:`django.db.models.Model`
+    :param group_name: The name of the group
+    :type group_name: string
+    """
+
+    def receiver(sender, **kwargs):
+        transaction.on_commit(lambda: invalidate(group_name))
+
+    dispatch_uid = 'rest_cache_%s_%s' % (model._meta.label, group_name)
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=dispatch_uid)
+
+
+def _get_group_key(group_name):
+    """Returns the cache key of the token that identifies the current contents of the given group
+
+    :param group_name: The name of the group
+    :type group_name: string
+    :returns: The cache key
+    :rtype: string
+    """
+
+    return 'rest-group:%s' % group_name
+
+
+def _get_key(cache, request, group_names):
+    """Returns the cache key of the response for the given request. The key includes the current token of each group so
+    that invalidating a group changes the keys of all of its responses.
+
+    :param cache: The cache
+    :type cache: :class:`django.core.cache.backends.base.BaseCache`
+    :param request: The HTTP GET request
+    :type request: :class:`rest_framework.request.Request`
+    :param group_names: The names of the groups of the response
+    :type group_names: list
+    :returns: The cache key
+    :rtype: string
+    """
+
+    tokens = []
+    for group_name in group_names:
+        group_key = _get_group_key(group_name)
+        token = cache.get(group_key)
+        if token is None:
+            cache.add(group_key, uuid.uuid4().hex, None)
+            token = cache.get(group_key)
+        tokens.append('%s=%s' % (group_name, token))
+
+    # Parameters are sorted by name, repeated values keep their order since it can be significant (such as order)
+    params = sorted(request.query_params.lists())
+    key_data = json.dumps([request.build_absolute_uri(request.path), params, tokens])
+    return 'rest-response:%s' % hashlib.sha1(key_data.encode('utf-8')).hexdigest()
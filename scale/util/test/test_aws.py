@@ -143,6 +143,19 @@ class TestS3Client(TestCase):
 
         self.assertEqual(len(list(results)), 2)
 
+    @patch('botocore.client.BaseClient._make_api_call')
+    def test_delete_objects_batches(self, mock_func):
+        mock_func.side_effect = [{'Errors': [{'Key': 'key_5', 'Code': 'InternalError'}]}, {}]
+        key_names = ['key_%i' % i for i in range(1500)]
+
+        with S3Client(self.credentials) as client:
+            errors = client.delete_objects('sample-bucket', key_names)
+
+        self.assertDictEqual(errors, {'key_5': 'InternalError'})
+        self.assertEqual(mock_func.call_count, 2)
+        self.assertEqual(len(mock_func.call_args_list[0][0][1]['Delete']['Objects']), 1000)
+        self.assertEqual(len(mock_func.call_args_list[1][0][1]['Delete']['Objects']), 500)
+
 
 
 class TestSQSClient(TestCase):
@@ -0,0 +1,92 @@
+from __future__ import unicode_literals
+
+import json
+
+import django
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import override_settings
+from rest_framework import status
+
+import error.test.utils as error_test_utils
+import util.rest_cache as rest_cache
+
+
+@override_settings(REST_CACHE_TIMEOUT=60)
+class TestCacheResponse(TestCase):
+
+    def setUp(self):
+        django.setup()
+
+        caches[rest_cache.CACHE_NAME].clear()
+        self.error = error_test_utils.create_error(category='DATA')
+        self.url = '/v6/errors/'
+
+    def test_hit(self):
+        """Tests that the second identical request is answered from the cache"""
+
+        response_1 = self.client.generic('GET', self.url)
+        self.assertEqual(response_1.status_code, status.HTTP_200_OK, response_1.content)
+        self.assertEqual(response_1['X-Cache'], 'MISS')
+
+        response_2 = self.client.generic('GET', self.url)
+        self.assertEqual(response_2.status_code, status.HTTP_200_OK, response_2.content)
+        self.assertEqual(response_2['X-Cache'], 'HIT')
+        self.assertEqual(response_2['ETag'], response_1['ETag'])
+        self.assertDictEqual(json.loads(response_2.content), json.loads(response_1.content))
+
+        # Different parameters are cached separately
+        response_3 = self.client.generic('GET', '%s?page_size=10' % self.url)
+        self.assertEqual(response_3['X-Cache'], 'MISS')
+
+        # Different hosts are cached separately since responses contain absolute links
+        response_4 = self.client.generic('GET', self.url, HTTP_HOST='localhost')
+        self.assertEqual(response_4['X-Cache'], 'MISS')
+
+    def test_not_modified(self):
+        """Tests that a request with a matching ETag gets a 304 response"""
+
+        response_1 = self.client.generic('GET', self.url)
+
+        response_2 = self.client.generic('GET', self.url, HTTP_IF_NONE_MATCH=response_1['ETag'])
+        self.assertEqual(response_2.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response_2['ETag'], response_1['ETag'])
+        self.assertEqual(response_2.content, b'')
+
+    @override_settings(REST_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        """Tests that responses are not cached when the cache is disabled"""
+
+        response = self.client.generic('GET', self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertFalse(response.has_header('X-Cache'))
+
+
+@override_settings(REST_CACHE_TIMEOUT=60)
+class TestInvalidateOnChange(TransactionTestCase):
+
+    def setUp(self):
+        django.setup()
+
+        caches[rest_cache.CACHE_NAME].clear()
+        self.error = error_test_utils.create_error(category='DATA')
+        self.url = '/v6/errors/'
+
+    def test_invalidate_on_change(self):
+        """Tests that saving a model invalidates the cached responses of its group once the change commits"""
+
+        response_1 = self.client.generic('GET', self.url)
+        count = json.loads(response_1.content)['count']
+
+        with transaction.atomic():
+            error_test_utils.create_error()
+
+            # The cached response is still used until the transaction commits
+            response_2 = self.client.generic('GET', self.url)
+            self.assertEqual(response_2['X-Cache'], 'HIT')
+
+        response_3 = self.client.generic('GET', self.url)
+        self.assertEqual(response_3['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response_3.content)['count'], count + 1)
+        self.assertNotEqual(response_3['ETag'], response_1['ETag'])